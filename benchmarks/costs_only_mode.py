@@ -0,0 +1,82 @@
+"""
+Compares a full run with a costs only run of the same project list.
+
+For each mode, this script runs every project in the input folder with
+XlsxSerialManagerRunner and reports the wall time and the peak memory
+allocated during the run, as measured by tracemalloc. The serial runner is
+used so that all the work happens in this process and is measured.
+
+Each mode is run twice, alternating, after a warm up run that fills the
+cache of input workbooks. The best time of each mode is reported.
+
+Run from the root of the repository:
+
+python -m benchmarks.costs_only_mode INPUT_FOLDER OUTPUT_FOLDER
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+from landbosse.excelio import XlsxFileOperations
+from landbosse.excelio import XlsxSerialManagerRunner
+
+
+def run(input_path, costs_only):
+    """
+    Runs all the projects once.
+
+    Parameters
+    ----------
+    input_path : str
+        The input folder, which has the project_list.xlsx
+
+    costs_only : bool
+        True to run in costs only mode.
+
+    Returns
+    -------
+    float, int, int
+        The elapsed time in seconds, the peak memory in bytes and the number
+        of rows of costs.
+    """
+    file_ops = XlsxFileOperations()
+    manager_runner = XlsxSerialManagerRunner(file_ops)
+    projects_xlsx = os.path.join(input_path, 'project_list.xlsx')
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, costs_only=costs_only)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, len(final_result['module_type_operation_df'])
+
+
+if __name__ == '__main__':
+    input_path, output_path = sys.argv[1], sys.argv[2]
+    os.environ['LANDBOSSE_INPUT_DIR'] = input_path
+    os.environ['LANDBOSSE_OUTPUT_DIR'] = output_path
+    del sys.argv[1:]
+
+    run(input_path, costs_only=False)
+
+    results = {False: [], True: []}
+    for _ in range(2):
+        for costs_only in [False, True]:
+            results[costs_only].append(run(input_path, costs_only))
+
+    full_time = min(elapsed for elapsed, _, _ in results[False])
+    full_peak = min(peak for _, peak, _ in results[False])
+    costs_time = min(elapsed for elapsed, _, _ in results[True])
+    costs_peak = min(peak for _, peak, _ in results[True])
+
+    print(f'{"Mode":<12}{"cost rows":>12}{"time s":>10}{"peak MB":>10}')
+    print(f'{"full":<12}{results[False][0][2]:>12}{full_time:>10.2f}{full_peak / 1e6:>10.1f}')
+    print(f'{"costs only":<12}{results[True][0][2]:>12}{costs_time:>10.2f}{costs_peak / 1e6:>10.1f}')
+    print(f'Speedup {full_time / costs_time:.2f}x, peak memory saved {(full_peak - costs_peak) / 1e6:.1f} MB '
+          f'({100 * (full_peak - costs_peak) / full_peak:.0f}%)')
@@ -0,0 +1,153 @@
+"""
+Micro-benchmarks for building dataframes row by row.
+
+The cost modules and Manager used to grow dataframes one piece at a time
+with DataFrame.append. Each append copies the whole dataframe, so the
+accumulation is quadratic in the number of pieces. They now collect the
+pieces in a list and concatenate once.
+
+The accumulation benchmarks are synthetic. They do not run the cost
+modules. For every place that was changed, this script makes pieces
+shaped like the ones that module produces and times both patterns on
+them. The incremental pattern is written with
+pd.concat([accumulated, piece]), which is what DataFrame.append does
+internally. Only the last table times a real method,
+ErectionCost.calculate_crane_lift_polygons(), after the change.
+
+Run from the root of the repository:
+
+python -m benchmarks.dataframe_accumulation
+"""
+
+import timeit
+
+import pandas as pd
+
+from landbosse.model import ErectionCost
+
+COST_COLUMNS = ['Type of cost', 'Cost USD', 'Phase of construction']
+
+
+def incremental(pieces, sort=False):
+    """
+    Accumulates the pieces the old way, one copy per piece.
+    """
+    accumulated = pd.DataFrame()
+    for piece in pieces:
+        accumulated = pd.concat([accumulated, piece], sort=sort)
+    return accumulated
+
+
+def single_concat(pieces, sort=False):
+    """
+    Accumulates the pieces the new way, one concatenation at the end.
+    """
+    return pd.concat(pieces, sort=sort)
+
+
+def cost_rows(count, phase):
+    """
+    Makes single row cost dataframes like those made in calculate_costs()
+    of the cost modules.
+    """
+    return [pd.DataFrame([['Labor', 1000.0 * i, phase]], columns=COST_COLUMNS) for i in range(count)]
+
+
+def crane_rows(count):
+    """
+    Makes rows like those made for each crane by
+    ErectionCost.calculate_crane_lift_polygons()
+    """
+    columns = ['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne',
+               'Max wind speed m per s', 'Setup time hr', 'Breakdown time hr', 'Hoist speed m per min',
+               'Speed of travel km per hr', 'Crew type ID', 'Crane poly']
+    return [pd.DataFrame([['Crawler crane', 'E01', f'crane{i}', 'SL', 600, 12.0, 10.0, 4.0, 30.0, 1.0, 'C01', None]],
+                         columns=columns) for i in range(count)]
+
+
+def component_rows(cranes, components):
+    """
+    Makes dataframes like those made for each crane by
+    ErectionCost.calculate_component_lift_max_wind_speed()
+    """
+    component_group = pd.DataFrame({
+        'Component': [f'component{i}' for i in range(components)],
+        'Mass tonne': [100.0] * components,
+        'Lift height m': [80.0] * components,
+        'vmax': [12.0] * components,
+        'crane_bool': [True] * components,
+    })
+    pieces = []
+    for i in range(cranes):
+        piece = component_group.copy()
+        piece['Crane name'] = f'crane{i}'
+        piece['Boom system'] = 'SL'
+        pieces.append(piece)
+    return pieces
+
+
+def crane_grouped(cranes):
+    """
+    Makes a crane_specs groupby for calling
+    ErectionCost.calculate_crane_lift_polygons() directly.
+    """
+    rows = []
+    for i in range(cranes):
+        for capacity, height in [(600, 80.0), (300, 100.0), (100, 120.0)]:
+            rows.append(['Crawler crane', 'E01', f'crane{i}', 'SL', 600, capacity, height, 12.0, 30.0, 1.0,
+                         10.0, 4.0, 'C01'])
+    crane_specs = pd.DataFrame(rows, columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system',
+                                              'Crane capacity tonne', 'Max capacity tonne', 'Hub height m',
+                                              'Max wind speed m per s', 'Hoist speed m per min',
+                                              'Speed of travel km per hr', 'Setup time hr', 'Breakdown time hr',
+                                              'Crew type ID'])
+    return crane_specs.groupby(['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne'])
+
+
+def time_it(fn, repeat):
+    """
+    Returns the best time of a number of repeats in milliseconds.
+    """
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1000
+
+
+if __name__ == '__main__':
+    cases = [
+        ('Manager total_costs', lambda: cost_rows(7, 'All'), False),
+        ('FoundationCost.calculate_costs', lambda: cost_rows(4, 'Foundation'), False),
+        ('SitePreparationCost material_needs', lambda: [
+            pd.DataFrame([[f'unit{i}', 10.0 * i]], columns=['Units', 'Quantity of material']) for i in range(5)
+        ], False),
+        ('SitePreparationCost.calculate_costs', lambda: cost_rows(5, 'Roads'), False),
+        ('CollectionCost.calculate_costs', lambda: cost_rows(4, 'Collection'), False),
+        ('ErectionCost.calculate_crane_lift_polygons', lambda: crane_rows(40), True),
+        ('ErectionCost.calculate_component_lift_max_wind_speed', lambda: component_rows(40, 8), True),
+        ('ErectionCost.find_minimum_cost_cranes', lambda: cost_rows(3, 'Erection'), True),
+    ]
+
+    print(f'{"Accumulation":<56}{"pieces":>8}{"append ms":>12}{"concat ms":>12}{"speedup":>10}')
+    for name, make_pieces, sort in cases:
+        pieces = make_pieces()
+        old = time_it(lambda: incremental(pieces, sort), repeat=20)
+        new = time_it(lambda: single_concat(pieces, sort), repeat=20)
+        print(f'{name:<56}{len(pieces):>8}{old:>12.3f}{new:>12.3f}{old / new:>9.1f}x')
+
+    # The quadratic cost shows when the number of pieces grows, as it does
+    # with large crane catalogs.
+    print()
+    print(f'{"Scaling of component max speed accumulation":<56}{"cranes":>8}{"append ms":>12}{"concat ms":>12}{"speedup":>10}')
+    for cranes in [10, 100, 1000]:
+        pieces = component_rows(cranes, 8)
+        old = time_it(lambda: incremental(pieces, True), repeat=3)
+        new = time_it(lambda: single_concat(pieces, True), repeat=3)
+        print(f'{"":<56}{cranes:>8}{old:>12.3f}{new:>12.3f}{old / new:>9.1f}x')
+
+    # Time the refactored method itself, where the rows are collected in a
+    # list and the dataframe is made once.
+    print()
+    print(f'{"ErectionCost.calculate_crane_lift_polygons (actual method)":<56}{"cranes":>8}{"ms":>12}')
+    erection_cost = ErectionCost(input_dict=dict(), output_dict=dict(), project_name='benchmark')
+    for cranes in [10, 100, 1000]:
+        grouped = crane_grouped(cranes)
+        elapsed = time_it(lambda: erection_cost.calculate_crane_lift_polygons(crane_grouped=grouped), repeat=3)
+        print(f'{"":<56}{cranes:>8}{elapsed:>12.3f}')
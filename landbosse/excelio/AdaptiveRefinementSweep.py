@@ -0,0 +1,348 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .XlsxOperationException import XlsxOperationException
+from .XlsxReader import XlsxReader
+from .GridSearchTree import GridSearchTree
+from .ProjectResultWriter import ProjectResultWriter
+
+
+class AdaptiveRefinementSweep:
+    """
+    AdaptiveRefinementSweep runs a parametric sweep that starts coarse and
+    adds points only where the costs change, instead of running every
+    point of the grids in the parametric list.
+
+    The grid of each Project ID in the parametric list (Min/Max/Step or
+    Value list) is the finest resolution the sweep may reach. The sweep
+    goes in rounds:
+
+    1. The first round runs a coarse grid: a few evenly spaced values on
+       each axis, always including both ends. Projects without parametric
+       variations are run once in this round too.
+
+    2. After each round, every pair of neighboring points that have been
+       run is compared. Neighbors differ on a single axis and have no point
+       that has been run between them. If the total cost, or the cost of
+       any module, differs by more than the tolerance, the point halfway
+       between them on the grid is added to the next round.
+
+    3. Rounds continue until there are no points to add or the run budget
+       is used up. When the budget cannot hold all the points of a round,
+       the points between neighbors with the biggest differences are run
+       first.
+
+    Each round is run with the run_projects() method of a manager runner,
+    so it can be serial or parallel. Serial numbers are assigned as points
+    are added, and the results of all the rounds are put together in the
+    same dictionary returned by run_from_project_list_xlsx() of the runners.
+    """
+
+    def __init__(self, manager_runner, run_budget, tolerance=0.05, initial_points_per_axis=3, by_module=True):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner that runs the projects of each round.
+
+        run_budget : int
+            The maximum number of projects to run, including the projects
+            that have no parametric variations. Those projects are always
+            run, even if there are more of them than the budget.
+
+        tolerance : float
+            The relative difference of costs between neighboring points
+            above which the sweep adds a point between them. 0.05 means 5%
+            of the larger of the two costs.
+
+        initial_points_per_axis : int
+            The number of values on each axis of the coarse grid.
+
+        by_module : bool
+            True to compare the cost of each module as well as the total
+            cost. False to compare the total cost only.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the run budget is less than 1.
+        """
+        if run_budget < 1:
+            raise XlsxOperationException('The run budget of an adaptive sweep must be at least 1.')
+        self.manager_runner = manager_runner
+        self.run_budget = run_budget
+        self.tolerance = tolerance
+        self.initial_points_per_axis = initial_points_per_axis
+        self.by_module = by_module
+
+    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False, costs_only=False,
+                                   result_writer=None):
+        """
+        Runs the sweep of the project list and parametric list in the input
+        directory. The arguments and the returned dictionary are the same as
+        XlsxManagerRunner.run_from_project_list_xlsx(). The sweep is limited
+        by its run budget, so the outputs of the rounds are kept in memory
+        and handed to result_writer in one chunk at the end.
+
+        Returns
+        -------
+        dict
+            The details_df, module_type_operation_df and
+            extended_project_list of all the rounds, in the order the points
+            were run, if result_writer is None. Otherwise the return value
+            of result_writer.result()
+        """
+        project_list, parametric_list = self.manager_runner.read_project_and_parametric_lists()
+        xlsx_reader = XlsxReader()
+        self.manager_runner.prefetch_project_data(project_list)
+
+        axes_by_project_id = self.project_axes(parametric_list)
+        digit_count = xlsx_reader.serial_digit_count(self.run_budget)
+
+        # For each Project ID, the costs of the points that have been run,
+        # keyed by the tuple of the positions of the point's values on the
+        # axes.
+        costs_by_project_id = {project_id: dict() for project_id in axes_by_project_id}
+
+        unvaried_project_list = project_list[~project_list['Project ID'].isin(list(axes_by_project_id))]
+        new_points = self.initial_points(axes_by_project_id)
+        run_count = 0
+        serial_count = 0
+        round_count = 0
+        round_results = ProjectResultWriter()
+
+        while run_count < self.run_budget:
+            # Projects without parametric variations count against the budget
+            # but are only run in the first round.
+            if round_count == 0:
+                points_in_budget = max(self.run_budget - len(unvaried_project_list), 0)
+            else:
+                points_in_budget = self.run_budget - run_count
+            new_points = new_points[:points_in_budget]
+            if len(new_points) == 0 and round_count > 0:
+                break
+
+            # Assign serial numbers as points are added
+            serials = {}
+            for point in new_points:
+                project_id, _ = point
+                serials[point] = f'{project_id}_{str(serial_count).zfill(digit_count)}'
+                serial_count += 1
+            round_unvaried_project_list = unvaried_project_list if round_count == 0 else None
+            round_project_list, parametric_value_list = self.round_project_list(
+                project_list, round_unvaried_project_list, axes_by_project_id, new_points, serials)
+
+            round_size = len(new_points) + (len(unvaried_project_list) if round_count == 0 else 0)
+            print(f'Adaptive sweep round {round_count}: running {round_size} projects')
+            point_costs, round_result = self.manager_runner.run_costs_by_module(
+                round_project_list, parametric_value_list, enable_cost_and_scaling_modifications, costs_only)
+            round_count += 1
+
+            # The rows of the extended project list are numbered in the
+            # order the points were run.
+            extended_project_list = round_result['extended_project_list']
+            extended_project_list.index = pd.RangeIndex(run_count, run_count + len(extended_project_list))
+            round_results.write(round_result['module_type_operation_df'], round_result['details_df'],
+                                extended_project_list)
+            run_count += len(extended_project_list)
+
+            # Points that failed to run have no costs.
+            for point, serial in serials.items():
+                project_id, positions = point
+                if point_costs.loc[serial].notnull().all():
+                    costs_by_project_id[project_id][positions] = point_costs.loc[serial]
+
+            new_points = self.refinement_points(axes_by_project_id, costs_by_project_id)
+
+        final_result = round_results.result()
+        if result_writer is None:
+            return final_result
+        result_writer.write(final_result['module_type_operation_df'], final_result['details_df'],
+                            final_result['extended_project_list'])
+        return result_writer.result()
+
+    def project_axes(self, parametric_list):
+        """
+        Finds the grid of each Project ID in the parametric list.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The parametric list. It may be empty.
+
+        Returns
+        -------
+        dict
+            Keys are Project IDs. Values are lists of the axes of their
+            grids, as returned by GridSearchTree.axes()
+
+        Raises
+        ------
+        XlsxOperationException
+            If a Project ID uses a sampling design instead of a grid.
+        """
+        axes_by_project_id = dict()
+        if parametric_list.empty:
+            return axes_by_project_id
+        xlsx_reader = XlsxReader()
+        for project_id, group in parametric_list.groupby('Project ID'):
+            design = xlsx_reader.parametric_design(group)
+            if not isinstance(design, GridSearchTree):
+                raise XlsxOperationException(
+                    f'Adaptive refinement needs a grid for Project ID {project_id}, not a sampling design.'
+                )
+            axes = design.axes()
+            if all(len(values) > 0 for _, values in axes):
+                axes_by_project_id[project_id] = axes
+        return axes_by_project_id
+
+    def initial_points(self, axes_by_project_id):
+        """
+        Makes the points of the coarse grids.
+
+        Parameters
+        ----------
+        axes_by_project_id : dict
+            See project_axes()
+
+        Returns
+        -------
+        list
+            Tuples of Project ID and the positions of the point's values on
+            each axis.
+        """
+        points = []
+        for project_id, axes in axes_by_project_id.items():
+            axis_positions = []
+            for _, values in axes:
+                value_count = min(self.initial_points_per_axis, len(values))
+                positions = np.unique(np.round(np.linspace(0, len(values) - 1, max(value_count, 1))).astype(int))
+                axis_positions.append(positions.tolist())
+            for positions in itertools.product(*axis_positions):
+                points.append((project_id, tuple(positions)))
+        return points
+
+    def refinement_points(self, axes_by_project_id, costs_by_project_id):
+        """
+        Finds the points to add between neighbors whose costs differ by
+        more than the tolerance.
+
+        Parameters
+        ----------
+        axes_by_project_id : dict
+            See project_axes()
+
+        costs_by_project_id : dict
+            For each Project ID, a dictionary with the positions of the
+            points that have been run as keys and their costs as values.
+
+        Returns
+        -------
+        list
+            Tuples of Project ID and positions, ordered from the biggest
+            difference to the smallest.
+        """
+        candidates = dict()
+        for project_id, costs_by_positions in costs_by_project_id.items():
+            axis_count = len(axes_by_project_id[project_id])
+            for axis in range(axis_count):
+
+                # Group the points into lines along the axis
+                lines = dict()
+                for positions in costs_by_positions:
+                    line_key = positions[:axis] + positions[axis + 1:]
+                    lines.setdefault(line_key, []).append(positions)
+
+                for line in lines.values():
+                    line.sort(key=lambda positions: positions[axis])
+                    for left, right in zip(line[:-1], line[1:]):
+                        if right[axis] - left[axis] < 2:
+                            continue
+                        difference = self.relative_difference(costs_by_positions[left], costs_by_positions[right])
+                        if difference > self.tolerance:
+                            middle = left[:axis] + ((left[axis] + right[axis]) // 2,) + left[axis + 1:]
+                            if middle not in costs_by_positions:
+                                point = (project_id, middle)
+                                candidates[point] = max(difference, candidates.get(point, 0))
+
+        return sorted(candidates, key=lambda point: (-candidates[point], str(point[0]), point[1]))
+
+    def relative_difference(self, left_costs, right_costs):
+        """
+        Parameters
+        ----------
+        left_costs : pandas.Series
+            The costs of one point, as in a row of
+            XlsxManagerRunner.extract_costs_by_module()
+
+        right_costs : pandas.Series
+            The costs of the other point.
+
+        Returns
+        -------
+        float
+            The biggest relative difference among the compared costs.
+        """
+        if not self.by_module:
+            left_costs = left_costs[['Total']]
+            right_costs = right_costs[['Total']]
+        left_costs, right_costs = left_costs.align(right_costs, fill_value=0)
+        left_costs = left_costs.values.astype(float)
+        right_costs = right_costs.values.astype(float)
+        scale = np.maximum(np.abs(left_costs), np.abs(right_costs))
+        difference = np.abs(left_costs - right_costs)
+        relative = np.divide(difference, scale, out=np.zeros_like(difference), where=scale > 0)
+        return float(relative.max()) if len(relative) > 0 else 0.0
+
+    def round_project_list(self, project_list, unvaried_project_list, axes_by_project_id, points, serials):
+        """
+        Picks the projects of a round and makes the parametric values of
+        its points.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        unvaried_project_list : pandas.DataFrame
+            The projects without parametric variations to run in this round,
+            or None.
+
+        axes_by_project_id : dict
+            See project_axes()
+
+        points : list
+            Tuples of Project ID and positions of the points to run.
+
+        serials : dict
+            The Project ID with serial of each point.
+
+        Returns
+        -------
+        pandas.DataFrame, pandas.DataFrame
+            The rows of the project list to run in the round, and the
+            parametric values of the points. Joined, they are the extended
+            project list of the round, in the order of the project list.
+        """
+        parametric_value_rows = []
+        for point in points:
+            project_id, positions = point
+            parametric_value_row = dict()
+            for (cell_specification, values), position in zip(axes_by_project_id[project_id], positions):
+                parametric_value_row[cell_specification] = values[position]
+            parametric_value_row['Project ID'] = project_id
+            parametric_value_row['Project ID with serial'] = serials[point]
+            parametric_value_rows.append(parametric_value_row)
+
+        point_project_ids = {project_id for project_id, _ in points}
+        is_in_round = project_list['Project ID'].isin(list(point_project_ids))
+        if unvaried_project_list is not None:
+            is_in_round |= project_list.index.isin(unvaried_project_list.index)
+
+        if len(parametric_value_rows) > 0:
+            parametric_value_list = pd.DataFrame(parametric_value_rows)
+        else:
+            parametric_value_list = pd.DataFrame(columns=['Project ID', 'Project ID with serial'])
+        return project_list[is_in_round], parametric_value_list
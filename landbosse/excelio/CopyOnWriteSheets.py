@@ -0,0 +1,147 @@
+from collections.abc import MutableMapping
+
+
+class CopyOnWriteSheets(MutableMapping):
+    """
+    CopyOnWriteSheets is a dictionary of the sheets of a project data .xlsx
+    file that shares the dataframes with XlsxDataframeCache rather than
+    copying them.
+
+    Reading a sheet with sheets[name] returns the dataframe shared by
+    every project that uses the same .xlsx file. It must be treated as read
+    only. A caller that modifies a sheet must first ask for a writable
+    version of it with writable(name). The first call copies that one sheet
+    and every later access to that name, through either sheets[name] or
+    writable(name), returns the copy. The other sheets remain shared.
+
+    Most parametric variants change a cell or two on a single sheet, so
+    only that sheet is copied instead of the whole workbook.
+
+    Assigning a dataframe with sheets[name] = df stores it for this
+    instance only. Deleting a sheet hides it from this instance only.
+    """
+
+    def __init__(self, shared_sheets):
+        """
+        Parameters
+        ----------
+        shared_sheets : Mapping
+            Keys are names of sheets and values are the shared dataframes.
+            These dataframes are never modified by this class.
+        """
+        self._shared = shared_sheets
+        self._own = dict()
+        self._deleted = set()
+
+    def __getitem__(self, sheet_name):
+        if sheet_name in self._own:
+            return self._own[sheet_name]
+        if sheet_name in self._deleted:
+            raise KeyError(sheet_name)
+        return self._shared[sheet_name]
+
+    def __setitem__(self, sheet_name, df):
+        self._own[sheet_name] = df
+        self._deleted.discard(sheet_name)
+
+    def __delitem__(self, sheet_name):
+        if sheet_name not in self:
+            raise KeyError(sheet_name)
+        self._own.pop(sheet_name, None)
+        self._deleted.add(sheet_name)
+
+    def __contains__(self, sheet_name):
+        if sheet_name in self._own:
+            return True
+        return sheet_name not in self._deleted and sheet_name in self._shared
+
+    def __iter__(self):
+        for sheet_name in self._shared:
+            if sheet_name in self:
+                yield sheet_name
+        for sheet_name in self._own:
+            if sheet_name not in self._shared:
+                yield sheet_name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def writable(self, sheet_name):
+        """
+        Returns a version of a sheet that the caller may modify in place.
+        The first time this is called for a sheet, the shared dataframe is
+        copied. Later calls return the same copy.
+
+        Parameters
+        ----------
+        sheet_name : str
+            The name of the sheet.
+
+        Returns
+        -------
+        pd.DataFrame
+            The dataframe of the sheet owned by this instance.
+        """
+        if sheet_name not in self._own:
+            self._own[sheet_name] = self[sheet_name].copy()
+        return self._own[sheet_name]
+
+    def is_shared(self, sheet_name):
+        """
+        Parameters
+        ----------
+        sheet_name : str
+            The name of the sheet.
+
+        Returns
+        -------
+        bool
+            True if sheets[sheet_name] is still the shared, unmodified
+            dataframe. False if this instance has its own version of it.
+        """
+        return sheet_name in self and sheet_name not in self._own
+
+    def shared_sheets(self):
+        """
+        Returns
+        -------
+        Mapping
+            The shared sheets this instance was made from. They must not be
+            modified.
+        """
+        return self._shared
+
+    def copied_sheet_names(self):
+        """
+        Returns
+        -------
+        list
+            The names of the sheets that are owned by this instance rather
+            than shared, because they were made writable or assigned.
+        """
+        return list(self._own.keys())
+
+    @staticmethod
+    def writable_sheet(sheets, sheet_name):
+        """
+        Returns a version of a sheet that may be modified in place. This
+        works both on instances of CopyOnWriteSheets and on plain
+        dictionaries of dataframes. Plain dictionaries are assumed to be
+        owned by the caller, so their dataframes are returned as they are.
+
+        Parameters
+        ----------
+        sheets : dict or CopyOnWriteSheets
+            The sheets.
+
+        sheet_name : str
+            The name of the sheet.
+
+        Returns
+        -------
+        pd.DataFrame
+            The dataframe that may be modified.
+        """
+        if isinstance(sheets, CopyOnWriteSheets):
+            return sheets.writable(sheet_name)
+        return sheets[sheet_name]
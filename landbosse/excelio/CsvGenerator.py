@@ -1,11 +1,29 @@
 import pandas as pd
 
+from ..model import DetailCollector
+from ..model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+
 
 class CsvGenerator:
     """
     This class generates CSV files.
     """
 
+    # Keys are the columns of the costs dataframe made by the manager
+    # runners. Values are the names of those columns in the costs .csv,
+    # in the order they are written.
+    costs_csv_columns = {
+        'project_id_with_serial': 'Project ID with serial',
+        'num_turbines': 'Number of turbines',
+        'turbine_rating_MW': 'Turbine rating MW',
+        'rotor_diameter_m': 'Rotor diameter m',
+        'module': 'Module',
+        'type_of_cost': 'Type of cost',
+        'cost_per_turbine': 'Cost per turbine',
+        'cost_per_project': 'Cost per project',
+        'usd_per_kw_per_project': 'Cost per kW'
+    }
+
     def __init__(self, file_ops):
         """
         Parameters
@@ -21,93 +39,57 @@ class CsvGenerator:
 
         Parameters
         ----------
-        details : list[dict]
-            A list of dictionaries to be converted into a Pandas dataframe
+        details : pd.DataFrame or list[dict]
+            The block of detail rows made by the manager runners, with the
+            columns in DetailCollector.columns. A list of dictionaries is
+            also accepted.
 
         Returns
         -------
         pd.DataFrame
             The dataframe that can be written to a .csv file.
         """
-
-        # This the list of details to write to the .csv
-        details_to_write_to_csv = []
-        for row in details:
-            new_row = {}
-            new_row["Project ID with serial"] = row["project_id_with_serial"]
-            new_row["Module"] = row["module"]
-            new_row["Variable name"] = row["variable_df_key_col_name"]
-            new_row["Unit"] = row["unit"]
-
-            value = row["value"]
-            value_is_number = self._is_numeric(value)
-            if value_is_number:
-                new_row["Numeric value"] = value
-            else:
-                new_row["Non-numeric value"] = value
-
-            # If there is a last_number, which means this is a dataframe row that has a number
-            # at the end, write this into the numeric value column. This overrides automatic
-            # type detection.
-
-            if "last_number" in row:
-                new_row["Numeric value"] = row["last_number"]
-
-            details_to_write_to_csv.append(new_row)
-
-        details = pd.DataFrame(details_to_write_to_csv)
-
-        return details
+        if not isinstance(details, pd.DataFrame):
+            details = DetailCollector.from_records(details)
+
+        # Numeric values go in the numeric column and everything else goes
+        # in the non-numeric column.
+        value = details['value']
+        value_is_number = DetailCollector.numeric_value_mask(value)
+        numeric_value = value.where(value_is_number)
+        non_numeric_value = value.where(~value_is_number)
+
+        # If there is a last_number, which means this is a dataframe row that has a number
+        # at the end, write this into the numeric value column. This overrides automatic
+        # type detection.
+        has_last_number = details['has_last_number'].values
+        numeric_value = numeric_value.where(~has_last_number, details['last_number'])
+
+        details_to_write_to_csv = pd.DataFrame({
+            'Project ID with serial': details['project_id_with_serial'],
+            'Module': details['module'],
+            'Variable name': details['variable_df_key_col_name'],
+            'Unit': details['unit'],
+            'Numeric value': numeric_value.infer_objects(),
+            'Non-numeric value': non_numeric_value.infer_objects()
+        })
+
+        return details_to_write_to_csv.reset_index(drop=True)
 
     def create_costs_dataframe(self, costs):
         """
         Parameters
         ----------
-        costs : list[dict]
-            The list of dictionaries of costs.
+        costs : pd.DataFrame or list[dict]
+            The dataframe of costs made by the manager runners. A list of
+            dictionaries of costs is also accepted.
 
         Returns
         -------
         pd.DataFrame
             A dataframe to be written as a .csv
         """
-        new_rows = []
-        for row in costs:
-            new_row = {
-                "Project ID with serial": row["project_id_with_serial"],
-                "Number of turbines": row["num_turbines"],
-                "Turbine rating MW": row["turbine_rating_MW"],
-                "Rotor diameter m": row["rotor_diameter_m"],
-                "Module": row["module"],
-                "Type of cost": row["type_of_cost"],
-                "Cost per turbine": row["cost_per_turbine"],
-                "Cost per project": row["cost_per_project"],
-                "Cost per kW": row["usd_per_kw_per_project"]
-            }
-            new_rows.append(new_row)
-        costs_df = pd.DataFrame(new_rows)
-        return costs_df
-
-    def _is_numeric(self, value):
-        """
-        This method tests if a value is a numeric (that is, can be parsed
-        by float()) or non numeric (which cannot be parsed).
-
-        The decision from this method determines whether values go into
-        the numeric or non-numeric columns.
-
-        Parameters
-        ----------
-        value
-            The value to be tested.
-
-        Returns
-        -------
-        bool
-            True if the value is numeric, False otherwise.
-        """
-        try:
-            float(value)
-        except ValueError:
-            return False
-        return True
+        if not isinstance(costs, pd.DataFrame):
+            costs = pd.DataFrame(costs, columns=COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS)
+        costs_df = costs[list(self.costs_csv_columns.keys())].rename(columns=self.costs_csv_columns)
+        return costs_df.reset_index(drop=True)
@@ -1,28 +1,30 @@
+import itertools
+
 import numpy as np
 import pandas as pd
 
 """
-This module contains the logic to handle a tree to compute
-points in an N-dimensional parametric search space.
+This module contains the logic to compute points in an N-dimensional
+parametric search space.
 """
 
-class GridSearchTreeNode:
-    """
-    This just contains information about a node in the grid
-    search tree.
-    """
-
-    def __init__(self):
-        self.cell_specification = None
-        self.children = []
-        self.value = None
-
 
 class GridSearchTree:
     """
-    This class implements a k-ary tree to compute possible
-    combinations of points in a N-dimensional parametric
-    search space.
+    This class computes the possible combinations of points in a
+    N-dimensional parametric search space.
+
+    Conceptually, the points are the leaves of a k-ary tree. Each level of
+    the tree is one row of the parametric list (an axis) and each node on
+    that level is one value of that axis. The points are in the order of a
+    depth first traversal of that tree: the last axis changes fastest.
+
+    The tree is never built. The number of points is the product of the
+    number of values on each axis, and the point at any position in the
+    traversal is found with index arithmetic. This means that points can
+    be streamed one at a time with iter_grid() or in columnar chunks with
+    iter_grid_chunks(), and a sweep with millions of points does not need
+    to fit in memory.
     """
 
     def __init__(self, parametric_list):
@@ -36,127 +38,109 @@ class GridSearchTree:
             The dataframe of the parametrics list.
         """
         self.parametric_list = parametric_list
+        self._axes = None
 
-    def build_grid_tree_and_return_grid(self):
+    def axes(self):
         """
-        See the dataframes in XlsxReader.create_parametric_value_list()
-        for context.
-
-        This builds a tree of points in the search space and traverse
-        it to find points on the grid.
+        Returns the axes of the search space, in the order of the rows of
+        the parametric list.
 
         Returns
         -------
+        list
+            A list of tuples. The first element of each tuple is the cell
+            specification and the second is a numpy array of the values
+            on that axis.
         """
-
-        # Build the tree. Its leaf nodes contain the values for each
-        # point in the grid.
-        root = self.build_tree()
-
-        # Recursions of the traversal method needs to start with an empty
-        # list.
-        grid = self.dfs_search_tree(root, traversal=[])
-        return grid
-
-    def build_tree(self, depth=0, root=None):
+        if self._axes is None:
+            self._axes = []
+            for _, row in self.parametric_list.iterrows():
+                cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+
+                # First, make an iterable of the range we are going to be using.
+                #
+                # Putting the stop at end + step ensures the end value is in the sequence
+                if 'Value list' in row and not pd.isnull(row['Value list']):
+                    values = np.array([float(value) for value in row['Value list'].split(',')])
+                else:
+                    start = row['Min']
+                    end = row['Max']
+                    step = row['Step']
+                    values = np.arange(start, end + step, step)
+
+                self._axes.append((cell_specification, values))
+        return self._axes
+
+    def point_count(self):
         """
-        This method builds a k-ary tree to contain cell_specifications and
-        their values.
-
-        Callers from outside this method shouldn't override the defaults
-        for the parameters. These parameters are to manage the recursion,
-        and are supplied by this method when it invokes itself.
-
-        Parameters
-        ----------
-        root : GridSearchTreeNode
-            The root of the subtree. At the start of iteration, at the
-            root of the whole tree, this should be None.
-
-        depth : int
-            The level of the tree currently being built. This is
-            also the row number in the dataframe from which the tree
-            is being built.
-
         Returns
         -------
-        GridSearchTreeNode
-            The root of the tree just built.
+        int
+            The number of points in the search space.
         """
-        row = self.parametric_list.iloc[depth]
-        cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
-
-        # First, make an iterable of the range we are going to be using.
-        if 'Value list' in row and not pd.isnull(row['Value list']):
-            values = [float(value) for value in row['Value list'].split(',')]
-        else:
-            start = row['Min']
-            end = row['Max']
-            step = row['Step']
-            values = np.arange(start, end + step, step)
-
-        if root == None:
-            root = GridSearchTreeNode()
-
-        # Putting the stop at end + step ensures the end value is in the sequence
-        #
-        # Append children for each value in the parametric step sequence.
-
-        for value in values:
-            child = GridSearchTreeNode()
-            child.value = value
-            child.cell_specification = cell_specification
-            root.children.append(child)
-
-            # If there are more levels of variables to add, recurse
-            # down 1 level.
-            if len(self.parametric_list) > depth + 1:
-                self.build_tree(depth + 1, child)
-
-        return root
-
-    def dfs_search_tree(self, root, traversal, path=None):
-        """
-        This does a depth first search traversal of the GridSearchTree
-        specified by the root parameter. It stores the node it encounters
-        in the list referenced by traversal.
-
-        There is a distinction from normal DFS traversals: Only leaf nodes
-        are recorded in the traversal. This means that only nodes that have
-        a complete list of cell specifications and values are returned.
-
-        Parameters
-        ----------
-        root : GridSearchTreeNode
-            The root of the
+        return int(np.prod([len(values) for _, values in self.axes()], dtype=object))
 
-        traversal : list
-            The nodes traversed on the tree. When this method is called
-            by an external caller, this should be an empty list ([])
+    def build_grid_tree_and_return_grid(self):
+        """
+        See the dataframes in XlsxReader.create_parametric_value_list()
+        for context.
 
-        path : list
-            This shouldn't be manipulated except by this method itself.
-            It is for storing the paths to the leaf nodes.
+        This returns all the points of the grid in a list. For large search
+        spaces, use iter_grid() or iter_grid_chunks() instead.
 
         Returns
         -------
         list
-            A list of dictionaries that hold the cell specifications and
-            values of each leaf node.
+            A list with one element for each point. Each element is a list
+            of dictionaries that hold the cell specifications and values of
+            the point.
         """
+        return list(self.iter_grid())
 
-        path = [] if path is None else path[:]
-
-        if root.cell_specification is not None:
-            path.append({
-                'cell_specification': root.cell_specification,
-                'value': root.value,
-            })
-
-        if len(root.children) == 0:
-            traversal.append(path)
+    def iter_grid(self):
+        """
+        Yields the points of the grid one at a time, in depth first order.
 
-        for child in root.children:
-            self.dfs_search_tree(child, traversal, path)
+        Yields
+        ------
+        list
+            A list of dictionaries for each point, with the keys
+            'cell_specification' and 'value', one dictionary per axis.
+        """
+        axes = self.axes()
+        cell_specifications = [cell_specification for cell_specification, _ in axes]
+        for point in itertools.product(*[values for _, values in axes]):
+            yield [
+                {'cell_specification': cell_specification, 'value': value}
+                for cell_specification, value in zip(cell_specifications, point)
+            ]
+
+    def iter_grid_chunks(self, chunk_size):
+        """
+        Yields the points of the grid in columnar chunks, in depth first
+        order. The values of each chunk are computed from the positions of
+        its points with numpy.unravel_index().
 
-        return traversal
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of points in each chunk.
+
+        Yields
+        ------
+        int, dict
+            The position of the first point of the chunk in the whole grid,
+            and a dictionary of the values of the points. Keys are cell
+            specifications and values are numpy arrays with one element
+            for each point. If an axis is repeated, the last one wins.
+        """
+        axes = self.axes()
+        shape = [len(values) for _, values in axes]
+        point_count = self.point_count()
+        for start in range(0, point_count, chunk_size):
+            positions = np.arange(start, min(start + chunk_size, point_count))
+            indices = np.unravel_index(positions, shape)
+            chunk = dict()
+            for (cell_specification, values), index in zip(axes, indices):
+                chunk[cell_specification] = values[index]
+            yield start, chunk
@@ -0,0 +1,185 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .XlsxOperationException import XlsxOperationException
+
+
+class ParametricOverridePlan:
+    """
+    A ParametricOverridePlan is the precompiled form of the cell
+    specifications in a project list. A cell specification is a column
+    named like "rsmeans/Excavation/Rate USD per unit" that gives, for each
+    project, a value to place in a cell of the project data or, when the
+    name starts with "project list/", in the project parameters.
+
+    Resolving a cell specification means splitting its name, finding the
+    rows whose first column matches the row name and finding the column.
+    Every serial of a parametric sweep uses the same project data file and
+    the same cell specifications, so the plan does this once. Each
+    variant then only writes its values at the resolved integer row and
+    column positions.
+
+    Errors, such as a sheet, row or column that does not exist, are found
+    when the plan is made but are only raised when a project actually has
+    a value for that cell specification. This matches the behavior of
+    checking each cell specification as its value is applied.
+    """
+
+    # This is a regex to match a column name that specifies a change to make
+    # to a cell
+    cell_spec_re = re.compile('^.*/.*/.*$')
+
+    def __init__(self, project_data_dataframes, parameter_names):
+        """
+        Parameters
+        ----------
+        project_data_dataframes : dict or CopyOnWriteSheets
+            The sheets of the project data, before any modifications.
+
+        parameter_names : iterable
+            The names of the project parameters. Those that are cell
+            specifications become steps of the plan.
+        """
+        self.steps = []
+        for parameter_name in parameter_names:
+            if self.cell_spec_re.match(parameter_name):
+                self.steps.append(self.resolve(project_data_dataframes, parameter_name))
+
+    @classmethod
+    def cell_spec_names(cls, parameter_names):
+        """
+        Parameters
+        ----------
+        parameter_names : iterable
+            The names of the project parameters.
+
+        Returns
+        -------
+        tuple
+            The names that are cell specifications, in order.
+        """
+        return tuple(name for name in parameter_names if cls.cell_spec_re.match(name))
+
+    @classmethod
+    def resolve(cls, project_data_dataframes, parameter_name):
+        """
+        Resolves one cell specification.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict or CopyOnWriteSheets
+            The sheets of the project data.
+
+        parameter_name : str
+            The cell specification, in the form "dataframe/row/column"
+
+        Returns
+        -------
+        dict
+            The step of the plan. It has the keys 'parameter_name',
+            'dataframe_name', 'column_name', 'row_positions',
+            'column_positions' and 'error'. If 'error' is not None, it is the
+            message of the XlsxOperationException to raise when the step is
+            applied.
+        """
+        dataframe_name, row_name, column_name = parameter_name.split('/')
+        step = {
+            'parameter_name': parameter_name,
+            'dataframe_name': dataframe_name,
+            'column_name': column_name,
+            'row_positions': None,
+            'column_positions': None,
+            'error': None
+        }
+
+        # Project list parameters are checked against the project parameters
+        # when the step is applied.
+        if dataframe_name == 'project list':
+            return step
+
+        # Check if dataframe exists
+        if dataframe_name not in project_data_dataframes:
+            step['error'] = \
+                f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.'
+            return step
+
+        df = project_data_dataframes[dataframe_name]
+        first_col = df.columns[0]
+
+        # Check if row exists
+        row_positions = np.flatnonzero((df[first_col] == row_name).values)
+        if len(row_positions) == 0:
+            step['error'] = \
+                f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.'
+            return step
+
+        # Check if column exists
+        column_positions = np.flatnonzero(df.columns == column_name)
+        if len(column_positions) == 0:
+            step['error'] = \
+                f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.'
+            return step
+
+        step['row_positions'] = row_positions
+        step['column_positions'] = column_positions
+        return step
+
+    def apply(self, project_data_dataframes, project_parameters, writable_sheet, apply_project_list=True,
+              apply_project_data=True):
+        """
+        Applies the values of one project to the project data and the
+        project parameters, in place.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict or CopyOnWriteSheets
+            The sheets of the project data. They must have the same rows and
+            columns as the sheets the plan was made from.
+
+        project_parameters : pandas.Series
+            The project parameters, with the values of the cell
+            specifications.
+
+        writable_sheet : callable
+            Called with project_data_dataframes and the name of a sheet to
+            get a version of the sheet that may be modified.
+
+        apply_project_list : bool
+            If False, the values of the "project list/" cell specifications
+            are not applied to the project parameters, because they were
+            applied already. Their columns are still checked.
+
+        apply_project_data : bool
+            If False, the values of the other cell specifications are not
+            written to the project data, because the project data is
+            modified elsewhere. Their cells are still checked.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a cell specification with a value does not point to a valid
+            cell.
+        """
+        for step in self.steps:
+            value = project_parameters[step['parameter_name']]
+            if pd.isnull(value):
+                continue
+
+            if step['dataframe_name'] == 'project list':
+                column_name = step['column_name']
+                if column_name not in project_parameters:
+                    raise XlsxOperationException(
+                        f'Column {column_name} not found in project parameters'
+                    )
+                if apply_project_list:
+                    project_parameters[column_name] = value
+
+            else:
+                if step['error'] is not None:
+                    raise XlsxOperationException(step['error'])
+                if not apply_project_data:
+                    continue
+                df = writable_sheet(project_data_dataframes, step['dataframe_name'])
+                df.iloc[step['row_positions'], step['column_positions']] = value
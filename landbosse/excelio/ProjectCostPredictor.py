@@ -0,0 +1,124 @@
+from collections import deque
+
+import numpy as np
+
+
+class ProjectCostPredictor:
+    """
+    ProjectCostPredictor predicts how long a project takes to run, so the
+    parallel runner can start the longest projects first and size its
+    batches by cost rather than by the number of projects.
+
+    The prediction is linear in the features of a project:
+
+    - A constant, for the work every project does.
+
+    - The number of turbines, which sizes the collection system, roads
+      and foundations.
+
+    - The construction time in months, which sets the length of the
+      extended weather window that the weather delays are computed over.
+
+    - The number of crane options times the number of components, the
+      combinations that ErectionCost computes the wind delays and costs of.
+
+    Until min_timings projects have been timed, the coefficients are a
+    prior from the sizes of the inputs, which only has to rank the projects
+    and give their relative costs. After that, the coefficients are fit by
+    least squares to the most recent max_timings timings. The timings are
+    kept by the predictor, so a runner that runs several sweeps, like the
+    points of a SensitivityAnalysis, learns from the sweeps before.
+    """
+
+    # The prior coefficients, in seconds, of the features in order
+    prior_coefficients = np.array([1.0, 0.001, 0.01, 0.001])
+
+    def __init__(self, min_timings=8, max_timings=10000):
+        """
+        Parameters
+        ----------
+        min_timings : int
+            The number of timings needed before the coefficients are fit.
+
+        max_timings : int
+            The number of the most recent timings used for the fit.
+        """
+        self.min_timings = min_timings
+        self.coefficients = self.prior_coefficients
+        self._timings = deque(maxlen=max_timings)
+        self._stale = False
+
+    @staticmethod
+    def features(project_parameters, project_data_sheets):
+        """
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The project parameters.
+
+        project_data_sheets : dict
+            The sheets of the project data of the project. Only the
+            number of rows of crane_specs and components are used.
+
+        Returns
+        -------
+        numpy.ndarray
+            The features of the project, in the order of the coefficients.
+        """
+        crane_combinations = len(project_data_sheets['crane_specs']) * len(project_data_sheets['components'])
+        return np.array([
+            1.0,
+            float(project_parameters['Number of turbines']),
+            float(project_parameters['Total project construction time (months)']),
+            float(crane_combinations)
+        ])
+
+    def predict(self, features):
+        """
+        Parameters
+        ----------
+        features : numpy.ndarray
+            The features of one project, or one row per project.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The predicted run time of each project in seconds. It is never
+            less than a tenth of the constant coefficient of the prior, so
+            every project has some cost.
+        """
+        if self._stale and len(self._timings) >= self.min_timings:
+            self.fit()
+        features = np.asarray(features, dtype=float)
+        return np.maximum(features @ self.coefficients, 0.1 * self.prior_coefficients[0])
+
+    def record(self, features, seconds):
+        """
+        Records the measured run time of a project.
+
+        Parameters
+        ----------
+        features : numpy.ndarray
+            The features of the project.
+
+        seconds : float
+            The time the project took to run.
+        """
+        self._timings.append((np.asarray(features, dtype=float), float(seconds)))
+        self._stale = True
+
+    def fit(self):
+        """
+        Fits the coefficients to the recorded timings by least squares.
+        Features that did not vary among the timings keep the coefficients
+        they had, so the fit does not extrapolate along them.
+        """
+        features = np.array([timing[0] for timing in self._timings])
+        seconds = np.array([timing[1] for timing in self._timings])
+        varied = np.ptp(features, axis=0) > 0
+        varied[0] = True
+        coefficients = self.coefficients.copy()
+        fixed_seconds = features[:, ~varied] @ coefficients[~varied]
+        coefficients[varied] = np.linalg.lstsq(features[:, varied], seconds - fixed_seconds, rcond=None)[0]
+        self.coefficients = coefficients
+        self._stale = False
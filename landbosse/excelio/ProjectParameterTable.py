@@ -0,0 +1,176 @@
+import pandas as pd
+
+
+class ProjectParameterTable:
+    """
+    A ProjectParameterTable is a columnar store of the rows of an extended
+    project list, for dispatching the projects to workers.
+
+    A row of the extended project list as a pandas Series has an index and
+    an object array, and pickling it, sending it to a worker and pickling
+    it back costs far more than its few dozen values. The table keeps the
+    columns with their dtypes and makes a ProjectParameters record for
+    each row on request. The records of a table share one tuple of names
+    and one mapping of names to positions, and each holds only a list of
+    its values, so a record pickles about as fast as a tuple.
+
+    The records support the part of the Series interface that the reader
+    and the parametric override plans use: getting and setting values by
+    name, "in", get() and index. Series and dataframes are only made again
+    to write outputs, with to_series() and records_to_dataframe().
+    """
+
+    def __init__(self, extended_project_list):
+        """
+        Parameters
+        ----------
+        extended_project_list : pandas.DataFrame
+            The rows of the extended project list. The index of each row
+            becomes the name of its record.
+        """
+        self.names = tuple(extended_project_list.columns)
+        self.columns = {name: extended_project_list[name] for name in self.names}
+        self.row_names = list(extended_project_list.index)
+        self._positions = {name: position for position, name in enumerate(self.names)}
+        self._rows = None
+
+    def __len__(self):
+        return len(self.row_names)
+
+    def record(self, position):
+        """
+        Parameters
+        ----------
+        position : int
+            The position of the row in the table.
+
+        Returns
+        -------
+        ProjectParameters
+            A new record with the values of the row. Changing it does not
+            change the table.
+        """
+        if self._rows is None:
+            # Series.tolist() gives the same Python values as iterrows()
+            self._rows = list(zip(*[column.tolist() for column in self.columns.values()]))
+        return ProjectParameters(self.names, self._positions, list(self._rows[position]), self.row_names[position])
+
+    @staticmethod
+    def records_to_dataframe(records):
+        """
+        Makes a dataframe from records, like making a dataframe from a
+        list of Series.
+
+        Parameters
+        ----------
+        records : list
+            The ProjectParameters records.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per record, named by the record. The columns are the
+            names of the records in order, with dtypes inferred from the
+            values.
+        """
+        if len(records) == 0:
+            return pd.DataFrame()
+
+        # Consecutive records with the same names are made into one frame.
+        frames = []
+        start = 0
+        for end in range(1, len(records) + 1):
+            if end == len(records) or records[end].index != records[start].index:
+                group = records[start:end]
+                frames.append(pd.DataFrame.from_records(
+                    [record.values for record in group], columns=list(group[0].index),
+                    index=[record.name for record in group]
+                ))
+                start = end
+        return frames[0] if len(frames) == 1 else pd.concat(frames, sort=False)
+
+
+class ProjectParameters:
+    """
+    A ProjectParameters record holds the parameters of one project, the
+    values of one row of the extended project list. See
+    ProjectParameterTable.
+    """
+
+    __slots__ = ('index', 'values', 'name', '_positions')
+
+    # The positions of the names, for records that were unpickled, so a
+    # worker builds them once for each set of names.
+    _positions_by_index = dict()
+
+    def __init__(self, index, positions, values, name=None):
+        """
+        Parameters
+        ----------
+        index : tuple
+            The names of the parameters.
+
+        positions : dict
+            The position of each name in index. It may be shared by many
+            records.
+
+        values : list
+            The value of each parameter.
+
+        name : object
+            The index of the row in the extended project list.
+        """
+        self.index = index
+        self.values = values
+        self.name = name
+        self._positions = positions
+
+    def __getitem__(self, key):
+        return self.values[self._positions[key]]
+
+    def __setitem__(self, key, value):
+        position = self._positions.get(key)
+        if position is None:
+            # A new name gets a new index, so other records are unchanged.
+            self.index = self.index + (key,)
+            self._positions = {**self._positions, key: len(self.values)}
+            self.values.append(value)
+        else:
+            self.values[position] = value
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def __len__(self):
+        return len(self.values)
+
+    def __reduce__(self):
+        return _project_parameters_from_state, (self.index, self.values, self.name)
+
+    def get(self, key, default=None):
+        """
+        Returns the value of a parameter, or default if there is none.
+        """
+        position = self._positions.get(key)
+        return default if position is None else self.values[position]
+
+    def to_series(self):
+        """
+        Returns
+        -------
+        pandas.Series
+            The parameters as a Series, like a row of
+            DataFrame.iterrows()
+        """
+        return pd.Series(self.values, index=list(self.index), name=self.name, dtype=object)
+
+
+def _project_parameters_from_state(index, values, name):
+    """
+    Makes a ProjectParameters record again after it is unpickled.
+    """
+    positions = ProjectParameters._positions_by_index.get(index)
+    if positions is None:
+        positions = {key: position for position, key in enumerate(index)}
+        ProjectParameters._positions_by_index[index] = positions
+    return ProjectParameters(index, positions, values, name)
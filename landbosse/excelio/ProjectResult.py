@@ -0,0 +1,60 @@
+import warnings
+
+from ..model import DetailCollector
+
+
+class ProjectResult(dict):
+    """
+    The dictionary of outputs returned by ProjectResultWriter.result(),
+    and so by the run_from_project_list_xlsx() and run_projects() methods
+    of the manager runners. Its keys are:
+
+    module_type_operation_df : pandas.DataFrame
+        The cost rows of all the projects.
+
+    details_df : pandas.DataFrame
+        The detail rows of all the projects.
+
+    extended_project_list : pandas.DataFrame
+        The rows of the extended project list of all the projects.
+
+    The keys 'module_type_operation_list' and 'details_list', which held
+    the same rows as lists of dictionaries in earlier versions, still work
+    during a deprecation period. They make the lists from the
+    dataframes each time they are read, and warn with a
+    DeprecationWarning.
+    """
+
+    # Keys are the deprecated keys. Values are the keys of the dataframes
+    # they are made from and the functions that make the lists.
+    deprecated_keys = {
+        'module_type_operation_list': ('module_type_operation_df', lambda rows: rows.to_dict('records')),
+        'details_list': ('details_df', DetailCollector.to_records)
+    }
+
+    def __missing__(self, key):
+        """
+        Makes the list of a deprecated key.
+
+        Parameters
+        ----------
+        key : str
+            The key that is not in the dictionary.
+
+        Returns
+        -------
+        list
+            The rows of the dataframe the deprecated key is made from, as
+            a list of dictionaries.
+
+        Raises
+        ------
+        KeyError
+            If the key is not a deprecated key.
+        """
+        if key not in self.deprecated_keys:
+            raise KeyError(key)
+        dataframe_key, to_list = self.deprecated_keys[key]
+        warnings.warn(f"The '{key}' key of the result is deprecated. Use '{dataframe_key}' instead.",
+                      DeprecationWarning, stacklevel=2)
+        return to_list(self[dataframe_key])
@@ -0,0 +1,167 @@
+import os
+
+import pandas as pd
+from pandas.api.types import is_float_dtype, is_integer_dtype
+
+from ..model import DetailCollector
+from ..model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+from .CsvGenerator import CsvGenerator
+from .XlsxGenerator import XlsxGenerator
+from .ProjectResultWriter import ProjectResultWriter
+
+
+class ProjectResultFileWriter(ProjectResultWriter):
+    """
+    This result writer writes each chunk of outputs to the output folder
+    as soon as a manager runner hands it over, so the outputs of a long
+    sweep are never all in memory. It writes:
+
+    - landbosse-costs.csv and the costs_by_module_type_operation tab of
+      landbosse-output.xlsx
+    - landbosse-details.csv, unless only costs are output
+    - calculated_parametric_inputs/extended_project_list.csv
+
+    Each chunk is appended to the files, and only the first writes their
+    headers. The xlsx workbook is written in constant memory mode.
+
+    The values of each chunk are formatted by the dtypes pandas infers
+    for that chunk. A column of the extended project list that is float
+    in the first chunk is written as float in all of them, but a column
+    of whole numbers that only becomes float in a later chunk is written
+    as 1 in the earlier chunks and 1.0 in the later ones. The runners
+    hand over 10000 projects at a time, so the outputs of smaller sweeps
+    are the same as if they were written at once.
+
+    Only the positions and IDs of the projects, for the manifest of a
+    shard, and the number of detail rows are kept. The cost rows are kept
+    too if keep_costs is True, for validation.
+
+    It is a context manager, so it is used in the following manner:
+
+    with ProjectResultFileWriter(file_ops) as result_writer:
+        manager_runner.run_from_project_list_xlsx(projects_xlsx, result_writer=result_writer)
+    """
+
+    def __init__(self, file_ops, costs_only=False, keep_costs=False):
+        """
+        Parameters
+        ----------
+        file_ops : XlsxFileOperations
+            An instance of XlsxFileOperations to manage file names.
+
+        costs_only : bool
+            If True, the details .csv is not written.
+
+        keep_costs : bool
+            If True, the cost rows are kept in module_type_operation_df.
+        """
+        super().__init__()
+        self.file_ops = file_ops
+        self.costs_only = costs_only
+        self.keep_costs = keep_costs
+        self.csv_generator = CsvGenerator(file_ops)
+        self.costs_csv_path = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
+        self.details_csv_path = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
+        self.extended_project_list_csv_path = \
+            os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv')
+        self.xlsx = None
+        self.extended_project_list_dtypes = None
+        self.chunk_count = 0
+        self.details_row_count = 0
+        self.project_id_blocks = []
+
+    def __enter__(self):
+        """
+        Opens landbosse-output.xlsx for writing.
+
+        Returns
+        -------
+        self
+            Returns self for easy use in the context manager.
+        """
+        self.xlsx = XlsxGenerator('landbosse-output', self.file_ops, constant_memory=True)
+        self.xlsx.__enter__()
+        return self
+
+    def __exit__(self, exception_type, exception_val, exception_traceback):
+        """
+        Writes the headers of the outputs if no chunk was written, and
+        closes landbosse-output.xlsx. Exceptions are not suppressed.
+        """
+        if exception_type is None and self.chunk_count == 0:
+            self.write(pd.DataFrame(columns=COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS),
+                       DetailCollector.empty_dataframe(), pd.DataFrame())
+        self.xlsx.__exit__(None, None, None)
+        return False
+
+    def write(self, module_type_operation_df, details_df, extended_project_list):
+        """
+        Appends the outputs of the next projects to the output files. See
+        ProjectResultWriter.write()
+        """
+        mode = 'w' if self.chunk_count == 0 else 'a'
+        header = self.chunk_count == 0
+
+        costs = self.csv_generator.create_costs_dataframe(module_type_operation_df)
+        costs.to_csv(self.costs_csv_path, mode=mode, header=header, index=False)
+        self.xlsx.append_costs_by_module_type_operation(module_type_operation_df)
+        if self.keep_costs:
+            self.cost_blocks.append(module_type_operation_df)
+
+        if not self.costs_only:
+            details = self.csv_generator.create_details_dataframe(details_df)
+            details.to_csv(self.details_csv_path, mode=mode, header=header, index=False)
+        self.details_row_count += len(details_df)
+
+        # The header of the extended project list is written with the
+        # first chunk, so the columns of the other chunks are put in the
+        # same order. Whole numbers in columns that were float in the first
+        # chunk are written as floats too.
+        if self.chunk_count == 0:
+            self.extended_project_list_dtypes = extended_project_list.dtypes
+        else:
+            extended_project_list = extended_project_list.reindex(columns=self.extended_project_list_dtypes.index)
+            for column, dtype in self.extended_project_list_dtypes.items():
+                if is_float_dtype(dtype) and is_integer_dtype(extended_project_list[column].dtype):
+                    extended_project_list[column] = extended_project_list[column].astype(dtype)
+        extended_project_list.to_csv(self.extended_project_list_csv_path, mode=mode, header=header, index=False)
+        if len(extended_project_list) > 0:
+            self.project_id_blocks.append(extended_project_list[['Project ID', 'Project ID with serial']])
+
+        self.chunk_count += 1
+
+    def result(self):
+        """
+        The outputs are in the output files, so there is no result to
+        return.
+
+        Returns
+        -------
+        None
+        """
+        return None
+
+    @property
+    def module_type_operation_df(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            The cost rows of all the chunks, if keep_costs is True.
+        """
+        return super().result()['module_type_operation_df']
+
+    @property
+    def extended_project_ids(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            The Project ID and Project ID with serial columns of the
+            extended project list of all the chunks, indexed by the position
+            of each row in the extended project list. See
+            ShardMerger.write_manifest()
+        """
+        if len(self.project_id_blocks) == 0:
+            return pd.DataFrame(columns=['Project ID', 'Project ID with serial'])
+        return pd.concat(self.project_id_blocks)
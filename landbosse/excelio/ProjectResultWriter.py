@@ -0,0 +1,74 @@
+import pandas as pd
+
+from ..model import DetailCollector
+from ..model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+from .ProjectResult import ProjectResult
+
+
+class ProjectResultWriter:
+    """
+    The manager runners hand the outputs of the projects they run to a
+    result writer, one chunk at a time, in the order of the extended
+    project list. Each chunk has the cost rows, the detail rows and the
+    rows of the extended project list of some of the projects.
+
+    This class keeps the chunks in memory and puts them together in the
+    dictionary returned by result(). It is the result writer of the
+    runners when none is given, for the drivers that need the costs of the
+    projects they run. ProjectResultFileWriter writes the chunks to the
+    output files instead, so the outputs of a long sweep are never all in
+    memory.
+    """
+
+    def __init__(self):
+        self.cost_blocks = []
+        self.detail_blocks = []
+        self.extended_project_lists = []
+
+    def write(self, module_type_operation_df, details_df, extended_project_list):
+        """
+        Receives the outputs of the next projects.
+
+        Parameters
+        ----------
+        module_type_operation_df : pandas.DataFrame
+            The cost rows of the projects, with the columns in
+            COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS.
+
+        details_df : pandas.DataFrame
+            The detail rows of the projects, with the columns in
+            DetailCollector.columns. It is empty in costs only mode.
+
+        extended_project_list : pandas.DataFrame
+            The rows of the extended project list of the projects, after
+            the parametric modifications. Its index is the position of each
+            row in the extended project list.
+        """
+        self.cost_blocks.append(module_type_operation_df)
+        self.detail_blocks.append(details_df)
+        self.extended_project_lists.append(extended_project_list)
+
+    def result(self):
+        """
+        Returns
+        -------
+        ProjectResult
+            The cost rows of all the chunks, in one dataframe, under the
+            key 'module_type_operation_df', the detail rows under the key
+            'details_df' and the rows of the extended project list under
+            the key 'extended_project_list'.
+        """
+        cost_blocks = [block for block in self.cost_blocks if len(block) > 0]
+        extended_project_lists = [block for block in self.extended_project_lists if len(block) > 0]
+
+        final_result = ProjectResult()
+        final_result['details_df'] = DetailCollector.concat(self.detail_blocks)
+        if len(cost_blocks) > 0:
+            final_result['module_type_operation_df'] = pd.concat(cost_blocks, ignore_index=True, sort=False)
+        else:
+            final_result['module_type_operation_df'] = pd.DataFrame(columns=COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS)
+        if len(extended_project_lists) > 0:
+            final_result['extended_project_list'] = pd.concat(extended_project_lists, sort=False)
+        else:
+            final_result['extended_project_list'] = pd.DataFrame()
+        return final_result
@@ -0,0 +1,256 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from ..model import DetailCollector, Manager, QuantityTable
+from .XlsxDataframeCache import XlsxDataframeCache
+from .XlsxReader import XlsxReader
+from .ProjectResultWriter import ProjectResultWriter
+
+
+class RepricingSweep:
+    """
+    RepricingSweep runs a parametric sweep over prices without running the
+    cost modules for every point.
+
+    A Project ID whose rows in the parametric list are all price items (see
+    QuantityTable) is taken off once: the full model is run at its first
+    point, the anchor, and once more for each price item with that price
+    changed by a small step. Costs are affine in the prices, so the
+    differences give the quantity of each price item in each cost row. The
+    costs of the other points are then computed from the QuantityTable in
+    one sparse matrix product per chunk of the extended project list.
+
+    The points of other projects, points that do not set every price item
+    and points whose prices change the choice of cranes in ErectionCost
+    are run with the run_projects() method of the manager runner.
+
+    The sweep is run in costs only mode. The quantity tables of the
+    projects are kept in quantity_tables, keyed by Project ID.
+    """
+
+    def __init__(self, manager_runner, relative_step=0.01, max_step_halvings=4):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner that runs the points that cannot be repriced.
+
+        relative_step : float
+            The step of each price for the take off, relative to its price
+            at the anchor. Prices of 0 are stepped by relative_step.
+
+        max_step_halvings : int
+            If a step changes the choice of cranes, it is halved up to this
+            many times. If the choice still changes, the project is not
+            repriced.
+        """
+        self.manager_runner = manager_runner
+        self.relative_step = relative_step
+        self.max_step_halvings = max_step_halvings
+        self.quantity_tables = dict()
+        self.repriced_count = 0
+        self.full_model_count = 0
+
+    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False, costs_only=True,
+                                   result_writer=None):
+        """
+        Runs the sweep. This has the same parameters and return value as
+        XlsxManagerRunner.run_from_project_list_xlsx(), so it can be used
+        in place of a runner. The costs of the repriced points and of the
+        points run with the full model are put in order at the end, so
+        they are handed to result_writer in one chunk.
+
+        Parameters
+        ----------
+        projects_xlsx : str
+            Not used. The project list is read by the manager runner.
+
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        costs_only : bool
+            Ignored. The sweep always runs in costs only mode.
+
+        result_writer : ProjectResultWriter
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        dict
+            The return value of result_writer.result(). See
+            XlsxManagerRunner.run_from_project_list_xlsx(). The details
+            dataframe is empty.
+        """
+        print('Calculating parametric values')
+        project_list, parametric_list = self.manager_runner.read_project_and_parametric_lists()
+        xlsx_reader = XlsxReader()
+        self.manager_runner.prefetch_project_data(project_list)
+
+        price_items = dict()
+        if not parametric_list.empty:
+            for project_id, group in parametric_list.groupby('Project ID'):
+                cell_specifications = list(dict.fromkeys(
+                    f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}" for _, row in group.iterrows()
+                ))
+                if QuantityTable.is_linear(cell_specifications):
+                    price_items[project_id] = cell_specifications
+
+        repriced_rows = []
+        cost_blocks = []
+        full_model_rows = []
+        self.repriced_count = 0
+        for chunk in self.manager_runner.iter_extended_project_list_chunks(project_list, parametric_list):
+            for project_id, rows in chunk.groupby('Project ID', sort=False):
+                if project_id not in price_items or rows['Project ID with serial'].isnull().any():
+                    full_model_rows.extend(rows.iterrows())
+                    continue
+
+                if project_id not in self.quantity_tables:
+                    self.quantity_tables[project_id] = self.take_off(
+                        rows.iloc[0].copy(), price_items[project_id], enable_cost_and_scaling_modifications)
+                quantity_table = self.quantity_tables[project_id]
+                if quantity_table is None:
+                    full_model_rows.extend(rows.iterrows())
+                    continue
+
+                prices = rows[quantity_table.price_items].values.astype(float)
+                raw_costs, needs_full_model = quantity_table.reprice(prices)
+                needs_full_model |= np.isnan(prices).any(axis=1)
+                full_model_rows.extend(rows[needs_full_model].iterrows())
+
+                repriced = ~needs_full_model
+                cost_blocks.append(quantity_table.cost_rows(
+                    raw_costs[repriced], rows.loc[repriced, 'Project ID with serial'].values))
+                if enable_cost_and_scaling_modifications:
+                    repriced_chunk = \
+                        xlsx_reader.apply_cost_and_scaling_modifications_to_extended_project_list(rows[repriced])
+                else:
+                    repriced_chunk = \
+                        xlsx_reader.apply_project_list_cell_specifications_to_extended_project_list(rows[repriced])
+                repriced_rows.extend(project_parameters for _, project_parameters in repriced_chunk.iterrows())
+                self.repriced_count += int(repriced.sum())
+
+        self.full_model_count = len(full_model_rows)
+        print(f'Repriced {self.repriced_count} projects. Running {self.full_model_count} with the full model.')
+        extended_project_lists = [pd.DataFrame(repriced_rows)]
+        if len(full_model_rows) > 0:
+            result = self.manager_runner.run_projects(
+                iter(full_model_rows), enable_cost_and_scaling_modifications, costs_only=True)
+            cost_blocks.append(result['module_type_operation_df'])
+            extended_project_lists.append(result['extended_project_list'])
+
+        # Put the rows in the order of the extended project list.
+        extended_project_list = pd.concat(extended_project_lists, sort=False).sort_index()
+        project_ids_with_serial = extended_project_list['Project ID with serial'] \
+            .where(extended_project_list['Project ID with serial'].notnull(), extended_project_list['Project ID'])
+        positions = pd.Series(np.arange(len(extended_project_list)), index=project_ids_with_serial.values)
+        module_type_operation_df = pd.concat(cost_blocks, ignore_index=True, sort=False)
+        order = np.argsort(module_type_operation_df['project_id_with_serial'].map(positions).values, kind='mergesort')
+
+        if result_writer is None:
+            result_writer = ProjectResultWriter()
+        result_writer.write(module_type_operation_df.iloc[order].reset_index(drop=True),
+                            DetailCollector.empty_dataframe(), extended_project_list)
+        return result_writer.result()
+
+    def take_off(self, project_parameters, price_items, enable_cost_and_scaling_modifications=False):
+        """
+        Makes the QuantityTable of a project.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The row of the extended project list of the anchor. It must
+            have a value for every price item.
+
+        price_items : list
+            The cell specifications of the price items.
+
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        QuantityTable
+            The quantity table, or None if a price step changes the choice
+            of cranes even when it is small or the cost rows of a step do
+            not match the anchor.
+        """
+        project_id = project_parameters['Project ID']
+        print(f'Taking off quantities of {len(price_items)} price items for {project_id}')
+        anchor_prices = project_parameters[price_items].values.astype(float)
+        anchor_costs, anchor_options, allow_same_crane = self.run_full_model(
+            project_parameters, enable_cost_and_scaling_modifications)
+        quantity_table = QuantityTable(project_id, price_items, anchor_prices, anchor_costs,
+                                       np.zeros((len(price_items), len(anchor_costs))), anchor_options,
+                                       None, allow_same_crane)
+
+        quantities = np.zeros((len(price_items), len(anchor_costs)))
+        crane_quantities = None if anchor_options is None else np.zeros((len(price_items), len(anchor_options)))
+        for item_index, price_item in enumerate(price_items):
+            step = self.relative_step * max(abs(anchor_prices[item_index]), 1.0)
+            for _ in range(self.max_step_halvings + 1):
+                stepped_parameters = project_parameters.copy()
+                stepped_parameters[price_item] = anchor_prices[item_index] + step
+                costs, options, _ = self.run_full_model(stepped_parameters, enable_cost_and_scaling_modifications)
+                same_rows = costs[['module', 'operation_id', 'type_of_cost']].equals(
+                    anchor_costs[['module', 'operation_id', 'type_of_cost']])
+                same_cranes = options is None or quantity_table.crane_options is None or (
+                    len(options) == len(anchor_options) and
+                    (quantity_table.crane_choices(options['Total cost USD'].values[np.newaxis, :])[0] ==
+                     quantity_table.anchor_crane_choices).all()
+                )
+                if same_rows and same_cranes:
+                    break
+                step /= 2
+            else:
+                print(f'{price_item} changes the costs of {project_id} in steps. It will not be repriced.')
+                return None
+
+            cost_changes = costs['raw_cost'].values.astype(float) - anchor_costs['raw_cost'].values.astype(float)
+            # Rounding leaves tiny changes in rows that do not depend on the price.
+            scale = np.maximum(np.abs(anchor_costs['raw_cost'].values.astype(float)), 1.0)
+            cost_changes[np.abs(cost_changes) <= 1e-12 * scale] = 0.0
+            quantities[item_index] = cost_changes / step
+            if crane_quantities is not None:
+                crane_quantities[item_index] = (options['Total cost USD'].values.astype(float) -
+                                                anchor_options['Total cost USD'].values.astype(float)) / step
+
+        quantity_table.quantities = sparse.csr_matrix(quantities)
+        quantity_table.crane_quantities = crane_quantities
+        return quantity_table
+
+    def run_full_model(self, project_parameters, enable_cost_and_scaling_modifications=False):
+        """
+        Runs the full model for one project in this process, keeping the
+        intermediate outputs that hold the crane options.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The row of the extended project list. It is not modified.
+
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame, pandas.DataFrame, bool
+            The cost rows, the crane options returned by
+            QuantityTable.crane_options() and the allow_same_flag of the
+            project.
+        """
+        xlsx_reader = XlsxReader()
+        project_parameters = project_parameters.copy()
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_parameters['Project data file'])
+        xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
+        if enable_cost_and_scaling_modifications:
+            xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+
+        master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+        output_dict = dict()
+        Manager(input_dict=master_input_dict, output_dict=output_dict).execute_landbosse(
+            project_name=project_parameters['Project ID with serial'])
+        costs = self.manager_runner.extract_module_type_operation_dataframe({'take off': output_dict})
+        return costs, QuantityTable.crane_options(output_dict), master_input_dict['allow_same_flag']
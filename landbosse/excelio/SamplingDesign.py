@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .XlsxOperationException import XlsxOperationException
+
+"""
+This module contains the logic to compute space filling samples of an
+N-dimensional parametric search space.
+"""
+
+
+class SamplingDesign:
+    """
+    This class computes a fixed number of points in a N-dimensional
+    parametric search space with a Latin hypercube, Sobol or Halton design,
+    rather than every combination of values like GridSearchTree. The number
+    of points does not grow with the number of dimensions, so a space with
+    10 axes can be covered with a few thousand points.
+
+    A design is chosen for a Project ID with these optional columns of the
+    parametric list:
+
+    Design: "Grid" (the default when blank), "Latin hypercube", "Sobol" or
+    "Halton". Case does not matter.
+
+    Sample count: The number of points. Required for all designs except
+    "Grid".
+
+    Seed: An integer seed, so that the same points are made each time. If
+    blank, the points are different for every run, and the sweep cannot
+    be run in shards with --shard.
+
+    Every row of the Project ID must have the same design, sample count and
+    seed, or leave them blank on all but one row.
+
+    Each row of the parametric list is an axis. The design makes points in
+    the unit hypercube, which are scaled to the axes as follows:
+
+    - If the row has a "Value list", each point takes one of the values in
+      the list.
+
+    - If the row has a "Step", each point takes one of the values from Min
+      to Max in increments of Step, the same values used by a grid.
+
+    - Otherwise, the points are spread continuously from Min to Max.
+
+    This class has the same interface as GridSearchTree for streaming the
+    points, so the rest of the parametric machinery handles both alike.
+    """
+
+    # The designs that this class can make, keyed by their lowercase names
+    # in the Design column.
+    samplers = {
+        'latin hypercube': qmc.LatinHypercube,
+        'sobol': qmc.Sobol,
+        'halton': qmc.Halton
+    }
+
+    def __init__(self, parametric_list):
+        """
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list of a single Project ID.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the design is not known, or the sample count is missing or
+            not positive.
+        """
+        self.parametric_list = parametric_list
+        self.design = self.design_name(parametric_list)
+        if self.design not in self.samplers:
+            raise XlsxOperationException(
+                f"Design {self.design} is not one of {', '.join(['grid'] + list(self.samplers))}."
+            )
+
+        sample_count = self.single_value(parametric_list, 'Sample count')
+        if sample_count is None or int(sample_count) < 1:
+            raise XlsxOperationException(f'Design {self.design} needs a Sample count of at least 1.')
+        self.sample_count = int(sample_count)
+
+        seed = self.single_value(parametric_list, 'Seed')
+        self.seed = None if seed is None else int(seed)
+
+        self._axes = None
+
+    @classmethod
+    def design_name(cls, parametric_list):
+        """
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list of a single Project ID.
+
+        Returns
+        -------
+        str
+            The lowercase name of the design. 'grid' if there is no Design
+            column or it is blank.
+        """
+        design = cls.single_value(parametric_list, 'Design')
+        return 'grid' if design is None else str(design).strip().lower()
+
+    @staticmethod
+    def single_value(parametric_list, column_name):
+        """
+        Returns the value of a column that must be the same for every row
+        of a Project ID. Blank cells are ignored.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list of a single Project ID.
+
+        column_name : str
+            The name of the column.
+
+        Returns
+        -------
+        object
+            The value, or None if the column is missing or blank.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the rows have different values.
+        """
+        if column_name not in parametric_list.columns:
+            return None
+        values = parametric_list[column_name].dropna().unique()
+        if len(values) == 0:
+            return None
+        if len(values) > 1:
+            raise XlsxOperationException(
+                f'{column_name} must be the same on every row of a Project ID in the parametric list.'
+            )
+        return values[0]
+
+    def axes(self):
+        """
+        Returns the axes of the search space, in the order of the rows of
+        the parametric list, with the values of every point.
+
+        Returns
+        -------
+        list
+            A list of tuples. The first element of each tuple is the cell
+            specification and the second is a numpy array with the value of
+            each point on that axis.
+        """
+        if self._axes is None:
+            dimension_count = len(self.parametric_list)
+            sampler = self.samplers[self.design](dimension_count, seed=self.seed)
+            unit_points = sampler.random(self.sample_count)
+
+            self._axes = []
+            for (_, row), unit_values in zip(self.parametric_list.iterrows(), unit_points.T):
+                cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+                self._axes.append((cell_specification, self.scale_to_axis(row, unit_values)))
+        return self._axes
+
+    @staticmethod
+    def scale_to_axis(row, unit_values):
+        """
+        Scales values in [0, 1] to the axis of a row of the parametric list,
+        as described in the class docstring.
+
+        Parameters
+        ----------
+        row : pandas.Series
+            The row of the parametric list.
+
+        unit_values : numpy.ndarray
+            The values in [0, 1]
+
+        Returns
+        -------
+        numpy.ndarray
+            The values on the axis.
+        """
+        if 'Value list' in row and not pd.isnull(row['Value list']):
+            levels = np.array([float(value) for value in row['Value list'].split(',')])
+        elif 'Step' in row and not pd.isnull(row['Step']):
+            levels = np.arange(row['Min'], row['Max'] + row['Step'], row['Step'])
+        else:
+            return row['Min'] + unit_values * (row['Max'] - row['Min'])
+
+        level_indices = np.minimum((unit_values * len(levels)).astype(int), len(levels) - 1)
+        return levels[level_indices]
+
+    def point_count(self):
+        """
+        Returns
+        -------
+        int
+            The number of points in the design.
+        """
+        return self.sample_count
+
+    def iter_grid_chunks(self, chunk_size):
+        """
+        Yields the points of the design in columnar chunks.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of points in each chunk.
+
+        Yields
+        ------
+        int, dict
+            The position of the first point of the chunk, and a dictionary
+            of the values of the points. Keys are cell specifications and
+            values are numpy arrays with one element for each point. If an
+            axis is repeated, the last one wins.
+        """
+        axes = self.axes()
+        for start in range(0, self.sample_count, chunk_size):
+            end = min(start + chunk_size, self.sample_count)
+            chunk = dict()
+            for cell_specification, values in axes:
+                chunk[cell_specification] = values[start:end]
+            yield start, chunk
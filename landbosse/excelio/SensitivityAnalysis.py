@@ -0,0 +1,293 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from .SamplingDesign import SamplingDesign
+from .XlsxOperationException import XlsxOperationException
+
+
+class SensitivityAnalysis:
+    """
+    SensitivityAnalysis ranks the inputs of one project by how much they
+    drive the cost of each module and the total cost.
+
+    The factors of the study are the project's rows in the parametric list.
+    Each row is scaled from the unit interval to its axis the same way as a
+    SamplingDesign, so a row may be continuous between Min and Max, or take
+    the values of a Step or a Value list. The Design, Sample count and Seed
+    columns are not used.
+
+    There are two methods:
+
+    sobol: Variance based indices from a Saltelli sample. Two base matrices
+    A and B of sample_count rows are taken from a scrambled Sobol sequence,
+    and for each factor a matrix AB_i is made from A with column i taken
+    from B. That is sample_count * (factors + 2) points. The first order
+    indices use the estimator of Saltelli et al. (2010) and the total
+    indices use the estimator of Jansen (1999).
+
+    morris: Elementary effects on sample_count trajectories through a grid
+    of levels in the unit hypercube, each moving one factor at a time. That
+    is sample_count * (factors + 1) points. mu_star, the mean of the
+    absolute effects, ranks the factors and sigma shows interactions and
+    nonlinearity. Effects are per unit of the factor's range.
+
+    Points are run with the run_projects() method of a manager runner,
+    normally an XlsxParallelManagerRunner, in costs only mode. The costs of
+    every point are cached by their input values, so the base points that
+    the blocks of a sample share, repeated grid levels and points from
+    earlier analyses with the same object are only run once.
+    """
+
+    methods = ['sobol', 'morris']
+
+    def __init__(self, manager_runner, project_id, method='sobol', sample_count=64, seed=0, levels=4):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner that runs the points.
+
+        project_id : str
+            The Project ID to study. It must have rows in the parametric
+            list.
+
+        method : str
+            'sobol' or 'morris'
+
+        sample_count : int
+            The number of rows in each base matrix for sobol, or the number
+            of trajectories for morris.
+
+        seed : int
+            The seed of the sample.
+
+        levels : int
+            The number of levels of the grid of a morris sample. It should
+            be even.
+        """
+        if method not in self.methods:
+            raise XlsxOperationException(f"Method {method} is not one of {', '.join(self.methods)}.")
+        if sample_count < 2:
+            raise XlsxOperationException('A sensitivity analysis needs a sample count of at least 2.')
+        self.manager_runner = manager_runner
+        self.project_id = project_id
+        self.method = method
+        self.sample_count = sample_count
+        self.seed = seed
+        self.levels = levels
+        self.project_list = None
+        self.factors = None
+        self.costs = None
+        self.evaluation_count = 0
+        self._cache = dict()
+        self._serial_count = 0
+
+    def run(self, enable_cost_and_scaling_modifications=False):
+        """
+        Makes the sample, runs the points that are not in the cache and
+        computes the indices.
+
+        Parameters
+        ----------
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per output and factor. For sobol, the columns are
+            Output, Factor, S1 and ST. For morris, they are Output, Factor,
+            mu, mu_star and sigma.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the project has no rows in the parametric list.
+        """
+        self.project_list, project_parametric_list = self.manager_runner.read_parametric_project(self.project_id)
+        self.factors = [
+            f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+            for _, row in project_parametric_list.iterrows()
+        ]
+
+        if self.method == 'sobol':
+            unit_points = self.saltelli_sample()
+        else:
+            unit_points = self.morris_sample()
+
+        points = np.column_stack([
+            SamplingDesign.scale_to_axis(row, unit_values)
+            for (_, row), unit_values in zip(project_parametric_list.iterrows(), unit_points.T)
+        ])
+
+        self.manager_runner.prefetch_project_data(self.project_list)
+        self.costs = self.evaluate(points, enable_cost_and_scaling_modifications)
+        print(f'Ran {self.evaluation_count} of {len(points)} points for the sensitivity of {self.project_id}')
+
+        if self.method == 'sobol':
+            return self.sobol_indices(self.costs)
+        return self.morris_indices(self.costs, unit_points)
+
+    def saltelli_sample(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The unit points of the blocks A, B, AB_1, ... AB_k stacked in
+            that order, with one column per factor.
+        """
+        factor_count = len(self.factors)
+        sampler = qmc.Sobol(2 * factor_count, seed=self.seed)
+        base = sampler.random(self.sample_count)
+        a, b = base[:, :factor_count], base[:, factor_count:]
+        blocks = [a, b]
+        for factor_index in range(factor_count):
+            ab = a.copy()
+            ab[:, factor_index] = b[:, factor_index]
+            blocks.append(ab)
+        return np.vstack(blocks)
+
+    def morris_sample(self):
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The unit points of the trajectories stacked in order, with one
+            column per factor. Each trajectory has one more point than
+            there are factors.
+        """
+        factor_count = len(self.factors)
+        rng = np.random.default_rng(self.seed)
+        delta = self.levels / (2 * (self.levels - 1))
+        base_levels = np.arange(self.levels // 2) / (self.levels - 1)
+
+        # Each row of the lower triangular matrix moves one more factor
+        # than the row before it.
+        steps = np.tril(np.ones((factor_count + 1, factor_count)), -1)
+        trajectories = []
+        for _ in range(self.sample_count):
+            start = rng.choice(base_levels, size=factor_count)
+            directions = rng.choice([-1, 1], size=factor_count)
+            order = rng.permutation(factor_count)
+            trajectory = start + delta / 2 * ((2 * steps - 1) * directions + 1)
+            trajectories.append(trajectory[:, np.argsort(order)])
+        return np.vstack(trajectories)
+
+    def evaluate(self, points, enable_cost_and_scaling_modifications=False):
+        """
+        Returns the costs of the points, running only those that are not
+        already in the cache.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            The inputs, with one row per point and one column per factor.
+
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame
+            The costs, with one row per point and one column per module and
+            the total. Points that failed to run have NaN costs.
+        """
+        keys = [tuple(point) for point in points.tolist()]
+        new_keys = list(dict.fromkeys(key for key in keys if key not in self._cache))
+        self.evaluation_count = len(new_keys)
+
+        if len(new_keys) > 0:
+            parametric_value_list = pd.DataFrame(new_keys, columns=self.factors)
+            parametric_value_list['Project ID'] = self.project_id
+            serials = [f'{self.project_id}_sensitivity_{self._serial_count + index}' for index in range(len(new_keys))]
+            self._serial_count += len(new_keys)
+            parametric_value_list['Project ID with serial'] = serials
+            costs, _ = self.manager_runner.run_costs_by_module(
+                self.project_list, parametric_value_list, enable_cost_and_scaling_modifications)
+            for key, (_, point_costs) in zip(new_keys, costs.iterrows()):
+                self._cache[key] = point_costs
+
+        return pd.DataFrame([self._cache[key] for key in keys]).reset_index(drop=True).astype(float)
+
+    def sobol_indices(self, costs):
+        """
+        Computes the first order and total indices from the costs of a
+        Saltelli sample. Rows of the base matrices where any block failed
+        to run are left out.
+
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            The costs of the points made by saltelli_sample(), in order.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The columns are Output, Factor, S1 and ST.
+        """
+        factor_count = len(self.factors)
+        rows = []
+        for output in costs.columns:
+            blocks = costs[output].values.reshape(factor_count + 2, self.sample_count)
+            valid = ~np.isnan(blocks).any(axis=0)
+            blocks = blocks[:, valid]
+            # Centering makes the estimates the same for costs that differ by
+            # a constant, such as a module and a total that includes it.
+            if valid.any():
+                blocks = blocks - np.concatenate([blocks[0], blocks[1]]).mean()
+            f_a, f_b = blocks[0], blocks[1]
+            variance = np.var(np.concatenate([f_a, f_b])) if valid.any() else np.nan
+            for factor_index, factor in enumerate(self.factors):
+                f_ab = blocks[factor_index + 2]
+                if variance > 0:
+                    first_order = np.mean(f_b * (f_ab - f_a)) / variance
+                    total = np.mean((f_a - f_ab) ** 2) / (2 * variance)
+                else:
+                    # An output that does not vary has no sensitivity to
+                    # anything.
+                    first_order = total = 0.0 if variance == 0 else np.nan
+                rows.append({'Output': output, 'Factor': factor, 'S1': first_order, 'ST': total})
+        return pd.DataFrame(rows, columns=['Output', 'Factor', 'S1', 'ST'])
+
+    def morris_indices(self, costs, unit_points):
+        """
+        Computes the statistics of the elementary effects from the costs of
+        a morris sample. Effects where either point failed to run are left
+        out.
+
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            The costs of the points made by morris_sample(), in order.
+
+        unit_points : numpy.ndarray
+            The unit points made by morris_sample().
+
+        Returns
+        -------
+        pandas.DataFrame
+            The columns are Output, Factor, mu, mu_star and sigma.
+        """
+        factor_count = len(self.factors)
+        unit_points = unit_points.reshape(self.sample_count, factor_count + 1, factor_count)
+        steps = np.diff(unit_points, axis=1)
+        # The factor that moves at each step of each trajectory
+        moved = np.argmax(np.abs(steps), axis=2)
+        step_sizes = np.take_along_axis(steps, moved[:, :, np.newaxis], axis=2)[:, :, 0]
+
+        rows = []
+        for output in costs.columns:
+            values = costs[output].values.reshape(self.sample_count, factor_count + 1)
+            effects = np.diff(values, axis=1) / step_sizes
+            for factor_index, factor in enumerate(self.factors):
+                factor_effects = effects[moved == factor_index]
+                factor_effects = factor_effects[~np.isnan(factor_effects)]
+                if len(factor_effects) == 0:
+                    mu = mu_star = sigma = np.nan
+                else:
+                    mu = factor_effects.mean()
+                    mu_star = np.abs(factor_effects).mean()
+                    sigma = factor_effects.std(ddof=1) if len(factor_effects) > 1 else 0.0
+                rows.append({'Output': output, 'Factor': factor, 'mu': mu, 'mu_star': mu_star, 'sigma': sigma})
+        return pd.DataFrame(rows, columns=['Output', 'Factor', 'mu', 'mu_star', 'sigma'])
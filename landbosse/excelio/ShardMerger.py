@@ -0,0 +1,246 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .XlsxOperationException import XlsxOperationException
+
+
+class ShardMerger:
+    """
+    ShardMerger combines the outputs of a sweep that was split into shards
+    with --shard, so that each machine ran one slice of the extended project
+    list.
+
+    Each shard writes a manifest, landbosse-shard.json, into its output
+    directory next to its landbosse-costs.csv, landbosse-details.csv and
+    calculated_parametric_inputs/extended_project_list.csv. The manifest
+    holds the shard index and count, the number of rows in the whole
+    extended project list and the position and Project ID with serial of
+    every row the shard ran.
+
+    Before merging, ShardMerger checks that the shards belong to the same
+    sweep, that every shard is present once and that every shard ran all
+    of its rows and wrote all of its outputs. The merged .csv files have the
+    rows in the same order as an unsharded run. The values are merged as
+    text, so they are written exactly as the shards wrote them.
+    """
+
+    MANIFEST_FILENAME = 'landbosse-shard.json'
+    COSTS_FILENAME = 'landbosse-costs.csv'
+    DETAILS_FILENAME = 'landbosse-details.csv'
+    EXTENDED_PROJECT_LIST_FILENAME = os.path.join('calculated_parametric_inputs', 'extended_project_list.csv')
+
+    def __init__(self, shard_dirs):
+        """
+        Parameters
+        ----------
+        shard_dirs : list
+            The output directories of the shards. These are the timestamped
+            landbosse-* directories.
+        """
+        self.shard_dirs = list(shard_dirs)
+        self.manifests = None
+
+    @classmethod
+    def write_manifest(cls, output_dir, shard, extended_project_count, extended_project_list, costs_only):
+        """
+        Writes the manifest of a shard.
+
+        Parameters
+        ----------
+        output_dir : str
+            The output directory of the shard.
+
+        shard : tuple
+            The shard index and shard count.
+
+        extended_project_count : int
+            The number of rows of the whole extended project list.
+
+        extended_project_list : pandas.DataFrame
+            The extended project list of the rows the shard ran. Its index
+            is the position of each row in the whole extended project list.
+
+        costs_only : bool
+            True if the shard ran in costs only mode and has no details
+            output.
+        """
+        shard_index, shard_count = shard
+        if len(extended_project_list) > 0:
+            project_ids_with_serial = extended_project_list['Project ID with serial'] \
+                .where(extended_project_list['Project ID with serial'].notnull(), extended_project_list['Project ID'])
+        else:
+            project_ids_with_serial = []
+        manifest = {
+            'shard_index': int(shard_index),
+            'shard_count': int(shard_count),
+            'extended_project_count': int(extended_project_count),
+            'costs_only': bool(costs_only),
+            'positions': [int(position) for position in extended_project_list.index],
+            'project_ids_with_serial': [str(project_id) for project_id in project_ids_with_serial]
+        }
+        with open(os.path.join(output_dir, cls.MANIFEST_FILENAME), 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+    def read_manifests(self):
+        """
+        Reads the manifests of all the shards.
+
+        Returns
+        -------
+        list
+            The manifest dictionaries, in the order of the shard
+            directories.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a shard directory has no manifest.
+        """
+        if self.manifests is None:
+            self.manifests = []
+            for shard_dir in self.shard_dirs:
+                manifest_filename = os.path.join(shard_dir, self.MANIFEST_FILENAME)
+                if not os.path.isfile(manifest_filename):
+                    raise XlsxOperationException(f'{shard_dir} has no {self.MANIFEST_FILENAME}. Was it run with --shard?')
+                with open(manifest_filename) as manifest_file:
+                    self.manifests.append(json.load(manifest_file))
+        return self.manifests
+
+    def check(self):
+        """
+        Checks that the shards are complete and belong to the same sweep.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a shard is missing, repeated, from another sweep or
+            incomplete.
+        """
+        manifests = self.read_manifests()
+        if len(manifests) == 0:
+            raise XlsxOperationException('There are no shards to merge.')
+
+        shard_count = manifests[0]['shard_count']
+        extended_project_count = manifests[0]['extended_project_count']
+        for shard_dir, manifest in zip(self.shard_dirs, manifests):
+            if manifest['shard_count'] != shard_count or manifest['extended_project_count'] != extended_project_count:
+                raise XlsxOperationException(f'{shard_dir} is from a different sweep than {self.shard_dirs[0]}.')
+
+        shard_indices = sorted(manifest['shard_index'] for manifest in manifests)
+        if shard_indices != list(range(shard_count)):
+            missing = sorted(set(range(shard_count)) - set(shard_indices))
+            repeated = sorted({index for index in shard_indices if shard_indices.count(index) > 1})
+            raise XlsxOperationException(
+                f'Shards of {shard_count} must each be merged once. Missing: {missing}. Repeated: {repeated}.'
+            )
+
+        for shard_dir, manifest in zip(self.shard_dirs, manifests):
+            shard_index = manifest['shard_index']
+            expected_positions = list(range(shard_index, extended_project_count, shard_count))
+            if manifest['positions'] != expected_positions:
+                raise XlsxOperationException(
+                    f'Shard {shard_index}/{shard_count} in {shard_dir} ran {len(manifest["positions"])} '
+                    f'of its {len(expected_positions)} projects.'
+                )
+
+            for filename in self.output_filenames(manifest):
+                if not os.path.isfile(os.path.join(shard_dir, filename)):
+                    raise XlsxOperationException(f'Shard {shard_index}/{shard_count} in {shard_dir} has no {filename}.')
+
+            costs = self.read_csv(os.path.join(shard_dir, self.COSTS_FILENAME), usecols=['Project ID with serial'])
+            cost_project_ids = set(costs['Project ID with serial'])
+            missing_costs = set(manifest['project_ids_with_serial']) - cost_project_ids
+            if len(missing_costs) > 0:
+                raise XlsxOperationException(
+                    f'Shard {shard_index}/{shard_count} in {shard_dir} has no costs for {sorted(missing_costs)}.'
+                )
+            extra_costs = cost_project_ids - set(manifest['project_ids_with_serial'])
+            if len(extra_costs) > 0:
+                raise XlsxOperationException(
+                    f'Shard {shard_index}/{shard_count} in {shard_dir} has costs for {sorted(extra_costs)}, '
+                    f'which are not in its manifest.'
+                )
+
+    def output_filenames(self, manifest):
+        """
+        Parameters
+        ----------
+        manifest : dict
+            The manifest of a shard.
+
+        Returns
+        -------
+        list
+            The names, relative to the shard directory, of the outputs
+            the shard must have.
+        """
+        filenames = [self.COSTS_FILENAME, self.EXTENDED_PROJECT_LIST_FILENAME]
+        if not manifest['costs_only']:
+            filenames.append(self.DETAILS_FILENAME)
+        return filenames
+
+    @staticmethod
+    def read_csv(filename, usecols=None):
+        """
+        Reads a .csv output of a shard with every value as text, so that
+        writing it again does not round numbers or turn integers into
+        floats.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the .csv file.
+
+        usecols : list
+            Optional. The names of the columns to read.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows of the file. Empty cells are empty strings.
+        """
+        return pd.read_csv(filename, usecols=usecols, dtype=str, keep_default_na=False)
+
+    def merge(self, output_dir):
+        """
+        Checks the shards and writes the merged landbosse-costs.csv,
+        landbosse-details.csv and extended_project_list.csv into
+        output_dir. The details are only merged if no shard ran in costs
+        only mode.
+
+        Parameters
+        ----------
+        output_dir : str
+            The directory of the merged outputs.
+        """
+        self.check()
+        manifests = self.read_manifests()
+        positions_by_project_id = dict()
+        for manifest in manifests:
+            positions_by_project_id.update(zip(manifest['project_ids_with_serial'], manifest['positions']))
+
+        # Rows of the extended project list are in the order of the positions
+        # in each manifest.
+        extended_project_lists = []
+        for shard_dir, manifest in zip(self.shard_dirs, manifests):
+            extended_project_list = self.read_csv(os.path.join(shard_dir, self.EXTENDED_PROJECT_LIST_FILENAME))
+            extended_project_list.index = manifest['positions']
+            extended_project_lists.append(extended_project_list)
+        merged = pd.concat(extended_project_lists, sort=False).sort_index()
+        os.makedirs(os.path.join(output_dir, os.path.dirname(self.EXTENDED_PROJECT_LIST_FILENAME)), exist_ok=True)
+        merged.to_csv(os.path.join(output_dir, self.EXTENDED_PROJECT_LIST_FILENAME), index=False)
+
+        # Rows of costs and details are ordered by the position of their
+        # project, keeping the order of rows within each project.
+        filenames = [self.COSTS_FILENAME]
+        if not any(manifest['costs_only'] for manifest in manifests):
+            filenames.append(self.DETAILS_FILENAME)
+        for filename in filenames:
+            frames = [self.read_csv(os.path.join(shard_dir, filename)) for shard_dir in self.shard_dirs]
+            merged = pd.concat(frames, ignore_index=True, sort=False)
+            positions = merged['Project ID with serial'].map(positions_by_project_id)
+            merged = merged.iloc[np.argsort(positions.values, kind='mergesort')]
+            merged.to_csv(os.path.join(output_dir, filename), index=False)
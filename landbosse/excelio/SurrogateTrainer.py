@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+from ..model.CostEmulator import CostEmulator
+from .XlsxOperationException import XlsxOperationException
+from .XlsxReader import XlsxReader
+
+
+class SurrogateTrainer:
+    """
+    SurrogateTrainer fits a CostEmulator for one project from runs of the
+    full model.
+
+    The training points are the parametric variations of the project in the
+    parametric list. A Latin hypercube, Sobol or Halton design (see
+    SamplingDesign) covers the inputs with the fewest runs, but a grid works
+    too. The inputs of the emulator are the cell specifications of the
+    project's rows in the parametric list and the outputs are the costs of
+    each module and the total cost.
+
+    The points are run with the run_projects() method of a manager runner,
+    which is normally an XlsxParallelManagerRunner, in costs only mode. A
+    fraction of the points is held out of the fit and used to report the
+    errors of the emulator.
+
+    The trained emulator falls back to full_model(), which runs the full
+    model for the project, for points outside the training domain.
+    """
+
+    def __init__(self, manager_runner, project_id, method='polynomial', test_fraction=0.2, seed=0, **emulator_options):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner that runs the training points and the fallback.
+
+        project_id : str
+            The Project ID to emulate. It must have rows in the parametric
+            list.
+
+        method : str
+            The method of the CostEmulator, 'polynomial' or 'rbf'
+
+        test_fraction : float
+            The fraction of the points held out to measure the errors.
+
+        seed : int
+            The seed for choosing the held out points.
+
+        emulator_options
+            Other keyword arguments for the CostEmulator, such as degree,
+            kernel or smoothing.
+        """
+        self.manager_runner = manager_runner
+        self.project_id = project_id
+        self.method = method
+        self.test_fraction = test_fraction
+        self.seed = seed
+        self.emulator_options = emulator_options
+        self.project_list = None
+        self.input_names = None
+        self.output_names = None
+        self.enable_cost_and_scaling_modifications = False
+
+    def train(self, enable_cost_and_scaling_modifications=False):
+        """
+        Runs the training points and fits the emulator.
+
+        Parameters
+        ----------
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx(). This also
+            applies to the runs of the fallback.
+
+        Returns
+        -------
+        CostEmulator
+            The emulator, with the errors on the held out points in its
+            validation attribute and full_model() as its fallback.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the project has no parametric variations, or too few to fit
+            the emulator.
+        """
+        self.enable_cost_and_scaling_modifications = enable_cost_and_scaling_modifications
+        self.project_list, project_parametric_list = self.manager_runner.read_parametric_project(self.project_id)
+        xlsx_reader = XlsxReader()
+        design = xlsx_reader.parametric_design(project_parametric_list)
+        self.input_names = list(dict.fromkeys(cell_specification for cell_specification, _ in design.axes()))
+
+        self.manager_runner.prefetch_project_data(self.project_list)
+        parametric_value_list = xlsx_reader.create_parametric_value_list(project_parametric_list)
+        print(f'Running {design.point_count()} training points for the surrogate of {self.project_id}')
+        costs, _ = self.manager_runner.run_costs_by_module(
+            self.project_list, parametric_value_list, enable_cost_and_scaling_modifications)
+
+        self.output_names = list(costs.columns)
+        inputs = parametric_value_list[self.input_names].values.astype(float)
+        costs = costs.values.astype(float)
+
+        # Points that failed to run have no costs.
+        has_costs = ~np.isnan(costs).any(axis=1)
+        inputs, costs = inputs[has_costs], costs[has_costs]
+
+        # Hold out some of the points for validation
+        test_count = int(round(len(inputs) * self.test_fraction))
+        order = np.random.default_rng(self.seed).permutation(len(inputs))
+        test, train = order[:test_count], order[test_count:]
+        if len(train) < 2:
+            raise XlsxOperationException(f'Project ID {self.project_id} needs more training points for a surrogate.')
+
+        emulator = CostEmulator(self.input_names, self.output_names, self.method, **self.emulator_options)
+        emulator.fit(inputs[train], costs[train])
+        emulator.validate(inputs[test], costs[test])
+        emulator.fallback = self.full_model
+        return emulator
+
+    def full_model(self, inputs):
+        """
+        Runs the full model for the project at the given inputs. This is
+        the fallback of the emulators made by train().
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Inputs with one row per point and one column per input name.
+
+        Returns
+        -------
+        numpy.ndarray
+            The costs, with one row per point and one column per output
+            name of the emulator.
+        """
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+        parametric_value_list = pd.DataFrame(inputs, columns=self.input_names)
+        parametric_value_list['Project ID'] = self.project_id
+        parametric_value_list['Project ID with serial'] = \
+            [f'{self.project_id}_surrogate_fallback_{index}' for index in range(len(inputs))]
+        costs, _ = self.manager_runner.run_costs_by_module(
+            self.project_list, parametric_value_list, self.enable_cost_and_scaling_modifications)
+        return costs.reindex(columns=self.output_names).values.astype(float)
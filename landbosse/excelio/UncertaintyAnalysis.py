@@ -0,0 +1,326 @@
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import qmc
+
+from ..model import QuantityTable
+from .RepricingSweep import RepricingSweep
+from .XlsxOperationException import XlsxOperationException
+from .XlsxReader import XlsxReader
+
+
+class UncertaintyAnalysis:
+    """
+    UncertaintyAnalysis propagates the uncertainty of the inputs of one
+    project to the cost of each module and the total cost, by Monte Carlo.
+
+    The uncertain inputs are the project's rows in the parametric list.
+    Each row is given a distribution with these optional columns:
+
+    Distribution: "Uniform" (the default when blank), "Triangular",
+    "Normal" or "Lognormal". Case does not matter.
+
+    Uniform uses Min and Max. Triangular uses Min, Mode and Max. Normal
+    uses Mean and Standard deviation, and is truncated to Min and Max if
+    they are given. Lognormal uses the Mean and Standard deviation of the
+    input itself, not of its logarithm.
+
+    The samples are a Latin hypercube mapped through the inverse CDF of each
+    distribution. The Step, Value list, Design and Sample count columns are
+    not used.
+
+    When every input is a price item (see QuantityTable), the costs are
+    affine in the inputs, so no sample is run with the cost modules. The
+    quantities are taken off at the median of the inputs with a
+    RepricingSweep, and the costs of all the samples are one sparse matrix
+    product. Samples that change the choice of cranes in ErectionCost are
+    grouped by the cranes they choose, and the quantities are taken off
+    again in the middle of the largest group, up to max_take_offs times.
+    Samples that are left over, and all the samples when the inputs are
+    not all price items, are run with the run_projects() method of the
+    manager runner in costs only mode.
+    """
+
+    distributions = ['uniform', 'triangular', 'normal', 'lognormal']
+
+    def __init__(self, manager_runner, project_id, sample_count=10000, seed=0, max_take_offs=10,
+                 percentiles=(5, 10, 25, 50, 75, 90, 95)):
+        """
+        Parameters
+        ----------
+        manager_runner : XlsxManagerRunner
+            The runner that runs the samples that cannot be repriced.
+
+        project_id : str
+            The Project ID to study. It must have rows in the parametric
+            list.
+
+        sample_count : int
+            The number of samples.
+
+        seed : int
+            The seed of the samples.
+
+        max_take_offs : int
+            The most quantity take offs to make, one for each choice of
+            cranes.
+
+        percentiles : tuple
+            The percentiles of the costs to report.
+        """
+        if sample_count < 2:
+            raise XlsxOperationException('An uncertainty analysis needs a sample count of at least 2.')
+        self.manager_runner = manager_runner
+        self.repricing_sweep = RepricingSweep(manager_runner)
+        self.project_id = project_id
+        self.sample_count = sample_count
+        self.seed = seed
+        self.max_take_offs = max_take_offs
+        self.percentiles = percentiles
+        self.project_list = None
+        self.factors = None
+        self.samples = None
+        self.costs = None
+        self.quantity_tables = []
+        self.full_model_count = 0
+
+    @classmethod
+    def distribution(cls, row):
+        """
+        Makes the distribution of a row of the parametric list.
+
+        Parameters
+        ----------
+        row : pandas.Series
+            The row of the parametric list.
+
+        Returns
+        -------
+        scipy.stats.rv_frozen
+            The distribution.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the distribution is not known or its parameters are missing.
+        """
+        def value(column_name):
+            return row[column_name] if column_name in row and not pd.isnull(row[column_name]) else None
+
+        cell_specification = f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+        name = value('Distribution')
+        name = 'uniform' if name is None else str(name).strip().lower()
+        if name not in cls.distributions:
+            raise XlsxOperationException(
+                f"Distribution {name} of {cell_specification} is not one of {', '.join(cls.distributions)}."
+            )
+
+        required = {
+            'uniform': ['Min', 'Max'],
+            'triangular': ['Min', 'Mode', 'Max'],
+            'normal': ['Mean', 'Standard deviation'],
+            'lognormal': ['Mean', 'Standard deviation']
+        }[name]
+        missing = [column_name for column_name in required if value(column_name) is None]
+        if len(missing) > 0:
+            raise XlsxOperationException(
+                f"Distribution {name} of {cell_specification} needs {', '.join(missing)}."
+            )
+
+        if name == 'uniform':
+            return stats.uniform(loc=row['Min'], scale=row['Max'] - row['Min'])
+        if name == 'triangular':
+            width = row['Max'] - row['Min']
+            return stats.triang((row['Mode'] - row['Min']) / width, loc=row['Min'], scale=width)
+        mean, standard_deviation = float(row['Mean']), float(row['Standard deviation'])
+        if name == 'normal':
+            low = -np.inf if value('Min') is None else (row['Min'] - mean) / standard_deviation
+            high = np.inf if value('Max') is None else (row['Max'] - mean) / standard_deviation
+            return stats.truncnorm(low, high, loc=mean, scale=standard_deviation)
+        sigma_squared = np.log(1 + (standard_deviation / mean) ** 2)
+        return stats.lognorm(np.sqrt(sigma_squared), scale=np.exp(np.log(mean) - sigma_squared / 2))
+
+    def run(self, enable_cost_and_scaling_modifications=False):
+        """
+        Draws the samples, computes their costs and summarizes them.
+
+        Parameters
+        ----------
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per module and the total. See summary().
+
+        Raises
+        ------
+        XlsxOperationException
+            If the project has no rows in the parametric list.
+        """
+        self.project_list, project_parametric_list = self.manager_runner.read_parametric_project(self.project_id)
+        self.factors = [
+            f"{row['Dataframe name']}/{row['Row name']}/{row['Column name']}"
+            for _, row in project_parametric_list.iterrows()
+        ]
+        distributions = [self.distribution(row) for _, row in project_parametric_list.iterrows()]
+
+        unit_points = qmc.LatinHypercube(len(self.factors), seed=self.seed).random(self.sample_count)
+        samples = np.column_stack([
+            distribution.ppf(unit_values) for distribution, unit_values in zip(distributions, unit_points.T)
+        ])
+        self.samples = pd.DataFrame(samples, columns=self.factors)
+
+        self.manager_runner.prefetch_project_data(self.project_list)
+        medians = np.array([distribution.median() for distribution in distributions])
+        self.quantity_tables = []
+        self.full_model_count = 0
+        if QuantityTable.is_linear(self.factors):
+            self.costs = self.reprice(samples, medians, enable_cost_and_scaling_modifications)
+        else:
+            print(f'The inputs of {self.project_id} are not all price items. Running every sample.')
+            self.costs = self.run_full_model(samples, np.arange(len(samples)), enable_cost_and_scaling_modifications)
+        print(f'Made {len(self.quantity_tables)} quantity take offs and ran {self.full_model_count} of '
+              f'{self.sample_count} samples with the full model for the uncertainty of {self.project_id}')
+
+        return self.summary(self.costs)
+
+    def reprice(self, samples, anchor_prices, enable_cost_and_scaling_modifications=False):
+        """
+        Computes the costs of samples of price items from quantity take
+        offs, as described in the class docstring.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            One row per sample and one column per factor.
+
+        anchor_prices : numpy.ndarray
+            The prices of the first take off.
+
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame
+            The costs, with one row per sample and one column per module
+            and the total.
+        """
+        scale = samples.std(axis=0)
+        scale[scale == 0] = 1.0
+        rng = np.random.default_rng(self.seed)
+        blocks = []
+        pending = np.arange(len(samples))
+        take_off_count = 0
+        while len(pending) > 0 and take_off_count < self.max_take_offs:
+            take_off_count += 1
+            anchor_row = XlsxReader().outer_join_projects_to_parametric_values(
+                self.project_list, self.parametric_value_list(anchor_prices[np.newaxis, :], ['anchor'])).iloc[0]
+            quantity_table = self.repricing_sweep.take_off(
+                anchor_row, self.factors, enable_cost_and_scaling_modifications)
+            if quantity_table is None:
+                # The anchor is too close to a change of cranes to take off
+                # the quantities, so try one of the samples that are left.
+                anchor_prices = samples[pending[rng.integers(len(pending))]]
+                continue
+            self.quantity_tables.append(quantity_table)
+
+            raw_costs, needs_full_model = quantity_table.reprice(samples[pending])
+            blocks.append(quantity_table.module_costs(raw_costs[~needs_full_model])
+                          .set_index(pending[~needs_full_model]))
+            pending = pending[needs_full_model]
+            if len(pending) == 0:
+                break
+
+            # Take off again in the middle of the largest group of samples
+            # that choose the same cranes.
+            choices = quantity_table.crane_choices(quantity_table.option_costs(samples[pending]))
+            _, group_indices, group_sizes = np.unique(choices, axis=0, return_inverse=True, return_counts=True)
+            group = samples[pending[group_indices.ravel() == np.argmax(group_sizes)]]
+            distances = (((group - group.mean(axis=0)) / scale) ** 2).sum(axis=1)
+            anchor_prices = group[np.argmin(distances)]
+
+        if len(pending) > 0:
+            blocks.append(self.run_full_model(samples[pending], pending, enable_cost_and_scaling_modifications))
+
+        columns = list(dict.fromkeys(column for block in blocks for column in block.columns if column != 'Total'))
+        # A module without costs in one block has no cost rows there.
+        blocks = [block.reindex(columns=sorted(columns) + ['Total'], fill_value=0) for block in blocks]
+        return pd.concat(blocks).sort_index()
+
+    def run_full_model(self, samples, positions, enable_cost_and_scaling_modifications=False):
+        """
+        Runs samples with the full model.
+
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            One row per sample and one column per factor.
+
+        positions : numpy.ndarray
+            The position of each sample, used for the index of the result.
+
+        enable_cost_and_scaling_modifications : bool
+            See XlsxManagerRunner.run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame
+            The costs, with one row per sample and one column per module
+            and the total. Samples that failed to run have NaN costs.
+        """
+        costs, _ = self.manager_runner.run_costs_by_module(
+            self.project_list, self.parametric_value_list(samples, [str(position) for position in positions]),
+            enable_cost_and_scaling_modifications)
+        self.full_model_count += len(samples)
+        costs.index = positions
+        return costs
+
+    def parametric_value_list(self, samples, suffixes):
+        """
+        Parameters
+        ----------
+        samples : numpy.ndarray
+            One row per sample and one column per factor.
+
+        suffixes : list
+            The suffix of the Project ID with serial of each sample.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The parametric values of the samples.
+        """
+        parametric_value_list = pd.DataFrame(samples, columns=self.factors)
+        parametric_value_list['Project ID'] = self.project_id
+        parametric_value_list['Project ID with serial'] = \
+            [f'{self.project_id}_uncertainty_{suffix}' for suffix in suffixes]
+        return parametric_value_list
+
+    def summary(self, costs):
+        """
+        Parameters
+        ----------
+        costs : pandas.DataFrame
+            The costs of the samples, with one column per output.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per output. The columns are Output, Samples (the number
+            of samples with costs), Mean, Standard deviation and one column
+            per percentile, like P50.
+        """
+        values = costs.values.astype(float)
+        percentiles = np.nanpercentile(values, self.percentiles, axis=0)
+        summary = pd.DataFrame({
+            'Output': costs.columns,
+            'Samples': (~np.isnan(values)).sum(axis=0),
+            'Mean': np.nanmean(values, axis=0),
+            'Standard deviation': np.nanstd(values, axis=0, ddof=1)
+        })
+        for percentile, percentile_values in zip(self.percentiles, percentiles):
+            summary[f'P{percentile:g}'] = percentile_values
+        return summary
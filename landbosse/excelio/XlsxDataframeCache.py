@@ -1,7 +1,13 @@
+import hashlib
 import os
+import pickle
+import tempfile
+from concurrent import futures
+
 import pandas as pd
 
 from .XlsxFileOperations import XlsxFileOperations
+from .CopyOnWriteSheets import CopyOnWriteSheets
 
 class XlsxDataframeCache:
     """
@@ -9,7 +15,7 @@ class XlsxDataframeCache:
     cache is shared throughout all parts of the code that needs access
     to any part of the project_data .xlsx files.
 
-    This class is made to read all sheets from xlsx files and store those
+    This class is made to read sheets from xlsx files and store those
     sheets as dictionaries. This is so .xlsx files only need to be parsed
     once.
 
@@ -20,25 +26,60 @@ class XlsxDataframeCache:
 
     Regardless of which executor is used, care must be taken that one thread
     or process cannot mutate the dataframes of another process. So, this
-    class make copies of dataframes so the callables running from the
-    executor cannot overwrite each other's data.
+    class does not hand out the cached dataframes in a plain dictionary.
+    Instead, it returns a CopyOnWriteSheets. The sheets in it are shared
+    and read only until a caller asks for a writable version of a
+    particular sheet with writable(). Only that sheet is copied. This way,
+    the callables running from the executor cannot overwrite each other's
+    data, but they do not pay to copy sheets they never modify.
+
+    Besides the cache in memory, there is an optional cache on disk.
+    Parsing .xlsx files is slow, so when cache_dir is set, the sheets of
+    each .xlsx file are pickled into a file in that folder. The next run,
+    or the next worker process, that needs the .xlsx file loads the sheets
+    from the cache file without parsing the .xlsx at all. The cache is off
+    unless it is enabled with --cache-dir or LANDBOSSE_CACHE_DIR (see
+    XlsxFileOperations.disk_cache_dir()), and nothing is ever written to
+    the input folder.
+
+    A cache file stores the absolute path, modification time, size and
+    SHA-256 hash of the .xlsx file it was made from. When the modification
+    time and size match the .xlsx file on disk, the cache file is used
+    without reading the .xlsx file. When only the modification time
+    differs, the .xlsx file is hashed, and the cache file is still used if
+    the contents are the same. Otherwise, the cache file is stale and is
+    replaced. A cache file is only written when there is none for the
+    .xlsx file, when it is stale or when the modification time changed,
+    so that the .xlsx file is not hashed again on the next run.
+
+    Cache files are written by LandBOSSE itself, and pickle files should
+    never be loaded from untrusted sources, so the cache folder must not be
+    shared with anyone untrusted. If a cache file cannot be read or written,
+    the .xlsx file is simply parsed.
     """
 
     # _cache is a class attribute that holds the cache of sheets and their
     # dataframes
     _cache = {}
 
+    # The folder of the cache files. None disables the cache on disk.
+    cache_dir = None
+
+    # The suffix of the names of the cache files.
+    CACHE_SUFFIX = '.landbosse-cache.pkl'
+
     @classmethod
     def read_all_sheets_from_xlsx(cls, xlsx_basename, xlsx_path=None):
         """
         If the .xlsx file specified by .xlsx_basename has been read before
-        (meaning it is stored as a key on cls._cache), a copy of all the
-        dataframes stored under that sheet name is returned. See the note
-        about copying in the class docstring for why copies are being made.
+        (meaning it is stored as a key on cls._cache), copy-on-write handles
+        to the dataframes stored under that name are returned. See the note
+        about copying in the class docstring for why the dataframes must not
+        be modified without calling writable() first.
 
         If the xlsx_basename has not been read before, all the sheets are
-        read and copies are returned. The sheets are stored on the dictionary
-        cache.
+        read and handles to them are returned. The sheets are stored on the
+        dictionary cache.
 
         Parameters
         ----------
@@ -56,42 +97,274 @@ class XlsxDataframeCache:
 
         Returns
         -------
-        dict
+        CopyOnWriteSheets
             A dictionary of dataframes. Keys on the dictionary are names of
             sheets and values in the dictionary are dataframes in that
             .xlsx file.
         """
-        if xlsx_basename in cls._cache:
-            original = cls._cache[xlsx_basename]
-            return cls.copy_dataframes(original)
+        if xlsx_basename not in cls._cache:
+            xlsx_filename = cls.xlsx_filename(xlsx_basename, xlsx_path)
+            cls._cache[xlsx_basename] = load_xlsx_sheets(xlsx_filename, cls.cache_dir)
+        return CopyOnWriteSheets(cls._cache[xlsx_basename])
+
+    @classmethod
+    def prefetch(cls, xlsx_basenames, xlsx_path=None, max_workers=None):
+        """
+        Loads several .xlsx files into the cache at once. The files that
+        are not in the cache yet are loaded concurrently, one per process of
+        a ProcessPoolExecutor, and the results are stored on the cache. After
+        this, read_all_sheets_from_xlsx() finds them in the cache and does not
+        block to parse them.
 
-        file_ops = XlsxFileOperations()
+        If only one file needs to be loaded, it is loaded in this process.
 
+        Parameters
+        ----------
+        xlsx_basenames : iterable
+            The base names of the .xlsx files, without the .xlsx. Duplicates
+            are loaded once.
+
+        xlsx_path : str
+            Optional. The folder of the .xlsx files. If None, the
+            project_data folder of the input folder is used.
+
+        max_workers : int
+            Optional. The maximum number of processes. If None, the default
+            of ProcessPoolExecutor is used.
+        """
+        basenames = [basename for basename in dict.fromkeys(xlsx_basenames) if basename not in cls._cache]
+        xlsx_filenames = [cls.xlsx_filename(basename, xlsx_path) for basename in basenames]
+
+        if len(basenames) == 0:
+            return
+        elif len(basenames) == 1:
+            workbooks = [load_xlsx_sheets(xlsx_filenames[0], cls.cache_dir)]
+        else:
+            with futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                workbooks = list(executor.map(load_xlsx_sheets, xlsx_filenames,
+                                              [cls.cache_dir] * len(basenames)))
+
+        for basename, workbook in zip(basenames, workbooks):
+            cls._cache[basename] = workbook
+
+    @classmethod
+    def xlsx_filename(cls, xlsx_basename, xlsx_path=None):
+        """
+        Parameters
+        ----------
+        xlsx_basename : str
+            The base name of the .xlsx file, without the .xlsx.
+
+        xlsx_path : str
+            The folder of the .xlsx file. If None, the project_data folder
+            of the input folder is used.
+
+        Returns
+        -------
+        str
+            The path of the .xlsx file.
+        """
         if xlsx_path is None:
-            xlsx_filename = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{xlsx_basename}.xlsx')
+            file_ops = XlsxFileOperations()
+            return os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{xlsx_basename}.xlsx')
         else:
-            xlsx_filename = os.path.join(xlsx_path, f'{xlsx_basename}.xlsx')
+            return os.path.join(xlsx_path, f'{xlsx_basename}.xlsx')
+
+    @classmethod
+    def parse_all_sheets(cls, xlsx_filename):
+        """
+        Parses all the sheets of a .xlsx file.
+
+        Parameters
+        ----------
+        xlsx_filename : str
+            The path of the .xlsx file.
 
+        Returns
+        -------
+        dict
+            A dictionary of dataframes. Keys are names of sheets and values
+            are the dataframes of those sheets.
+        """
         xlsx = pd.ExcelFile(xlsx_filename)
-        sheets_dict = {sheet_name: xlsx.parse(sheet_name) for sheet_name in xlsx.sheet_names}
-        cls._cache[xlsx_basename] = sheets_dict
-        return cls.copy_dataframes(sheets_dict)
+        return {sheet_name: xlsx.parse(sheet_name) for sheet_name in xlsx.sheet_names}
 
     @classmethod
-    def copy_dataframes(cls, dict_of_dataframes):
+    def cache_filename(cls, xlsx_filename, cache_dir):
         """
-        This copies a dictionary of dataframes. See the class docstring for an
-        explanation of why this copying is taking place.
+        Parameters
+        ----------
+        xlsx_filename : str
+            The path of the .xlsx file.
+
+        cache_dir : str
+            The folder of the cache files.
+
+        Returns
+        -------
+        str
+            The path of the cache file for the .xlsx file. The name has the
+            name of the .xlsx file and a hash of its absolute path, so .xlsx
+            files with the same name in different folders do not share a
+            cache file.
+        """
+        path_hash = hashlib.sha256(os.path.abspath(xlsx_filename).encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f'{os.path.basename(xlsx_filename)}-{path_hash}{cls.CACHE_SUFFIX}')
+
+    @classmethod
+    def content_hash(cls, xlsx_filename):
+        """
+        Parameters
+        ----------
+        xlsx_filename : str
+            The path of the .xlsx file.
+
+        Returns
+        -------
+        str
+            The SHA-256 hash of the contents of the .xlsx file.
+        """
+        digest = hashlib.sha256()
+        with open(xlsx_filename, 'rb') as xlsx:
+            for chunk in iter(lambda: xlsx.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def cache_key(cls, xlsx_filename, sha256=None):
+        """
+        Makes the key that identifies the version of a .xlsx file that a
+        cache file was made from.
+
+        Parameters
+        ----------
+        xlsx_filename : str
+            The path of the .xlsx file.
+
+        sha256 : str
+            Optional. The SHA-256 hash of the contents of the .xlsx file,
+            if it is known.
+
+        Returns
+        -------
+        dict
+            The absolute path, modification time in nanoseconds, size in
+            bytes and SHA-256 hash of the contents of the .xlsx file. The
+            pandas version is included too, since pickled dataframes may not
+            load in other versions of pandas.
+        """
+        stat = os.stat(xlsx_filename)
+        return {
+            'path': os.path.abspath(xlsx_filename),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': sha256,
+            'pandas_version': pd.__version__
+        }
+
+    @classmethod
+    def read_cache_file(cls, cache_filename):
+        """
+        Reads a cache file.
 
         Parameters
         ----------
-        dict_of_dataframes : dict
-            The dictionary of dataframes to copy.
+        cache_filename : str
+            The path of the cache file.
 
         Returns
         -------
         dict
-            Keys are the same as the original dictionary of dataframes.
-            Values are copies of the origin dataframes.
+            The key of the .xlsx file the cache file was made from, under
+            the key 'key', and the dataframes of its sheets, under the key
+            'sheets'. None if the cache file does not exist or cannot be
+            read.
+        """
+        try:
+            with open(cache_filename, 'rb') as cache_file:
+                cached = pickle.load(cache_file)
+            if isinstance(cached, dict) and 'key' in cached and 'sheets' in cached:
+                return cached
+        except (OSError, pickle.UnpicklingError, EOFError, TypeError, AttributeError, ImportError):
+            pass
+        return None
+
+    @classmethod
+    def write_cache_file(cls, cache_filename, key, sheets_dict):
+        """
+        Writes a cache file. The file is written to a temporary file first
+        and then moved into place, so other processes never see a partly
+        written cache file. If the cache file cannot be written, nothing
+        happens.
+
+        Parameters
+        ----------
+        cache_filename : str
+            The path of the cache file.
+
+        key : dict
+            The key made by cache_key() for the .xlsx file.
+
+        sheets_dict : dict
+            The dataframes of the sheets of the .xlsx file.
         """
-        return {xlsx_basename: df.copy() for xlsx_basename, df in dict_of_dataframes.items()}
+        temp_filename = None
+        try:
+            os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+            fd, temp_filename = tempfile.mkstemp(dir=os.path.dirname(cache_filename), suffix=f'{cls.CACHE_SUFFIX}.tmp')
+            with os.fdopen(fd, 'wb') as cache_file:
+                pickle.dump({'key': key, 'sheets': sheets_dict}, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, cache_filename)
+        except OSError:
+            if temp_filename is not None and os.path.exists(temp_filename):
+                os.remove(temp_filename)
+
+
+def load_xlsx_sheets(xlsx_filename, cache_dir):
+    """
+    Reads all the sheets of a .xlsx file. If cache_dir has a cache file for
+    the .xlsx file as it is now, the sheets are loaded from it. Otherwise,
+    the .xlsx file is parsed and, if cache_dir is not None, a new cache file
+    is written. See the XlsxDataframeCache docstring for when a cache file
+    is up to date. This is defined outside of the class so that it can be
+    run in the processes of XlsxDataframeCache.prefetch().
+
+    Parameters
+    ----------
+    xlsx_filename : str
+        The path of the .xlsx file.
+
+    cache_dir : str
+        The folder of the cache files, or None to always parse the .xlsx
+        file.
+
+    Returns
+    -------
+    dict
+        A dictionary of dataframes. Keys are names of sheets and values are
+        the dataframes of those sheets.
+    """
+    if cache_dir is None:
+        return XlsxDataframeCache.parse_all_sheets(xlsx_filename)
+
+    cache_filename = XlsxDataframeCache.cache_filename(xlsx_filename, cache_dir)
+    key = XlsxDataframeCache.cache_key(xlsx_filename)
+    cached = XlsxDataframeCache.read_cache_file(cache_filename)
+    if cached is not None:
+        cached_key = cached['key']
+        same_file = all(cached_key.get(name) == key[name] for name in ['path', 'size', 'pandas_version'])
+        if same_file and cached_key.get('mtime_ns') == key['mtime_ns']:
+            return cached['sheets']
+
+        # The modification time changed, for example because the file was
+        # copied, but the contents may not have.
+        key['sha256'] = XlsxDataframeCache.content_hash(xlsx_filename)
+        if same_file and cached_key.get('sha256') == key['sha256']:
+            XlsxDataframeCache.write_cache_file(cache_filename, key, cached['sheets'])
+            return cached['sheets']
+
+    if key['sha256'] is None:
+        key['sha256'] = XlsxDataframeCache.content_hash(xlsx_filename)
+    sheets_dict = XlsxDataframeCache.parse_all_sheets(xlsx_filename)
+    XlsxDataframeCache.write_cache_file(cache_filename, key, sheets_dict)
+    return sheets_dict
@@ -118,6 +118,310 @@ class XlsxFileOperations:
         # Return the state of the command line arguments.
         return input_path, output_path, validation_enabled, enable_scaling_study
 
+    def costs_only_enabled(self):
+        """
+        This uses the sys.argv object to look for the option that enables
+        costs only mode:
+
+        --costs-only or -c
+
+        In costs only mode, only the costs outputs (landbosse-costs.csv and
+        the costs_by_module_type_operation tab) are calculated and written.
+        The details outputs, and the parametric project data workbooks,
+        are skipped, and the intermediate dataframes of each project are
+        dropped as soon as the project finishes.
+
+        Returns
+        -------
+        bool
+            True if costs only mode is enabled, False otherwise.
+        """
+        return '--costs-only' in sys.argv or '-c' in sys.argv
+
+    def keep_intermediates_enabled(self):
+        """
+        This uses the sys.argv object to look for the option that keeps the
+        intermediate outputs of every project for debugging:
+
+        --keep-intermediates
+
+        Normally the runners keep only the cost and detail rows of each
+        project, and workers send only those rows back to the parent. With
+        this option, the whole output dictionary of each project is kept.
+
+        Returns
+        -------
+        bool
+            True if the intermediate outputs are kept, False otherwise.
+        """
+        return '--keep-intermediates' in sys.argv
+
+    def repricing_enabled(self):
+        """
+        This uses the sys.argv object to look for the option that runs the
+        parametric list as a repricing sweep:
+
+        --reprice
+
+        Projects whose parametric variations only change prices are taken
+        off once by RepricingSweep and their variations are computed from
+        the quantities, without running the cost modules. Repricing implies
+        costs only mode. The quantities are written to
+        landbosse-quantities.csv.
+
+        Returns
+        -------
+        bool
+            True if repricing is enabled, False otherwise.
+        """
+        return '--reprice' in sys.argv
+
+    def adaptive_refinement_options(self):
+        """
+        This uses the sys.argv object to look for the options of an
+        adaptive refinement sweep:
+
+        --adaptive [run budget]
+
+        --tolerance [relative tolerance]
+
+        If --adaptive is present, the parametric list is run with
+        AdaptiveRefinementSweep, which runs at most the given number of
+        projects. --tolerance is the relative difference of costs between
+        neighboring points above which points are added. It defaults to
+        0.05.
+
+        Returns
+        -------
+        int, float
+            The run budget, or None if --adaptive is not present, and the
+            tolerance.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the run budget or tolerance is missing or not a number.
+        """
+        run_budget = None
+        tolerance = 0.05
+
+        try:
+            if '--adaptive' in sys.argv:
+                run_budget = int(sys.argv[sys.argv.index('--adaptive') + 1])
+            if '--tolerance' in sys.argv:
+                tolerance = float(sys.argv[sys.argv.index('--tolerance') + 1])
+        except (IndexError, ValueError):
+            raise XlsxOperationException('--adaptive needs a run budget and --tolerance needs a number.')
+
+        return run_budget, tolerance
+
+    def shard_option(self):
+        """
+        This uses the sys.argv object to look for the option that runs one
+        shard of the extended project list:
+
+        --shard [index]/[count]
+
+        For example, --shard 0/4 through --shard 3/4 split a sweep across
+        four machines. Shard indices start at 0.
+
+        Returns
+        -------
+        tuple
+            The shard index and shard count, or None if --shard is not
+            present.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the shard is not in the form index/count.
+        """
+        if '--shard' not in sys.argv:
+            return None
+
+        try:
+            shard_index, shard_count = sys.argv[sys.argv.index('--shard') + 1].split('/')
+            return int(shard_index), int(shard_count)
+        except (IndexError, ValueError):
+            raise XlsxOperationException('--shard needs a shard index and count in the form index/count, like 0/4.')
+
+    def merge_shard_dirs(self):
+        """
+        This uses the sys.argv object to look for the option that merges
+        the outputs of shards instead of running projects:
+
+        --merge-shards [shard output directory] [shard output directory] ...
+
+        Every argument after --merge-shards, up to the next option, is the
+        output directory of one shard. The merged outputs are written to
+        the output directory.
+
+        Returns
+        -------
+        list
+            The shard output directories, or None if --merge-shards is not
+            present.
+        """
+        if '--merge-shards' not in sys.argv:
+            return None
+
+        shard_dirs = []
+        for arg in sys.argv[sys.argv.index('--merge-shards') + 1:]:
+            if arg.startswith('-'):
+                break
+            shard_dirs.append(arg)
+        return shard_dirs
+
+    def surrogate_options(self):
+        """
+        This uses the sys.argv object to look for the options that train a
+        surrogate of the model instead of writing the usual outputs:
+
+        --train-surrogate [Project ID]
+
+        --surrogate-method [polynomial or rbf]
+
+        The parametric variations of the Project ID are run and a
+        CostEmulator is fit to their costs. The method defaults to
+        polynomial.
+
+        Returns
+        -------
+        str, str
+            The Project ID, or None if --train-surrogate is not present,
+            and the method.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the Project ID or method is missing.
+        """
+        project_id = None
+        method = 'polynomial'
+
+        try:
+            if '--train-surrogate' in sys.argv:
+                project_id = sys.argv[sys.argv.index('--train-surrogate') + 1]
+            if '--surrogate-method' in sys.argv:
+                method = sys.argv[sys.argv.index('--surrogate-method') + 1]
+        except IndexError:
+            raise XlsxOperationException('--train-surrogate needs a Project ID and --surrogate-method needs a method.')
+
+        return project_id, method
+
+    def sensitivity_options(self):
+        """
+        This uses the sys.argv object to look for the options of a
+        sensitivity analysis, which is run instead of the usual outputs:
+
+        --sensitivity [Project ID]
+
+        --sensitivity-method [sobol or morris]
+
+        --samples [sample count]
+
+        The rows of the Project ID in the parametric list are the factors
+        of a SensitivityAnalysis. The method defaults to sobol and the
+        sample count to 64.
+
+        Returns
+        -------
+        str, str, int
+            The Project ID, or None if --sensitivity is not present, the
+            method and the sample count.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the Project ID, method or sample count is missing or the
+            sample count is not an integer.
+        """
+        project_id = None
+        method = 'sobol'
+        sample_count = 64
+
+        try:
+            if '--sensitivity' in sys.argv:
+                project_id = sys.argv[sys.argv.index('--sensitivity') + 1]
+            if '--sensitivity-method' in sys.argv:
+                method = sys.argv[sys.argv.index('--sensitivity-method') + 1]
+            if '--samples' in sys.argv:
+                sample_count = int(sys.argv[sys.argv.index('--samples') + 1])
+        except (IndexError, ValueError):
+            raise XlsxOperationException(
+                '--sensitivity needs a Project ID, --sensitivity-method needs a method and --samples needs an integer.'
+            )
+
+        return project_id, method, sample_count
+
+    def uncertainty_options(self):
+        """
+        This uses the sys.argv object to look for the options of an
+        uncertainty analysis, which is run instead of the usual outputs:
+
+        --uncertainty [Project ID]
+
+        --samples [sample count]
+
+        The rows of the Project ID in the parametric list are the uncertain
+        inputs of an UncertaintyAnalysis. The sample count defaults to
+        10000.
+
+        Returns
+        -------
+        str, int
+            The Project ID, or None if --uncertainty is not present, and the
+            sample count.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the Project ID or sample count is missing or the sample count
+            is not an integer.
+        """
+        project_id = None
+        sample_count = 10000
+
+        try:
+            if '--uncertainty' in sys.argv:
+                project_id = sys.argv[sys.argv.index('--uncertainty') + 1]
+            if '--samples' in sys.argv:
+                sample_count = int(sys.argv[sys.argv.index('--samples') + 1])
+        except (IndexError, ValueError):
+            raise XlsxOperationException('--uncertainty needs a Project ID and --samples needs an integer.')
+
+        return project_id, sample_count
+
+    def disk_cache_dir(self):
+        """
+        This uses the sys.argv object to look for the option that keeps the
+        parsed project data .xlsx files in a cache on disk:
+
+        --cache-dir [folder]
+
+        If the option is missing, the folder is taken from the environment
+        variable LANDBOSSE_CACHE_DIR. If neither is set, there is no cache
+        on disk and every run parses the .xlsx files. See
+        XlsxDataframeCache for how the cache works.
+
+        Returns
+        -------
+        str
+            The folder of the cache, or None if the cache is disabled.
+
+        Raises
+        ------
+        XlsxOperationException
+            If --cache-dir is not followed by a folder.
+        """
+        if '--cache-dir' not in sys.argv:
+            return os.environ.get('LANDBOSSE_CACHE_DIR')
+
+        cache_dir_idx = sys.argv.index('--cache-dir') + 1
+        if cache_dir_idx >= len(sys.argv) or sys.argv[cache_dir_idx].startswith('-'):
+            raise XlsxOperationException('--cache-dir needs a folder.')
+        return sys.argv[cache_dir_idx]
+
     def landbosse_input_dir(self):
         """
         See the get_input_output_paths_from_argv_or_env() function above. This
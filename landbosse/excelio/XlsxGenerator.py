@@ -4,6 +4,8 @@ import pandas as pd
 import os
 import traceback
 
+from ..model import DetailCollector
+from ..model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
 from .XlsxFileOperations import XlsxFileOperations
 
 
@@ -19,7 +21,7 @@ class XlsxGenerator:
     output Excel workbook.
     """
 
-    def __init__(self, output_xlsx, file_ops):
+    def __init__(self, output_xlsx, file_ops, constant_memory=False):
         """
         This constructor sets the name of the .xlsx file for writing
 
@@ -35,6 +37,11 @@ class XlsxGenerator:
 
         file_ops : XlsxFileOperations
             An instance of XlsxFileOperations to manage file names.
+
+        constant_memory : bool
+            If True, each row is flushed to disk once the next row is
+            written, so the rows of a tab must be written in order. Only
+            append_costs_by_module_type_operation() writes rows in order.
         """
 
         # Set all instance attributes to None first in the constructor as good
@@ -45,6 +52,12 @@ class XlsxGenerator:
         self.percent_format = None
         self.output_xlsx_path = os.path.join(file_ops.landbosse_output_dir(), f'{output_xlsx}.xlsx')
         self.file_ops = file_ops
+        self.constant_memory = constant_memory
+
+        # The costs_by_module_type_operation tab and the number of rows
+        # written to it. See append_costs_by_module_type_operation()
+        self.costs_worksheet = None
+        self.costs_row_count = 0
 
     @classmethod
     def write_project_data(cls, project_data_dataframes, project_data_output_xlsx_path):
@@ -79,7 +92,8 @@ class XlsxGenerator:
         self
             Returns self for easy use in the context manager.
         """
-        self.workbook = xlsxwriter.Workbook(self.output_xlsx_path, {'nan_inf_to_errors': True})
+        self.workbook = xlsxwriter.Workbook(self.output_xlsx_path, {'nan_inf_to_errors': True,
+                                                                    'constant_memory': self.constant_memory})
         self.set_workbook_formats()
         return self
 
@@ -133,51 +147,82 @@ class XlsxGenerator:
 
         Parameters
         ----------
-        rows : list
-            List of dictionaries that are each row in the output
-            sheet.
-        """
-        worksheet = self.workbook.add_worksheet('costs_by_module_type_operation')
-        for idx, col_name in enumerate(['Project ID with serial',
-                                        'Number of turbines',
-                                        'Turbine rating MW',
-                                        'Rotor diameter m',
-                                        'Module',
-                                        'Operation ID',
-                                        'Type of cost',
-                                        'Cost per turbine',
-                                        'Cost per project',
-                                        'USD/kW per project']):
-            worksheet.write(0, idx, col_name, self.header_format)
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['num_turbines'])
-            worksheet.write(row_idx + 1, 2, row['turbine_rating_MW'])
-            worksheet.write(row_idx + 1, 3, row['rotor_diameter_m'])
-            worksheet.write(row_idx + 1, 4, row['module'])
-            worksheet.write(row_idx + 1, 5, row['operation_id'])
-            worksheet.write(row_idx + 1, 6, row['type_of_cost'])
-            worksheet.write(row_idx + 1, 7, row['cost_per_turbine'], self.accounting_format)
-            worksheet.write(row_idx + 1, 8, row['cost_per_project'], self.accounting_format)
-            worksheet.write(row_idx + 1, 9, row['usd_per_kw_per_project'], self.accounting_format)
-            worksheet.set_column(0, 5, 25)
-            worksheet.set_column(6, 10, 17)
-        worksheet.freeze_panes(1, 0)  # Freeze the first row.
+        rows : pd.DataFrame or list
+            The dataframe of costs made by the manager runners. A list
+            of dictionaries that are each row in the output sheet is also
+            accepted.
+        """
+        self.append_costs_by_module_type_operation(rows)
+
+    def append_costs_by_module_type_operation(self, rows):
+        """
+        This appends rows to the costs_by_module_type_operation tab. The
+        first call adds the tab and writes its header, so the costs of a
+        sweep can be written one chunk at a time.
+
+        Parameters
+        ----------
+        rows : pd.DataFrame or list
+            See tab_costs_by_module_type_operation()
+        """
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame(rows, columns=COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS)
+        if self.costs_worksheet is None:
+            self.costs_worksheet = self.workbook.add_worksheet('costs_by_module_type_operation')
+            for idx, col_name in enumerate(['Project ID with serial',
+                                            'Number of turbines',
+                                            'Turbine rating MW',
+                                            'Rotor diameter m',
+                                            'Module',
+                                            'Operation ID',
+                                            'Type of cost',
+                                            'Cost per turbine',
+                                            'Cost per project',
+                                            'USD/kW per project']):
+                self.costs_worksheet.write(0, idx, col_name, self.header_format)
+            self.costs_worksheet.set_column(0, 5, 25)
+            self.costs_worksheet.set_column(6, 10, 17)
+            self.costs_worksheet.freeze_panes(1, 0)  # Freeze the first row.
+
+        # Write the tab row by row, so that it can be written in constant
+        # memory mode. tolist() gives native Python values that the writer
+        # handles directly.
+        columns = [
+            ('project_id_with_serial', None),
+            ('num_turbines', None),
+            ('turbine_rating_MW', None),
+            ('rotor_diameter_m', None),
+            ('module', None),
+            ('operation_id', None),
+            ('type_of_cost', None),
+            ('cost_per_turbine', self.accounting_format),
+            ('cost_per_project', self.accounting_format),
+            ('usd_per_kw_per_project', self.accounting_format)
+        ]
+        cell_formats = [cell_format for _, cell_format in columns]
+        for values in zip(*[rows[col_name].tolist() for col_name, _ in columns]):
+            self.costs_row_count += 1
+            for col_idx, (value, cell_format) in enumerate(zip(values, cell_formats)):
+                self.costs_worksheet.write(self.costs_row_count, col_idx, value, cell_format)
 
     def tab_details(self, rows):
         """
-        This writes a detailed outputs tab. It takes a list of dictionaries
-        as the parameters and in each of those dictionaries it looks at the keys:
+        This writes a detailed outputs tab. It takes the block of detail
+        rows made by the manager runners and looks at the columns:
 
-        ['project_id', 'module', 'type', 'variable_df_key_col_name', 'unit', 'numeric value', 'non_numeric_value']
+        ['project_id', 'module', 'type', 'variable_df_key_col_name', 'unit', 'value', 'last_number', 'non_numeric_value']
 
-        The values of each of those keys become each cell in the row.
+        The values of each of those columns become each cell in the row.
 
         Parameters
         ----------
-        rows : list
-            list of dicts. See above.
+        rows : pd.DataFrame or list
+            The block of detail rows, with the columns in DetailCollector.columns.
+            A list of dicts with the keys above is also accepted.
         """
+        if not isinstance(rows, pd.DataFrame):
+            rows = DetailCollector.from_records(rows)
+
         worksheet = self.workbook.add_worksheet('details')
         worksheet.set_column(3, 3, 66)
         worksheet.set_column(4, 4, 17)
@@ -187,17 +232,19 @@ class XlsxGenerator:
         for idx, col_name in enumerate(['Project ID with serial', 'Module', 'Variable or DataFrame', 'name', 'unit', 'Numeric value', 'Non-numeric value']):
             worksheet.write(0, idx, col_name, self.header_format)
 
-        # Go through each row and create Excel rows from each of those rows.
-        for row_idx, row in enumerate(rows):
-            worksheet.write(row_idx + 1, 0, row['project_id_with_serial'])
-            worksheet.write(row_idx + 1, 1, row['module'])
-            worksheet.write(row_idx + 1, 2, row['type'])
-            worksheet.write(row_idx + 1, 3, row['variable_df_key_col_name'])
-            worksheet.write(row_idx + 1, 4, row['unit'])
-
-            value = row['value']
-            value_is_number = self._is_numeric(value)
-            if value_is_number:
+        # Write the label columns column by column.
+        for col_idx, col_name in enumerate(['project_id_with_serial', 'module', 'type', 'variable_df_key_col_name', 'unit']):
+            for row_idx, value in enumerate(rows[col_name].tolist()):
+                worksheet.write(row_idx + 1, col_idx, value)
+
+        value_is_number = DetailCollector.numeric_value_mask(rows['value']).tolist()
+        for row_idx, (value, is_number, last_number, has_last_number, non_numeric_value) in enumerate(zip(
+                rows['value'].tolist(),
+                value_is_number,
+                rows['last_number'].tolist(),
+                rows['has_last_number'].tolist(),
+                rows['non_numeric_value'].tolist())):
+            if is_number:
                 worksheet.write(row_idx + 1, 5, value, self.scientific_format)
             else:
                 worksheet.write(row_idx + 1, 6, value)
@@ -206,38 +253,14 @@ class XlsxGenerator:
             # at the end, write this into the numeric value column. This overrides automatic
             # type detection.
 
-            if 'last_number' in row:
-                worksheet.write(row_idx + 1, 5, row['last_number'], self.scientific_format)
+            if has_last_number:
+                worksheet.write(row_idx + 1, 5, last_number, self.scientific_format)
 
-            # Certain data are pairs of numeric and non-numeric values. If a key of
-            # "non_numeric_value" exists, put that in column 6.
+            # Certain data are pairs of numeric and non-numeric values. If there is
+            # a non_numeric_value, put that in column 6.
             # An example is mobilization of an LB75-SL3F-Offload at some numeric cost
 
-            if 'non_numeric_value' in row:
-                worksheet.write(row_idx + 1, 6, row['non_numeric_value'])
+            if non_numeric_value is not None:
+                worksheet.write(row_idx + 1, 6, non_numeric_value)
 
         worksheet.freeze_panes(1, 0)  # Freeze the first row.
-
-    def _is_numeric(self, value):
-        """
-        This method tests if a value is a numeric (that is, can be parsed
-        by float()) or non numeric (which cannot be parsed).
-
-        The decision from this method determines whether values go into
-        the numeric or non-numeric columns.
-
-        Parameters
-        ----------
-        value
-            The value to be tested.
-
-        Returns
-        -------
-        bool
-            True if the value is numeric, False otherwise.
-        """
-        try:
-            float(value)
-        except ValueError:
-            return False
-        return True
@@ -1,8 +1,16 @@
+import time
+from itertools import islice
+
 import pandas as pd
 
+from ..model import DetailCollector
+from ..model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
+from .SamplingDesign import SamplingDesign
+from .XlsxOperationException import XlsxOperationException
+from .ProjectParameterTable import ProjectParameterTable
 
 
 class XlsxManagerRunner:
@@ -14,7 +22,12 @@ class XlsxManagerRunner:
     or parallel manager runner is needed.
     """
 
-    def __init__(self, file_ops=None):
+    # If True, the whole output dictionary of each project is kept, with
+    # the intermediate dataframes of the modules, for debugging. Otherwise,
+    # only the cost and detail rows are kept. See compact_output_dict().
+    keep_intermediate_outputs = False
+
+    def __init__(self, file_ops=None, shard=None):
         """
         The constructor simply creates an XlsxFileOperations instance
         to live throughout the lifetime of the instance
@@ -25,10 +38,27 @@ class XlsxManagerRunner:
             The file operation instance used to create filenames. If this
             is left at the default of None, a new instance of
             XlsxFileOperations is created.
+
+        shard : tuple
+            Optional. A tuple of the shard index and the shard count, to
+            run only one slice of the extended project list. Shard i of N
+            runs the rows whose position in the extended project list,
+            which is also the serial number of parametric rows, has a
+            remainder of i when divided by N. Shard indices start at 0.
+            If None, all rows are run.
         """
         self.file_ops = file_ops if file_ops is not None else XlsxFileOperations()
+        if shard is not None:
+            shard_index, shard_count = shard
+            if not 0 <= shard_index < shard_count:
+                raise XlsxOperationException(f'Shard {shard_index}/{shard_count} must be between 0/{shard_count} and {shard_count - 1}/{shard_count}.')
+        self.shard = shard
+
+        # The time in seconds the last call to warm_up_project_data() took
+        self.warm_up_seconds = None
 
-    def run_from_project_list_xlsx(self, projects_xlsx,  enable_cost_and_scaling_modifications=True):
+    def run_from_project_list_xlsx(self, projects_xlsx,  enable_cost_and_scaling_modifications=True, costs_only=False,
+                                   result_writer=None):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
         the OrderedDict that holds the results of all the runs. See the return
@@ -53,17 +83,26 @@ class XlsxManagerRunner:
             modified by the parameters for to scale certain input values based
             on what has been parametrically modified. This is implemented by subclasses.
 
+        costs_only : bool
+            If True, only the costs_by_module_type_operation outputs are
+            calculated. The details outputs, the intermediate dataframes of
+            each project and the parametric project data workbooks are not
+            made, so the details dataframe in the result is empty. This is
+            implemented by subclasses.
+
+        result_writer : ProjectResultWriter
+            Optional. The outputs of the projects are handed to it one
+            chunk at a time, in the order of the extended project list. If
+            None, a ProjectResultWriter keeps them in memory.
+
         Returns
         -------
-        OrderedDict or dict, list
-            First element of tuple is an ordered dict that is the result of
-            all the runs. Each key is the name of a project and each value
-            is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets. For the first element, serial
-            processes implement an OrderedDict (because order can be guaranteed)
-            and for the second element processes implement a dict (because
-            order cannot be guaranteed).
+        dict
+            The return value of result_writer.result(). For a
+            ProjectResultWriter, the dataframes of the detail rows, the
+            cost rows and the extended project list of all the projects,
+            under the keys 'details_df', 'module_type_operation_df' and
+            'extended_project_list'.
 
         Raises
         ------
@@ -73,61 +112,341 @@ class XlsxManagerRunner:
         """
         raise NotImplementedError('run_from_project_list_xlsx() can only be called on subclasses')
 
-    def extract_module_type_operation_lists(self, runs_dict):
+    def run_projects(self, project_rows, enable_cost_and_scaling_modifications=False, costs_only=False,
+                     result_writer=None):
+        """
+        Runs the projects in the given rows of an extended project list.
+        run_from_project_list_xlsx() calls this with every row of the
+        project list xlsx. Drivers that decide which projects to run, such
+        as AdaptiveRefinementSweep, call it directly.
+
+        This method is meant to be overriden by subclasses.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        enable_cost_and_scaling_modifications : bool
+            See run_from_project_list_xlsx()
+
+        costs_only : bool
+            See run_from_project_list_xlsx()
+
+        result_writer : ProjectResultWriter
+            See run_from_project_list_xlsx()
+
+        Returns
+        -------
+        dict
+            The same dictionary as run_from_project_list_xlsx(), for the
+            given projects only.
+
+        Raises
+        ------
+        NotImplementedError
+            NotImplementedError is raised if the method is called on the
+            superclass.
+        """
+        raise NotImplementedError('run_projects() can only be called on subclasses')
+
+    @staticmethod
+    def compact_output_dict(output_dict):
+        """
+        Makes a compact copy of the output dictionary of a project, with
+        only the rows that extract_module_type_operation_dataframe() and
+        extract_details_dataframe() use. The intermediate dataframes,
+        cable objects and crane frames of the modules are left behind, so
+        the copy is cheap to pickle back from a worker and to keep until
+        all the projects are done.
+
+        Parameters
+        ----------
+        output_dict : dict
+            The output dictionary of a project.
+
+        Returns
+        -------
+        dict
+            The cost rows of all the modules in one dataframe, under the
+            key 'project_module_type_operation', and the detail rows of all
+            the modules in one block, under the key 'project_csv'. Each key
+            is left out if the project has no such rows.
+        """
+        cost_blocks = []
+        detail_blocks = []
+        for key, value in output_dict.items():
+            if key.endswith('_module_type_operation') and len(value) > 0:
+                cost_blocks.append(value)
+            elif key.endswith('_csv'):
+                detail_blocks.append(value)
+
+        compact = dict()
+        if len(cost_blocks) > 0:
+            compact['project_module_type_operation'] = pd.concat(cost_blocks, ignore_index=True)
+        if len(detail_blocks) > 0:
+            compact['project_csv'] = DetailCollector.concat(detail_blocks)
+        return compact
+
+    def write_outputs(self, result_writer, runs_dict, extended_project_list):
+        """
+        Hands the outputs of some projects to a result writer as one
+        chunk.
+
+        Parameters
+        ----------
+        result_writer : ProjectResultWriter
+            The result writer.
+
+        runs_dict : dict
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects, in the order of the extended
+            project list.
+
+        extended_project_list : pandas.DataFrame
+            The rows of the extended project list of the projects.
         """
-        This method extract all the cost_by_module_type_operation lists for
-        output in an Excel file.
+        result_writer.write(
+            self.extract_module_type_operation_dataframe(runs_dict),
+            self.extract_details_dataframe(runs_dict),
+            extended_project_list
+        )
 
-        It finds values for the keys ending in '_module_type_operation'. It
-        then concatenates them
-        together so they can be easily written to a .csv or .xlsx
+    def extract_module_type_operation_dataframe(self, runs_dict):
+        """
+        This method extracts all the cost_by_module_type_operation blocks
+        for output in an Excel or .csv file.
+
+        It finds values for the keys ending in '_module_type_operation'.
+        Each of these is a dataframe of rows for one module of one project.
+        It concatenates them together in one step so they can be easily
+        written to a .csv or .xlsx
 
         Parameters
         ----------
         runs_dict : dict
-            Values are the names of the projects. Keys are the lists of
-            dictionaries that are lines for the .csv
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects.
 
         Returns
         -------
-        list
-            List of dicts to write to the .csv.
+        pd.DataFrame
+            All the cost rows of all the projects, with the columns in
+            COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS.
         """
-        result = []
+        blocks = []
         for project_results in runs_dict.values():
             for key, value in project_results.items():
-                if key.endswith('_module_type_operation'):
-                    result.extend(value)
-        return result
+                if key.endswith('_module_type_operation') and len(value) > 0:
+                    blocks.append(value)
+        if len(blocks) == 0:
+            return pd.DataFrame(columns=COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS)
+        return pd.concat(blocks, ignore_index=True)
 
-    def extract_details_lists(self, runs_dict):
+    def extract_costs_by_module(self, module_type_operation_df):
         """
-        This method extract all .csv lists from the OrderDict of runs to output
-        into an Excel or .csv file.
+        Sums the costs of each project by module.
+
+        Parameters
+        ----------
+        module_type_operation_df : pandas.DataFrame
+            Cost rows, as returned by
+            extract_module_type_operation_dataframe()
 
-        It finds values for the keys ending in '_csv'. It then concatenates them
-        together so they can be easily written to a .csv, .xlsx or other
-        columnar format. (The actual writing is left to other functions.
+        Returns
+        -------
+        pandas.DataFrame
+            One row per Project ID with serial and one column per module,
+            plus a Total column, of costs per project.
+        """
+        costs = module_type_operation_df.pivot_table(
+            index='project_id_with_serial', columns='module', values='cost_per_project', aggfunc='sum', fill_value=0
+        )
+        costs['Total'] = costs.sum(axis=1)
+        return costs
+
+    def read_parametric_project(self, project_id):
+        """
+        Reads the project list and the parametric list with
+        read_project_and_parametric_lists() and keeps the rows of one
+        project, for the drivers that analyze the parametric variations of
+        a single project.
+
+        Parameters
+        ----------
+        project_id : str
+            The Project ID.
+
+        Returns
+        -------
+        pandas.DataFrame, pandas.DataFrame
+            The rows of the project list and of the parametric list with
+            the Project ID.
+
+        Raises
+        ------
+        XlsxOperationException
+            If the project has no rows in the parametric list.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_lists()
+        if parametric_list.empty or not (parametric_list['Project ID'] == project_id).any():
+            raise XlsxOperationException(f'Project ID {project_id} has no rows in the parametric list.')
+        return project_list[project_list['Project ID'] == project_id], \
+            parametric_list[parametric_list['Project ID'] == project_id]
+
+    def run_costs_by_module(self, project_list, parametric_value_list, enable_cost_and_scaling_modifications=False,
+                            costs_only=True):
+        """
+        Joins parametric values to the project list, runs the projects with
+        run_projects() and sums the costs of each project by module with
+        extract_costs_by_module().
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The projects to run.
+
+        parametric_value_list : pandas.DataFrame
+            The parametric values, with a Project ID and a Project ID with
+            serial on each row. See
+            XlsxReader.outer_join_projects_to_parametric_values()
+
+        enable_cost_and_scaling_modifications : bool
+            See run_from_project_list_xlsx()
+
+        costs_only : bool
+            See run_from_project_list_xlsx()
+
+        Returns
+        -------
+        pandas.DataFrame, dict
+            The costs of each row of parametric_value_list, in order and
+            indexed by its Project ID with serial. Projects that failed to
+            run have NaN costs. The dictionary is the one returned by
+            run_projects().
+        """
+        extended_project_list = XlsxReader().outer_join_projects_to_parametric_values(
+            project_list, parametric_value_list)
+        result = self.run_projects(extended_project_list.iterrows(), enable_cost_and_scaling_modifications, costs_only)
+        costs = self.extract_costs_by_module(result['module_type_operation_df'])
+        return costs.reindex(parametric_value_list['Project ID with serial'].tolist()), result
+
+    def extract_module_type_operation_lists(self, runs_dict):
+        """
+        This method extract all the cost_by_module_type_operation rows as
+        a list of dictionaries. This is for legacy consumers that need
+        rows as dictionaries. Everything else should use
+        extract_module_type_operation_dataframe() instead.
 
         Parameters
         ----------
         runs_dict : dict
-            Values are the names of the projects. Keys are the lists of
-            dictionaries that are lines for the .csv
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects.
 
         Returns
         -------
         list
             List of dicts to write to the .csv.
         """
-        runs_for_csv = []
+        return self.extract_module_type_operation_dataframe(runs_dict).to_dict('records')
+
+    def extract_details_dataframe(self, runs_dict):
+        """
+        This method extracts all the details blocks from the runs to output
+        into an Excel or .csv file.
+
+        It finds values for the keys ending in '_csv'. Each of these is a
+        block of detail rows made by a DetailCollector for one module of
+        one project. It concatenates them together in one step so they can
+        be easily written to a .csv, .xlsx or other columnar format. (The
+        actual writing is left to other functions.)
+
+        Parameters
+        ----------
+        runs_dict : dict
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects.
+
+        Returns
+        -------
+        pd.DataFrame
+            All the detail rows of all the projects, with the columns in
+            DetailCollector.columns.
+        """
+        blocks = []
         for project_results in runs_dict.values():
             for key, value in project_results.items():
                 if key.endswith('_csv'):
-                    runs_for_csv.extend(value)
-        return runs_for_csv
+                    blocks.append(value)
+        return DetailCollector.concat(blocks)
 
-    def read_project_and_parametric_list_from_xlsx(self):
+    def extract_details_lists(self, runs_dict):
+        """
+        This method extracts all the detail rows as a list of dictionaries.
+        This is for legacy consumers that need rows as dictionaries.
+        Everything else should use extract_details_dataframe() instead.
+
+        Parameters
+        ----------
+        runs_dict : dict
+            Keys are the names of the projects. Values are the output
+            dictionaries of the projects.
+
+        Returns
+        -------
+        list
+            List of dicts to write to the .csv.
+        """
+        return DetailCollector.to_records(self.extract_details_dataframe(runs_dict))
+
+    def prefetch_project_data(self, project_list):
+        """
+        Loads all the project data .xlsx files referenced by the project
+        list into XlsxDataframeCache before any project runs. The files are
+        parsed concurrently, rather than one at a time as the runner
+        reaches the first project that uses each of them.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list or the project list with the parametric
+            variations. Both reference the same project data files.
+        """
+        project_data_basenames = project_list['Project data file'].dropna().unique()
+        XlsxDataframeCache.prefetch(project_data_basenames)
+        self.warm_up_project_data(project_list)
+
+    def warm_up_project_data(self, project_list):
+        """
+        Prepares the inputs derived from each project data file in the
+        project list, for each labor cost multiplier and construction time
+        the file is used with. See XlsxReader.warm_up_project_data().
+
+        This is called by prefetch_project_data(), before any project runs,
+        so the worker processes of a parallel runner inherit the prepared
+        inputs when they are forked. The time it takes is kept in
+        warm_up_seconds.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list or the project list with the parametric
+            variations.
+        """
+        start_time = time.perf_counter()
+        xlsx_reader = XlsxReader()
+        project_list = project_list.dropna(subset=['Project data file'])
+        for project_data_basename, projects in project_list.groupby('Project data file', sort=False):
+            xlsx_reader.warm_up_project_data(
+                project_data_basename,
+                projects['Labor cost multiplier'].dropna().unique(),
+                projects['Total project construction time (months)'].dropna().unique()
+            )
+        self.warm_up_seconds = time.perf_counter() - start_time
+
+    def read_project_and_parametric_lists(self):
         """
         This method reads both the project and parametric list from the
         project_list xlsx. It returns them as a tuple.
@@ -136,10 +455,9 @@ class XlsxManagerRunner:
         that contain only one sheet, the following actions take place
 
         1. Project list spreadsheet contains one sheet: The only sheet
-        that is present is read as the project list, and a dataframe for
-        parametrics is returned that has all the columns but no rows so
-        it can be used in joins. It doe snot matter what the sheet name
-        is.
+        that is present is read as the project list, and an empty
+        dataframe is returned for the parametrics. It does not matter
+        what the sheet name is.
 
         2. Project list spreadsheet contains two sheets: The sheet named
         "Project list" is assumed to be the project list and the sheet
@@ -149,9 +467,8 @@ class XlsxManagerRunner:
 
         Returns
         -------
-        pandas.DataFrame
-            The enhanced project list that has support for all parametric
-            adjustments for each step.
+        pandas.DataFrame, pandas.DataFrame
+            The project list and the parametric list.
 
         Raises
         ------
@@ -177,6 +494,32 @@ class XlsxManagerRunner:
         else:
             raise KeyError("Project list needs to have a single sheet or sheets named 'Project list' and 'Parametric list'.")
 
+        return project_list, parametric_list
+
+    def read_project_and_parametric_list_from_xlsx(self):
+        """
+        This method reads the project and parametric lists with
+        read_project_and_parametric_lists() and joins them into the
+        extended project list, which has one row for every project and
+        parametric variation.
+
+        For sweeps with many points, iter_extended_project_list_chunks()
+        yields the same rows without making the whole list at once.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The enhanced project list that has support for all parametric
+            adjustments for each step.
+
+        Raises
+        ------
+        KeyError
+            When the spreadsheet contains multiple sheets and one or
+            both of "Project list" or "Parametric list" are undefined.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_lists()
+
         # Instantiate and XlsxReader to assemble master input dictionary
         xlsx_reader = XlsxReader()
 
@@ -186,3 +529,239 @@ class XlsxManagerRunner:
                                                                                  parametric_value_list)
 
         return extended_project_list
+
+    def iter_extended_project_list_chunks(self, project_list, parametric_list, chunk_size=10000):
+        """
+        Yields the extended project list in chunks, in the same order and
+        with the same serial numbers as
+        read_project_and_parametric_list_from_xlsx(). Only one chunk of
+        the parametric grid is in memory at a time.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list. It may be empty.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            The next rows of the extended project list.
+        """
+        xlsx_reader = XlsxReader()
+        yield from xlsx_reader.iter_extended_project_list_chunks(project_list, parametric_list, chunk_size)
+
+    def iter_rows_with_cost_and_scaling_modifications(self, project_rows, chunk_size=10000):
+        """
+        Applies the cost and scaling modifications to rows of an extended
+        project list in chunks, with
+        XlsxReader.apply_cost_and_scaling_modifications_to_extended_project_list(),
+        rather than one row at a time.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        chunk_size : int
+            The maximum number of rows modified at once.
+
+        Yields
+        ------
+        int, pandas.Series
+            The index and the modified project parameters of each row, in
+            the same order.
+        """
+        for chunk in self.iter_project_row_chunks(project_rows, True, chunk_size):
+            yield from chunk.iterrows()
+
+    def iter_project_parameter_records(self, project_rows, enable_cost_and_scaling_modifications=False,
+                                       chunk_size=10000):
+        """
+        Turns rows of an extended project list into compact
+        ProjectParameters records for dispatch to workers. The rows are
+        collected into a ProjectParameterTable for each chunk.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        enable_cost_and_scaling_modifications : bool
+            If True, the cost and scaling modifications are applied to each
+            chunk.
+
+        chunk_size : int
+            The maximum number of rows in each table.
+
+        Yields
+        ------
+        int, ProjectParameters
+            The index and the record of each row, in the same order.
+        """
+        for chunk in self.iter_project_row_chunks(project_rows, enable_cost_and_scaling_modifications, chunk_size):
+            table = ProjectParameterTable(chunk)
+            for position in range(len(table)):
+                record = table.record(position)
+                yield record.name, record
+
+    def iter_project_row_chunks(self, project_rows, enable_cost_and_scaling_modifications=False, chunk_size=10000):
+        """
+        Collects rows of an extended project list into dataframes.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        enable_cost_and_scaling_modifications : bool
+            If True, the cost and scaling modifications are applied to each
+            chunk.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            The next rows, indexed by the index of each row.
+        """
+        xlsx_reader = XlsxReader()
+        project_rows = iter(project_rows)
+        while True:
+            rows = list(islice(project_rows, chunk_size))
+            if len(rows) == 0:
+                return
+            chunk = pd.DataFrame([project_parameters for _, project_parameters in rows])
+            chunk.index = [index for index, _ in rows]
+            if enable_cost_and_scaling_modifications:
+                chunk = xlsx_reader.apply_cost_and_scaling_modifications_to_extended_project_list(chunk)
+            yield chunk
+
+    def iter_project_groups(self, project_rows, window_size=10000):
+        """
+        Groups rows of an extended project list by the project data they
+        have after the parametric modifications and their labor multiplier,
+        so that projects of a group can be sent to a worker in a batch that
+        needs its project data read, modified and sent once and the inputs
+        derived from it prepared once. See
+        XlsxReader.project_data_group_key().
+
+        The rows are read window_size at a time and grouped within each
+        window, so the rows of a long sweep are never all in memory. Each
+        row comes with its position in project_rows, so results can be put
+        back in order after the groups are run out of order.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        window_size : int
+            The number of rows grouped at a time.
+
+        Yields
+        ------
+        list
+            The groups of a window, in the order of their first rows. Each
+            group is a list of tuples of position, index and project
+            parameters, in order.
+        """
+        xlsx_reader = XlsxReader()
+        project_rows = enumerate(project_rows)
+        while True:
+            rows = list(islice(project_rows, window_size))
+            if len(rows) == 0:
+                return
+            groups = dict()
+            for position, (index, project_parameters) in rows:
+                groups.setdefault(xlsx_reader.project_data_group_key(project_parameters), []) \
+                    .append((position, index, project_parameters))
+            yield list(groups.values())
+
+    def iter_extended_project_list_rows(self, project_list, parametric_list, chunk_size=10000):
+        """
+        Yields the rows of the extended project list one at a time, like
+        DataFrame.iterrows(), from the chunks yielded by
+        iter_extended_project_list_chunks()
+
+        If this runner has a shard, only the rows of the shard are yielded.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list. It may be empty.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        Yields
+        ------
+        int, pandas.Series
+            The position of the row in the extended project list and the
+            project parameters in the row.
+
+        Raises
+        ------
+        XlsxOperationException
+            If this runner has a shard and the parametric list has a
+            sampling design without a seed. See check_shardable().
+        """
+        if self.shard is not None:
+            self.check_shardable(parametric_list)
+        for chunk in self.iter_extended_project_list_chunks(project_list, parametric_list, chunk_size):
+            if self.shard is not None:
+                shard_index, shard_count = self.shard
+                chunk = chunk[chunk.index % shard_count == shard_index]
+            yield from chunk.iterrows()
+
+    @staticmethod
+    def check_shardable(parametric_list):
+        """
+        Checks that every shard of a sweep of the parametric list computes
+        the same extended project list. Each shard computes the points of
+        the sampling designs itself, so a Latin hypercube, Sobol or Halton
+        design without a Seed would have different points on each shard.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The parametric list. It may be empty.
+
+        Raises
+        ------
+        XlsxOperationException
+            If a Project ID has a sampling design without a seed.
+        """
+        if parametric_list.empty:
+            return
+        for project_id, group in parametric_list.groupby('Project ID'):
+            design = SamplingDesign.design_name(group)
+            if design != 'grid' and SamplingDesign.single_value(group, 'Seed') is None:
+                raise XlsxOperationException(
+                    f'Project ID {project_id} has a {design} design without a Seed. '
+                    f'It needs a Seed to run in shards, so that every shard samples the same points.'
+                )
+
+    def extended_project_count(self):
+        """
+        Returns
+        -------
+        int
+            The number of rows of the whole extended project list, in all
+            the shards.
+        """
+        project_list, parametric_list = self.read_project_and_parametric_lists()
+        return XlsxReader().extended_project_count(project_list, parametric_list)
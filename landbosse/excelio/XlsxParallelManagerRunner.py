@@ -1,23 +1,76 @@
+import multiprocessing
 import os
+import time
 from concurrent import futures
 
+import numpy as np
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxGenerator import XlsxGenerator
+from .ProjectParameterTable import ProjectParameterTable
+from .ProjectCostPredictor import ProjectCostPredictor
+from .ProjectResultWriter import ProjectResultWriter
 
 
 class XlsxParallelManagerRunner(XlsxManagerRunner):
     """
     This subclass implementation of XlsxManagerRunner runs all projects
     with a ProcessPoolExecutor.
+
+    Projects are sent to the workers in batches that share their project
+    data, largest predicted cost first, so that the last batches to finish
+    are small and the workers stay busy until the end. See
+    plan_batches().
     """
 
-    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
+    # The number of batches, for each worker process, that may wait in the
+    # executor at a time.
+    max_pending_tasks_per_worker = 4
+
+    # The maximum number of projects with the same project data that are
+    # sent to a worker in one batch.
+    max_projects_per_batch = 16
+
+    # The share of the remaining predicted cost, divided among the workers,
+    # that a batch may hold. See plan_batches().
+    batch_cost_fraction = 0.5
+
+    # The start method of the worker processes. Forked workers inherit the
+    # project data and the inputs prepared by prefetch_project_data(), so
+    # they are not sent with each batch. Where fork is not available, or if
+    # this is None, the default start method of the platform is used.
+    start_method = 'fork'
+
+    def __init__(self, file_ops=None, shard=None):
+        """
+        Parameters
+        ----------
+        file_ops : XlsxFileOperations
+            See XlsxManagerRunner
+
+        shard : tuple
+            See XlsxManagerRunner
+        """
+        super().__init__(file_ops, shard)
+
+        # The predictor learns from the timings of every project this runner
+        # runs.
+        self.cost_predictor = ProjectCostPredictor()
+
+        # The startup time and first batch latency of each worker process
+        # of the last call to run_projects(). See report_worker_timings().
+        self.worker_timings = []
+
+        # The time each batch of the last call to run_projects() took to
+        # prepare the inputs its projects share. See run_project_batch().
+        self.batch_setup_seconds = []
+
+    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False, costs_only=False,
+                                   result_writer=None):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
         the OrderedDict that holds the results of all the runs. See the return
@@ -39,154 +92,472 @@ class XlsxParallelManagerRunner(XlsxManagerRunner):
             modified by the parameters for to scale certain input values based
             on what has been parametrically modified.
 
+        costs_only : bool
+            If True, only the costs_by_module_type_operation outputs are
+            calculated. The details outputs, the intermediate dataframes of
+            each project and the parametric project data workbooks are not
+            made, so the details dataframe in the result is empty.
+
+        result_writer : ProjectResultWriter
+            Optional. The outputs of the projects are handed to it one
+            window of iter_project_groups() at a time. If None, a
+            ProjectResultWriter keeps them in memory.
+
         Returns
         -------
-        dict, list, module_type_operation_lists
-            First element of tuple is a dict that is the result of
-            all the runs. Each key is the name of a project and each value
-            is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets.
+        dict
+            The return value of result_writer.result(). See
+            XlsxManagerRunner.run_from_project_list_xlsx()
         """
         # Load the project list
         print('Calculating parametric values')
-        extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
+        project_list, parametric_list = self.read_project_and_parametric_lists()
+
+        # Parse all the project data files the projects need at once
+        self.prefetch_project_data(project_list)
 
-        # Prepare the file operations
-        file_ops = XlsxFileOperations()
+        # Run every project
+        project_rows = self.iter_extended_project_list_rows(project_list, parametric_list)
+        return self.run_projects(project_rows, enable_cost_and_scaling_modifications, costs_only, result_writer)
+
+    def run_projects(self, project_rows, enable_cost_and_scaling_modifications=False, costs_only=False,
+                     result_writer=None):
+        """
+        Runs the projects in the rows of an extended project list with a
+        ProcessPoolExecutor. This is a concrete implementation of the super
+        class method.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        enable_cost_and_scaling_modifications : bool
+            See run_from_project_list_xlsx()
+
+        costs_only : bool
+            See run_from_project_list_xlsx()
+
+        result_writer : ProjectResultWriter
+            See run_from_project_list_xlsx()
+
+        Returns
+        -------
+        dict
+            See run_from_project_list_xlsx()
+        """
+        if result_writer is None:
+            result_writer = ProjectResultWriter()
 
         # Instantiate an XlsxReader to handle the parametrics and master input
         # dictionaries
         xlsx_reader = XlsxReader()
 
-        # Get a list ready to hold the project parameters after they have been modified
-        # After all rows have been added to this list (each row is a series) then the
-        # whole list will be transformed into a dataframe.
-        #
-        # See notes at https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.append.html
-        # for why this is more performant than appending to a dataframe.
-        extended_project_list_after_parameter_modifications = []
-
-        # Prep all task for the executor
-        all_tasks = []
-        print(f'Found {len(extended_project_list_before_parameter_modifications)} projects for execution')
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
-
-            # If project_parameters['Project ID with serial'] is null, that means there are no
-            # parametric modifications to the project data dataframes. Hence,
-            # just the plain Project ID without a serial number should be used.
-            if pd.isnull(project_parameters['Project ID with serial']):
-                project_id_with_serial = project_parameters['Project ID']
-            else:
-                project_id_with_serial = project_parameters['Project ID with serial']
-
-            print(f'Preparing {project_id_with_serial}')
-
-            project_data_basename = project_parameters['Project data file']
-            task = dict()
-
-            task['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
-
-            # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(task['project_data_sheets'], project_parameters)
-
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
-
-            # Append the modified project parameters
-            extended_project_list_after_parameter_modifications.append(project_parameters)
-
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(task['project_data_sheets'], parametric_project_data_path)
-
-            task['project_data_basename'] = project_data_basename
-            task['project_id_with_serial'] = project_id_with_serial
-            task['project_series'] = project_parameters
-            all_tasks.append(task)
-
-        # Execute every project
-        with futures.ProcessPoolExecutor() as executor:
-            executor_result = executor.map(run_single_project, all_tasks)
-
-        # Get the output dictionary ready
-        runs_dict = {project_id_with_serial: result for project_id_with_serial, result in executor_result}
-
-        # Assemble the dictionary with content for the details, details with inputs,
-        #  cost_by_module_type_operation and cost_by_module_type_operation_with_input tabs
-        final_result = dict()
-        final_result['details_list'] = self.extract_details_lists(runs_dict)
-        final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
-        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        # The rows are sent to the workers as compact ProjectParameters
+        # records rather than Series. The cost and scaling modifications are
+        # applied to the rows in chunks before they are dispatched, if needed.
+        project_rows = self.iter_project_parameter_records(project_rows, enable_cost_and_scaling_modifications)
+
+        # The outputs are handed to the result writer one window at a time,
+        # in order. The batches of a window finish out of order, and the
+        # batches of the next windows may start before it is done, so each
+        # window keeps the outputs and the modified project parameters of
+        # its projects, with their positions, until all of them are done.
+        windows = []
+        project_windows = dict()
+
+        # The features of each running project, to record its timing
+        project_features = dict()
+
+        def write_finished_windows():
+            while len(windows) > 0 and windows[0]['finished_count'] == windows[0]['project_count']:
+                window = windows.pop(0)
+                positions = window['positions']
+                runs_dict = dict(sorted(window['runs_dict'].items(), key=lambda item: positions[item[0]]))
+                extended_project_list_after_parameter_modifications = [
+                    project_parameters for _, project_parameters in
+                    sorted(window['extended_project_list'], key=lambda item: item[0])
+                ]
+                self.write_outputs(result_writer, runs_dict, ProjectParameterTable.records_to_dataframe(
+                    extended_project_list_after_parameter_modifications))
+
+        # The time the first batch was submitted, when the executor starts
+        # the worker processes
+        self.worker_timings = []
+        self.batch_setup_seconds = []
+        first_submit_time = None
+
+        def collect(finished_batch):
+            results, setup_seconds, worker_timing = finished_batch.result()
+            self.batch_setup_seconds.append(setup_seconds)
+            for project_id_with_serial, output_dict, seconds in results:
+                window = project_windows[project_id_with_serial].pop(0)
+                window['runs_dict'][project_id_with_serial] = output_dict
+                window['finished_count'] += 1
+                self.cost_predictor.record(project_features.pop(project_id_with_serial), seconds)
+            if worker_timing is not None:
+                worker_timing['startup_seconds'] = worker_timing.pop('ready_time') - first_submit_time
+                self.worker_timings.append(worker_timing)
+            write_finished_windows()
+
+        # The parametric variations are generated in windows. The batches of
+        # a window are planned, then submitted to the executor as they are
+        # prepared. At most max_pending_batches batches are waiting at a
+        # time, so the batches and their project data are never all in
+        # memory together. Batches are collected as they finish.
+        worker_count = os.cpu_count() or 1
+        mp_context = self.worker_context()
+        inherits_project_data = mp_context.get_start_method() == 'fork'
+        with futures.ProcessPoolExecutor(max_workers=worker_count, mp_context=mp_context,
+                                         initializer=start_worker) as executor:
+            max_pending_batches = self.max_pending_tasks_per_worker * worker_count
+            pending_batches = set()
+            task_count = 0
+
+            for groups in self.iter_project_groups(project_rows):
+                window = dict()
+                window['project_count'] = sum(len(group) for group in groups)
+                window['finished_count'] = 0
+                window['runs_dict'] = dict()
+                window['positions'] = dict()
+                window['extended_project_list'] = []
+                windows.append(window)
+
+                for predicted_cost, batch_rows in self.plan_batches(groups, worker_count):
+                    batch = dict()
+                    batch['projects'] = []
+                    batch['project_data_sheets'] = None
+
+                    for position, _, project_parameters, features in batch_rows:
+
+                        # If project_parameters['Project ID with serial'] is null, that means there are no
+                        # parametric modifications to the project data dataframes. Hence,
+                        # just the plain Project ID without a serial number should be used.
+                        if pd.isnull(project_parameters['Project ID with serial']):
+                            project_id_with_serial = project_parameters['Project ID']
+                        else:
+                            project_id_with_serial = project_parameters['Project ID with serial']
+
+                        print(f'Preparing {project_id_with_serial}')
+
+                        # Load the sheets the workers need here, once per batch,
+                        # so that they are sent with the batch rather than parsed
+                        # again by each worker.
+                        project_data_basename = project_parameters['Project data file']
+                        if batch['project_data_sheets'] is None:
+                            batch['project_data_sheets'] = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+
+                        # Transform the dataframes so that they have the right values for
+                        # the parametric variables. The projects of a batch write the
+                        # same values to the project data, so for all but the first
+                        # this only modifies the project parameters. The project list
+                        # values were already applied, before the cost and scaling
+                        # modifications, if those are enabled. Forked workers read
+                        # the sheets from the XlsxDataframeCache they inherit and
+                        # modify them themselves, so only the project parameters
+                        # are modified here.
+                        xlsx_reader.modify_project_data_and_project_list(
+                            batch['project_data_sheets'], project_parameters,
+                            apply_project_list=not enable_cost_and_scaling_modifications,
+                            apply_project_data=not inherits_project_data)
+
+                        # Append the modified project parameters
+                        window['extended_project_list'].append((position, project_parameters))
+
+                        # Write all project_data sheets, unless only costs are output.
+                        # Forked workers write them after they modify the sheets.
+                        if not costs_only and not inherits_project_data:
+                            parametric_project_data_path = \
+                                os.path.join(self.file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+                            XlsxGenerator.write_project_data(batch['project_data_sheets'], parametric_project_data_path)
+
+                        batch['projects'].append((project_id_with_serial, project_parameters))
+                        window['positions'][project_id_with_serial] = position
+                        project_windows.setdefault(project_id_with_serial, []).append(window)
+                        project_features[project_id_with_serial] = features
+
+                    # Forked workers are not sent the sheets. They are told
+                    # where to write the project data instead.
+                    batch['parametric_project_data_path'] = None
+                    if inherits_project_data:
+                        batch['project_data_sheets'] = None
+                        if not costs_only:
+                            batch['parametric_project_data_path'] = self.file_ops.parametric_project_data_output_path()
+
+                    batch['project_data_basename'] = project_data_basename
+                    batch['costs_only'] = costs_only
+                    batch['keep_intermediate_outputs'] = self.keep_intermediate_outputs
+
+                    # Execute the batch, after waiting for any pending batch to
+                    # finish if too many are waiting.
+                    if len(pending_batches) >= max_pending_batches:
+                        finished_batches, pending_batches = \
+                            futures.wait(pending_batches, return_when=futures.FIRST_COMPLETED)
+                        for finished_batch in finished_batches:
+                            collect(finished_batch)
+                    batch['submit_time'] = time.time()
+                    if first_submit_time is None:
+                        first_submit_time = batch['submit_time']
+                    pending_batches.add(executor.submit(run_project_batch, batch))
+                    task_count += len(batch['projects'])
+
+            print(f'Submitted {task_count} projects for execution')
+
+            # Collect the remaining batches
+            for finished_batch in futures.as_completed(pending_batches):
+                collect(finished_batch)
+
+        self.report_worker_timings(mp_context.get_start_method())
 
         # Return the runs for all the scenarios.
-        return final_result
+        return result_writer.result()
+
+
+    def worker_context(self):
+        """
+        Returns
+        -------
+        multiprocessing.context.BaseContext
+            The context that starts the worker processes with start_method,
+            or the default context if start_method is None or not
+            available on this platform.
+        """
+        if self.start_method is not None and self.start_method in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context(self.start_method)
+        return multiprocessing.get_context()
+
+    def report_worker_timings(self, start_method):
+        """
+        Prints how long the worker processes of the last call to
+        run_projects() took to start, from the submission of the first
+        batch until they were ready, and how long their first batches
+        waited from submission until they began. It also prints how long
+        the batches took to prepare the inputs their projects share and, if
+        the project data was warmed up before, see warm_up_project_data(),
+        how long that took.
+
+        Parameters
+        ----------
+        start_method : str
+            The start method of the worker processes.
+        """
+        if self.warm_up_seconds is not None:
+            print(f'Warmed up the project data in {self.warm_up_seconds:.2f} s')
+        if len(self.batch_setup_seconds) > 0:
+            setup_seconds = np.array(self.batch_setup_seconds)
+            print(f'Set up {len(setup_seconds)} batches: mean {setup_seconds.mean():.3f} s, '
+                  f'total {setup_seconds.sum():.3f} s')
+        if len(self.worker_timings) == 0:
+            return
+        startup_seconds = np.array([timing['startup_seconds'] for timing in self.worker_timings])
+        latency_seconds = np.array([timing['first_batch_latency_seconds'] for timing in self.worker_timings])
+        print(f'Started {len(self.worker_timings)} workers with {start_method}: '
+              f'startup mean {startup_seconds.mean():.3f} s, max {startup_seconds.max():.3f} s; '
+              f'first batch latency mean {latency_seconds.mean():.3f} s, max {latency_seconds.max():.3f} s')
+
+    def plan_batches(self, groups, worker_count):
+        """
+        Splits groups of projects that share their project data into
+        batches, and orders the batches by their predicted cost, largest
+        first.
+
+        The groups are taken in order of their predicted cost, largest
+        first, and each batch is filled until its predicted cost reaches
+        batch_cost_fraction of the predicted cost not yet planned, divided
+        by the number of workers, or it has max_projects_per_batch
+        projects. So batches start large and shrink as the plan goes on,
+        and the last batches to run, while the workers run out of work, are
+        the smallest.
+
+        Parameters
+        ----------
+        groups : list
+            The groups of a window, as yielded by iter_project_groups().
+
+        worker_count : int
+            The number of worker processes.
+
+        Returns
+        -------
+        list
+            Tuples of the predicted cost of a batch, in seconds, and the
+            tuples of position, index, project parameters and features (see
+            ProjectCostPredictor) of its projects.
+        """
+        costed_groups = []
+        for group in groups:
+            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(group[0][2]['Project data file'])
+            features = np.array([
+                ProjectCostPredictor.features(project_parameters, project_data_sheets)
+                for _, _, project_parameters in group
+            ])
+            costed_groups.append((group, features, self.cost_predictor.predict(features)))
+        costed_groups.sort(key=lambda costed_group: costed_group[2].sum(), reverse=True)
+
+        remaining_cost = sum(costs.sum() for _, _, costs in costed_groups)
+        batches = []
+        for group, features, costs in costed_groups:
+            batch_rows = []
+            batch_cost = 0.0
+            target_cost = self.batch_cost_fraction * remaining_cost / worker_count
+            for row, row_features, cost in zip(group, features, costs):
+                batch_rows.append((*row, row_features))
+                batch_cost += cost
+                if batch_cost >= target_cost or len(batch_rows) == self.max_projects_per_batch:
+                    batches.append((batch_cost, batch_rows))
+                    remaining_cost -= batch_cost
+                    target_cost = self.batch_cost_fraction * remaining_cost / worker_count
+                    batch_rows = []
+                    batch_cost = 0.0
+            if len(batch_rows) > 0:
+                batches.append((batch_cost, batch_rows))
+                remaining_cost -= batch_cost
+
+        # The sort is stable, so batches of equal cost keep their order.
+        batches.sort(key=lambda batch: batch[0], reverse=True)
+        return batches
 
 
 """
-The following function is deliberately defined outside of the class.
-This makes it easier to think about it being a pure function for
+The following functions are deliberately defined outside of the class.
+This makes it easier to think about them being pure functions for
 parallel processes.
 """
 
+# The timing of this worker process, set by start_worker() and returned
+# with the first batch the worker runs
+_worker_timing = None
+
+
+def start_worker():
+    """
+    Initializes a worker process of XlsxParallelManagerRunner. It records
+    when the worker was ready, after the process started and, for workers
+    that are not forked, imported the modules.
+    """
+    global _worker_timing
+    _worker_timing = {'pid': os.getpid(), 'ready_time': time.time(), 'first_batch_latency_seconds': None}
+
+
 
-def run_single_project(task_dict):
+def run_project_batch(batch_dict):
     """
-    The dictionary project_definition_dict contains the following keys.
+    The dictionary batch_dict contains the following keys.
 
-    For each process another logger is created, so that each process does
-    not attempt to use the same logger.
+    project_data_basename : str
+        The name of the project data file of the projects.
 
-    input_xlsx : str
-        The filename for the input .xlsx that has all the dataframes
-        for the for ErectionCost and FoundationCost
+    project_data_sheets : CopyOnWriteSheets
+        The sheets of the project data, with the parametric modifications
+        that all the projects of the batch share. None if the worker was
+        forked, in which case the sheets are read from the inherited
+        XlsxDataframeCache and modified here.
 
-    project_series : pd.Series
-        The series that has the non-dataframe values for each project,
-        including the project name.
+    parametric_project_data_path : str
+        The folder where the worker writes the project data of each
+        project, after it modifies the sheets. None if the sheets were sent
+        with the batch, in which case the parent wrote them, or if only
+        costs are output.
 
-    project_id : str
-        The string that is the name of the project.
+    submit_time : float
+        The time.time() when the batch was submitted.
+
+    projects : list
+        Tuples of the project ID with serial and the ProjectParameters
+        record of each project. See ProjectParameterTable.
+
+    costs_only : bool
+        True if only the costs_by_module_type_operation outputs should be
+        calculated.
+
+    keep_intermediate_outputs : bool
+        True if the whole output dictionaries should be returned. Otherwise
+        only the compact rows made by
+        XlsxManagerRunner.compact_output_dict() are returned.
 
     Basically, the map operation goes like this:
 
-    task_dict -> master_input_dict -> master_output_dict
+    batch_dict -> master_input_dicts -> master_output_dicts
 
-    Wrapped in a functional executor, this maps projects into their
-    output dictionaries.
+    The inputs derived from the project data, like the labor multiplied
+    rates, the views of the ProjectDataIndex and the extended weather
+    windows, are prepared once for the batch, before any of its projects
+    run, and shared by the master input dictionaries of its projects.
+    Wrapped in a functional executor, this maps batches of projects into
+    their output dictionaries.
 
     Parameters
     ----------
-    task_dict : dict
-        The configuration of the task.
+    batch_dict : dict
+        The configuration of the batch.
 
     Returns
     -------
-    tuple : (str, dict)
-        The str is the project_id. The dict is the resulting output
-        dictionary.
+    list, float, dict
+        The list has tuples of the project ID with serial, the resulting
+        output dictionary, or its compact form, and the time in seconds the
+        project took to run, of each project in order. The float is the
+        time in seconds the batch took to read, modify and write the
+        project data and prepare the inputs its projects share, which is
+        not part of the time of any project. The dict is the
+        timing of the worker process, with its pid, the time.time() when it
+        was ready and the latency of this batch, for the first batch the
+        worker runs, and None for the others.
     """
-    project_data_basename = task_dict['project_data_basename']
-    project_series = task_dict['project_series']
-    project_id_with_serial = task_dict['project_id_with_serial']
-    project_data_sheets = task_dict['project_data_sheets']
-
-    # Log each project. Use print because it works better for multiple processes.
-    print(f'Start {project_id_with_serial}, project data in {project_data_basename}')
-
-    # Read the Excel
+    global _worker_timing
+    worker_timing = None
+    if _worker_timing is not None:
+        worker_timing = _worker_timing
+        worker_timing['first_batch_latency_seconds'] = time.time() - batch_dict['submit_time']
+        _worker_timing = None
+
+    project_data_basename = batch_dict['project_data_basename']
+    project_data_sheets = batch_dict['project_data_sheets']
+    shared_inputs = dict()
+    results = []
+
+    setup_start_time = time.perf_counter()
     xlsx_reader = XlsxReader()
-    master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_series)
-
-    # Now run the manager and accumulate its result into the runs_dict
-    output_dict = dict()
-    output_dict['project_series'] = project_series
-    mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
-    mc.execute_landbosse(project_name=project_id_with_serial)
-
-    print(f'End {project_id_with_serial}')
-
-    return project_id_with_serial, output_dict
+    if project_data_sheets is None:
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+        # The parent already modified the project parameters.
+        xlsx_reader.modify_project_data_and_project_list(
+            project_data_sheets, batch_dict['projects'][0][1], apply_project_list=False)
+
+    # Write all project_data sheets, if the parent did not.
+    parametric_project_data_path = batch_dict.get('parametric_project_data_path')
+    if parametric_project_data_path is not None:
+        for project_id_with_serial, _ in batch_dict['projects']:
+            XlsxGenerator.write_project_data(
+                project_data_sheets,
+                os.path.join(parametric_project_data_path, f'{project_id_with_serial}_project_data.xlsx'))
+
+    # Prepare the inputs the projects share before timing them.
+    for _, project_parameters in batch_dict['projects']:
+        xlsx_reader.prepare_shared_inputs(project_data_sheets, project_parameters, shared_inputs)
+    xlsx_reader.warm_up_project_data_index(shared_inputs['project_data_index'])
+    setup_seconds = time.perf_counter() - setup_start_time
+
+    for project_id_with_serial, project_parameters in batch_dict['projects']:
+        # Log each project. Use print because it works better for multiple processes.
+        print(f'Start {project_id_with_serial}, project data in {project_data_basename}')
+        start_time = time.perf_counter()
+
+        master_input_dict = xlsx_reader.create_master_input_dictionary(
+            project_data_sheets, project_parameters, shared_inputs)
+        master_input_dict['costs_only'] = batch_dict.get('costs_only', False)
+
+        # Now run the manager and accumulate its result into the runs_dict
+        # The parent keeps the project parameters, so they are not sent back.
+        output_dict = dict()
+        mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
+        mc.execute_landbosse(project_name=project_id_with_serial)
+
+        print(f'End {project_id_with_serial}')
+
+        if not batch_dict.get('keep_intermediate_outputs', False):
+            output_dict = XlsxManagerRunner.compact_output_dict(output_dict)
+        results.append((project_id_with_serial, output_dict, time.perf_counter() - start_time))
+
+    return results, setup_seconds, worker_timing
@@ -1,13 +1,15 @@
-import re
+from collections import OrderedDict
 
 import pandas as pd
 import numpy as np
-from math import ceil
 
-from .XlsxOperationException import XlsxOperationException
 from .WeatherWindowCSVReader import read_weather_window, extend_weather_window
-from ..model import DefaultMasterInputDict
+from ..model import DefaultMasterInputDict, ProjectDataIndex
 from .GridSearchTree import GridSearchTree
+from .SamplingDesign import SamplingDesign
+from .CopyOnWriteSheets import CopyOnWriteSheets
+from .ParametricOverridePlan import ParametricOverridePlan
+from .XlsxDataframeCache import XlsxDataframeCache
 
 
 class XlsxReader:
@@ -58,6 +60,40 @@ class XlsxReader:
     possible.
     """
 
+    # _labor_multiplier_cache is a class attribute that holds the crew_price
+    # and rsmeans dataframes after the labor multiplier is applied. Keys are
+    # tuples of the sheet name, the identity or fingerprint of the sheet
+    # before the multiplier is applied and the multiplier.
+    _labor_multiplier_cache = OrderedDict()
+    _max_labor_multiplier_cache = 256
+
+    # _override_plans is a class attribute that holds the
+    # ParametricOverridePlans made by parametric_override_plan(). Keys are
+    # tuples of the id of the shared project data sheets and the names of
+    # the cell specifications. _cell_spec_names maps tuples of project
+    # parameter names to the names among them that are cell specifications.
+    _override_plans = OrderedDict()
+    _max_override_plans = 256
+    _cell_spec_names = dict()
+
+    # _weather_windows is a class attribute that holds the weather windows
+    # read from the weather_window sheets that are still shared by a
+    # CopyOnWriteSheets. Keys are tuples of the id of the sheet and the
+    # number of months of construction the window is extended to, or None
+    # for the window before it is extended.
+    _weather_windows = OrderedDict()
+    _max_weather_windows = 64
+
+    # The modules whose rows of rsmeans warm_up_project_data_index() selects
+    warm_up_rsmeans_modules = [
+        'Collection',
+        'Small DW Collection',
+        'Foundations',
+        'Small DW Foundations',
+        'Roads',
+        'Small DW Roads'
+    ]
+
     def create_parametric_value_list(self, parametric_list):
         """
         Assuming we have a "Parametric list" sheet/dataframe like the following
@@ -95,6 +131,12 @@ class XlsxReader:
         sorted alphabetically, they will end up in the same order as numeric
         sorting.
 
+        The example above is a full factorial grid. A project can instead
+        have a fixed number of points from a Latin hypercube, Sobol or
+        Halton design with the optional Design, Sample count and Seed
+        columns. See SamplingDesign. The rows of those points have the same
+        format as above.
+
         Parameters
         ----------
         parametric_list : pandas.DataFrame
@@ -116,55 +158,137 @@ class XlsxReader:
                 }
             ])
 
-        all_parametric_value_rows = []
-
-        # Group all the projects by their ID and iterate over each group
-        group_by_project = parametric_list.groupby('Project ID')
-        for name, group in group_by_project:
-
-            # For each group/project ID, build a new grid search tree
-            grid_search_tree = GridSearchTree(group)
-            grid = grid_search_tree.build_grid_tree_and_return_grid()
-
-            # After the tree is built, make new rows that have individual
-            # parametric values.
-            #
-            # A grid_point is set of cell specifications and their values.
-            # given our example above, a grid point would be a list of
-            # dictionaries about dataframe cells to modify.
-            #
-            # Grid point 0: alpha/fizz/buzz = 0, beta/foo/bar = 0
-            # Grid point 1: alpha/fizz/buzz = 0, beta/foo/bar = 6
-            # etc
-            parametric_value_rows = []
-            for grid_point in grid:
-                parametric_value_row = dict()
-                for axis in grid_point:
-                    parametric_value_row[axis['cell_specification']] = axis['value']
-                parametric_value_rows.append(parametric_value_row)
-
-            # Assign the project ID to each row. Because of the grouping,
-            # tha name is the same as the project ID.
-            for parametric_value_row in parametric_value_rows:
-                parametric_value_row['Project ID'] = name
-
-            # Add all these new rows into the master list before
-            # iterating again.
-            all_parametric_value_rows.extend(parametric_value_rows)
-
-        # Create project names with serial numbers for each row
-        for index, parametric_value_row in enumerate(all_parametric_value_rows):
-            project_id = parametric_value_row['Project ID']
-            serial = self.create_serial_number(project_id, index, len(all_parametric_value_rows))
-            parametric_value_row['Project ID with serial'] = serial
-
-        # Make a dataframe out of the list of dictionaries. This will
-        # add NaN where appropriate
-
-        result = pd.DataFrame(all_parametric_value_rows)
-
+        # Make a dataframe out of the chunks. This will add NaN where
+        # appropriate
+        chunks = list(self.iter_parametric_value_chunks(parametric_list))
+        if len(chunks) == 0:
+            return pd.DataFrame()
+        result = pd.concat(chunks, ignore_index=True, sort=False)
         return result
 
+    def iter_parametric_value_chunks(self, parametric_list, chunk_size=10000, project_id=None):
+        """
+        Yields the rows of the dataframe returned by
+        create_parametric_value_list() in chunks, without making the whole
+        dataframe. The rows are in the same order and have the same serial
+        numbers. Each chunk has the rows of a single Project ID.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The parametric list. It must not be empty.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        project_id : str
+            Optional. If given, only the rows of this Project ID are
+            yielded. Their serial numbers are the same as when all rows
+            are yielded.
+
+        Yields
+        ------
+        pandas.DataFrame
+            A chunk of rows, with a column for each cell specification of
+            the project, then the "Project ID" and "Project ID with serial"
+            columns.
+        """
+        grids, digit_count = self.parametric_grids(parametric_list)
+        for name, grid, offset in grids:
+            if project_id is None or name == project_id:
+                for chunk in self.iter_grid_value_chunks(name, grid, offset, digit_count, chunk_size):
+                    yield chunk
+
+    def parametric_grids(self, parametric_list):
+        """
+        Makes the grid of each Project ID in the parametric list.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The parametric list.
+
+        Returns
+        -------
+        list, int
+            A list of tuples of the Project ID, its GridSearchTree or
+            SamplingDesign and the
+            serial number of its first point, in the order of the rows of
+            create_parametric_value_list(). Second, the number of digits
+            of the serial numbers.
+        """
+        # Group all the projects by their ID. Each group/project ID has its
+        # own grid.
+        grids = []
+        offset = 0
+        for name, group in parametric_list.groupby('Project ID'):
+            grid = self.parametric_design(group)
+            grids.append((name, grid, offset))
+            offset += grid.point_count()
+
+        # Serial numbers run across all projects, so the total is needed
+        # before the first chunk.
+        digit_count = self.serial_digit_count(offset)
+        return grids, digit_count
+
+    def parametric_design(self, parametric_list):
+        """
+        Makes the object that computes the points of one Project ID. This is
+        a GridSearchTree for a full factorial grid, which is the default, or
+        a SamplingDesign for a Latin hypercube, Sobol or Halton design, as
+        chosen by the Design column of the parametric list.
+
+        Parameters
+        ----------
+        parametric_list : pandas.DataFrame
+            The rows of the parametric list of a single Project ID.
+
+        Returns
+        -------
+        GridSearchTree or SamplingDesign
+            The design of the Project ID.
+        """
+        if SamplingDesign.design_name(parametric_list) == 'grid':
+            return GridSearchTree(parametric_list)
+        return SamplingDesign(parametric_list)
+
+    def iter_grid_value_chunks(self, project_id, grid, offset, digit_count, chunk_size):
+        """
+        Yields the rows of create_parametric_value_list() for one Project ID
+        in chunks.
+
+        Parameters
+        ----------
+        project_id : str
+            The Project ID.
+
+        grid : GridSearchTree or SamplingDesign
+            The grid of the Project ID.
+
+        offset : int
+            The serial number of the first point of the grid.
+
+        digit_count : int
+            The number of digits of the serial numbers.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            A chunk of rows.
+        """
+        for start, chunk in grid.iter_grid_chunks(chunk_size):
+            point_count = len(next(iter(chunk.values())))
+            chunk['Project ID'] = [project_id] * point_count
+            first_index = offset + start
+            chunk['Project ID with serial'] = [
+                f'{project_id}_{str(index).zfill(digit_count)}'
+                for index in range(first_index, first_index + point_count)
+            ]
+            yield pd.DataFrame(chunk)
+
     def outer_join_projects_to_parametric_values(self, project_list, parametric_value_list):
         """
         Consider the dataframe we made in create_parametric_value_list.
@@ -235,19 +359,116 @@ class XlsxReader:
         result = project_list.merge(right=parametric_value_list, how='left', on='Project ID')
         return result
 
-    def modify_project_data_and_project_list(self, project_data_dataframes, project_parameters):
+    def iter_extended_project_list_chunks(self, project_list, parametric_list, chunk_size=10000):
+        """
+        Yields the extended project list in chunks. The chunks, put
+        together, are the same as the dataframe returned by
+        outer_join_projects_to_parametric_values() for the values of
+        create_parametric_value_list(): the same rows in the same order,
+        with the same index, columns, dtypes and serial numbers. But the
+        whole extended project list is never made, so parametric sweeps
+        with millions of points can be streamed.
+
+        To find the columns and dtypes, a small extended project list is
+        made with only the first point of each project's grid.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list. It may be empty.
+
+        chunk_size : int
+            The maximum number of rows in each chunk.
+
+        Yields
+        ------
+        pandas.DataFrame
+            A chunk of the extended project list.
+        """
+        grids, digit_count = self.parametric_grids(parametric_list) if not parametric_list.empty else ([], 1)
+
+        # Without any points, the extended project list is small.
+        if all(grid.point_count() == 0 for _, grid, _ in grids):
+            yield self.outer_join_projects_to_parametric_values(
+                project_list, self.create_parametric_value_list(parametric_list))
+            return
+
+        grids_by_project_id = {name: (grid, offset) for name, grid, offset in grids}
+
+        # A skeleton with one point per project has the same columns and
+        # dtypes as the whole extended project list.
+        skeleton_parametric_list = pd.concat([
+            next(self.iter_grid_value_chunks(name, grid, offset, digit_count, chunk_size=1))
+            for name, grid, offset in grids
+            if grid.point_count() > 0
+        ], ignore_index=True, sort=False)
+        skeleton = self.outer_join_projects_to_parametric_values(project_list, skeleton_parametric_list)
+
+        # Like the left join, each row of the project list is followed by
+        # the points of its grid, or stands alone if it has no grid.
+        row_offset = 0
+        for project_position in range(len(project_list)):
+            project_row = project_list.iloc[[project_position]].reset_index(drop=True)
+            project_id = project_row['Project ID'].iloc[0]
+            if project_id in grids_by_project_id and grids_by_project_id[project_id][0].point_count() > 0:
+                grid, offset = grids_by_project_id[project_id]
+                extended_chunks = (
+                    self.outer_join_projects_to_parametric_values(project_row, parametric_value_chunk)
+                    for parametric_value_chunk in
+                    self.iter_grid_value_chunks(project_id, grid, offset, digit_count, chunk_size)
+                )
+            else:
+                extended_chunks = [project_row]
+            for extended_chunk in extended_chunks:
+                extended_chunk = extended_chunk.reindex(columns=skeleton.columns).astype(skeleton.dtypes)
+                extended_chunk.index = pd.RangeIndex(row_offset, row_offset + len(extended_chunk))
+                row_offset += len(extended_chunk)
+                yield extended_chunk
+
+    def extended_project_count(self, project_list, parametric_list):
+        """
+        Counts the rows of the extended project list without making it.
+
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list. It may be empty.
+
+        Returns
+        -------
+        int
+            The number of rows yielded by
+            iter_extended_project_list_chunks()
+        """
+        grids, _ = self.parametric_grids(parametric_list) if not parametric_list.empty else ([], 1)
+        point_counts = {name: grid.point_count() for name, grid, _ in grids}
+        return sum(max(point_counts.get(project_id, 0), 1) for project_id in project_list['Project ID'])
+
+    def modify_project_data_and_project_list(self, project_data_dataframes, project_parameters, apply_project_list=True,
+                                             apply_project_data=True):
         """
         This method modifies project data dataframes according to the
         parametric modifications in the project parameters. It does not
         return a value because dataframes are modified in place.
 
-        Note: This method will modify the dataframes in place. This isn't
-        a problem if the dataframes are returned from
-        XlsxReader.read_all_sheets_from_xlsx.
+        Note: This method will modify the dataframes in place. If
+        project_data_dataframes is a CopyOnWriteSheets, as returned by
+        XlsxDataframeCache.read_all_sheets_from_xlsx, only the sheets that
+        are modified are copied and the shared sheets are left untouched.
 
         If the dataframe name, column name or row name are not found, an
         XlsxOperationException is raised.
 
+        The cell specifications are resolved into row and column positions
+        by a ParametricOverridePlan. See parametric_override_plan() for how
+        the plans are reused across the serials of a parametric sweep.
+
         Also, it modifies (once again in plance) the project parameters
         according to the parametrics.
 
@@ -263,6 +484,20 @@ class XlsxReader:
             create_parametric_value_list that have the values to
             placed into the dataframes.
 
+        apply_project_list : bool
+            If False, the project list cell specifications are not applied
+            to the project parameters. This is for project parameters that
+            had them applied, with the cost and scaling modifications after
+            them, by apply_cost_and_scaling_modifications_to_extended_project_list().
+            Applying them again would undo the modifications.
+
+        apply_project_data : bool
+            If False, the project data dataframes are left untouched and
+            only the project parameters are modified. This is for a runner
+            that has the project data modified elsewhere, like the forked
+            workers of XlsxParallelManagerRunner. The cell specifications
+            are still checked.
+
         Returns
         -------
         None
@@ -275,58 +510,106 @@ class XlsxReader:
             is not found. The message is descriptive to help diagnose the
             problem during operation.
         """
-        # This is a regex to match a column name that specifies a change to make
-        # to a cell
-        cell_spec_re = re.compile('^.*/.*/.*$')
-
-        # Go through each project parameter
-        for index, value in project_parameters.iteritems():
-
-            # If the column specifies a cell to change in the dataframe
-            # or project list, inspect it to ensure it points somewhere
-            # valid and change the project list or the dataframe
-
-            if cell_spec_re.match(index) and not pd.isnull(value):
-                dataframe_name, row_name, column_name = index.split('/')
-
-                # First, branch on whether this a project list parameter
-                # or a dataframe parameter. First, if it is a project list
-                # parameter.
-                if dataframe_name == 'project list':
-                    if column_name not in project_parameters:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in project parameters'
-                        )
-                    if not pd.isnull(value):
-                        project_parameters[column_name] = value
-
-                # Second, if it is a dataframe parameter
-                else:
-                    # Check if dataframe exists
-                    if dataframe_name not in project_data_dataframes:
-                        raise XlsxOperationException(
-                            f'Datframe {dataframe_name} not found. Please check the project_data spreadsheet and project_list.')
-
-                    df = project_data_dataframes[dataframe_name]
-                    first_col = df.columns[0]
-
-                    # Check if row exists
-                    if df.loc[df[first_col] == row_name].empty:
-                        raise XlsxOperationException(
-                            f'Row {row_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
-
-                    # Check if column exists
-                    if df.loc[df[first_col] == row_name, column_name].empty:
-                        raise XlsxOperationException(
-                            f'Column {column_name} not found in dataframe {dataframe_name}. Please check the project_data spreadsheet and project_list.')
-
-                    # If all the above check pass, check to make sure the value is not nan.
-                    # If it is not nan, then a modification needs to be made, either to the
-                    # dataframe or the project list.
-                    if not pd.isnull(value):
-                        df.loc[df[first_col] == row_name, column_name] = value
-
-    def create_master_input_dictionary(self, project_data_dataframes, project_parameters):
+        plan = self.parametric_override_plan(project_data_dataframes, project_parameters)
+        plan.apply(project_data_dataframes, project_parameters, CopyOnWriteSheets.writable_sheet, apply_project_list,
+                   apply_project_data)
+
+    def parametric_override_plan(self, project_data_dataframes, project_parameters):
+        """
+        Returns the ParametricOverridePlan that applies the cell
+        specifications in the project parameters to the project data.
+
+        When the project data is a CopyOnWriteSheets, plans are cached by
+        the shared sheets they were made from and the names of the cell
+        specifications. So a plan is made once for each project data file
+        in a parametric sweep and reused by every serial. For a plain
+        dictionary of dataframes, a new plan is made on every call.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict or CopyOnWriteSheets
+            The sheets of the project data.
+
+        project_parameters : pandas.Series
+            The project parameters.
+
+        Returns
+        -------
+        ParametricOverridePlan
+            The plan for the project data and the cell specifications.
+        """
+        if not isinstance(project_data_dataframes, CopyOnWriteSheets):
+            return ParametricOverridePlan(project_data_dataframes, project_parameters.index)
+
+        # The names of the cell specifications are found once per distinct
+        # set of project parameter names.
+        parameter_names = tuple(project_parameters.index)
+        cell_spec_names = self._cell_spec_names.get(parameter_names)
+        if cell_spec_names is None:
+            cell_spec_names = ParametricOverridePlan.cell_spec_names(parameter_names)
+            self._cell_spec_names[parameter_names] = cell_spec_names
+
+        shared_sheets = project_data_dataframes.shared_sheets()
+        key = (id(shared_sheets), cell_spec_names)
+
+        # The shared sheets are kept with the plan so that their id() cannot
+        # be reused by other sheets.
+        cached = self._override_plans.get(key)
+        if cached is not None and cached[0] is shared_sheets:
+            self._override_plans.move_to_end(key)
+            return cached[1]
+
+        plan = ParametricOverridePlan(shared_sheets, cell_spec_names)
+        self._override_plans[key] = (shared_sheets, plan)
+        while len(self._override_plans) > self._max_override_plans:
+            self._override_plans.popitem(last=False)
+        return plan
+
+    def project_data_group_key(self, project_parameters):
+        """
+        Returns the key of the group of projects that have the same project
+        data after the parametric modifications and the labor multiplier.
+        Such projects, like the variants of a parametric sweep that only
+        change project list columns, can share the derived inputs made by
+        create_master_input_dictionary(). See its shared_inputs parameter.
+
+        Parameters
+        ----------
+        project_parameters : pandas.Series
+            The project parameters.
+
+        Returns
+        -------
+        tuple
+            The project data file, the type and value of the labor cost
+            multiplier and a tuple of the names, types and values of the
+            cell specifications with values that modify the project data.
+            The types are included because values like 1 and 1.0 are equal
+            but give the project data different dtypes.
+        """
+        parameter_names = tuple(project_parameters.index)
+        cell_spec_names = self._cell_spec_names.get(parameter_names)
+        if cell_spec_names is None:
+            cell_spec_names = ParametricOverridePlan.cell_spec_names(parameter_names)
+            self._cell_spec_names[parameter_names] = cell_spec_names
+
+        # The labor cost multiplier may itself be set by a cell specification
+        # of the project list, which modify_project_data_and_project_list()
+        # applies later.
+        labor_cost_multiplier = project_parameters['Labor cost multiplier']
+        project_data_values = []
+        for name in cell_spec_names:
+            value = project_parameters[name]
+            if pd.isnull(value):
+                continue
+            if not name.startswith('project list/'):
+                project_data_values.append((name, type(value), value))
+            elif name.endswith('/Labor cost multiplier'):
+                labor_cost_multiplier = value
+        return project_parameters['Project data file'], type(labor_cost_multiplier), labor_cost_multiplier, \
+            tuple(project_data_values)
+
+    def create_master_input_dictionary(self, project_data_dataframes, project_parameters, shared_inputs=None):
         """
         This method takes a dictionary of dataframes that are the project data
         and unites them with the project parameters as found in the project list
@@ -347,6 +630,15 @@ class XlsxReader:
             See the subclasses of XlsxManagerRunner for examples on how this
             project series is read from a spreadsheet.
 
+        shared_inputs : dict
+            Optional. The inputs derived from the project data, kept for the
+            next project with the same project_data_dataframes. The projects
+            must have the same project_data_group_key(). The labor
+            multiplier is applied and the ProjectDataIndex is made on the
+            first call only, and the weather window is read once and
+            extended once for each construction time. Pass an empty
+            dictionary for the first project of a group.
+
         Returns
         -------
         dict
@@ -366,9 +658,13 @@ class XlsxReader:
         # The erection module takes in a bunch of keys and values under the
         # 'project_data' key in the incomplete_input_dict
 
-        # Apply the labor multipliers
-        labor_cost_multiplier = project_parameters['Labor cost multiplier']
-        self.apply_labor_multiplier_to_project_data_dict(project_data_dataframes, labor_cost_multiplier)
+        # Without shared inputs, every input is derived again.
+        if shared_inputs is None:
+            shared_inputs = dict()
+
+        # Apply the labor multipliers and read the weather window, unless
+        # an earlier project of the group did.
+        self.prepare_shared_inputs(project_data_dataframes, project_parameters, shared_inputs)
 
         erection_input_worksheets = [
             'crane_specs',
@@ -404,6 +700,7 @@ class XlsxReader:
             incomplete_input_dict[component] = np.array(incomplete_input_dict['component_data'][component])
 
         incomplete_input_dict['cable_specs_pd'] = project_data_dataframes['cable_specs']
+        incomplete_input_dict['project_data_index'] = shared_inputs['project_data_index']
 
         # For development cost, legacy input data will specify an itemized
         # breakdown in the project data. Newer input data will specify the
@@ -502,17 +799,182 @@ class XlsxReader:
         # The weather window is stored on a sheet of the project_data, but
         # needs preprocessing after it is read. The preprocessing changes it
         # from wind toolkit format to a dataframe.
+        # Like the project data, the weather windows are shared and must be
+        # treated as read only.
         number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
-        weather_window_input = project_data_dataframes['weather_window']
-        weather_window_intermediate = read_weather_window(weather_window_input)
-        extended_weather_window = extend_weather_window(weather_window_intermediate, number_of_months_for_construction)
-        incomplete_input_dict['weather_window'] = extended_weather_window
+        incomplete_input_dict['weather_window'] = \
+            self.weather_window(project_data_dataframes, number_of_months_for_construction, shared_inputs)
 
         # Now fill any missing values with sensible defaults.
         defaults = DefaultMasterInputDict()
         master_input_dict = defaults.populate_input_dict(incomplete_input_dict=incomplete_input_dict)
         return master_input_dict
 
+    def prepare_shared_inputs(self, project_data_dataframes, project_parameters, shared_inputs):
+        """
+        Derives the inputs of a project from the project data and keeps
+        them in shared_inputs, unless an earlier project of the group did.
+        The labor multiplier is applied to the sheets and the
+        ProjectDataIndex is made on the first call, and the weather window
+        is extended to the construction time of the project. See
+        create_master_input_dictionary(), which calls this.
+
+        A runner can call this for every project of a group before it runs
+        them, to keep the time these inputs take out of the time of the
+        first project.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict or CopyOnWriteSheets
+            The sheets of the project data. The labor multiplier is applied
+            to them in place.
+
+        project_parameters : pandas.Series
+            The project parameters.
+
+        shared_inputs : dict
+            The inputs of the group. See create_master_input_dictionary()
+        """
+        if 'project_data_index' not in shared_inputs:
+            labor_cost_multiplier = project_parameters['Labor cost multiplier']
+            self.apply_labor_multiplier_to_project_data_dict(project_data_dataframes, labor_cost_multiplier)
+
+            # The cost modules query the project data through this index so
+            # that the views they need (like rsmeans filtered by module) are
+            # built once and shared across modules and projects. It is
+            # created after the labor multiplier has been applied so that
+            # the views reflect the multiplied rates.
+            shared_inputs['project_data_index'] = ProjectDataIndex(project_data_dataframes)
+
+        number_of_months_for_construction = int(project_parameters['Total project construction time (months)'])
+        self.weather_window(project_data_dataframes, number_of_months_for_construction, shared_inputs)
+
+    def warm_up_project_data_index(self, project_data_index):
+        """
+        Builds the views of a ProjectDataIndex that the cost modules use,
+        so that they are in the shared cache of ProjectDataIndex before any
+        project runs.
+
+        Parameters
+        ----------
+        project_data_index : ProjectDataIndex
+            The index over the sheets of the project data, with the labor
+            multiplier applied.
+        """
+        for module in self.warm_up_rsmeans_modules:
+            project_data_index.rsmeans_for_module(module)
+        project_data_index.management_crew()
+        project_data_index.crew_with_prices()
+        project_data_index.crane_lift_polygons()
+        project_data_index.crane_lift_polygons(offload=True)
+
+    def weather_window(self, project_data_dataframes, number_of_months_for_construction, shared_inputs=None):
+        """
+        Reads the weather window of the project data and extends it to the
+        construction time. See read_weather_window() and
+        extend_weather_window().
+
+        The windows are kept in shared_inputs, if it is given. A
+        weather_window sheet that is still shared by a CopyOnWriteSheets is
+        never modified, so its windows are also cached by this class, keyed
+        by the sheet itself. Workers forked after warm_up_project_data()
+        find the windows of the unmodified project data in that cache.
+
+        Parameters
+        ----------
+        project_data_dataframes : dict or CopyOnWriteSheets
+            The sheets of the project data.
+
+        number_of_months_for_construction : int
+            The number of months the window must cover.
+
+        shared_inputs : dict
+            Optional. See create_master_input_dictionary()
+
+        Returns
+        -------
+        pandas.DataFrame
+            The extended weather window. It is shared, so it must be treated
+            as read only.
+        """
+        if shared_inputs is None:
+            shared_inputs = dict()
+        extended_weather_window_key = ('extended_weather_window', number_of_months_for_construction)
+        if extended_weather_window_key in shared_inputs:
+            return shared_inputs[extended_weather_window_key]
+
+        weather_window_input = project_data_dataframes['weather_window']
+        if isinstance(project_data_dataframes, CopyOnWriteSheets) and project_data_dataframes.is_shared('weather_window'):
+            sheet_id = id(weather_window_input)
+        else:
+            sheet_id = None
+
+        def cached(months):
+            # The sheet is kept with the window so that its id() cannot be
+            # reused by another dataframe.
+            entry = self._weather_windows.get((sheet_id, months)) if sheet_id is not None else None
+            if entry is not None and entry[0] is weather_window_input:
+                self._weather_windows.move_to_end((sheet_id, months))
+                return entry[1]
+            return None
+
+        def store(months, window):
+            if sheet_id is not None:
+                self._weather_windows[(sheet_id, months)] = (weather_window_input, window)
+                while len(self._weather_windows) > self._max_weather_windows:
+                    self._weather_windows.popitem(last=False)
+
+        extended_weather_window = cached(number_of_months_for_construction)
+        if extended_weather_window is None:
+            if 'weather_window' not in shared_inputs:
+                weather_window = cached(None)
+                if weather_window is None:
+                    weather_window = read_weather_window(weather_window_input)
+                    store(None, weather_window)
+                shared_inputs['weather_window'] = weather_window
+            extended_weather_window = \
+                extend_weather_window(shared_inputs['weather_window'], number_of_months_for_construction)
+            store(number_of_months_for_construction, extended_weather_window)
+        shared_inputs[extended_weather_window_key] = extended_weather_window
+        return extended_weather_window
+
+    def warm_up_project_data(self, project_data_basename, labor_cost_multipliers, construction_months):
+        """
+        Prepares the inputs that create_master_input_dictionary() derives
+        from the unmodified sheets of a project data file, and keeps them in
+        the caches of this class and of ProjectDataIndex: the sheets with
+        each labor multiplier applied, the views of the ProjectDataIndex
+        that the cost modules use, the lift polygons of the cranes and the
+        weather window for each construction time.
+
+        Worker processes that are forked afterwards inherit the caches, so
+        projects whose modifications leave those sheets shared find them
+        there instead of preparing them again.
+
+        Parameters
+        ----------
+        project_data_basename : str
+            The name of the project data file, which must be in the
+            XlsxDataframeCache.
+
+        labor_cost_multipliers : iterable
+            The labor cost multipliers to prepare the sheets with.
+
+        construction_months : iterable
+            The numbers of months of construction to extend the weather
+            window to.
+        """
+        for labor_cost_multiplier in labor_cost_multipliers:
+            project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+            self.apply_labor_multiplier_to_project_data_dict(project_data_sheets, labor_cost_multiplier)
+            self.warm_up_project_data_index(ProjectDataIndex(project_data_sheets))
+
+        # The labor multiplier does not change the weather window, so it is
+        # read from the unmodified sheets.
+        project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
+        for number_of_months_for_construction in construction_months:
+            self.weather_window(project_data_sheets, int(number_of_months_for_construction))
+
     def apply_labor_multiplier_to_project_data_dict(self, project_data_dict, labor_cost_multiplier):
         """
         Applies the labor multiplier to the dataframes that contain the labor
@@ -524,42 +986,73 @@ class XlsxReader:
 
         For the rsmeans dataframe, rows that have "Labor" for the "Type of cost"
         column are found and, for those rows, the values in the "Rate USD per unit"
-        column is multiplied by the multiplier
-
-        The dataframes are modified in place.
+        column is multiplied by the multiplier. The "Rate USD per unit" column
+        becomes the last column of the dataframe.
+
+        The two dataframes in the dictionary are replaced with the adjusted
+        dataframes. The original dataframes are not modified, so this works
+        with a CopyOnWriteSheets without copying the sheets first.
+
+        Many projects in a parametric sweep share the same project data and
+        the same multiplier. So the adjusted dataframes are cached, keyed by
+        the original sheet and the multiplier. The type of the multiplier is
+        part of the key, because an int multiplier of 1 leaves integer
+        columns as integers while a float 1.0 makes them floats, even though
+        1 == 1.0. A sheet that is still shared
+        by a CopyOnWriteSheets is never modified, so it is identified by the
+        dataframe object itself. Any other sheet is identified by the
+        fingerprint of its contents (see ProjectDataIndex.sheet_fingerprint()).
+        On a cache hit, the same adjusted dataframe is placed in the
+        dictionary again. Like the other project data sheets, it must be
+        treated as read only.
 
         Parameters
         ----------
-        project_data_dict : dict
+        project_data_dict : dict or CopyOnWriteSheets
             The dictionary that has the dataframes as values.
 
         labor_cost_multiplier : float
             The scalar labor cost multiplier.
         """
-        crew_price = project_data_dict['crew_price']
-        crew_price_new_hourly_rates = crew_price['Hourly rate USD per hour'] * labor_cost_multiplier
-        crew_price_new_per_diem_rates = crew_price['Per diem USD per day'] * labor_cost_multiplier
-        crew_price['Hourly rate USD per hour'] = crew_price_new_hourly_rates
-        crew_price['Per diem USD per day'] = crew_price_new_per_diem_rates
-
-        rsmeans = project_data_dict['rsmeans']
-
-        # This function maps new labor rates in rsmeans. Used with an apply()
-        # call, it will create a new Series that can be mapped back onto the
-        # original dataframe.
-        #
-        # If the column "Type of cost" is "Labor" then return the current cost
-        # times the labor multiplier. If "Type of cost" isn't "Labor" then
-        # just return the current cost.
-        def map_labor_rates(row):
-            if row['Type of cost'] == 'Labor':
-                return row['Rate USD per unit'] * labor_cost_multiplier
+        fingerprints = ProjectDataIndex(project_data_dict)
+
+        def adjust_crew_price(crew_price):
+            crew_price = crew_price.copy()
+            crew_price['Hourly rate USD per hour'] = crew_price['Hourly rate USD per hour'] * labor_cost_multiplier
+            crew_price['Per diem USD per day'] = crew_price['Per diem USD per day'] * labor_cost_multiplier
+            return crew_price
+
+        # Only the rates of rows that have "Labor" for the "Type of cost"
+        # are multiplied. The rate column is removed and added back so that
+        # it ends up last, as it always has.
+        def adjust_rsmeans(rsmeans):
+            rates = rsmeans['Rate USD per unit']
+            is_labor = rsmeans['Type of cost'] == 'Labor'
+            new_rates = rates.where(~is_labor, rates * labor_cost_multiplier)
+            rsmeans = rsmeans.drop(columns=['Rate USD per unit'])
+            rsmeans['Rate USD per unit'] = new_rates
+            return rsmeans
+
+        for sheet_name, adjust in [('crew_price', adjust_crew_price), ('rsmeans', adjust_rsmeans)]:
+            original = project_data_dict[sheet_name]
+            if isinstance(project_data_dict, CopyOnWriteSheets) and project_data_dict.is_shared(sheet_name):
+                key = (sheet_name, 'shared', id(original), type(labor_cost_multiplier), labor_cost_multiplier)
             else:
-                return row['Rate USD per unit']
-
-        rsmeans_new_labor_rates = rsmeans.apply(map_labor_rates, axis=1)
-        rsmeans.drop(columns=['Rate USD per unit'], inplace=True)
-        rsmeans['Rate USD per unit'] = rsmeans_new_labor_rates
+                key = (sheet_name, fingerprints.sheet_fingerprint(sheet_name), type(labor_cost_multiplier),
+                       labor_cost_multiplier)
+
+            # The original is kept with the adjusted dataframe so that the id()
+            # of a shared sheet cannot be reused by another dataframe.
+            cached = self._labor_multiplier_cache.get(key)
+            if cached is not None and (key[1] != 'shared' or cached[0] is original):
+                self._labor_multiplier_cache.move_to_end(key)
+                adjusted = cached[1]
+            else:
+                adjusted = adjust(original)
+                self._labor_multiplier_cache[key] = (original, adjusted)
+                while len(self._labor_multiplier_cache) > self._max_labor_multiplier_cache:
+                    self._labor_multiplier_cache.popitem(last=False)
+            project_data_dict[sheet_name] = adjusted
 
     def apply_cost_and_scaling_modifications_to_project_parameters(self, project_parameters):
         """
@@ -570,47 +1063,138 @@ class XlsxReader:
         modified with the parametrics by modify_project_data_and_project_list()
         above.
 
-        It modifies the parameters IN PLACE.
+        It modifies the parameters IN PLACE. The rules are those of
+        apply_cost_and_scaling_modifications_to_extended_project_list(),
+        which should be used to modify many projects at once.
 
         Parameters
         ----------
         project_parameters : pd.Series
             The project parameters to be modified.
         """
-        project_size_MW = project_parameters['Number of turbines'] * project_parameters['Turbine rating MW']
-        hub_height_m = project_parameters['Hub height m']
-        flag_use_user_homerun = project_parameters['Flag for user-defined home run trench length (0 = no; 1 = yes)']
-        nameplate = project_parameters['Turbine rating MW']
+        modified = self.apply_cost_and_scaling_modifications_to_extended_project_list(
+            pd.DataFrame([project_parameters])
+        )
+        for column_name in modified.columns:
+            project_parameters[column_name] = modified[column_name].iloc[0]
+
+    def apply_cost_and_scaling_modifications_to_extended_project_list(self, extended_project_list):
+        """
+        This applies the cost and scaling modifications to every project of
+        an extended project list at once, with column operations.
+
+        The project list cell specifications are applied first, with
+        apply_project_list_cell_specifications_to_extended_project_list(),
+        so the modifications see the parametric values.
+
+        The modifications depend on the size of the project in MW:
+
+        - Projects of 20 MW or less have no distance to the interconnect,
+          no breakpoint between base and topping, no access roads and a
+          road length adder of 1 km. Larger projects scale these with
+          their size.
+
+        - Projects larger than 40 MW get a new switchyard.
+
+        - The interconnect voltage and development labor cost scale with the
+          size of every project.
+
+        - The number of highway permits scales with the number of turbines
+          and the rate of deliveries with the turbine rating.
+
+        - If the flag for the user-defined home run trench length is 1, the
+          combined home run trench length is also scaled with the size.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The rows of the extended project list to be modified. It is not
+            modified.
+
+        Returns
+        -------
+        pd.DataFrame
+            A copy of the extended project list with the modifications.
+        """
+        result = self.apply_project_list_cell_specifications_to_extended_project_list(extended_project_list)
+
+        number_of_turbines = result['Number of turbines'].values.astype(float)
+        nameplate = result['Turbine rating MW'].values.astype(float)
+        hub_height_m = result['Hub height m'].values.astype(float)
+        flag_use_user_homerun = result['Flag for user-defined home run trench length (0 = no; 1 = yes)'].values
+        project_size_MW = number_of_turbines * nameplate
+        up_to_20_MW = project_size_MW <= 20
 
-        distance_to_interconnect_mi = 0.0 if project_size_MW <= 20 else (0.009375 * project_size_MW + 0.625)
+        distance_to_interconnect_mi = np.where(up_to_20_MW, 0.0, 0.009375 * project_size_MW + 0.625)
         interconnect_voltage_kV = 0.4398 * project_size_MW + 60.204
-        new_switchyard_y_n = 'n' if project_size_MW <= 40 else 'y'
-        road_length_adder_m = 1e3 if project_size_MW <= 20 else (13.542 * project_size_MW + 1458.3)
+        new_switchyard_y_n = np.where(project_size_MW <= 40, 'n', 'y').astype(object)
+        road_length_adder_m = np.where(up_to_20_MW, 1e3, 13.542 * project_size_MW + 1458.3)
 
         # if greater than 20 MW, then breakpoint between base and topping at 35 meters
-        breakpoint_between_base_and_topping = 0.0 if project_size_MW <= 20 else (35 / hub_height_m)
+        breakpoint_between_base_and_topping = np.where(up_to_20_MW, 0.0, 35 / hub_height_m)
 
-        number_of_access_roads = 0.0 if project_size_MW <= 20 else ceil(0.0052 * project_size_MW + 0.7917)
-        number_of_highway_permits = ceil(0.2 * project_parameters['Number of turbines'])
-        if flag_use_user_homerun is 1:
-             project_parameters['Combined Homerun Trench Length to Substation (km)'] = 0.1776 * project_size_MW - 2.551
+        number_of_access_roads = np.where(up_to_20_MW, 0.0, np.ceil(0.0052 * project_size_MW + 0.7917))
+        number_of_highway_permits = np.ceil(0.2 * number_of_turbines).astype(int)
+        use_user_homerun = flag_use_user_homerun == 1
+        if use_user_homerun.any():
+            result.loc[use_user_homerun, 'Combined Homerun Trench Length to Substation (km)'] = \
+                0.1776 * project_size_MW[use_user_homerun] - 2.551
 
         # 10 deliveries per week for 1.5 MW machines
-        rate_deliveries = ceil(15 / nameplate)
+        rate_deliveries = np.ceil(15 / nameplate).astype(int)
 
         # $17,000 / MW for a development cost estimate
         development_labor_cost_usd = project_size_MW * 17000
 
-        project_parameters['Rate of deliveries(turbines per week)'] = rate_deliveries
-        project_parameters['Development labor cost USD'] = development_labor_cost_usd
-        project_parameters['Project size MW'] = project_size_MW
-        project_parameters['Distance to interconnect (miles)'] = distance_to_interconnect_mi
-        project_parameters['Interconnect Voltage (kV)'] = interconnect_voltage_kV
-        project_parameters['New Switchyard (y/n)'] = new_switchyard_y_n
-        project_parameters['Road length adder (m)'] = road_length_adder_m
-        project_parameters['Breakpoint between base and topping (percent)'] = breakpoint_between_base_and_topping
-        project_parameters['Number of access roads'] = number_of_access_roads
-        project_parameters['Number of highway permits'] = number_of_highway_permits
+        result['Rate of deliveries(turbines per week)'] = rate_deliveries
+        result['Development labor cost USD'] = development_labor_cost_usd
+        result['Project size MW'] = project_size_MW
+        result['Distance to interconnect (miles)'] = distance_to_interconnect_mi
+        result['Interconnect Voltage (kV)'] = interconnect_voltage_kV
+        result['New Switchyard (y/n)'] = new_switchyard_y_n
+        result['Road length adder (m)'] = road_length_adder_m
+        result['Breakpoint between base and topping (percent)'] = breakpoint_between_base_and_topping
+        result['Number of access roads'] = number_of_access_roads
+        result['Number of highway permits'] = number_of_highway_permits
+        return result
+
+    def apply_project_list_cell_specifications_to_extended_project_list(self, extended_project_list):
+        """
+        Applies the values of the project list cell specifications, like
+        "project list/Project/Number of turbines", to the columns of the
+        project parameters they name, for every project of an extended
+        project list at once. This is what
+        modify_project_data_and_project_list() does to the project
+        parameters of one project.
+
+        If the values have a different dtype than the column, such as float
+        values for an integer column, the column becomes an object column.
+        That way, each project keeps the type of value it would get from
+        modify_project_data_and_project_list(), so the rows that are not
+        modified keep their integers.
+
+        Parameters
+        ----------
+        extended_project_list : pd.DataFrame
+            The rows of the extended project list. It is not modified.
+
+        Returns
+        -------
+        pd.DataFrame
+            A copy of the extended project list with the values applied.
+        """
+        result = extended_project_list.copy()
+        for parameter_name in ParametricOverridePlan.cell_spec_names(result.columns):
+            dataframe_name, _, column_name = parameter_name.split('/')
+            if dataframe_name == 'project list' and column_name in result.columns:
+                has_value = result[parameter_name].notnull()
+                if has_value.any():
+                    column = result[column_name]
+                    values = result[parameter_name]
+                    if column.dtype != values.dtype:
+                        column, values = column.astype(object), values.astype(object)
+                    result[column_name] = column.mask(has_value, values)
+        return result
 
     def create_serial_number(self, project_id, index, max_index):
         """
@@ -638,9 +1222,26 @@ class XlsxReader:
         str
             The left padded serial number as a string.
         """
-        total_digit_count = 1
+        total_digit_count = self.serial_digit_count(max_index)
         index_digit_count = len(str(index))
+        padding = '0' * (total_digit_count - index_digit_count)
+        return f'{project_id}_{padding}{index}'
 
+    def serial_digit_count(self, max_index):
+        """
+        Returns the number of digits that serial numbers are padded to.
+        See create_serial_number()
+
+        Parameters
+        ----------
+        max_index : int
+            The total number of indices in the sequence.
+
+        Returns
+        -------
+        int
+            The number of digits.
+        """
         if max_index < 10:
             total_digit_count = 1
         elif 0 < max_index < 1e1 - 1:
@@ -662,5 +1263,4 @@ class XlsxReader:
         else:
             total_digit_count = 9
 
-        padding = '0' * (total_digit_count - index_digit_count)
-        return f'{project_id}_{padding}{index}'
+        return total_digit_count
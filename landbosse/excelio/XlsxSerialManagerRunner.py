@@ -4,11 +4,11 @@ import os
 import pandas as pd
 
 from ..model import Manager
-from .XlsxFileOperations import XlsxFileOperations
 from .XlsxReader import XlsxReader
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxDataframeCache import XlsxDataframeCache
 from .XlsxGenerator import XlsxGenerator
+from .ProjectResultWriter import ProjectResultWriter
 
 
 class XlsxSerialManagerRunner(XlsxManagerRunner):
@@ -17,7 +17,12 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
     in a serial loop.
     """
 
-    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False):
+    # The number of projects whose outputs are handed to the result writer
+    # at a time.
+    output_chunk_size = 10000
+
+    def run_from_project_list_xlsx(self, projects_xlsx, enable_cost_and_scaling_modifications=False, costs_only=False,
+                                   result_writer=None):
         """
         This function runs all the scenarios in the projects_xlsx file. It creates
         the OrderedDict that holds the results of all the runs. See the return
@@ -39,40 +44,87 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             modified by the parameters for to scale certain input values based
             on what has been parametrically modified.
 
+        costs_only : bool
+            If True, only the costs_by_module_type_operation outputs are
+            calculated. The details outputs, the intermediate dataframes of
+            each project and the parametric project data workbooks are not
+            made, so the details dataframe in the result is empty.
+
+        result_writer : ProjectResultWriter
+            Optional. The outputs of the projects are handed to it
+            output_chunk_size projects at a time. If None, a
+            ProjectResultWriter keeps them in memory.
+
         Returns
         -------
-        OrderedDict, list, list, list
-            First element of tuple is an ordered dict that is the result of
-            all the runs. Each key is the name of a project and each value
-            is the output dictionary of that project. The second element
-            is the list of rows for the csv. The third element is the list
-            of costs for the spreadsheets. The fourth element is the same as
-            module_type_operation_lists, but every row has all the inputs
-            on each row.
+        dict
+            The return value of result_writer.result(). See
+            XlsxManagerRunner.run_from_project_list_xlsx()
         """
-        # Load the project list
-        extended_project_list_before_parameter_modifications = self.read_project_and_parametric_list_from_xlsx()
+        # Load the project list. The parametric variations are generated
+        # in chunks as the projects are run.
+        project_list, parametric_list = self.read_project_and_parametric_lists()
         print('>>> Project and parametric lists loaded')
 
-        # For file operations
-        file_ops = XlsxFileOperations()
+        # Parse all the project data files the projects need at once
+        self.prefetch_project_data(project_list)
+
+        # Run every project
+        project_rows = self.iter_extended_project_list_rows(project_list, parametric_list)
+        return self.run_projects(project_rows, enable_cost_and_scaling_modifications, costs_only, result_writer)
+
+    def run_projects(self, project_rows, enable_cost_and_scaling_modifications=False, costs_only=False,
+                     result_writer=None):
+        """
+        Runs the projects in the rows of an extended project list in a
+        serial loop. This is a concrete implementation of the super class
+        method.
+
+        Parameters
+        ----------
+        project_rows : iterable
+            Tuples of index and project parameters, like those yielded by
+            DataFrame.iterrows() on the extended project list.
+
+        enable_cost_and_scaling_modifications : bool
+            See run_from_project_list_xlsx()
 
-        # Get the output dictionary ready
+        costs_only : bool
+            See run_from_project_list_xlsx()
+
+        result_writer : ProjectResultWriter
+            See run_from_project_list_xlsx()
+
+        Returns
+        -------
+        dict
+            See run_from_project_list_xlsx()
+        """
+        if result_writer is None:
+            result_writer = ProjectResultWriter()
+
+        # Get the output dictionary ready. It holds the outputs of the
+        # projects until they are handed to the result writer.
         runs_dict = OrderedDict()
 
         # Instantiate and XlsxReader to assemble master input dictionary
         xlsx_reader = XlsxReader()
 
         # Get a list ready to hold the project parameters after they have been modified
-        # After all rows have been added to this list (each row is a series) then the
-        # whole list will be transformed into a dataframe.
+        # After output_chunk_size rows have been added to this list (each row is a series)
+        # the list is transformed into a dataframe and handed to the result writer.
         #
         # See notes at https://pandas.pydata.org/pandas-docs/stable/reference/api/pandas.DataFrame.append.html
         # for why this is more performant than appending to a dataframe.
         extended_project_list_after_parameter_modifications = []
 
+        # Apply the cost and scaling modifications to the rows in chunks,
+        # before they are dispatched, if needed.
+        if enable_cost_and_scaling_modifications:
+            project_rows = self.iter_rows_with_cost_and_scaling_modifications(project_rows)
+
         # Loop over every project
-        for _, project_parameters in extended_project_list_before_parameter_modifications.iterrows():
+        for _, project_parameters in project_rows:
 
             # If project_parameters['Project ID with serial'] is null, that means there are no
             # parametric modifications to the project data dataframes. Hence,
@@ -85,7 +137,7 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             project_data_basename = project_parameters['Project data file']
 
             # Input path for unmodified project input data.
-            project_data_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
+            project_data_xlsx = os.path.join(self.file_ops.landbosse_input_dir(), 'project_data', f'{project_data_basename}.xlsx')
 
             # Log each project
             print(f'<><><><><><><><><><><><><><><><><><> {project_id_with_serial} <><><><><><><><><><><><><><><><><><>')
@@ -96,35 +148,46 @@ class XlsxSerialManagerRunner(XlsxManagerRunner):
             project_data_sheets = XlsxDataframeCache.read_all_sheets_from_xlsx(project_data_basename)
 
             # Transform the dataframes so that they have the right values for
-            # the parametric variables.
-            xlsx_reader.modify_project_data_and_project_list(project_data_sheets, project_parameters)
-
-            # Apply cost and scaling modifications if needed.
-            if enable_cost_and_scaling_modifications:
-                xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+            # the parametric variables. The project list values were already
+            # applied, before the cost and scaling modifications, if those
+            # are enabled.
+            xlsx_reader.modify_project_data_and_project_list(
+                project_data_sheets, project_parameters,
+                apply_project_list=not enable_cost_and_scaling_modifications)
 
             # Append the modified project parameters
             extended_project_list_after_parameter_modifications.append(project_parameters)
 
-            # Write all project_data sheets
-            parametric_project_data_path = \
-                os.path.join(file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
-            XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
+            # Write all project_data sheets, unless only costs are output.
+            if not costs_only:
+                parametric_project_data_path = \
+                    os.path.join(self.file_ops.parametric_project_data_output_path(), f'{project_id_with_serial}_project_data.xlsx')
+                XlsxGenerator.write_project_data(project_data_sheets, parametric_project_data_path)
 
             # Create the master input dictionary.
             master_input_dict = xlsx_reader.create_master_input_dictionary(project_data_sheets, project_parameters)
+            master_input_dict['costs_only'] = costs_only
 
             # Now run the manager and accumulate its result into the runs_dict
             output_dict = dict()
             mc = Manager(input_dict=master_input_dict, output_dict=output_dict)
             mc.execute_landbosse(project_name=project_id_with_serial)
-            output_dict['project_series'] = project_parameters
-            runs_dict[project_id_with_serial] = output_dict
+            if self.keep_intermediate_outputs:
+                output_dict['project_series'] = project_parameters
+                runs_dict[project_id_with_serial] = output_dict
+            else:
+                runs_dict[project_id_with_serial] = self.compact_output_dict(output_dict)
+
+            # Hand the outputs over in chunks
+            if len(extended_project_list_after_parameter_modifications) == self.output_chunk_size:
+                self.write_outputs(result_writer, runs_dict,
+                                   pd.DataFrame(extended_project_list_after_parameter_modifications))
+                runs_dict = OrderedDict()
+                extended_project_list_after_parameter_modifications = []
 
-        final_result = dict()
-        final_result['details_list'] = self.extract_details_lists(runs_dict)
-        final_result['module_type_operation_list'] = self.extract_module_type_operation_lists(runs_dict)
-        final_result['extended_project_list'] = pd.DataFrame(extended_project_list_after_parameter_modifications)
+        if len(extended_project_list_after_parameter_modifications) > 0:
+            self.write_outputs(result_writer, runs_dict,
+                               pd.DataFrame(extended_project_list_after_parameter_modifications))
 
         # Return the runs for all the projects.
-        return final_result
+        return result_writer.result()
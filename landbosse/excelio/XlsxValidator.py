@@ -18,9 +18,10 @@ class XlsxValidator:
         expected_xlsx : str
             The absolute filename of the expected output .xlsx file.
 
-        actual_module_type_operation_list : str
-            The module_type_operation_list as returned by a subclass of
-            XlsxManagerRunner.
+        actual_module_type_operation_list : pd.DataFrame or list
+            The module_type_operation dataframe as returned by a subclass of
+            XlsxManagerRunner. A list of dictionaries, one for each row, is
+            also accepted.
 
         validation_output_xlsx : str
             The absolute pathname to the output file with the comparison
@@ -32,10 +33,10 @@ class XlsxValidator:
             True if the expected and actual results are equal. It returns
             False otherwise.
         """
-        # First, make the list of dictionaries into a dataframe, and drop
+        # First, make sure the actual costs are a dataframe, and drop
         # the raw_cost and raw_cost_total_or_per_turbine columns.
         actual_df = pd.DataFrame(actual_module_type_operation_list)
-        actual_df.drop(['raw_cost', 'raw_cost_total_or_per_turbine'], axis=1, inplace=True)
+        actual_df = actual_df.drop(['raw_cost', 'raw_cost_total_or_per_turbine'], axis=1)
         expected_df = pd.read_excel(expected_xlsx, 'costs_by_module_type_operation')
         expected_df.rename(columns={
             'Project ID with serial': 'project_id_with_serial',
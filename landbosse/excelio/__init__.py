@@ -3,7 +3,19 @@ from .XlsxGenerator import XlsxGenerator
 from .XlsxManagerRunner import XlsxManagerRunner
 from .XlsxSerialManagerRunner import XlsxSerialManagerRunner
 from .XlsxParallelManagerRunner import XlsxParallelManagerRunner
+from .AdaptiveRefinementSweep import AdaptiveRefinementSweep
+from .ShardMerger import ShardMerger
+from .SurrogateTrainer import SurrogateTrainer
+from .SensitivityAnalysis import SensitivityAnalysis
+from .RepricingSweep import RepricingSweep
+from .UncertaintyAnalysis import UncertaintyAnalysis
 from .XlsxFileOperations import XlsxFileOperations
 from .XlsxValidator import XlsxValidator
 from .XlsxDataframeCache import XlsxDataframeCache
+from .CopyOnWriteSheets import CopyOnWriteSheets
+from .ProjectParameterTable import ProjectParameterTable, ProjectParameters
+from .ProjectCostPredictor import ProjectCostPredictor
 from .CsvGenerator import CsvGenerator
+from .ProjectResult import ProjectResult
+from .ProjectResultWriter import ProjectResultWriter
+from .ProjectResultFileWriter import ProjectResultFileWriter
@@ -18,6 +18,7 @@ import traceback
 import pandas as pd
 
 from .CostModule import CostModule
+from .DetailCollector import DetailCollector
 from .WeatherDelay import WeatherDelay as WD
 
 
@@ -709,13 +710,12 @@ class ArraySystem(CostModule):
         throughput_operations = construction_time_input_data['rsmeans']
         trench_length_km = construction_time_output_data['trench_length_km']
         if construction_time_input_data['turbine_rating_MW'] >= 0.1:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Collection').dropna(
-                thresh=4)
+            # The view is shared, so copy it before columns are added below.
+            operation_data = self.project_data_index().rsmeans_for_module('Collection').copy()
             # from rsmeans data, only read in Collection related data and filter out the rest:
             cable_trenching = throughput_operations[throughput_operations.Module == 'Collection']
         else:   #switch for small DW
-            operation_data = throughput_operations.where(
-                throughput_operations['Module'] == 'Small DW Collection').dropna(thresh=4)
+            operation_data = self.project_data_index().rsmeans_for_module('Small DW Collection').copy()
             # from rsmeans data, only read in Collection related data and filter out the rest:
             cable_trenching = throughput_operations[throughput_operations.Module == 'Small DW Collection']
         # operation_data = pd.merge()
@@ -761,9 +761,7 @@ class ArraySystem(CostModule):
         # No 'management crew' in small DW
         if construction_time_input_data['turbine_rating_MW'] >= 0.1:
             # pull out management data
-            crew_cost = self.input_dict['crew_cost']
-            crew = self.input_dict['crew'][self.input_dict['crew']['Crew type ID'].str.contains('M0')]
-            management_crew = pd.merge(crew_cost, crew, on=['Labor type ID'])
+            management_crew = self.project_data_index().management_crew()
             management_crew = management_crew.assign(per_diem_total=management_crew['Per diem USD per day'] * management_crew['Number of workers'] * num_days)
             management_crew = management_crew.assign(hourly_costs_total=management_crew['Hourly rate USD per hour'] * self.input_dict['hour_day'][self.input_dict['time_construct']] * num_days)
             management_crew = management_crew.assign(total_crew_cost_before_wind_delay=management_crew['per_diem_total'] + management_crew['hourly_costs_total'])
@@ -843,10 +841,9 @@ class ArraySystem(CostModule):
                                                columns = ['Type of cost', 'Cost USD', 'Phase of construction'])
 
         # Combine all calculated cost items into the 'collection_cost' dataframe:
-        collection_cost = pd.DataFrame([],columns = ['Type of cost', 'Cost USD', 'Phase of construction'])
-        collection_cost = collection_cost.append(trenching_equipment_rental_cost_df)
-        collection_cost = collection_cost.append(trenching_labor_cost_df)
-        collection_cost = collection_cost.append(cable_cost_usd_per_LF_df)
+        collection_cost = pd.concat([trenching_equipment_rental_cost_df,
+                                     trenching_labor_cost_df,
+                                     cable_cost_usd_per_LF_df])
 
         # Calculate Mobilization Cost and add to collection_cost dataframe.
         # For utility scale plants, mobilization is assumed to be 5% of the sum of labor, equipment, and material costs.
@@ -864,7 +861,7 @@ class ArraySystem(CostModule):
 
         mobilization_cost = pd.DataFrame([['Mobilization', calculate_costs_output_dict['mob_cost'], 'Collection']],
                                          columns=['Type of cost', 'Cost USD', 'Phase of construction'])
-        collection_cost = collection_cost.append(mobilization_cost)
+        collection_cost = pd.concat([collection_cost, mobilization_cost])
 
         calculate_costs_output_dict['total_collection_cost'] = collection_cost
 
@@ -872,79 +869,79 @@ class ArraySystem(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Collects the rows of the details output in a DetailCollector and
+        returns them as a block of columns.
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        pd.DataFrame
+            The block of rows, with the columns in DetailCollector.columns.
         """
-        result = []
         module = 'Collection Cost'
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total Number of Turbines',
-            'value': float(self.output_dict['total_turb'])
-        })
-
-        result.append({
-            'unit': 'km',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total trench length',
-            'value': float(self.output_dict['trench_length_km'])
-        })
-
-        result.append({
-            'unit': 'km',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total cable length',
-            'value': float(self.output_dict['total_cable_len_km'])
-        })
-
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Turbines Per String in Full String',
-            'value': float(self.output_dict['total_turb_per_string'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Full Strings',
-            'value': float(self.output_dict['num_full_strings'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Turbines in Partial String',
-            'value': float(self.output_dict['num_leftover_turb'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Number of Partial Strings',
-            'value': float(self.output_dict['num_partial_strings'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total number of strings full + partial',
-            'value': float(self.output_dict['num_full_strings'] + self.output_dict['num_partial_strings'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Trench Length to Substation (km)',
-            'value': float(self.output_dict['distance_to_grid_connection_km'])
-        })
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Cable Length to Substation (km)',
-            'value': float(self.output_dict['cable_len_to_grid_connection_km'])
-        })
+        result = DetailCollector(self.project_name, module)
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Total Number of Turbines',
+            value=float(self.output_dict['total_turb'])
+        )
+
+        result.add(
+            unit='km',
+            type='variable',
+            variable_df_key_col_name='Total trench length',
+            value=float(self.output_dict['trench_length_km'])
+        )
+
+        result.add(
+            unit='km',
+            type='variable',
+            variable_df_key_col_name='Total cable length',
+            value=float(self.output_dict['total_cable_len_km'])
+        )
+
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Number of Turbines Per String in Full String',
+            value=float(self.output_dict['total_turb_per_string'])
+        )
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Number of Full Strings',
+            value=float(self.output_dict['num_full_strings'])
+        )
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Number of Turbines in Partial String',
+            value=float(self.output_dict['num_leftover_turb'])
+        )
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Number of Partial Strings',
+            value=float(self.output_dict['num_partial_strings'])
+        )
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Total number of strings full + partial',
+            value=float(self.output_dict['num_full_strings'] + self.output_dict['num_partial_strings'])
+        )
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Trench Length to Substation (km)',
+            value=float(self.output_dict['distance_to_grid_connection_km'])
+        )
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='Cable Length to Substation (km)',
+            value=float(self.output_dict['cable_len_to_grid_connection_km'])
+        )
 
         cables = ''
         n = 1  # to keep tab of number of cables input by user.
@@ -956,74 +953,70 @@ class ArraySystem(CostModule):
 
             for variable, value in specs.__dict__.items():
                 if variable == 'array_cable_len':
-                    result.append({
-                        'unit': 'km',
-                        'type': 'variable',
-                        'variable_df_key_col_name': 'Array cable length for cable  ' + cable,
-                        'value': float(value)
-                    })
+                    result.add(
+                        unit='km',
+                        type='variable',
+                        variable_df_key_col_name='Array cable length for cable  ' + cable,
+                        value=float(value)
+                    )
                 elif variable == 'total_length':
-                    result.append({
-                        'unit': 'km',
-                        'type': 'variable',
-                        'variable_df_key_col_name': 'Total cable length for cable  ' + cable,
-                        'value': float(value)
-                    })
+                    result.add(
+                        unit='km',
+                        type='variable',
+                        variable_df_key_col_name='Total cable length for cable  ' + cable,
+                        value=float(value)
+                    )
 
                 elif variable == 'total_cost':
-                    result.append({
-                        'unit': 'usd',
-                        'type': 'variable',
-                        'variable_df_key_col_name': 'Total cable cost for cable  ' + cable,
-                        'value': float(value)
-                    })
+                    result.add(
+                        unit='usd',
+                        type='variable',
+                        variable_df_key_col_name='Total cable cost for cable  ' + cable,
+                        value=float(value)
+                    )
             n += 1
 
-        result.append({
-            'unit': '',
-            'type': 'list',
-            'variable_df_key_col_name': 'Number of turbines per cable type in full strings [' + cables + ']',
+        result.add(
+            unit='',
+            type='list',
+            variable_df_key_col_name='Number of turbines per cable type in full strings [' + cables + ']',
 
-            'value': str(self.output_dict['num_turb_per_cable'])
-        })
+            value=str(self.output_dict['num_turb_per_cable'])
+        )
 
         if self.input_dict['turbine_rating_MW'] > 0.1:
             for row in self.output_dict['management_crew'].itertuples():
                 dashed_row = ' <--> '.join(str(x) for x in list(row))
-                result.append({
-                    'unit': '',
-                    'type': 'dataframe',
-                    'variable_df_key_col_name': 'Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ',
-                    'value': dashed_row
-                })
+                result.add(
+                    unit='',
+                    type='dataframe',
+                    variable_df_key_col_name='Labor type ID <--> Hourly rate USD per hour <--> Per diem USD per day <--> Operation <--> Crew type <--> Crew name <--> Number of workers <--> Per Diem Total <--> Hourly costs total <--> Crew total cost ',
+                    value=dashed_row
+                )
 
-        result.append({
-            'unit': '',
-            'type': 'list',
-            'variable_df_key_col_name': 'Percent length of cable in partial string [' + cables + ']',
+        result.add(
+            unit='',
+            type='list',
+            variable_df_key_col_name='Percent length of cable in partial string [' + cables + ']',
 
-            'value': str(self.output_dict['perc_partial_string'])
-        })
+            value=str(self.output_dict['perc_partial_string'])
+        )
 
 
 
         for row in self.output_dict['total_collection_cost'].itertuples():
             dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                value=dashed_row,
+                last_number=row[2]
+            )
 
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
 
-        self.output_dict['collection_cost_csv'] = result
-        return result
+        self.output_dict['collection_cost_csv'] = result.to_dataframe()
+        return self.output_dict['collection_cost_csv']
 
     def run_module(self):
         """
@@ -1063,7 +1056,8 @@ class ArraySystem(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detailed_outputs_enabled():
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             self.output_dict['collection_cost_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_collection_cost'],
                 project_id=self.project_name,
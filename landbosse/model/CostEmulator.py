@@ -0,0 +1,289 @@
+import itertools
+import pickle
+
+import numpy as np
+import pandas as pd
+from numpy.polynomial import legendre
+from scipy.interpolate import RBFInterpolator
+
+
+class CostEmulator:
+    """
+    A CostEmulator is a surrogate of LandBOSSE that predicts the cost of
+    each module, and the total, from a few input values without running the
+    Manager. It is fit to the costs of projects that were run by the full
+    model, and evaluating it is a handful of vectorized numpy operations on
+    all the points at once.
+
+    There are two methods of fitting:
+
+    polynomial: A polynomial chaos expansion. The inputs are scaled to
+    [-1, 1] over the training domain and the costs are fit by least squares
+    with products of Legendre polynomials up to a total degree.
+
+    rbf: Radial basis function interpolation with
+    scipy.interpolate.RBFInterpolator. With the gaussian kernel and some
+    smoothing, this is the mean of a Gaussian process with a fixed kernel.
+
+    The training domain is the box between the smallest and largest value of
+    each input in the training data. Surrogates are not reliable outside of
+    it, so evaluate() sends points outside of the domain to the fallback,
+    which is normally a function that runs the full model.
+
+    Emulators can be saved to and loaded from disk. The fallback is not
+    saved and must be set again after loading.
+    """
+
+    methods = ['polynomial', 'rbf']
+
+    def __init__(self, input_names, output_names, method='polynomial', degree=2, kernel='thin_plate_spline',
+                 smoothing=0.0):
+        """
+        Parameters
+        ----------
+        input_names : list
+            The names of the inputs, such as the cell specifications of a
+            parametric list.
+
+        output_names : list
+            The names of the outputs, normally the modules and 'Total'.
+
+        method : str
+            'polynomial' or 'rbf'
+
+        degree : int
+            The total degree of the polynomial chaos expansion.
+
+        kernel : str
+            The kernel of the RBF interpolation. See RBFInterpolator.
+
+        smoothing : float
+            The smoothing of the RBF interpolation. 0 interpolates the
+            training costs exactly.
+        """
+        if method not in self.methods:
+            raise ValueError(f"Method {method} is not one of {', '.join(self.methods)}.")
+        self.input_names = list(input_names)
+        self.output_names = list(output_names)
+        self.method = method
+        self.degree = degree
+        self.kernel = kernel
+        self.smoothing = smoothing
+        self.lower = None
+        self.upper = None
+        self.terms = None
+        self.coefficients = None
+        self.interpolator = None
+        self.validation = None
+        self.fallback = None
+
+    def __getstate__(self):
+        # The fallback usually refers to a runner, which cannot be saved.
+        state = self.__dict__.copy()
+        state['fallback'] = None
+        return state
+
+    def fit(self, inputs, costs):
+        """
+        Fits the emulator.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            The inputs of the training points, with one row per point and
+            one column per input name.
+
+        costs : numpy.ndarray
+            The costs of the training points, with one row per point and
+            one column per output name.
+
+        Returns
+        -------
+        CostEmulator
+            This emulator.
+        """
+        inputs = np.asarray(inputs, dtype=float)
+        costs = np.asarray(costs, dtype=float)
+        self.lower = inputs.min(axis=0)
+        self.upper = inputs.max(axis=0)
+        scaled = self.scale(inputs)
+
+        if self.method == 'polynomial':
+            self.terms = np.array([
+                term for term in itertools.product(range(self.degree + 1), repeat=len(self.input_names))
+                if sum(term) <= self.degree
+            ], dtype=int).reshape(-1, len(self.input_names))
+            self.coefficients, _, _, _ = np.linalg.lstsq(self.basis(scaled), costs, rcond=None)
+        else:
+            self.interpolator = RBFInterpolator(scaled, costs, kernel=self.kernel, smoothing=self.smoothing)
+
+        return self
+
+    def scale(self, inputs):
+        """
+        Scales inputs from the training domain to [-1, 1]. Inputs that did
+        not vary in the training data are scaled to 0.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Inputs with one row per point.
+
+        Returns
+        -------
+        numpy.ndarray
+            The scaled inputs.
+        """
+        span = self.upper - self.lower
+        safe_span = np.where(span > 0, span, 1.0)
+        return np.where(span > 0, 2 * (inputs - self.lower) / safe_span - 1, 0.0)
+
+    def basis(self, scaled):
+        """
+        Evaluates the products of Legendre polynomials of the polynomial
+        chaos expansion.
+
+        Parameters
+        ----------
+        scaled : numpy.ndarray
+            Scaled inputs with one row per point.
+
+        Returns
+        -------
+        numpy.ndarray
+            One row per point and one column per term.
+        """
+        # Legendre polynomials of each degree for each input: points x inputs x degrees
+        values = legendre.legvander(scaled, self.degree)
+        input_positions = np.arange(scaled.shape[1])
+        return np.prod(values[:, input_positions, self.terms], axis=2)
+
+    def predict(self, inputs):
+        """
+        Predicts the costs with the emulator alone, even outside the
+        training domain.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Inputs with one row per point, or a single point.
+
+        Returns
+        -------
+        numpy.ndarray
+            The costs, with one row per point and one column per output.
+        """
+        scaled = self.scale(np.atleast_2d(np.asarray(inputs, dtype=float)))
+        if self.method == 'polynomial':
+            return self.basis(scaled) @ self.coefficients
+        return self.interpolator(scaled)
+
+    def in_domain(self, inputs, tolerance=1e-9):
+        """
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Inputs with one row per point, or a single point.
+
+        tolerance : float
+            How far, relative to the width of the domain, a point may be
+            outside the domain and still count as inside.
+
+        Returns
+        -------
+        numpy.ndarray
+            True for the points in the training domain.
+        """
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+        margin = tolerance * np.maximum(self.upper - self.lower, 1.0)
+        return np.all((inputs >= self.lower - margin) & (inputs <= self.upper + margin), axis=1)
+
+    def evaluate(self, inputs):
+        """
+        Evaluates the costs. Points in the training domain are predicted by
+        the emulator. Points outside of it are evaluated by the fallback or,
+        if there is no fallback, are NaN.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            Inputs with one row per point, or a single point.
+
+        Returns
+        -------
+        numpy.ndarray
+            The costs, with one row per point and one column per output.
+        """
+        inputs = np.atleast_2d(np.asarray(inputs, dtype=float))
+        costs = self.predict(inputs)
+        outside = ~self.in_domain(inputs)
+        if outside.any():
+            if self.fallback is None:
+                costs[outside] = np.nan
+            else:
+                costs[outside] = self.fallback(inputs[outside])
+        return costs
+
+    def validate(self, inputs, costs):
+        """
+        Compares the predictions of the emulator with costs from the full
+        model, normally for held out points that were not used to fit it.
+        The result is kept in the validation attribute.
+
+        Parameters
+        ----------
+        inputs : numpy.ndarray
+            The inputs of the points.
+
+        costs : numpy.ndarray
+            The costs of the full model at the points.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per output with the number of points, the root mean
+            square error, the largest absolute error and the largest error
+            relative to the cost.
+        """
+        costs = np.asarray(costs, dtype=float)
+        errors = self.predict(inputs) - costs
+        scale = np.abs(costs)
+        relative_errors = np.divide(np.abs(errors), scale, out=np.zeros_like(errors), where=scale > 0)
+        self.validation = pd.DataFrame({
+            'Output': self.output_names,
+            'Points': len(costs),
+            'RMSE': np.sqrt(np.mean(errors ** 2, axis=0)) if len(costs) > 0 else np.nan,
+            'Max absolute error': np.abs(errors).max(axis=0) if len(costs) > 0 else np.nan,
+            'Max relative error': relative_errors.max(axis=0) if len(costs) > 0 else np.nan
+        })
+        return self.validation
+
+    def save(self, filename):
+        """
+        Saves the emulator to a file.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the file.
+        """
+        with open(filename, 'wb') as emulator_file:
+            pickle.dump(self, emulator_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Loads an emulator saved with save().
+
+        Parameters
+        ----------
+        filename : str
+            The path of the file.
+
+        Returns
+        -------
+        CostEmulator
+            The emulator, without a fallback.
+        """
+        with open(filename, 'rb') as emulator_file:
+            return pickle.load(emulator_file)
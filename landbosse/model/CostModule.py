@@ -1,5 +1,27 @@
 import math
 
+import pandas as pd
+
+from .ProjectDataIndex import ProjectDataIndex
+
+# These are the columns, in order, of the blocks of rows for the
+# costs_by_module_type_operation outputs of every module.
+COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS = [
+    'operation_id',
+    'type_of_cost',
+    'raw_cost',
+    'turbine_rating_MW',
+    'num_turbines',
+    'rotor_diameter_m',
+    'project_id_with_serial',
+    'module',
+    'raw_cost_total_or_per_turbine',
+    'cost_per_turbine',
+    'cost_per_project',
+    'usd_per_kw_per_project'
+]
+
+
 class CostModule:
     """
     This is a super class for all other cost modules to import
@@ -26,29 +48,67 @@ class CostModule:
         mobilization_cost_multiplier = (36.892 * math.exp(-5e-04 * (turbine_rating * 1000))) / 100
         return mobilization_cost_multiplier
 
+    def detailed_outputs_enabled(self):
+        """
+        Returns False when the project runs in costs only mode. In that
+        mode, modules compute only what feeds the costs_by_module_type_operation
+        output and skip the details output and the intermediate dataframes
+        that exist only for the details output.
+
+        Costs only mode is enabled by setting the key 'costs_only' to True on
+        the master input dictionary.
+
+        Returns
+        -------
+        bool
+            True if the details output should be made.
+        """
+        return not self.input_dict.get('costs_only', False)
+
+    def project_data_index(self):
+        """
+        Returns the ProjectDataIndex that holds the pre-built views of the
+        project data sheets. XlsxReader places one on the master input
+        dictionary under the key 'project_data_index'. If the input
+        dictionary was assembled some other way, an index is created from
+        the dataframes in the input dictionary and stored there so the other
+        modules can share it.
+
+        Returns
+        -------
+        ProjectDataIndex
+            The index of the project data for this project.
+        """
+        if 'project_data_index' not in self.input_dict:
+            self.input_dict['project_data_index'] = ProjectDataIndex.from_input_dict(self.input_dict)
+        return self.input_dict['project_data_index']
+
     def outputs_for_costs_by_module_type_operation(self,
                                                    *,
                                                    input_df,
                                                    project_id,
                                                    total_or_turbine):
         """
-        This takes a dataframe and turns it into a list of dictionaries
-        suitable for output to a cost tab in a spreadsheet.
+        This takes a dataframe and turns it into a block of rows suitable
+        for output to a cost tab in a spreadsheet.
 
-        Outputs dictionaries that are rows, with each row being a dict that
-        has costs broken down by and module id, operation id, type of cost,
-        cost, and per turbine or total. Each of those values are stored in
-        their own column.
+        The block has costs broken down by and module id, operation id,
+        type of cost, cost, and per turbine or total. Each of those values
+        are stored in their own column. See COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+        for the names of the columns.
 
-        It maps each row of this dataframe into a dictionary with keys
-        of those names. It accumulates these dictionaries into a list.
+        The block is computed with column operations on input_df rather than
+        row by row, so the runners can concatenate the blocks of every module
+        and every project directly. Consumers that still need the legacy list
+        of dictionaries can call .to_dict('records') on the block.
 
         It must be called with keyword arguments.
 
         Parameters
         ----------
         input_df : pd.DataFrame
-           The input dataframe that has the columns listed above.
+           The input dataframe that has the columns 'Phase of construction',
+           'Type of cost' and 'Cost USD'.
 
         project_id : str
             The id of the project (it is a string, not an integer) to
@@ -60,42 +120,73 @@ class CostModule:
 
         Returns
         -------
-        list
-            List of dicts, with each dict representing a row for
-            the output.
+        pd.DataFrame
+            The block of rows for the output, one row for each row of
+            input_df.
+        """
+        return self.costs_by_module_type_operation_block(
+            operation_id=input_df['Phase of construction'].values,
+            type_of_cost=input_df['Type of cost'].values,
+            raw_cost=input_df['Cost USD'].values,
+            total_or_turbine=total_or_turbine
+        )
+
+    def costs_by_module_type_operation_block(self,
+                                             *,
+                                             operation_id,
+                                             type_of_cost,
+                                             raw_cost,
+                                             total_or_turbine):
+        """
+        This assembles the columns of a block of costs_by_module_type_operation
+        rows. The per turbine, per project and per kW costs are calculated from
+        the raw costs for all rows at once.
+
+        It must be called with keyword arguments.
+
+        Parameters
+        ----------
+        operation_id : array-like or str
+            The operation id of each row, or a single operation id for all rows.
+
+        type_of_cost : array-like
+            The type of cost of each row.
+
+        raw_cost : array-like
+            The cost of each row in USD.
+
+        total_or_turbine : bool
+            True if the raw costs are totals for the project. False if they
+            are per turbine.
+
+        Returns
+        -------
+        pd.DataFrame
+            The block with the columns in COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS.
         """
-        result = []
-        # module = type(self).__name__
         module = 'CollectionCost' if (type(self).__name__ == 'ArraySystem') else type(self).__name__
         turbine_rating_MW = self.input_dict['turbine_rating_MW']
         num_turbines = self.input_dict['num_turbines']
         rotor_diameter_m = self.input_dict['rotor_diameter_m']
         project_size_kw = num_turbines * turbine_rating_MW * 1000
 
-        for _, row in input_df.iterrows():
-            _dict = dict()
-            row = row.to_dict()
-            _dict['operation_id'] = row['Phase of construction']
-            _dict['type_of_cost'] = row['Type of cost']
-            _dict['raw_cost'] = row['Cost USD']
-            result.append(_dict)
-
-        for _dict in result:
-            _dict['turbine_rating_MW'] = turbine_rating_MW
-            _dict['num_turbines'] = num_turbines
-            _dict['rotor_diameter_m'] = rotor_diameter_m
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
-            if total_or_turbine:  # If raw_cost is the total cost
-                _dict['raw_cost_total_or_per_turbine'] = 'total'
-                _dict['cost_per_turbine'] = _dict['raw_cost'] / num_turbines
-                _dict['cost_per_project'] = _dict['raw_cost']
-                _dict['usd_per_kw_per_project'] = _dict['raw_cost'] / project_size_kw
-            else:                 # If raw_cost is per turbine
-                _dict['raw_cost_total_or_per_turbine'] = 'turbine'
-                _dict['cost_per_turbine'] = _dict['raw_cost']
-                _dict['cost_per_project'] = _dict['raw_cost'] * num_turbines
-                _dict['usd_per_kw_per_project'] = _dict['cost_per_project'] / project_size_kw
-
-        return result
+        block = pd.DataFrame({'type_of_cost': type_of_cost, 'raw_cost': raw_cost})
+        block['operation_id'] = operation_id
+        block['turbine_rating_MW'] = turbine_rating_MW
+        block['num_turbines'] = num_turbines
+        block['rotor_diameter_m'] = rotor_diameter_m
+        block['project_id_with_serial'] = self.project_name
+        block['module'] = module
+
+        if total_or_turbine:  # If raw_cost is the total cost
+            block['raw_cost_total_or_per_turbine'] = 'total'
+            block['cost_per_turbine'] = block['raw_cost'] / num_turbines
+            block['cost_per_project'] = block['raw_cost']
+            block['usd_per_kw_per_project'] = block['raw_cost'] / project_size_kw
+        else:                 # If raw_cost is per turbine
+            block['raw_cost_total_or_per_turbine'] = 'turbine'
+            block['cost_per_turbine'] = block['raw_cost']
+            block['cost_per_project'] = block['raw_cost'] * num_turbines
+            block['usd_per_kw_per_project'] = block['cost_per_project'] / project_size_kw
+
+        return block[COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS]
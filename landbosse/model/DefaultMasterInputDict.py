@@ -18,6 +18,10 @@ class DefaultMasterInputDict:
         self.default_input_dict['operational_construction_time'] = self.default_input_dict['hour_day'][
             self.default_input_dict['time_construct']]
 
+        # By default, all outputs are calculated. Set this to True to
+        # calculate only the costs_by_module_type_operation outputs.
+        self.default_input_dict['costs_only'] = False
+
     def populate_input_dict(self, incomplete_input_dict):
         """
         Completely fills the input_dict. If there are any keys in the
@@ -0,0 +1,355 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+class DetailCollector:
+    """
+    DetailCollector accumulates the rows of the details output of one
+    module of one project. Rather than a list of dictionaries that repeat
+    the same keys and strings on every row, it keeps one list per column.
+    When the module is finished, to_dataframe() turns these lists into a
+    block of typed columns. Repeated strings (the project id, module, type,
+    variable name and unit) are stored as categoricals.
+
+    Modules add rows in one of two ways:
+
+    add()
+        Adds a single row, such as a scalar variable.
+
+    add_many()
+        Adds one row for each element of an array, such as one row for
+        each row of an intermediate dataframe.
+
+    The blocks of all modules and all projects are joined with concat()
+    and written by XlsxGenerator and CsvGenerator. Legacy consumers that
+    need a list of dictionaries can call to_records() on a block.
+
+    The columns of a block are the following:
+
+    project_id_with_serial, module, type, variable_df_key_col_name, unit
+        (categorical) The labels of the row.
+
+    value
+        (object) The value of the row. This may be a number or a string.
+
+    last_number
+        (object) For rows made from dataframes that end with a number,
+        this number is written to the numeric column of the output. It
+        overrides the automatic type detection on value.
+
+    has_last_number
+        (bool) True if last_number was given for the row.
+
+    non_numeric_value
+        (object) A string paired with a numeric value, such as the name of
+        an operation, or None.
+    """
+
+    columns = [
+        'project_id_with_serial',
+        'module',
+        'type',
+        'variable_df_key_col_name',
+        'unit',
+        'value',
+        'last_number',
+        'has_last_number',
+        'non_numeric_value'
+    ]
+
+    categorical_columns = [
+        'project_id_with_serial',
+        'module',
+        'type',
+        'variable_df_key_col_name',
+        'unit'
+    ]
+
+    def __init__(self, project_id_with_serial, module):
+        """
+        Parameters
+        ----------
+        project_id_with_serial : str
+            The project id placed on every row.
+
+        module : str
+            The name of the module placed on every row.
+        """
+        self.project_id_with_serial = project_id_with_serial
+        self.module = module
+        self._type = []
+        self._variable_df_key_col_name = []
+        self._unit = []
+        self._value = []
+        self._last_number = []
+        self._has_last_number = []
+        self._non_numeric_value = []
+
+    def __len__(self):
+        return len(self._value)
+
+    def add(self, *, unit, type, variable_df_key_col_name, value, last_number=None, non_numeric_value=None):
+        """
+        Adds one row. It must be called with keyword arguments.
+
+        Parameters
+        ----------
+        unit : str
+            The unit of the value.
+
+        type : str
+            'variable', 'dataframe' or 'list'
+
+        variable_df_key_col_name : str
+            The name of the variable, or the names of the dataframe columns
+            the value was made from.
+
+        value
+            The value of the row.
+
+        last_number
+            Optional. The number to write to the numeric column of the output.
+
+        non_numeric_value : str
+            Optional. A string to write to the non-numeric column of the output.
+        """
+        self._type.append(type)
+        self._variable_df_key_col_name.append(variable_df_key_col_name)
+        self._unit.append(unit)
+        self._value.append(value)
+        self._last_number.append(last_number)
+        self._has_last_number.append(last_number is not None)
+        self._non_numeric_value.append(non_numeric_value)
+
+    def add_many(self, *, unit, type, variable_df_key_col_name, values, last_numbers=None, non_numeric_values=None):
+        """
+        Adds one row for each element of values. The unit, type and
+        variable name are the same for every row added. It must be called
+        with keyword arguments.
+
+        Parameters
+        ----------
+        unit : str
+            The unit of the values.
+
+        type : str
+            'variable', 'dataframe' or 'list'
+
+        variable_df_key_col_name : str
+            The name of the variable, or the names of the dataframe columns
+            the values were made from.
+
+        values : array-like
+            The value of each row.
+
+        last_numbers : array-like
+            Optional. The number of each row to write to the numeric column
+            of the output. Must be the same length as values.
+
+        non_numeric_values : array-like
+            Optional. The string of each row to write to the non-numeric
+            column of the output. Must be the same length as values.
+        """
+        values = list(values)
+        count = len(values)
+        self._type.extend([type] * count)
+        self._variable_df_key_col_name.extend([variable_df_key_col_name] * count)
+        self._unit.extend([unit] * count)
+        self._value.extend(values)
+        if last_numbers is None:
+            self._last_number.extend([None] * count)
+            self._has_last_number.extend([False] * count)
+        else:
+            self._last_number.extend(last_numbers)
+            self._has_last_number.extend([True] * count)
+        if non_numeric_values is None:
+            self._non_numeric_value.extend([None] * count)
+        else:
+            self._non_numeric_value.extend(non_numeric_values)
+
+    def to_dataframe(self):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            The block of rows collected so far, with the columns listed
+            in DetailCollector.columns.
+        """
+        count = len(self)
+        block = pd.DataFrame({
+            'project_id_with_serial': pd.Categorical([self.project_id_with_serial] * count),
+            'module': pd.Categorical([self.module] * count),
+            'type': pd.Categorical(self._type),
+            'variable_df_key_col_name': pd.Categorical(self._variable_df_key_col_name),
+            'unit': pd.Categorical(self._unit),
+            'value': pd.Series(self._value, dtype=object),
+            'last_number': pd.Series(self._last_number, dtype=object),
+            'has_last_number': np.array(self._has_last_number, dtype=bool),
+            'non_numeric_value': pd.Series(self._non_numeric_value, dtype=object)
+        })
+        return block
+
+    @classmethod
+    def empty_dataframe(cls):
+        """
+        Returns
+        -------
+        pd.DataFrame
+            A block with all the columns and no rows.
+        """
+        return cls(project_id_with_serial='', module='').to_dataframe()
+
+    @classmethod
+    def concat(cls, blocks):
+        """
+        Concatenates blocks into a single block. The categories of each
+        categorical column are merged so that the columns stay categorical.
+
+        Parameters
+        ----------
+        blocks : list[pd.DataFrame]
+            The blocks to concatenate, as made by to_dataframe().
+
+        Returns
+        -------
+        pd.DataFrame
+            All the rows of all the blocks, in order.
+        """
+        blocks = [block for block in blocks if len(block) > 0]
+        if len(blocks) == 0:
+            return cls.empty_dataframe()
+        result = pd.concat([block[cls.columns] for block in blocks], ignore_index=True)
+        for column in cls.categorical_columns:
+            result[column] = union_categoricals([block[column] for block in blocks])
+        return result
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Converts a list of dictionaries, in the form the modules used to
+        produce, into a block. This is for callers that still assemble
+        detail rows as dictionaries.
+
+        Parameters
+        ----------
+        records : list[dict]
+            One dictionary for each row. The keys 'last_number' and
+            'non_numeric_value' are optional.
+
+        Returns
+        -------
+        pd.DataFrame
+            The block with the rows of the dictionaries.
+        """
+        def column(key):
+            return [record[key] for record in records]
+
+        block = pd.DataFrame({
+            'project_id_with_serial': pd.Categorical(column('project_id_with_serial')),
+            'module': pd.Categorical(column('module')),
+            'type': pd.Categorical(column('type')),
+            'variable_df_key_col_name': pd.Categorical(column('variable_df_key_col_name')),
+            'unit': pd.Categorical(column('unit')),
+            'value': pd.Series(column('value'), dtype=object),
+            'last_number': pd.Series([record.get('last_number') for record in records], dtype=object),
+            'has_last_number': np.array(['last_number' in record for record in records], dtype=bool),
+            'non_numeric_value': pd.Series([record.get('non_numeric_value') for record in records], dtype=object)
+        })
+        return block
+
+    @classmethod
+    def to_records(cls, block):
+        """
+        Converts a block into the list of dictionaries the modules used to
+        produce. The keys 'last_number' and 'non_numeric_value' are present
+        only on rows that have them.
+
+        Parameters
+        ----------
+        block : pd.DataFrame
+            The block to convert.
+
+        Returns
+        -------
+        list[dict]
+            One dictionary for each row of the block.
+        """
+        records = []
+        for project_id_with_serial, module, _type, variable_df_key_col_name, unit, value, last_number, \
+                has_last_number, non_numeric_value in zip(*[block[column].tolist() for column in cls.columns]):
+            record = {
+                'unit': unit,
+                'type': _type,
+                'variable_df_key_col_name': variable_df_key_col_name,
+                'value': value,
+                'project_id_with_serial': project_id_with_serial,
+                'module': module
+            }
+            if has_last_number:
+                record['last_number'] = last_number
+            if non_numeric_value is not None:
+                record['non_numeric_value'] = non_numeric_value
+            records.append(record)
+        return records
+
+    @staticmethod
+    def dataframe_rows(df, columns):
+        """
+        Returns the values of some columns of a dataframe as a list of rows.
+        The values are the same as DataFrame.iterrows() would give for those
+        columns, including the upcasting that happens when all the columns
+        of the dataframe are numeric. But no Series is made for each row.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The dataframe to read.
+
+        columns : list
+            The names of the columns to return, in the order they are
+            returned in each row.
+
+        Returns
+        -------
+        list[list]
+            One list of values for each row of the dataframe.
+        """
+        positions = [df.columns.get_loc(column) for column in columns]
+        return [[row[position] for position in positions] for row in df.values.tolist()]
+
+    @classmethod
+    def numeric_value_mask(cls, values):
+        """
+        Determines which values are numeric (that is, can be parsed by
+        float()) and which are non numeric. The decision determines whether
+        values go into the numeric or non-numeric columns of the output.
+
+        Numbers and missing values are numeric. Only the strings are tested
+        with float(), once for each distinct string.
+
+        Parameters
+        ----------
+        values : pd.Series
+            The values to test.
+
+        Returns
+        -------
+        np.ndarray
+            An array of bool that is True where the value is numeric.
+        """
+        is_string = values.map(lambda value: isinstance(value, str)).values.astype(bool)
+        mask = ~is_string
+        if is_string.any():
+            strings = values[is_string]
+            parses = {string: cls._parses_as_float(string) for string in strings.unique()}
+            mask[is_string] = strings.map(parses).values
+        return mask
+
+    @staticmethod
+    def _parses_as_float(value):
+        try:
+            float(value)
+        except ValueError:
+            return False
+        return True
@@ -1,5 +1,6 @@
 import traceback
 from .CostModule import CostModule
+from .DetailCollector import DetailCollector
 import pandas as pd
 import math
 
@@ -53,35 +54,34 @@ class DevelopmentCost(CostModule):
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Collects the rows of the details output in a DetailCollector and
+        returns them as a block of columns.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        pd.DataFrame
+            The block of rows, with the columns in DetailCollector.columns.
         """
 
-        result = []
         module = type(self).__name__
-        for _, row in self.output_dict['total_development_cost'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row["Type of cost"], row["Phase of construction"], math.ceil(row["Cost USD"]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost - Phase of Construction - Cost in USD',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-
-        self.output_dict['development_cost_csv'] = result
-        return result
+        result = DetailCollector(self.project_name, module)
+        total_development_cost = self.output_dict['total_development_cost']
+        result.add_many(
+            unit='',
+            type='dataframe',
+            variable_df_key_col_name='Type of Cost - Phase of Construction - Cost in USD',
+            values=['{} - {} - {}'.format(type_of_cost, phase_of_construction, math.ceil(cost_usd))
+                    for type_of_cost, phase_of_construction, cost_usd in zip(
+                        total_development_cost['Type of cost'],
+                        total_development_cost['Phase of construction'],
+                        total_development_cost['Cost USD'])],
+            last_numbers=total_development_cost.iloc[:, 2].tolist()
+        )
+
+        self.output_dict['development_cost_csv'] = result.to_dataframe()
+        return self.output_dict['development_cost_csv']
 
     def run_module(self):
         """
@@ -91,7 +91,8 @@ class DevelopmentCost(CostModule):
 
         try:
             self.calculate_costs()
-            self.outputs_for_detailed_tab()
+            if self.detailed_outputs_enabled():
+                self.outputs_for_detailed_tab()
             self.output_dict['development_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_development_cost'],
                 project_id=self.project_name,
@@ -1,10 +1,11 @@
 import pandas as pd
 import numpy as np
 from shapely.geometry import Point
-from shapely.geometry.polygon import Polygon
 from math import ceil
 
 from .CostModule import CostModule
+from .ProjectDataIndex import ProjectDataIndex
+from .DetailCollector import DetailCollector
 from .WeatherDelay import WeatherDelay
 
 import traceback
@@ -158,7 +159,8 @@ class ErectionCost(CostModule):
         """
         try:
             self.calculate_costs()
-            self.outputs_for_detailed_tab()
+            if self.detailed_outputs_enabled():
+                self.outputs_for_detailed_tab()
             self.output_dict['erection_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_erection_cost'],
                 project_id=self.project_name,
@@ -172,182 +174,166 @@ class ErectionCost(CostModule):
 
     def outputs_for_detailed_tab(self):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Collects the rows of the details output in a DetailCollector and
+        returns them as a block of columns.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        pd.DataFrame
+            The block of rows, with the columns in DetailCollector.columns.
         """
-        result =[]
-
-        for _, row in self._number_of_equip.iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': '_number_of_equip: Operation-Crane name-Boom system-Number of equipment',
-                'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Number of equipment"]}',
-                'last_number': row["Number of equipment"]
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days',
-                'value': f'{row["Operation"]}-{row["Crane name"]}-{row["Boom system"]}-{row["Operational construct days over time construct days"]}',
-                'last_number': row["Operational construct days over time construct days"]
-            })
+        module = type(self).__name__
+        result = DetailCollector(self.project_name, module)
+        rows = DetailCollector.dataframe_rows
+        erection_selected_detailed_data = self.output_dict['erection_selected_detailed_data']
+
+        number_of_equip = rows(self._number_of_equip, ['Operation', 'Crane name', 'Boom system', 'Number of equipment'])
+        result.add_many(
+            unit='',
+            type='dataframe',
+            variable_df_key_col_name='_number_of_equip: Operation-Crane name-Boom system-Number of equipment',
+            values=[f'{operation}-{crane_name}-{boom_system}-{number_of_equipment}'
+                    for operation, crane_name, boom_system, number_of_equipment in number_of_equip],
+            last_numbers=[row[3] for row in number_of_equip]
+        )
+
+        construct_days = rows(erection_selected_detailed_data, ['Operation', 'Crane name', 'Boom system',
+                                                                'Operational construct days over time construct days'])
+        result.add_many(
+            unit='',
+            type='dataframe',
+            variable_df_key_col_name=f'erection_selected_detailed_data: Operation-Crane name-Boom system-Operational construct days over time construct days',
+            values=[f'{operation}-{crane_name}-{boom_system}-{days}'
+                    for operation, crane_name, boom_system, days in construct_days],
+            last_numbers=[row[3] for row in construct_days]
+        )
 
         for row in self.output_dict['component_name_topvbase'].itertuples():
             dashed_row = '{} - {}'.format(row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'component_name_topvbase: Operation - Top or Base',
-                'value': dashed_row
-            })
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='component_name_topvbase: Operation - Top or Base',
+                value=dashed_row
+            )
 
         for row in self.output_dict['crane_choice'].itertuples():
             dashed_row = '{} - {} - {}'.format(row[1], row[2], row[3])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_choice: Crew name - Boom system - Operation',
-                'value': dashed_row
-            })
-
-        for _, row in self.output_dict['crane_data_output'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_data_output: crane_boom_operation_concat - variable - value',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['crane_cost_details'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'crane_cost_details: Operation ID - Type of cost - Cost',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['total_erection_cost'].iterrows():
-            dashed_row = '{} - {} - {}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'total_erection_cost: Phase of construction - Type of cost - Cost USD',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Labor cost USD without management']
-            operation = row['Operation']
-            result.append({
-                'unit': 'usd',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: crew cost without management',
-                'value': value,
-                'non_numeric_value': operation
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Mobilization cost USD']
-            crane_boom_operation_concat = row['crane_boom_operation_concat']
-            result.append({
-                'unit': 'usd',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'erection_selected_detailed_data: mobilization',
-                'value': value,
-                'non_numeric_value': crane_boom_operation_concat
-            })
-
-        for _, row in self.output_dict['erection_selected_detailed_data'].iterrows():
-            value = row['Wind multiplier']
-            operation = row['Operation']
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': f'erection_selected_detailed_data: wind multiplier',
-                'value': value,
-                'non_numeric_value': operation
-            })
-
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'total_cost_summed_erection',
-            'value': float(self.output_dict['total_cost_summed_erection'])
-        })
-
-        for _, row in self.output_dict['management_crews_cost'].iterrows():
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'management_crews_cost: {}'.format(' - '.join(row.index)),
-                'value': ' - '.join(list(str(x) for x in row)[1:])
-            })
-
-        result.append({
-            'unit': 'hours',
-            'type': 'variable',
-            'variable_df_key_col_name': 'number of hours in weather window',
-            'value': len(self.input_dict['weather_window'])
-        })
-
-        result.append({
-            'unit': 'none',
-            'type': 'variable',
-            'variable_df_key_col_name': 'time_weighted_weather_multiplier',
-            'value': self.output_dict['time_weighted_weather_multiplier']
-        })
-
-        result.append({
-            'unit': 'months',
-            'type': 'variable',
-            'variable_df_key_col_name': 'erection_construction_months',
-            'value': self.output_dict['erection_construction_months']
-        })
-
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'labor_cost_management',
-            'value': self.output_dict['labor_cost_management']
-        })
-
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'labor_cost_non_management',
-            'value': self.output_dict['labor_cost_non_management']
-        })
-
-        result.append({
-            'unit': 'usd',
-            'type': 'variable',
-            'variable_df_key_col_name': 'labor_cost_total',
-            'value': self.output_dict['labor_cost_total']
-        })
-
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='crane_choice: Crew name - Boom system - Operation',
+                value=dashed_row
+            )
 
-        module = type(self).__name__
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
-        self.output_dict['erection_cost_csv'] = result
+        # The next three dataframes are written positionally, with the
+        # first three columns of each row joined by dashes.
+        for df_name, variable_df_key_col_name in [
+            ('crane_data_output', 'crane_data_output: crane_boom_operation_concat - variable - value'),
+            ('crane_cost_details', 'crane_cost_details: Operation ID - Type of cost - Cost'),
+            ('total_erection_cost', 'total_erection_cost: Phase of construction - Type of cost - Cost USD')
+        ]:
+            df = self.output_dict[df_name]
+            first_three_columns = rows(df, df.columns[:3])
+            result.add_many(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name=variable_df_key_col_name,
+                values=['{} - {} - {}'.format(*row) for row in first_three_columns],
+                last_numbers=[row[2] for row in first_three_columns]
+            )
 
-        return result
+        crew_cost = rows(erection_selected_detailed_data, ['Labor cost USD without management', 'Operation'])
+        result.add_many(
+            unit='usd',
+            type='dataframe',
+            variable_df_key_col_name=f'erection_selected_detailed_data: crew cost without management',
+            values=[row[0] for row in crew_cost],
+            non_numeric_values=[row[1] for row in crew_cost]
+        )
+
+        mobilization = rows(erection_selected_detailed_data, ['Mobilization cost USD', 'crane_boom_operation_concat'])
+        result.add_many(
+            unit='usd',
+            type='dataframe',
+            variable_df_key_col_name='erection_selected_detailed_data: mobilization',
+            values=[row[0] for row in mobilization],
+            non_numeric_values=[row[1] for row in mobilization]
+        )
+
+        wind_multiplier = rows(erection_selected_detailed_data, ['Wind multiplier', 'Operation'])
+        result.add_many(
+            unit='',
+            type='dataframe',
+            variable_df_key_col_name=f'erection_selected_detailed_data: wind multiplier',
+            values=[row[0] for row in wind_multiplier],
+            non_numeric_values=[row[1] for row in wind_multiplier]
+        )
+
+        result.add(
+            unit='usd',
+            type='variable',
+            variable_df_key_col_name='total_cost_summed_erection',
+            value=float(self.output_dict['total_cost_summed_erection'])
+        )
+
+        management_crews_cost = self.output_dict['management_crews_cost']
+        result.add_many(
+            unit='',
+            type='dataframe',
+            variable_df_key_col_name='management_crews_cost: {}'.format(' - '.join(management_crews_cost.columns)),
+            values=[' - '.join(list(str(x) for x in row)[1:])
+                    for row in rows(management_crews_cost, management_crews_cost.columns)]
+        )
+
+        result.add(
+            unit='hours',
+            type='variable',
+            variable_df_key_col_name='number of hours in weather window',
+            value=len(self.input_dict['weather_window'])
+        )
+
+        result.add(
+            unit='none',
+            type='variable',
+            variable_df_key_col_name='time_weighted_weather_multiplier',
+            value=self.output_dict['time_weighted_weather_multiplier']
+        )
+
+        result.add(
+            unit='months',
+            type='variable',
+            variable_df_key_col_name='erection_construction_months',
+            value=self.output_dict['erection_construction_months']
+        )
+
+        result.add(
+            unit='usd',
+            type='variable',
+            variable_df_key_col_name='labor_cost_management',
+            value=self.output_dict['labor_cost_management']
+        )
+
+        result.add(
+            unit='usd',
+            type='variable',
+            variable_df_key_col_name='labor_cost_non_management',
+            value=self.output_dict['labor_cost_non_management']
+        )
+
+        result.add(
+            unit='usd',
+            type='variable',
+            variable_df_key_col_name='labor_cost_total',
+            value=self.output_dict['labor_cost_total']
+        )
+
+
+        self.output_dict['erection_cost_csv'] = result.to_dataframe()
+
+        return self.output_dict['erection_cost_csv']
 
     def calculate_erection_operation_time(self):
         """
@@ -386,7 +372,10 @@ class ErectionCost(CostModule):
         num_turbines = float(self.input_dict['num_turbines'])
         turbine_spacing_rotor_diameters = self.input_dict['turbine_spacing_rotor_diameters']
 
-        # for components in component list determine if base or topping
+        # for components in component list determine if base or topping.
+        # The components sheet may be shared with other projects, so the
+        # Operation column is added to a copy of it.
+        project_data['components'] = project_data['components'].copy()
         project_data['components']['Operation'] = project_data['components']['Lift height m'] > (
             float(hub_height_m * breakpoint_between_base_and_topping_percent))
         boolean_dictionary = {True: 'Top', False: 'Base'}
@@ -398,12 +387,9 @@ class ErectionCost(CostModule):
         # create groups for operations
         top_v_base = project_data['components'].groupby(['Operation'])
 
-        # group crane data by boom system and crane name to get distinct cranes
-        crane_grouped = project_data['crane_specs'].groupby(
-            ['Equipment name',  'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne'])
-
-        # Calculate the crane lift polygons
-        crane_poly = self.calculate_crane_lift_polygons(crane_grouped=crane_grouped)
+        # Calculate the crane lift polygons. They only depend on crane_specs,
+        # so they are shared by the projects with the same cranes.
+        crane_poly = self.project_data_index().crane_lift_polygons()
 
         # loop through operation type (topping vs. base)
         component_max_speed = pd.DataFrame()
@@ -529,14 +515,7 @@ class ErectionCost(CostModule):
         num_turbines = float(self.input_dict['num_turbines'])
         turbine_spacing_rotor_diameters = self.input_dict['turbine_spacing_rotor_diameters']
 
-        offload_cranes = project_data['crane_specs'].where(
-            project_data['crane_specs']['Equipment name'] == 'Offload crane')
-
-        # group crane data by boom system and crane name to get distinct cranes
-        crane_grouped = offload_cranes.groupby(
-            ['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne'])
-
-        crane_poly = self.calculate_crane_lift_polygons(crane_grouped=crane_grouped)
+        crane_poly = self.project_data_index().crane_lift_polygons(offload=True)
         component_group = project_data['components']
         component_max_speed = pd.DataFrame()
         lift_max_wind_speed = self.calculate_component_lift_max_wind_speed(component_group=component_group,
@@ -613,11 +592,10 @@ class ErectionCost(CostModule):
 
     def calculate_crane_lift_polygons(self, crane_grouped):
         """
-        Here we associate polygons with each crane. However, these polygons are not shapes
-        for the lift. Rather, they define functions f(x), where x is a crane lift load and
-        f(x) is the height to which that load can be lifted. To find out whether the crane
-        can lift a particular load, one just needs to check whether a point x (lift mass in
-        tonnes) and y (lift height in m) lies within the crane's polygon.
+        Associates a lift polygon with each crane. See
+        ProjectDataIndex.lift_polygons(), which makes the polygons. The
+        cost calculations get them from ProjectDataIndex.crane_lift_polygons()
+        so that they are made once for each crane_specs sheet.
 
         Parameters
         ----------
@@ -631,37 +609,7 @@ class ErectionCost(CostModule):
         pd.DataFrame
             A dataframe of the cranes and their lifting polygons.
         """
-        crane_poly = pd.DataFrame(
-            columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne', 'Crane poly'])
-        for (equipment_name, equipment_id, crane_name, boom_system, crane_capacity_tonne), crane in crane_grouped:
-            crane = crane.reset_index(drop=True)
-            x = crane['Max capacity tonne']
-            y = crane['Hub height m']
-            wind_speed = min(crane['Max wind speed m per s'])
-            hoist_speed = min(crane['Hoist speed m per min'])
-            travel_speed = min(crane['Speed of travel km per hr'])
-            setup_time = max(crane['Setup time hr'])
-            breakdown_time = max(crane['Breakdown time hr'])
-            crew_type = crane.loc[0, 'Crew type ID'] # For every crane/boom combo the crew is the same, so we can just take first crew.
-            polygon = Polygon([(0, 0), (0, max(y)), (min(x), max(y)), (max(x), min(y)), (max(x), 0)])
-            df = pd.DataFrame([[equipment_name,
-                                equipment_id,
-                                crane_name,
-                                boom_system,
-                                crane_capacity_tonne,
-                                wind_speed,
-                                setup_time,
-                                breakdown_time,
-                                hoist_speed,
-                                travel_speed,
-                                crew_type,
-                                polygon]],
-                              columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne',
-                                       'Max wind speed m per s', 'Setup time hr', 'Breakdown time hr',
-                                       'Hoist speed m per min', 'Speed of travel km per hr',
-                                       'Crew type ID', 'Crane poly'])
-            crane_poly = crane_poly.append(df, sort=True)
-        return crane_poly
+        return ProjectDataIndex.lift_polygons(crane_grouped)
 
     def calculate_component_lift_max_wind_speed(self, *, component_group, crane_poly, component_max_speed, operation):
         """
@@ -713,6 +661,10 @@ class ErectionCost(CostModule):
             crane_poly dataframe passed as a parameter to this function and with a column
             of "Crane bool {operation}" attached.
         """
+        # The max speed dataframes for each crane are collected here and
+        # concatenated onto component_max_speed once at the end.
+        component_max_speed_frames = [component_max_speed]
+
         for idx, crane in crane_poly.iterrows():
             polygon = crane['Crane poly']
 
@@ -755,7 +707,9 @@ class ErectionCost(CostModule):
             component_group_new['Boom system'] = crane['Boom system']
             component_group_new['crane_bool'] = bool_list
 
-            component_max_speed = component_max_speed.append(component_group_new, sort=True)
+            component_max_speed_frames.append(component_group_new)
+
+        component_max_speed = pd.concat(component_max_speed_frames, sort=True)
 
         crane_poly_new = crane_poly.copy()
         crane_poly_new['Crane bool {}'.format(operation)] = min(bool_list)
@@ -864,12 +818,9 @@ class ErectionCost(CostModule):
 
         possible_crane_cost = pd.merge(join_wind_operation, equipment_cost_to_merge, on=['Crane name', 'Boom system', 'Equipment ID', 'Operation'])
 
-        # Remove any duplicates from crew data.
-        crew_deduped = project_data['crew'].drop_duplicates(
-            subset=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID'], keep="first")
-
-        # Merge crew and price data for non-management crews only (base, topping, and offload only)
-        crew_cost = pd.merge(crew_deduped, project_data['crew_price'], on=['Labor type ID'])
+        # Crew and price data, with any duplicates removed from the crew data.
+        # The view is shared, so copy it before columns are added below.
+        crew_cost = self.project_data_index().crew_with_prices().copy()
         self.output_dict['crew_cost'] = crew_cost
         non_management_crew_cost = crew_cost.loc[crew_cost['Operation'].isin(['Base', 'Top', 'Offload'])]
 
@@ -991,7 +942,7 @@ class ErectionCost(CostModule):
 
         self.output_dict['separate_basetop'] = separate_basetop
 
-        total_separate_cost = pd.DataFrame()
+        separate_costs = []
         for operation in separate_basetop['Operation'].unique():
             # find minimum cost option for separate base and topping cranes
             min_val = min(separate_basetop['Total cost USD'].where(separate_basetop['Operation'] == operation).dropna())
@@ -999,14 +950,15 @@ class ErectionCost(CostModule):
             # find the crane that corresponds to the minimum cost for each operation
             crane = separate_basetop[separate_basetop['Total cost USD'] == min_val]
             cost = crane.groupby('Operation').min()
-            total_separate_cost = total_separate_cost.append(cost, sort=True)
+            separate_costs.append(cost)
 
         # reset index for separate crane costs
-        total_separate_cost = total_separate_cost.reset_index()
+        total_separate_cost = pd.concat(separate_costs, sort=True).reset_index()
 
         # duplicate offload records because assuming two offload cranes are on site
-        total_separate_cost = total_separate_cost.append(
-            total_separate_cost.loc[total_separate_cost['Operation'] == 'Offload'], sort=True)
+        total_separate_cost = pd.concat([total_separate_cost,
+                                         total_separate_cost.loc[total_separate_cost['Operation'] == 'Offload']],
+                                        sort=True)
 
         # sum costs for separate cranes to get total for all cranes
         cost_chosen_separate = total_separate_cost['Total cost USD'].sum()
@@ -1115,8 +1067,8 @@ class ErectionCost(CostModule):
 
         # append data for offloading
         if len(offload_specs) != 0:
-            crane_specs_withoffload = crane_specs.append(offload_specs, sort=True)
-            operation_time_withoffload = operation_time.append(offload_time, sort=True)
+            crane_specs_withoffload = pd.concat([crane_specs, offload_specs], sort=True)
+            operation_time_withoffload = pd.concat([operation_time, offload_time], sort=True)
         else:
             raise Exception('ErectionCost calculate_costs(): offload_specs empty')
 
@@ -1159,14 +1111,19 @@ class ErectionCost(CostModule):
 
         crane_choice = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].drop_duplicates()
 
-        selected_detailed_data['crane_boom_operation_concat'] = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].apply(lambda x: '-'.join(x), axis=1)
-        crane_data_output = selected_detailed_data.drop(['Crane name', 'Boom system', 'Operation'], axis=1)
-        crane_data_output = crane_data_output.melt(id_vars=['crane_boom_operation_concat'])
+        # crane_data_output and crane_cost_details are only used in the
+        # details output, so they are not made in costs only mode.
+        if self.detailed_outputs_enabled():
+            selected_detailed_data['crane_boom_operation_concat'] = selected_detailed_data[['Crane name', 'Boom system', 'Operation']].apply(lambda x: '-'.join(x), axis=1)
+            crane_data_output = selected_detailed_data.drop(['Crane name', 'Boom system', 'Operation'], axis=1)
+            crane_data_output = crane_data_output.melt(id_vars=['crane_boom_operation_concat'])
 
-        crane_cost_details = crane_data_output.where(crane_data_output['variable'].str.contains("cost")).dropna()
-        crane_cost_details = crane_cost_details.rename(index=str,
-                            columns={"crane_boom_operation_concat": "Operation ID", "variable": "Type of cost",
-                                     "value": "Cost"})
+            crane_cost_details = crane_data_output.where(crane_data_output['variable'].str.contains("cost")).dropna()
+            crane_cost_details = crane_cost_details.rename(index=str,
+                                columns={"crane_boom_operation_concat": "Operation ID", "variable": "Type of cost",
+                                         "value": "Cost"})
+            self.output_dict['crane_data_output'] = crane_data_output
+            self.output_dict['crane_cost_details'] = crane_cost_details
 
         subtotal_per_diem_labor_management_USD = management_crews_cost['per_diem_costs'].sum()
         subtotal_hourly_labor_management_USD = management_crews_cost['hourly_costs'].sum()
@@ -1192,8 +1149,6 @@ class ErectionCost(CostModule):
         self.output_dict['total_erection_cost'] = total_erection_cost
         self.output_dict['erection_wind_mult'] = erection_wind_mult
         self.output_dict['crane_choice'] = crane_choice
-        self.output_dict['crane_data_output'] = crane_data_output
-        self.output_dict['crane_cost_details'] = crane_cost_details
         self.output_dict['total_cost_summed_erection'] = total_cost_summed_erection
 
         # Put some diagnostic data on selected_detailed_data. This is the number of crews needed
@@ -1210,8 +1165,9 @@ class ErectionCost(CostModule):
 
         # Now get the number of equipment diagnostic data ready. This is held on an instance
         # attribute because it isn't meant to be used outside of the class.
-        self._number_of_equip = selected_detailed_data.merge(self._possible_crane_cost, on=['Crane name', 'Boom system', 'Operation'], how='inner')
-        self._number_of_equip = self._number_of_equip[['Operation', 'Crane name', 'Boom system', 'Number of equipment']]
+        if self.detailed_outputs_enabled():
+            self._number_of_equip = selected_detailed_data.merge(self._possible_crane_cost, on=['Crane name', 'Boom system', 'Operation'], how='inner')
+            self._number_of_equip = self._number_of_equip[['Operation', 'Crane name', 'Boom system', 'Number of equipment']]
 
         # Management crews data
         self.output_dict['management_crews_cost'] = management_crews_cost
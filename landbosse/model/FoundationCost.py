@@ -9,6 +9,7 @@ from sympy import Symbol
 
 from .WeatherDelay import WeatherDelay as WD
 from .CostModule import CostModule
+from .DetailCollector import DetailCollector
 
 
 class FoundationCost(CostModule):
@@ -483,8 +484,6 @@ class FoundationCost(CostModule):
         """
 
         foundation_construction_time = construction_time_input_data['construct_duration'] * 1 / 3
-        #throughput_operations = construction_time_input_data['throughput_operations']
-        throughput_operations = construction_time_input_data['rsmeans']
         material_needs_per_turbine = construction_time_output_data['material_needs_per_turbine']
         quantity_materials_entire_farm = material_needs_per_turbine['Quantity of material'] * construction_time_input_data['num_turbines']
 
@@ -494,12 +493,9 @@ class FoundationCost(CostModule):
         material_needs_entire_farm = construction_time_output_data['material_needs_entire_farm']
         material_needs_entire_farm['Quantity of material'] = quantity_materials_entire_farm
         if construction_time_input_data['turbine_rating_MW'] <= 0.1:
-            operation_data = throughput_operations.where(
-                throughput_operations['Module'] == 'Small DW Foundations').dropna(
-                thresh=4)
+            operation_data = self.project_data_index().rsmeans_for_module('Small DW Foundations')
         else:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Foundations').dropna(
-                thresh=4)
+            operation_data = self.project_data_index().rsmeans_for_module('Foundations')
 
         #operation data for entire wind farm:
         operation_data = pd.merge(material_needs_entire_farm, operation_data, on=['Material type ID'], how='outer')
@@ -522,9 +518,7 @@ class FoundationCost(CostModule):
 
         # pull out management data #TODO: Add this cost to Labor cost next
         if construction_time_input_data['turbine_rating_MW'] > 0.1:
-            crew_cost = self.input_dict['crew_cost']
-            crew = self.input_dict['crew'][self.input_dict['crew']['Crew type ID'].str.contains('M0')]
-            management_crew = pd.merge(crew_cost, crew, on=['Labor type ID'])
+            management_crew = self.project_data_index().management_crew()
             management_crew = management_crew.assign(per_diem_total=management_crew['Per diem USD per day'] * management_crew['Number of workers'] * num_days)
             management_crew = management_crew.assign(hourly_costs_total=management_crew['Hourly rate USD per hour'] * self.input_dict['hour_day'][self.input_dict['time_construct']] * num_days)
             management_crew = management_crew.assign(total_crew_cost_before_wind_delay=management_crew['per_diem_total'] + management_crew['hourly_costs_total'])
@@ -623,17 +617,13 @@ class FoundationCost(CostModule):
         wind_multiplier = 1 / (1 - wind_delay_fraction)
         calculate_costs_output_dict['wind_multiplier'] = wind_multiplier
 
-        rsmeans = calculate_costs_input_dict['rsmeans']
         if calculate_costs_input_dict['turbine_rating_MW'] > 0.1:
-            rsmeans = rsmeans.where(rsmeans['Module'] == 'Foundations').dropna(thresh=4)
+            rsmeans = self.project_data_index().rsmeans_for_module('Foundations')
         else:
-            rsmeans = rsmeans.where(rsmeans['Module'] == 'Small DW Foundations').dropna(thresh=4)
+            rsmeans = self.project_data_index().rsmeans_for_module('Small DW Foundations')
 
         labor_equip_data = pd.merge(material_vol_entire_farm, rsmeans, on=['Material type ID'])
 
-        # Create foundation cost dataframe
-        foundation_cost = pd.DataFrame(columns=['Type of cost', 'Cost USD', 'Phase of construction'])
-
         # Calculate per diem
         per_diem = operation_data['Number of workers'] * operation_data['Number of crews'] * (operation_data['Time construct days'] +
                                                                                               np.ceil(operation_data['Time construct days'] / 7)) * calculate_costs_input_dict['rsmeans_per_diem']
@@ -671,10 +661,8 @@ class FoundationCost(CostModule):
         material_costs = pd.DataFrame([['Materials', material_costs_sum, 'Foundation']],
                                       columns=['Type of cost', 'Cost USD', 'Phase of construction'])
 
-        # Append all cost items to foundation_cost
-        foundation_cost = foundation_cost.append(equipment_costs)
-        foundation_cost = foundation_cost.append(labor_costs)
-        foundation_cost = foundation_cost.append(material_costs)
+        # Combine all cost items into foundation_cost
+        foundation_cost = pd.concat([equipment_costs, labor_costs, material_costs])
 
         # Calculate mobilization cost as percentage of total foundation cost and add to foundation_cost
         # Assumed 5% of total foundation cost and add to foundation_cost for utility scale plant
@@ -694,7 +682,7 @@ class FoundationCost(CostModule):
 
         mob_cost = pd.DataFrame([['Mobilization', mobilization_cost, 'Foundation']], columns=['Type of cost', 'Cost USD', 'Phase of construction'])
 
-        foundation_cost = foundation_cost.append(mob_cost)
+        foundation_cost = pd.concat([foundation_cost, mob_cost])
 
         # todo: we add a separate tab in the output file for costs (all costs will be the same format but it's a different format than other data)
         # columns in cost tab would include project_id, module, operation_id, type_of_cost, total_or_per_turbine, cost_usd
@@ -712,15 +700,15 @@ class FoundationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Collects the rows of the details output in a DetailCollector and
+        returns them as a block of columns.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        pd.DataFrame
+            The block of rows, with the columns in DetailCollector.columns.
         """
 
         # Note that some values are cast with float() so that XlsxWriter
@@ -728,111 +716,107 @@ class FoundationCost(CostModule):
         # numbers. XlsxWriter, interestingly, cannot handle np.float32()
         # types.
 
-        result = []
         module = type(self).__name__
-        result.append({
-            'unit': '',
-            'type': 'variable',
-            'variable_df_key_col_name': 'wind_multiplier',
-            'value': float(self.output_dict['wind_multiplier'])
-        })
-        result.append({
-            'unit': 'kN',
-            'type': 'variable',
-            'variable_df_key_col_name': 'F_dead',
-            'value': float(self.output_dict['F_dead_kN_per_turbine'])
-        })
-        result.append({
-            'unit': 'kN',
-            'type': 'variable',
-            'variable_df_key_col_name': 'F_horiz',
-            'value': float(self.output_dict['F_horiz_kN_per_turbine'])
-        })
-        result.append({
-            'unit': 'kN_m',
-            'type': 'variable',
-            'variable_df_key_col_name': 'M_tot_kN',
-            'value': float(self.output_dict['M_tot_kN_m_per_turbine'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius_o',
-            'value': float(self.output_dict['Radius_o_m'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius_g',
-            'value': float(self.output_dict['Radius_g_m'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius_b',
-            'value': float(self.output_dict['Radius_b_m'])
-        })
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Radius',
-            'value': float(self.output_dict['Radius_m'])
-        })
-        result.append({
-            'unit': 'm^3',
-            'type': 'variable',
-            'variable_df_key_col_name': 'foundation_volume_concrete_m3_per_turbine',
-            'value': float(self.output_dict['foundation_volume_concrete_m3_per_turbine'])
-        })
-        result.append({
-            'unit': 'short_ton',
-            'type': 'variable',
-            'variable_df_key_col_name': 'steel_mass_short_ton_per_turbine',
-            'value': self.output_dict['steel_mass_short_ton_per_turbine']
-        })
+        result = DetailCollector(self.project_name, module)
+        result.add(
+            unit='',
+            type='variable',
+            variable_df_key_col_name='wind_multiplier',
+            value=float(self.output_dict['wind_multiplier'])
+        )
+        result.add(
+            unit='kN',
+            type='variable',
+            variable_df_key_col_name='F_dead',
+            value=float(self.output_dict['F_dead_kN_per_turbine'])
+        )
+        result.add(
+            unit='kN',
+            type='variable',
+            variable_df_key_col_name='F_horiz',
+            value=float(self.output_dict['F_horiz_kN_per_turbine'])
+        )
+        result.add(
+            unit='kN_m',
+            type='variable',
+            variable_df_key_col_name='M_tot_kN',
+            value=float(self.output_dict['M_tot_kN_m_per_turbine'])
+        )
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Radius_o',
+            value=float(self.output_dict['Radius_o_m'])
+        )
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Radius_g',
+            value=float(self.output_dict['Radius_g_m'])
+        )
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Radius_b',
+            value=float(self.output_dict['Radius_b_m'])
+        )
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Radius',
+            value=float(self.output_dict['Radius_m'])
+        )
+        result.add(
+            unit='m^3',
+            type='variable',
+            variable_df_key_col_name='foundation_volume_concrete_m3_per_turbine',
+            value=float(self.output_dict['foundation_volume_concrete_m3_per_turbine'])
+        )
+        result.add(
+            unit='short_ton',
+            type='variable',
+            variable_df_key_col_name='steel_mass_short_ton_per_turbine',
+            value=self.output_dict['steel_mass_short_ton_per_turbine']
+        )
         # foundation_volume_concrete_m3_per_turbine
-        result.append({
-            'unit': 'm^3',
-            'type': 'variable',
-            'variable_df_key_col_name': 'foundation_volume_concrete_m3_per_turbine',
-            'value': self.output_dict['foundation_volume_concrete_m3_per_turbine']
-        })
+        result.add(
+            unit='m^3',
+            type='variable',
+            variable_df_key_col_name='foundation_volume_concrete_m3_per_turbine',
+            value=self.output_dict['foundation_volume_concrete_m3_per_turbine']
+        )
 
         for row in self.output_dict['operation_data_id_days_crews_workers'].itertuples():
             dashed_row = '{}-{}-{}-{}'.format(row[1], math.ceil(row[2]), row[3], row[4])
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'operation_data: Operation ID-Number of days-Number of crews-Number of workers',
-                'value': dashed_row
-            })
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='operation_data: Operation ID-Number of days-Number of crews-Number of workers',
+                value=dashed_row
+            )
 
         for row in self.output_dict['material_needs_per_turbine'].itertuples():
             # This must be formatted in Python
             dashed_row = '{}-{}-{:.2e}'.format(row[0], row[1], row[2])
-            result.append({
-                'unit': row[3],
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'material_needs_per_turbine: {}'.format('-'.join(self.output_dict['material_needs_per_turbine'].columns[:-1])),
-                'value': dashed_row
-            })
+            result.add(
+                unit=row[3],
+                type='dataframe',
+                variable_df_key_col_name='material_needs_per_turbine: {}'.format('-'.join(self.output_dict['material_needs_per_turbine'].columns[:-1])),
+                value=dashed_row
+            )
 
         for row in self.output_dict['total_foundation_cost'].itertuples():
             dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                value=dashed_row,
+                last_number=row[2]
+            )
 
-        self.output_dict['foundation_cost_csv'] = result
-        return result
+        self.output_dict['foundation_cost_csv'] = result.to_dataframe()
+        return self.output_dict['foundation_cost_csv']
 
     def outputs_for_module_type_operation(self, input_dict, output_dict):
         result = []
@@ -907,7 +891,8 @@ class FoundationCost(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detailed_outputs_enabled():
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.output_dict['labor_equip_data']
             # self.output_dict['foundation_module_type_operation'] = self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['foundation_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
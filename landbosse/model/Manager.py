@@ -1,6 +1,8 @@
 import traceback
 import math
 
+import pandas as pd
+
 from .ManagementCost import ManagementCost
 from .FoundationCost import FoundationCost
 from .SubstationCost import SubstationCost
@@ -33,6 +35,11 @@ class Manager:
         self.output_dict = output_dict
 
     def execute_landbosse(self, project_name):
+        # In costs only mode, the outputs made during the run are dropped at
+        # the end, except the costs_by_module_type_operation blocks. Keys
+        # that were on the output dictionary before the run are kept.
+        keys_before_run = set(self.output_dict.keys())
+
         try:
             # Create weather window that will be used for all tasks (window for entire project; selected to restrict to seasons and hours specified)
             weather_data_user_input = self.input_dict['weather_window']
@@ -91,13 +98,13 @@ class Manager:
                 road_cost.at[index, 'Cost USD'] = other['Cost USD'] - amount_shorter_than_input_construction_time * 55500
                 self.output_dict['total_road_cost'] = road_cost
 
-            total_costs = self.output_dict['total_collection_cost']
-            total_costs = total_costs.append(self.output_dict['total_road_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_transdist_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_substation_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_foundation_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_erection_cost'], sort=False)
-            total_costs = total_costs.append(self.output_dict['total_development_cost'], sort=False)
+            total_costs = pd.concat([self.output_dict['total_collection_cost'],
+                                     self.output_dict['total_road_cost'],
+                                     self.output_dict['total_transdist_cost'],
+                                     self.output_dict['total_substation_cost'],
+                                     self.output_dict['total_foundation_cost'],
+                                     self.output_dict['total_erection_cost'],
+                                     self.output_dict['total_development_cost']], sort=False)
 
             self.input_dict['project_value_usd'] = total_costs.sum(numeric_only=True)[0]
             self.input_dict['foundation_cost_usd'] = self.output_dict['total_foundation_cost'].sum(numeric_only=True)[0]
@@ -109,3 +116,23 @@ class Manager:
         except Exception:
             traceback.print_exc()
             return 1  # module did not run successfully
+        finally:
+            if self.input_dict.get('costs_only', False):
+                self.drop_intermediate_outputs(keys_to_keep=keys_before_run)
+
+    def drop_intermediate_outputs(self, keys_to_keep=()):
+        """
+        Removes everything from the output dictionary except the
+        costs_by_module_type_operation blocks (the keys that end in
+        '_module_type_operation'). This frees the intermediate dataframes
+        of the modules, which are not needed when only costs are output.
+
+        Parameters
+        ----------
+        keys_to_keep : iterable
+            Other keys to keep on the output dictionary.
+        """
+        keys_to_keep = set(keys_to_keep)
+        for key in list(self.output_dict.keys()):
+            if key not in keys_to_keep and not key.endswith('_module_type_operation'):
+                del self.output_dict[key]
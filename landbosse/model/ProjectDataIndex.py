@@ -0,0 +1,297 @@
+import hashlib
+from collections import OrderedDict
+
+import pandas as pd
+from shapely.geometry.polygon import Polygon
+
+
+class ProjectDataIndex:
+    """
+    ProjectDataIndex is a read-only "database" built on top of the sheets of
+    a project_data .xlsx file. The cost modules repeatedly run the same
+    queries against the same sheets, such as filtering rsmeans by module or
+    joining the management crews with their prices. This class builds each
+    of those views once and hands the same dataframe to every module that
+    asks for it.
+
+    Views are keyed by a fingerprint of the contents of the sheets they are
+    built from. The views themselves are held in a cache shared by every
+    instance of this class. So, within a parametric sweep, a view is only
+    rebuilt when a parametric modification (or a labor cost multiplier)
+    changes a sheet the view depends on. Views built from untouched sheets
+    are reused from project to project.
+
+    The dataframes returned by this class are shared. Callers must not
+    modify them in place. If a caller needs to add columns or change
+    values, it must make a .copy() first.
+
+    The views available are:
+
+    rsmeans_for_module()
+        The rows of rsmeans for a particular module, such as 'Foundations'
+        or 'Roads'.
+
+    management_crew()
+        The crews with a 'Crew type ID' containing 'M0', joined with their
+        prices from crew_price.
+
+    crew_with_prices()
+        All crews, with duplicates removed, joined with their prices from
+        crew_price.
+
+    crane_lift_polygons()
+        The lift polygons of the cranes in crane_specs, or of the offload
+        cranes only.
+    """
+
+    # _shared_views is a class attribute that holds the views built by all
+    # instances. Keys are tuples of the name of the view and the
+    # fingerprints of the sheets the view depends on. The cache is bounded
+    # so large sweeps that modify sheets on every project do not grow it
+    # without limit.
+    _shared_views = OrderedDict()
+    _max_shared_views = 512
+
+    def __init__(self, project_data_dataframes):
+        """
+        Parameters
+        ----------
+        project_data_dataframes : dict
+            Keys are the names of the sheets in the project data and values
+            are the dataframes of those sheets. Once the index is created,
+            these dataframes are treated as read-only.
+        """
+        self._sheets = project_data_dataframes
+        self._fingerprints = dict()
+
+    @classmethod
+    def from_input_dict(cls, input_dict):
+        """
+        Creates an index from the dataframes already placed in a master input
+        dictionary. This is for callers, such as unit tests, that assemble
+        an input dictionary by hand rather than through XlsxReader.
+
+        Parameters
+        ----------
+        input_dict : dict
+            The master input dictionary.
+
+        Returns
+        -------
+        ProjectDataIndex
+            The index over the dataframes in the input dictionary.
+        """
+        sheets = dict(input_dict.get('project_data', dict()))
+        if 'rsmeans' in input_dict:
+            sheets['rsmeans'] = input_dict['rsmeans']
+        if 'crew' in input_dict:
+            sheets['crew'] = input_dict['crew']
+        if 'crew_cost' in input_dict:
+            sheets['crew_price'] = input_dict['crew_cost']
+        return cls(sheets)
+
+    @classmethod
+    def clear_shared_views(cls):
+        """
+        Empties the cache of views shared among all instances.
+        """
+        cls._shared_views.clear()
+
+    def sheet_fingerprint(self, sheet_name):
+        """
+        Computes a fingerprint of the contents of a sheet. The fingerprint
+        covers the column names and every value in the sheet, so two
+        sheets with the same fingerprint produce the same views.
+
+        Fingerprints are computed once per instance.
+
+        Parameters
+        ----------
+        sheet_name : str
+            The name of the sheet to fingerprint.
+
+        Returns
+        -------
+        str
+            The hexadecimal digest of the contents of the sheet.
+        """
+        if sheet_name not in self._fingerprints:
+            df = self._sheets[sheet_name]
+            digest = hashlib.sha1()
+            digest.update(repr(list(df.columns)).encode())
+            digest.update(repr(list(df.dtypes.astype(str))).encode())
+            digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+            self._fingerprints[sheet_name] = digest.hexdigest()
+        return self._fingerprints[sheet_name]
+
+    def _view(self, view_name, sheet_names, build):
+        """
+        Returns a view from the shared cache, building it if it is missing.
+
+        Parameters
+        ----------
+        view_name : str
+            The name of the view, including any arguments that select it.
+
+        sheet_names : list
+            The names of the sheets the view is built from.
+
+        build : callable
+            Called with no arguments to build the view on a cache miss.
+
+        Returns
+        -------
+        pd.DataFrame
+            The view.
+        """
+        key = (view_name,) + tuple(self.sheet_fingerprint(sheet_name) for sheet_name in sheet_names)
+        views = type(self)._shared_views
+        if key in views:
+            views.move_to_end(key)
+            return views[key]
+        view = build()
+        views[key] = view
+        if len(views) > self._max_shared_views:
+            views.popitem(last=False)
+        return view
+
+    def rsmeans_for_module(self, module):
+        """
+        Returns the rows of rsmeans that belong to a module. Rows with fewer
+        than 4 values are dropped, as the modules have always done.
+
+        Parameters
+        ----------
+        module : str
+            The value of the 'Module' column to select, such as 'Foundations'.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows of rsmeans for the module.
+        """
+        def build():
+            rsmeans = self._sheets['rsmeans']
+            return rsmeans.where(rsmeans['Module'] == module).dropna(thresh=4)
+
+        return self._view(f'rsmeans_for_module/{module}', ['rsmeans'], build)
+
+    def management_crew(self):
+        """
+        Returns the management crews (those with 'M0' in their 'Crew type ID')
+        joined with their prices.
+
+        Returns
+        -------
+        pd.DataFrame
+            The columns of crew_price followed by the columns of crew.
+        """
+        def build():
+            crew = self._sheets['crew']
+            management_crew = crew[crew['Crew type ID'].str.contains('M0')]
+            return pd.merge(self._sheets['crew_price'], management_crew, on=['Labor type ID'])
+
+        return self._view('management_crew', ['crew', 'crew_price'], build)
+
+    def crew_with_prices(self):
+        """
+        Returns every crew joined with its prices. Duplicate crew rows are
+        removed before the join.
+
+        Returns
+        -------
+        pd.DataFrame
+            The columns of crew followed by the columns of crew_price.
+        """
+        def build():
+            crew_deduped = self._sheets['crew'].drop_duplicates(
+                subset=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID'], keep='first')
+            return pd.merge(crew_deduped, self._sheets['crew_price'], on=['Labor type ID'])
+
+        return self._view('crew_with_prices', ['crew', 'crew_price'], build)
+
+    def crane_lift_polygons(self, offload=False):
+        """
+        Returns the lift polygons of the cranes in crane_specs. See
+        lift_polygons().
+
+        Parameters
+        ----------
+        offload : bool
+            True for the polygons of the offload cranes only, False for
+            the polygons of all the cranes.
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe of the cranes and their lifting polygons.
+        """
+        def build():
+            crane_specs = self._sheets['crane_specs']
+            if offload:
+                crane_specs = crane_specs.where(crane_specs['Equipment name'] == 'Offload crane')
+
+            # group crane data by boom system and crane name to get distinct cranes
+            crane_grouped = crane_specs.groupby(
+                ['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne'])
+            return self.lift_polygons(crane_grouped)
+
+        view_name = 'crane_lift_polygons/offload' if offload else 'crane_lift_polygons'
+        return self._view(view_name, ['crane_specs'], build)
+
+    @classmethod
+    def lift_polygons(cls, crane_grouped):
+        """
+        Here we associate polygons with each crane. However, these polygons are not shapes
+        for the lift. Rather, they define functions f(x), where x is a crane lift load and
+        f(x) is the height to which that load can be lifted. To find out whether the crane
+        can lift a particular load, one just needs to check whether a point x (lift mass in
+        tonnes) and y (lift height in m) lies within the crane's polygon.
+
+        Parameters
+        ----------
+        crane_grouped : pandas.core.groupby.generic.DataFrameGroupBy
+            The aggregation of the cranes to compute the lift polygons for. The columns
+            in the aggregation are assume to be 'Equipment name', 'Crane name', 'Boom system',
+            'Crane capacity tonne'
+
+        Returns
+        -------
+        pd.DataFrame
+            A dataframe of the cranes and their lifting polygons.
+        """
+        crane_poly_rows = []
+        for (equipment_name, equipment_id, crane_name, boom_system, crane_capacity_tonne), crane in crane_grouped:
+            crane = crane.reset_index(drop=True)
+            x = crane['Max capacity tonne']
+            y = crane['Hub height m']
+            wind_speed = min(crane['Max wind speed m per s'])
+            hoist_speed = min(crane['Hoist speed m per min'])
+            travel_speed = min(crane['Speed of travel km per hr'])
+            setup_time = max(crane['Setup time hr'])
+            breakdown_time = max(crane['Breakdown time hr'])
+            crew_type = crane.loc[0, 'Crew type ID'] # For every crane/boom combo the crew is the same, so we can just take first crew.
+            polygon = Polygon([(0, 0), (0, max(y)), (min(x), max(y)), (max(x), min(y)), (max(x), 0)])
+            crane_poly_rows.append([equipment_name,
+                                    equipment_id,
+                                    crane_name,
+                                    boom_system,
+                                    crane_capacity_tonne,
+                                    wind_speed,
+                                    setup_time,
+                                    breakdown_time,
+                                    hoist_speed,
+                                    travel_speed,
+                                    crew_type,
+                                    polygon])
+
+        # Make the dataframe once from all the rows, rather than appending
+        # a dataframe for every crane. Columns are sorted by name as they
+        # always have been.
+        crane_poly = pd.DataFrame(crane_poly_rows,
+                                  columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne',
+                                           'Max wind speed m per s', 'Setup time hr', 'Breakdown time hr',
+                                           'Hoist speed m per min', 'Speed of travel km per hr',
+                                           'Crew type ID', 'Crane poly'])
+        crane_poly = crane_poly.sort_index(axis=1)
+        return crane_poly
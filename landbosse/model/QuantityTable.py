@@ -0,0 +1,347 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class QuantityTable:
+    """
+    A QuantityTable holds the costs of one project as a function of price
+    items, so that the costs for many price vectors are found without
+    running the cost modules.
+
+    A price item is a cell specification, like those of the parametric
+    list, that points to a price: a rate in crew_price, equip_price,
+    material_price or rsmeans, the fuel cost or the labor cost multiplier.
+    See price_columns.
+
+    Prices only multiply quantities in the cost modules. Quantities, such
+    as volumes of concrete, crew hours, crane hours and weather delays,
+    do not depend on prices. So each cost row of each module is an affine
+    function of the prices, and the quantities in the table are the
+    derivatives of the raw cost of each row with respect to each price
+    item. The cost rows for any number of price vectors are then the
+    anchor costs plus one sparse matrix product.
+
+    The exception is ErectionCost, which chooses the least cost cranes. The
+    cost of every crane option is also an affine function of the prices, so
+    the table holds those too. When the prices change which cranes are
+    chosen, reprice() flags the price vector so it can be sent back to the
+    full model.
+
+    Labor rates are multiplied by the labor cost multiplier, so the costs
+    are not affine in both at once. A table cannot have the labor cost
+    multiplier together with crew_price or rsmeans items. Likewise, the
+    markups of ManagementCost multiply the value of the project, which is
+    the sum of the costs of the other modules, so a table cannot have
+    markups together with other price items. See is_linear().
+    """
+
+    # The columns of the project data sheets, and of the project list,
+    # that hold prices.
+    price_columns = {
+        'crew_price': ['Hourly rate USD per hour', 'Per diem USD per day'],
+        'equip_price': ['Equipment price USD per hour'],
+        'material_price': ['Material price USD per unit'],
+        'rsmeans': ['Rate USD per unit'],
+        'project list': [
+            'Fuel cost USD per gal',
+            'Labor cost multiplier',
+            'Markup contingency',
+            'Markup warranty management',
+            'Markup sales and use tax',
+            'Markup overhead',
+            'Markup profit margin'
+        ]
+    }
+
+    # The sheets with labor rates that the labor cost multiplier applies to.
+    labor_sheets = ['crew_price', 'rsmeans']
+
+    # The columns of the crane options in crane_options()
+    crane_option_columns = ['Choice', 'Operation', 'Crane name', 'Boom system', 'Total cost USD']
+
+    def __init__(self, project_id, price_items, anchor_prices, anchor_costs, quantities,
+                 crane_options=None, crane_quantities=None, allow_same_crane=True):
+        """
+        Parameters
+        ----------
+        project_id : str
+            The Project ID of the project.
+
+        price_items : list
+            The cell specifications of the price items.
+
+        anchor_prices : numpy.ndarray
+            The price of each item at the anchor, the point where the full
+            model was run.
+
+        anchor_costs : pandas.DataFrame
+            The cost rows of the project at the anchor, with the columns in
+            COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS.
+
+        quantities : numpy.ndarray or scipy.sparse matrix
+            One row per price item and one column per cost row. The change
+            in the raw cost of the row for a change of 1 in the price.
+
+        crane_options : pandas.DataFrame
+            Optional. The crane options of ErectionCost at the anchor, as
+            returned by crane_options().
+
+        crane_quantities : numpy.ndarray
+            Optional. One row per price item and one column per crane
+            option. The change in the total cost of the option for a change
+            of 1 in the price.
+
+        allow_same_crane : bool
+            The allow_same_flag of ErectionCost.
+        """
+        self.project_id = project_id
+        self.price_items = list(price_items)
+        self.anchor_prices = np.asarray(anchor_prices, dtype=float)
+        self.anchor_costs = anchor_costs.reset_index(drop=True)
+        self.quantities = sparse.csr_matrix(quantities)
+        self.crane_options = None if crane_options is None else crane_options.reset_index(drop=True)
+        self.crane_quantities = None if crane_quantities is None else np.asarray(crane_quantities, dtype=float)
+        self.allow_same_crane = allow_same_crane
+        self.anchor_crane_choices = None
+        if self.crane_options is not None:
+            self.anchor_crane_choices = self.crane_choices(self.crane_options['Total cost USD'].values[np.newaxis, :])[0]
+
+    @classmethod
+    def is_price_item(cls, cell_specification):
+        """
+        Parameters
+        ----------
+        cell_specification : str
+            A cell specification in the form "dataframe/row/column"
+
+        Returns
+        -------
+        bool
+            True if the cell specification points to a price.
+        """
+        parts = cell_specification.split('/')
+        if len(parts) != 3:
+            return False
+        dataframe_name, _, column_name = parts
+        return column_name in cls.price_columns.get(dataframe_name, [])
+
+    @classmethod
+    def is_linear(cls, price_items):
+        """
+        Parameters
+        ----------
+        price_items : list
+            Cell specifications.
+
+        Returns
+        -------
+        bool
+            True if all of the cell specifications are price items and the
+            costs are affine in all of them at once.
+        """
+        if not all(cls.is_price_item(item) for item in price_items):
+            return False
+        dataframe_names = {item.split('/')[0] for item in price_items}
+        has_labor_multiplier = any(item.endswith('/Labor cost multiplier') for item in price_items)
+        if has_labor_multiplier and dataframe_names.intersection(cls.labor_sheets):
+            return False
+        markup_count = sum(item.split('/')[2].startswith('Markup ') for item in price_items)
+        return markup_count == 0 or markup_count == len(price_items)
+
+    @classmethod
+    def crane_options(cls, output_dict):
+        """
+        Collects the crane options that ErectionCost chose from.
+
+        Parameters
+        ----------
+        output_dict : dict
+            The output dictionary of a project that was not run in costs
+            only mode.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per option, with the columns in crane_option_columns.
+            Choice is 'separate' for a crane for one operation and 'same'
+            for one crane for base and topping. None if the project has no
+            crane options.
+        """
+        if 'separate_basetop' not in output_dict or 'same_basetop' not in output_dict:
+            return None
+        separate = output_dict['separate_basetop'].assign(Choice='separate')
+        same = output_dict['same_basetop'].assign(Choice='same')
+        return pd.concat([separate[cls.crane_option_columns], same[cls.crane_option_columns]], ignore_index=True)
+
+    def crane_choices(self, option_costs):
+        """
+        Chooses the cranes the same way as
+        ErectionCost.find_minimum_cost_cranes()
+
+        Parameters
+        ----------
+        option_costs : numpy.ndarray
+            The total cost of each crane option, with one row per price
+            vector and one column per row of crane_options.
+
+        Returns
+        -------
+        numpy.ndarray
+            One row per price vector. The first column is 1 if the same
+            crane is used for base and topping. The other columns are the
+            positions of the chosen options.
+        """
+        choice = self.crane_options['Choice'].values
+        operation = self.crane_options['Operation'].values
+        separate = choice == 'separate'
+
+        choices = []
+        cost_separate = np.zeros(len(option_costs))
+        for name in pd.unique(operation[separate]):
+            positions = np.flatnonzero(separate & (operation == name))
+            costs = option_costs[:, positions]
+            choices.append(positions[np.argmin(costs, axis=1)])
+            # Two offload cranes are on site.
+            cost_separate += costs.min(axis=1) * (2 if name == 'Offload' else 1)
+        choices = np.column_stack(choices) if len(choices) > 0 else np.zeros((len(option_costs), 0), dtype=int)
+
+        same_positions = np.flatnonzero(~separate)
+        use_same = np.zeros(len(option_costs), dtype=bool)
+        if self.allow_same_crane and len(same_positions) > 0:
+            same_costs = option_costs[:, same_positions]
+            use_same = ~(cost_separate < same_costs.min(axis=1))
+            same_choice = same_positions[np.argmin(same_costs, axis=1)]
+            choices = np.where(use_same[:, np.newaxis], same_choice[:, np.newaxis], choices)
+
+        return np.column_stack([use_same.astype(int), choices])
+
+    def reprice(self, prices):
+        """
+        Computes the raw costs of the cost rows for price vectors.
+
+        Parameters
+        ----------
+        prices : numpy.ndarray
+            One row per price vector and one column per price item.
+
+        Returns
+        -------
+        numpy.ndarray, numpy.ndarray
+            The raw costs, with one row per price vector and one column per
+            cost row. Second, True for the price vectors that change the
+            choice of cranes. Their costs must come from the full model.
+        """
+        prices = np.atleast_2d(np.asarray(prices, dtype=float))
+        price_changes = prices - self.anchor_prices
+        raw_costs = self.anchor_costs['raw_cost'].values.astype(float) + (self.quantities.T @ price_changes.T).T
+
+        needs_full_model = np.zeros(len(prices), dtype=bool)
+        if self.crane_options is not None:
+            choices = self.crane_choices(self.option_costs(prices))
+            needs_full_model = (choices != self.anchor_crane_choices).any(axis=1)
+
+        return raw_costs, needs_full_model
+
+    def option_costs(self, prices):
+        """
+        Computes the total costs of the crane options for price vectors.
+
+        Parameters
+        ----------
+        prices : numpy.ndarray
+            One row per price vector and one column per price item.
+
+        Returns
+        -------
+        numpy.ndarray
+            One row per price vector and one column per row of
+            crane_options.
+        """
+        price_changes = np.atleast_2d(np.asarray(prices, dtype=float)) - self.anchor_prices
+        return self.crane_options['Total cost USD'].values.astype(float) + price_changes @ self.crane_quantities
+
+    def cost_rows(self, raw_costs, project_ids_with_serial):
+        """
+        Makes the cost rows of price vectors from the raw costs returned by
+        reprice(). The per turbine, per project and per kW costs are
+        computed the same way as
+        CostModule.costs_by_module_type_operation_block()
+
+        Parameters
+        ----------
+        raw_costs : numpy.ndarray
+            One row per price vector and one column per cost row.
+
+        project_ids_with_serial : array-like
+            The Project ID with serial of each price vector.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The cost rows of all the price vectors, with the columns in
+            COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS.
+        """
+        vector_count, row_count = raw_costs.shape
+        rows = self.anchor_costs.iloc[np.tile(np.arange(row_count), vector_count)].reset_index(drop=True)
+        rows['project_id_with_serial'] = np.repeat(np.asarray(project_ids_with_serial), row_count)
+
+        raw_cost = raw_costs.ravel()
+        num_turbines = rows['num_turbines'].values.astype(float)
+        project_size_kw = num_turbines * rows['turbine_rating_MW'].values.astype(float) * 1000
+        per_turbine = rows['raw_cost_total_or_per_turbine'].values == 'turbine'
+        cost_per_project = np.where(per_turbine, raw_cost * num_turbines, raw_cost)
+
+        rows['raw_cost'] = raw_cost
+        rows['cost_per_turbine'] = np.where(per_turbine, raw_cost, raw_cost / num_turbines)
+        rows['cost_per_project'] = cost_per_project
+        rows['usd_per_kw_per_project'] = cost_per_project / project_size_kw
+        return rows
+
+    def module_costs(self, raw_costs):
+        """
+        Sums the raw costs returned by reprice() by module, without making
+        the cost rows. The sums are the same as
+        XlsxManagerRunner.extract_costs_by_module()
+
+        Parameters
+        ----------
+        raw_costs : numpy.ndarray
+            One row per price vector and one column per cost row.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per price vector and one column per module, plus a
+            Total column, of costs per project.
+        """
+        per_turbine = self.anchor_costs['raw_cost_total_or_per_turbine'].values == 'turbine'
+        multipliers = np.where(per_turbine, self.anchor_costs['num_turbines'].values.astype(float), 1.0)
+        modules, module_indices = np.unique(self.anchor_costs['module'].values, return_inverse=True)
+        indicator = np.zeros((len(self.anchor_costs), len(modules)))
+        indicator[np.arange(len(self.anchor_costs)), module_indices] = multipliers
+        costs = pd.DataFrame(raw_costs @ indicator, columns=modules)
+        costs['Total'] = costs.sum(axis=1)
+        return costs
+
+    def quantity_table(self):
+        """
+        Returns
+        -------
+        pandas.DataFrame
+            One row for each price item that a cost row depends on, with
+            the columns Project ID, module, operation_id, type_of_cost,
+            raw_cost_total_or_per_turbine, Price item and Quantity.
+        """
+        quantities = self.quantities.tocoo()
+        cost_rows = self.anchor_costs.iloc[quantities.col]
+        table = pd.DataFrame({
+            'Project ID': self.project_id,
+            'module': cost_rows['module'].values,
+            'operation_id': cost_rows['operation_id'].values,
+            'type_of_cost': cost_rows['type_of_cost'].values,
+            'raw_cost_total_or_per_turbine': cost_rows['raw_cost_total_or_per_turbine'].values,
+            'Price item': np.asarray(self.price_items, dtype=object)[quantities.row],
+            'Quantity': quantities.data
+        })
+        return table.sort_values(['module', 'Price item'], kind='mergesort').reset_index(drop=True)
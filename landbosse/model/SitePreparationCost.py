@@ -4,6 +4,7 @@ import math
 from .WeatherDelay import WeatherDelay as WD
 import traceback
 from .CostModule import CostModule
+from .DetailCollector import DetailCollector
 
 
 class SitePreparationCost(CostModule):
@@ -278,8 +279,6 @@ class SitePreparationCost(CostModule):
             - Cost of labor and equipment rental prior to weather delays
 
         """
-        throughput_operations = estimate_construction_time_input['rsmeans']
-
         #TODO: Figure out where 'construct_duration' gets read in.
         estimate_construction_time_output['road_construction_time'] = estimate_construction_time_input[
                                                                           'construct_duration'] * 1 / 5  # assumes road construction occurs for 1/5 of project time
@@ -287,10 +286,9 @@ class SitePreparationCost(CostModule):
         # Main switch between small DW wind and (utility scale + distributed wind)
         # select operations for roads module that have data
         if estimate_construction_time_input['turbine_rating_MW'] >= 0.1:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Roads').dropna(thresh=4)
+            operation_data = self.project_data_index().rsmeans_for_module('Roads')
         else:
-            operation_data = throughput_operations.where(throughput_operations['Module'] == 'Small DW Roads').dropna(
-                thresh=4)
+            operation_data = self.project_data_index().rsmeans_for_module('Small DW Roads')
             operation_data = operation_data.dropna(subset=['Units'])
 
         # create list of unique material units for operations
@@ -356,11 +354,8 @@ class SitePreparationCost(CostModule):
                                       'embankment cubic yards road': estimate_construction_time_output['topsoil_volume']
                                       }
 
-        material_needs = pd.DataFrame(columns=['Units', 'Quantity of material'])
-        for unit in list_units:
-            unit_quantity = pd.DataFrame([[unit, material_quantity_dict[unit]]],
-                                         columns=['Units', 'Quantity of material'])
-            material_needs = material_needs.append(unit_quantity)
+        material_needs = pd.DataFrame([[unit, material_quantity_dict[unit]] for unit in list_units],
+                                      columns=['Units', 'Quantity of material'])
 
         estimate_construction_time_output['material_needs'] = material_needs
 
@@ -383,9 +378,7 @@ class SitePreparationCost(CostModule):
 
         # pull out management data
         if estimate_construction_time_input['turbine_rating_MW'] >= 0.1:
-            crew_cost = self.input_dict['crew_cost']
-            crew = self.input_dict['crew'][self.input_dict['crew']['Crew type ID'].str.contains('M0')]
-            management_crew = pd.merge(crew_cost, crew, on=['Labor type ID'])
+            management_crew = self.project_data_index().management_crew()
             management_crew = management_crew.assign(per_diem_total=
                                                      management_crew['Per diem USD per day'] *
                                                      management_crew['Number of workers'] *
@@ -618,9 +611,6 @@ class SitePreparationCost(CostModule):
 
 
 
-        # Create empty road cost (showing cost breakdown by type) dataframe:
-        road_cost = pd.DataFrame(columns=['Type of cost', 'Cost USD', 'Phase of construction'])
-
         #Filter out equipment costs from rsmeans tab:
         equipment_data = labor_equip_data[labor_equip_data['Type of cost'] == 'Equipment rental'].copy()
         equipment_data['Cost USD'] = (equipment_data['Quantity of material'] * equipment_data['Rate USD per unit']) * calculate_cost_output_dict['wind_multiplier']     #TODO: Annika can you confirm if this is correct.
@@ -655,10 +645,8 @@ class SitePreparationCost(CostModule):
         additional_costs = pd.DataFrame([['Other', cost_adder, 'Roads']],
                                         columns=['Type of cost', 'Cost USD', 'Phase of construction'])
 
-        road_cost = road_cost.append(material_costs)
-        road_cost = road_cost.append(equipment_costs)
-        road_cost = road_cost.append(labor_costs)
-        road_cost = road_cost.append(additional_costs)
+        # Road cost (showing cost breakdown by type) dataframe:
+        road_cost = pd.concat([material_costs, equipment_costs, labor_costs, additional_costs])
 
         # set mobilization cost equal to 5% of total road cost for utility scale model and function of
         # of turbine size for distributed wind:
@@ -680,7 +668,7 @@ class SitePreparationCost(CostModule):
                                                   columns=['Type of cost', 'Cost USD', 'Phase of construction'])
 
 
-        road_cost = road_cost.append(mobilization_costs)
+        road_cost = pd.concat([road_cost, mobilization_costs])
         total_road_cost = road_cost
         calculate_cost_output_dict['total_road_cost'] = total_road_cost
         calculate_cost_output_dict['siteprep_construction_months'] = siteprep_construction_months
@@ -689,122 +677,118 @@ class SitePreparationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Collects the rows of the details output in a DetailCollector and
+        returns them as a block of columns.
 
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        pd.DataFrame
+            The block of rows, with the columns in DetailCollector.columns.
         """
-        result = []
         module = type(self).__name__
+        result = DetailCollector(self.project_name, module)
 
         # Note that some values are cast with float() so that XlsxWriter
         # (the library depended on by XlsxGenerator) can output them as
         # numbers. XlsxWriter, interestingly, cannot handle np.float32()
         # types.
 
-        result.append({
-            'unit': 'm^3',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Total road volume',
-            'value': float(self.output_dict['road_volume_m3'])
-        })
-
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Depth to subgrade',
-            'value': self.output_dict['depth_to_subgrade_m']
-        })
-
-        result.append({
-            'unit': 'ft',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Crane path width',
-            'value': self.output_dict['crane_path_width_m']     #TODO: Rename variable to: crane_path_width_ft
-        })
+        result.add(
+            unit='m^3',
+            type='variable',
+            variable_df_key_col_name='Total road volume',
+            value=float(self.output_dict['road_volume_m3'])
+        )
+
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Depth to subgrade',
+            value=self.output_dict['depth_to_subgrade_m']
+        )
+
+        result.add(
+            unit='ft',
+            type='variable',
+            variable_df_key_col_name='Crane path width',
+            value=self.output_dict['crane_path_width_m']     #TODO: Rename variable to: crane_path_width_ft
+        )
 
         if not input_dict['road_distributed_wind']:
-            result.append({
-                'unit': 'm',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Road length',
-                'value': float(self.output_dict['road_length_m'])
-            })
-
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Road width',
-            'value': self.output_dict['road_width_m']
-        })
-
-        result.append({
-            'unit': 'm',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Road thickness',
-            'value': self.output_dict['road_thickness_m']
-        })
-
-
-
-        result.append({
-            'unit': 'cubic yards',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Material volume',
-            'value': float(self.output_dict['material_volume_cubic_yards'])
-        })
-
-        result.append({
-            'unit': 'cubic yards',
-            'type': 'variable',
-            'variable_df_key_col_name': 'Topsoil volume',
-            'value': float(self.output_dict['topsoil_volume'])
-        })
+            result.add(
+                unit='m',
+                type='variable',
+                variable_df_key_col_name='Road length',
+                value=float(self.output_dict['road_length_m'])
+            )
+
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Road width',
+            value=self.output_dict['road_width_m']
+        )
+
+        result.add(
+            unit='m',
+            type='variable',
+            variable_df_key_col_name='Road thickness',
+            value=self.output_dict['road_thickness_m']
+        )
+
+
+
+        result.add(
+            unit='cubic yards',
+            type='variable',
+            variable_df_key_col_name='Material volume',
+            value=float(self.output_dict['material_volume_cubic_yards'])
+        )
+
+        result.add(
+            unit='cubic yards',
+            type='variable',
+            variable_df_key_col_name='Topsoil volume',
+            value=float(self.output_dict['topsoil_volume'])
+        )
 
         if input_dict['turbine_rating_MW'] >= 0.1:
-            result.append({
-                'unit': 'cubic yards',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Embankment volume crane',
-                'value': float(self.output_dict['embankment_volume_crane'])
-            })
-
-            result.append({
-                'unit': 'cubic yards',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Embankment volume road',
-                'value': float(self.output_dict['embankment_volume_road'])
-            })
-
-            result.append({
-                'unit': 'ft^2',
-                'type': 'variable',
-                'variable_df_key_col_name': 'Rough grading area',
-                'value': float(self.output_dict['rough_grading_area'])
-            })
+            result.add(
+                unit='cubic yards',
+                type='variable',
+                variable_df_key_col_name='Embankment volume crane',
+                value=float(self.output_dict['embankment_volume_crane'])
+            )
+
+            result.add(
+                unit='cubic yards',
+                type='variable',
+                variable_df_key_col_name='Embankment volume road',
+                value=float(self.output_dict['embankment_volume_road'])
+            )
+
+            result.add(
+                unit='ft^2',
+                type='variable',
+                variable_df_key_col_name='Rough grading area',
+                value=float(self.output_dict['rough_grading_area'])
+            )
 
         for row in self.output_dict['total_road_cost'].itertuples():
             dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                value=dashed_row,
+                last_number=row[2]
+            )
 
 
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
 
-        self.output_dict['roads_cost_csv'] = result
-        return result
+        self.output_dict['roads_cost_csv'] = result.to_dataframe()
+        return self.output_dict['roads_cost_csv']
 
 
     def outputs_for_module_type_operation(self, input_dict, output_dict):
@@ -869,7 +853,8 @@ class SitePreparationCost(CostModule):
 
             self.calculate_weather_delay(self.weather_input_dict, self.output_dict)
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detailed_outputs_enabled():
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['siteprep_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['total_road_cost'],
@@ -3,6 +3,7 @@ import pandas as pd
 import math
 
 from .CostModule import CostModule
+from .DetailCollector import DetailCollector
 
 
 class SubstationCost(CostModule):
@@ -92,35 +93,31 @@ class SubstationCost(CostModule):
 
     def outputs_for_detailed_tab(self, input_dict, output_dict):
         """
-        Creates a list of dictionaries which can be used on their own or
-        used to make a dataframe.
+        Collects the rows of the details output in a DetailCollector and
+        returns them as a block of columns.
 
         Must be called after self.run_module()
 
         Returns
         -------
-        list(dict)
-            A list of dicts, with each dict representing a row of the data.
+        pd.DataFrame
+            The block of rows, with the columns in DetailCollector.columns.
         """
-        result = []
         module = type(self).__name__
+        result = DetailCollector(self.project_name, module)
 
         for row in self.output_dict['substation_cost_output_df'].itertuples():
             dashed_row = '{} <--> {} <--> {}'.format(row[1], row[3], math.ceil(row[2]))
-            result.append({
-                'unit': '',
-                'type': 'dataframe',
-                'variable_df_key_col_name': 'Type of Cost <--> Phase of Construction <--> Cost in USD ',
-                'value': dashed_row,
-                'last_number': row[2]
-            })
-
-        for _dict in result:
-            _dict['project_id_with_serial'] = self.project_name
-            _dict['module'] = module
+            result.add(
+                unit='',
+                type='dataframe',
+                variable_df_key_col_name='Type of Cost <--> Phase of Construction <--> Cost in USD ',
+                value=dashed_row,
+                last_number=row[2]
+            )
 
-        self.output_dict['substation_cost_csv'] = result
-        return result
+        self.output_dict['substation_cost_csv'] = result.to_dataframe()
+        return self.output_dict['substation_cost_csv']
 
 
     def run_module(self):
@@ -142,7 +139,8 @@ class SubstationCost(CostModule):
         """
         try:
             self.calculate_costs(self.input_dict, self.output_dict)
-            self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
+            if self.detailed_outputs_enabled():
+                self.outputs_for_detailed_tab(self.input_dict, self.output_dict)
             # self.outputs_for_module_type_operation(self.input_dict, self.output_dict)
             self.output_dict['substation_module_type_operation'] = self.outputs_for_costs_by_module_type_operation(
                 input_df=self.output_dict['substation_cost_output_df'],
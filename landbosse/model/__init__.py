@@ -9,3 +9,7 @@ from .GridConnectionCost import GridConnectionCost
 from .CollectionCost import Cable, Array, ArraySystem
 from .DevelopmentCost import DevelopmentCost
 from .DefaultMasterInputDict import DefaultMasterInputDict
+from .ProjectDataIndex import ProjectDataIndex
+from .DetailCollector import DetailCollector
+from .CostEmulator import CostEmulator
+from .QuantityTable import QuantityTable
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from landbosse.excelio import XlsxManagerRunner
+
+
+class FakeCostRunner(XlsxManagerRunner):
+    """
+    Runs projects without the model, for the tests of the drivers that
+    run projects with a manager runner. The project and parametric lists
+    are given instead of read from the input directory, and the cost rows
+    of each project are made by a cost function of its project parameters.
+    """
+
+    def __init__(self, project_list, parametric_list, cost_function):
+        """
+        Parameters
+        ----------
+        project_list : pandas.DataFrame
+            The project list.
+
+        parametric_list : pandas.DataFrame
+            The parametric list.
+
+        cost_function : function
+            Called with the project parameters of each project. It returns
+            a dict of the cost per project of each module, or a dataframe
+            of the cost rows of the project.
+        """
+        super().__init__()
+        self.project_list = project_list
+        self.parametric_list = parametric_list
+        self.cost_function = cost_function
+
+        # The number of projects of each call to run_projects()
+        self.run_counts = []
+
+    def read_project_and_parametric_lists(self):
+        return self.project_list, self.parametric_list
+
+    def prefetch_project_data(self, project_list):
+        pass
+
+    def run_projects(self, project_rows, enable_cost_and_scaling_modifications=False, costs_only=False,
+                     result_writer=None):
+        extended_project_list = []
+        cost_blocks = []
+        for _, project_parameters in project_rows:
+            if pd.isnull(project_parameters['Project ID with serial']):
+                project_id_with_serial = project_parameters['Project ID']
+            else:
+                project_id_with_serial = project_parameters['Project ID with serial']
+            extended_project_list.append(project_parameters)
+            costs = self.cost_function(project_parameters)
+            if isinstance(costs, dict):
+                costs = pd.DataFrame({
+                    'project_id_with_serial': project_id_with_serial,
+                    'module': list(costs.keys()),
+                    'cost_per_project': list(costs.values())
+                })
+            cost_blocks.append(costs)
+        self.run_counts.append(len(extended_project_list))
+        if len(cost_blocks) > 0:
+            module_type_operation_df = pd.concat(cost_blocks, ignore_index=True)
+        else:
+            module_type_operation_df = pd.DataFrame(columns=['project_id_with_serial', 'module', 'cost_per_project'])
+        return {
+            'details_df': pd.DataFrame(),
+            'module_type_operation_df': module_type_operation_df,
+            'extended_project_list': pd.DataFrame(extended_project_list)
+        }
@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import AdaptiveRefinementSweep
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.tests.model.FakeCostRunner import FakeCostRunner
+
+
+def step_costs(project_parameters):
+    """
+    The FoundationCost is a step function of alpha/fizz/buzz, which is 0
+    for projects without parametric variations, and the ErectionCost is
+    constant.
+    """
+    x = 0 if pd.isnull(project_parameters['Project ID with serial']) else project_parameters['alpha/fizz/buzz']
+    return {'FoundationCost': 100.0 if x < 37 else 200.0, 'ErectionCost': 50.0}
+
+
+class TestAdaptiveRefinementSweep(TestCase):
+    def setUp(self):
+        self.project_list = pd.DataFrame({
+            'Project ID': ['ge15', 'plain'],
+            'Project data file': ['ge15_data', 'plain_data']
+        })
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 100, 'Step': 1}
+        ])
+
+    def test_refines_around_step(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, step_costs)
+        sweep = AdaptiveRefinementSweep(runner, run_budget=100, tolerance=0.1)
+        final_result = sweep.run_from_project_list_xlsx(None)
+        values = sorted(final_result['extended_project_list']['alpha/fizz/buzz'].dropna().tolist())
+
+        # The coarse grid and the bisection of the interval with the step
+        self.assertEqual(values, [0, 25, 31, 34, 35, 36, 37, 50, 100])
+        self.assertEqual(runner.run_counts, [4, 1, 1, 1, 1, 1, 1])
+
+    def test_serials_in_order_added(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, step_costs)
+        sweep = AdaptiveRefinementSweep(runner, run_budget=100, tolerance=0.1)
+        final_result = sweep.run_from_project_list_xlsx(None)
+        serials = final_result['extended_project_list']['Project ID with serial'].dropna().tolist()
+        self.assertEqual(serials[:4], ['ge15_000', 'ge15_001', 'ge15_002', 'ge15_003'])
+        self.assertEqual(final_result['module_type_operation_df']['project_id_with_serial'].tolist()[:2],
+                         ['ge15_000', 'ge15_000'])
+
+    def test_budget_limits_runs(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, step_costs)
+        sweep = AdaptiveRefinementSweep(runner, run_budget=6, tolerance=0.1)
+        final_result = sweep.run_from_project_list_xlsx(None)
+        self.assertEqual(len(final_result['extended_project_list']), 6)
+
+    def test_flat_costs_are_not_refined(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, step_costs)
+        sweep = AdaptiveRefinementSweep(runner, run_budget=100, tolerance=1.5)
+        sweep.run_from_project_list_xlsx(None)
+        self.assertEqual(runner.run_counts, [4])
+
+    def test_sampling_design_rejected(self):
+        parametric_list = self.parametric_list.assign(Design='Sobol', **{'Sample count': 8})
+        sweep = AdaptiveRefinementSweep(FakeCostRunner(self.project_list, parametric_list, step_costs), run_budget=10)
+        with self.assertRaises(XlsxOperationException):
+            sweep.run_from_project_list_xlsx(None)
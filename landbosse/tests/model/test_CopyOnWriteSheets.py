@@ -0,0 +1,62 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import CopyOnWriteSheets, XlsxReader
+
+
+class TestCopyOnWriteSheets(TestCase):
+    def setUp(self):
+        self.shared = {
+            'crew_price': pd.DataFrame({
+                'Labor type ID': ['Crane operator', 'RSMeans'],
+                'Hourly rate USD per hour': [50.0, 60.0],
+                'Per diem USD per day': [100.0, 120.0]
+            }),
+            'rsmeans': pd.DataFrame({
+                'Operation ID': ['Excavation', 'Excavation'],
+                'Type of cost': ['Labor', 'Equipment rental'],
+                'Rate USD per unit': [10.0, 5.0]
+            }),
+            'weather_window': pd.DataFrame({'Speed m per s': [5.0, 6.0]})
+        }
+
+    def test_reads_are_shared(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        self.assertIs(sheets['rsmeans'], self.shared['rsmeans'])
+        self.assertEqual(list(sheets.keys()), list(self.shared.keys()))
+
+    def test_writable_copies_only_that_sheet(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        writable = sheets.writable('rsmeans')
+        writable.loc[0, 'Rate USD per unit'] = 20.0
+        self.assertIs(sheets['rsmeans'], writable)
+        self.assertIs(sheets.writable('rsmeans'), writable)
+        self.assertEqual(self.shared['rsmeans'].loc[0, 'Rate USD per unit'], 10.0)
+        self.assertEqual(sheets.copied_sheet_names(), ['rsmeans'])
+
+    def test_set_and_delete_do_not_touch_shared(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        del sheets['weather_window']
+        sheets['development'] = pd.DataFrame()
+        self.assertNotIn('weather_window', sheets)
+        self.assertIn('weather_window', self.shared)
+        self.assertEqual(list(sheets), ['crew_price', 'rsmeans', 'development'])
+        self.assertNotIn('development', self.shared)
+
+    def test_parametric_modification_copies_on_write(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        project_parameters = pd.Series({'rsmeans/Excavation/Rate USD per unit': 30.0})
+        XlsxReader().modify_project_data_and_project_list(sheets, project_parameters)
+        self.assertEqual(sheets['rsmeans']['Rate USD per unit'].tolist(), [30.0, 30.0])
+        self.assertEqual(self.shared['rsmeans']['Rate USD per unit'].tolist(), [10.0, 5.0])
+        self.assertEqual(sheets.copied_sheet_names(), ['rsmeans'])
+
+    def test_labor_multiplier_copies_on_write(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        XlsxReader().apply_labor_multiplier_to_project_data_dict(sheets, 2.0)
+        self.assertEqual(sheets['crew_price']['Hourly rate USD per hour'].tolist(), [100.0, 120.0])
+        self.assertEqual(sheets['rsmeans']['Rate USD per unit'].tolist(), [20.0, 5.0])
+        self.assertEqual(self.shared['crew_price']['Hourly rate USD per hour'].tolist(), [50.0, 60.0])
+        self.assertEqual(self.shared['rsmeans']['Rate USD per unit'].tolist(), [10.0, 5.0])
+        self.assertNotIn('weather_window', sheets.copied_sheet_names())
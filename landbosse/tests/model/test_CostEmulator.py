@@ -0,0 +1,69 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from landbosse.model import CostEmulator
+
+
+def quadratic_costs(inputs):
+    x, y = inputs[:, 0], inputs[:, 1]
+    foundation = 1000 + 20 * x + 3 * x * y
+    erection = 500 + y ** 2
+    return np.column_stack([foundation, erection, foundation + erection])
+
+
+class TestCostEmulator(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.inputs = np.column_stack([rng.uniform(0, 10, 40), rng.uniform(50, 100, 40)])
+        self.costs = quadratic_costs(self.inputs)
+        self.output_names = ['FoundationCost', 'ErectionCost', 'Total']
+
+    def test_polynomial_is_exact_for_quadratic(self):
+        emulator = CostEmulator(['x', 'y'], self.output_names, 'polynomial', degree=2).fit(self.inputs, self.costs)
+        points = np.array([[1.0, 60.0], [9.0, 95.0]])
+        np.testing.assert_allclose(emulator.predict(points), quadratic_costs(points), rtol=1e-9)
+
+    def test_rbf_interpolates_training_points(self):
+        emulator = CostEmulator(['x', 'y'], self.output_names, 'rbf').fit(self.inputs, self.costs)
+        np.testing.assert_allclose(emulator.predict(self.inputs), self.costs, rtol=1e-6)
+
+    def test_validation_report(self):
+        emulator = CostEmulator(['x', 'y'], self.output_names, 'polynomial', degree=1)
+        emulator.fit(self.inputs[:30], self.costs[:30])
+        validation = emulator.validate(self.inputs[30:], self.costs[30:])
+        self.assertEqual(validation['Output'].tolist(), self.output_names)
+        self.assertTrue((validation['Points'] == 10).all())
+        self.assertTrue((validation['RMSE'] > 0).all())
+
+    def test_fallback_outside_domain(self):
+        emulator = CostEmulator(['x', 'y'], self.output_names).fit(self.inputs, self.costs)
+        points = np.array([[5.0, 75.0], [20.0, 75.0]])
+        self.assertEqual(emulator.in_domain(points).tolist(), [True, False])
+        self.assertTrue(np.isnan(emulator.evaluate(points)[1]).all())
+
+        fallback_points = []
+
+        def fallback(inputs):
+            fallback_points.append(inputs)
+            return quadratic_costs(inputs)
+
+        emulator.fallback = fallback
+        np.testing.assert_allclose(emulator.evaluate(points), quadratic_costs(points), rtol=1e-9)
+        np.testing.assert_array_equal(np.concatenate(fallback_points), points[1:])
+
+    def test_save_and_load(self):
+        emulator = CostEmulator(['x', 'y'], self.output_names, 'rbf').fit(self.inputs, self.costs)
+        emulator.fallback = quadratic_costs
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, 'emulator.pkl')
+            emulator.save(filename)
+            loaded = CostEmulator.load(filename)
+        self.assertIsNone(loaded.fallback)
+        np.testing.assert_array_equal(loaded.predict(self.inputs[:5]), emulator.predict(self.inputs[:5]))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            CostEmulator(['x'], ['Total'], 'neural network')
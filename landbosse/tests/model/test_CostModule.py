@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model.CostModule import CostModule, COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+
+
+class ExampleCost(CostModule):
+    """
+    A minimal cost module so the shared output methods can be tested
+    without running a real module.
+    """
+    def __init__(self, input_dict, project_name):
+        self.input_dict = input_dict
+        self.project_name = project_name
+
+
+class TestCostModule(TestCase):
+    def setUp(self):
+        self.input_dict = {
+            'turbine_rating_MW': 2.5,
+            'num_turbines': 40,
+            'rotor_diameter_m': 120
+        }
+        self.module = ExampleCost(self.input_dict, 'project_1')
+        self.input_df = pd.DataFrame([
+            ['Labor', 1000.0, 'Roads'],
+            ['Equipment rental', 2500.0, 'Roads'],
+            ['Mobilization', 333.33, 'Roads']
+        ], columns=['Type of cost', 'Cost USD', 'Phase of construction'])
+
+    def test_total_costs(self):
+        block = self.module.outputs_for_costs_by_module_type_operation(
+            input_df=self.input_df,
+            project_id='project_1',
+            total_or_turbine=True
+        )
+        self.assertEqual(list(block.columns), COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS)
+        self.assertEqual(len(block), 3)
+        self.assertEqual(block['module'].unique().tolist(), ['ExampleCost'])
+        self.assertEqual(block['raw_cost_total_or_per_turbine'].unique().tolist(), ['total'])
+        self.assertEqual(block.loc[1, 'cost_per_turbine'], 2500.0 / 40)
+        self.assertEqual(block.loc[1, 'cost_per_project'], 2500.0)
+        self.assertEqual(block.loc[1, 'usd_per_kw_per_project'], 2500.0 / (40 * 2.5 * 1000))
+
+    def test_per_turbine_costs(self):
+        block = self.module.outputs_for_costs_by_module_type_operation(
+            input_df=self.input_df,
+            project_id='project_1',
+            total_or_turbine=False
+        )
+        self.assertEqual(block['raw_cost_total_or_per_turbine'].unique().tolist(), ['turbine'])
+        self.assertEqual(block.loc[2, 'cost_per_turbine'], 333.33)
+        self.assertEqual(block.loc[2, 'cost_per_project'], 333.33 * 40)
+        self.assertEqual(block.loc[2, 'usd_per_kw_per_project'], 333.33 * 40 / (40 * 2.5 * 1000))
+
+    def test_legacy_records(self):
+        """
+        The records of the block must be the dictionaries the cost modules
+        used to return.
+        """
+        block = self.module.outputs_for_costs_by_module_type_operation(
+            input_df=self.input_df,
+            project_id='project_1',
+            total_or_turbine=True
+        )
+        records = block.to_dict('records')
+        self.assertEqual(records[0], {
+            'operation_id': 'Roads',
+            'type_of_cost': 'Labor',
+            'raw_cost': 1000.0,
+            'turbine_rating_MW': 2.5,
+            'num_turbines': 40,
+            'rotor_diameter_m': 120,
+            'project_id_with_serial': 'project_1',
+            'module': 'ExampleCost',
+            'raw_cost_total_or_per_turbine': 'total',
+            'cost_per_turbine': 25.0,
+            'cost_per_project': 1000.0,
+            'usd_per_kw_per_project': 0.01
+        })
+
+    def test_detailed_outputs_enabled(self):
+        self.assertTrue(self.module.detailed_outputs_enabled())
+        self.input_dict['costs_only'] = True
+        self.assertFalse(self.module.detailed_outputs_enabled())
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import DetailCollector
+
+
+class TestDetailCollector(TestCase):
+    def setUp(self):
+        self.collector = DetailCollector('project_1', 'ErectionCost')
+        self.collector.add(
+            unit='usd',
+            type='variable',
+            variable_df_key_col_name='labor_cost_total',
+            value=1000.0
+        )
+        self.collector.add_many(
+            unit='',
+            type='dataframe',
+            variable_df_key_col_name='crane_cost_details: Operation ID - Type of cost - Cost',
+            values=['Top - Labor - 10.5', 'Base - Labor - 20.5'],
+            last_numbers=[10.5, 20.5]
+        )
+        self.collector.add_many(
+            unit='usd',
+            type='dataframe',
+            variable_df_key_col_name='erection_selected_detailed_data: mobilization',
+            values=[5.0],
+            non_numeric_values=['LR1600-SL3F-Top']
+        )
+
+    def test_to_dataframe(self):
+        block = self.collector.to_dataframe()
+        self.assertEqual(list(block.columns), DetailCollector.columns)
+        self.assertEqual(len(block), 4)
+        for column in DetailCollector.categorical_columns:
+            self.assertEqual(block[column].dtype.name, 'category')
+        self.assertEqual(block['has_last_number'].tolist(), [False, True, True, False])
+        self.assertEqual(block['non_numeric_value'].tolist(), [None, None, None, 'LR1600-SL3F-Top'])
+
+    def test_concat_keeps_categoricals(self):
+        other = DetailCollector('project_2', 'FoundationCost')
+        other.add(unit='m', type='variable', variable_df_key_col_name='Radius', value=3.5)
+        block = DetailCollector.concat([self.collector.to_dataframe(), DetailCollector.empty_dataframe(),
+                                        other.to_dataframe()])
+        self.assertEqual(len(block), 5)
+        self.assertEqual(block['project_id_with_serial'].dtype.name, 'category')
+        self.assertEqual(block['project_id_with_serial'].tolist(), ['project_1'] * 4 + ['project_2'])
+        self.assertEqual(block['unit'].tolist(), ['usd', '', '', 'usd', 'm'])
+
+    def test_records_round_trip(self):
+        """
+        The records must be the dictionaries the modules used to make, and
+        converting them back must give the same block.
+        """
+        block = self.collector.to_dataframe()
+        records = DetailCollector.to_records(block)
+        self.assertEqual(records[0], {
+            'unit': 'usd',
+            'type': 'variable',
+            'variable_df_key_col_name': 'labor_cost_total',
+            'value': 1000.0,
+            'project_id_with_serial': 'project_1',
+            'module': 'ErectionCost'
+        })
+        self.assertEqual(records[1]['last_number'], 10.5)
+        self.assertNotIn('last_number', records[3])
+        self.assertEqual(records[3]['non_numeric_value'], 'LR1600-SL3F-Top')
+        pd.testing.assert_frame_equal(DetailCollector.from_records(records), block, check_categorical=False)
+
+    def test_numeric_value_mask(self):
+        values = pd.Series([1, 2.5, '3.5', 'LR1600-SL3F-Top', float('nan'), '[1, 2]'], dtype=object)
+        mask = DetailCollector.numeric_value_mask(values)
+        self.assertEqual(mask.tolist(), [True, True, True, False, True, False])
+
+    def test_dataframe_rows_matches_iterrows(self):
+        df = pd.DataFrame({'Operation': ['Top', 'Base'], 'Count': [1, 2], 'Cost': [1.5, 2.5]})
+        expected = [[row['Count'], row['Operation']] for _, row in df.iterrows()]
+        self.assertEqual(DetailCollector.dataframe_rows(df, ['Count', 'Operation']), expected)
+
+        # When every column is numeric, iterrows upcasts integers to floats.
+        numeric_df = df[['Count', 'Cost']]
+        expected = [[row['Count']] for _, row in numeric_df.iterrows()]
+        actual = DetailCollector.dataframe_rows(numeric_df, ['Count'])
+        self.assertEqual(actual, expected)
+        self.assertIsInstance(actual[0][0], float)
@@ -0,0 +1,39 @@
+import itertools
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio.GridSearchTree import GridSearchTree
+
+
+class TestGridSearchTree(TestCase):
+    def setUp(self):
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 2, 'Step': 1, 'Value list': None},
+            {'Project ID': 'ge15', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': None, 'Max': None, 'Step': None, 'Value list': '5, 7'},
+            {'Project ID': 'ge15', 'Dataframe name': 'gamma', 'Row name': 'x', 'Column name': 'y',
+             'Min': 10, 'Max': 30, 'Step': 10, 'Value list': None}
+        ])
+
+    def test_point_count(self):
+        self.assertEqual(GridSearchTree(self.parametric_list).point_count(), 18)
+
+    def test_depth_first_order(self):
+        grid = GridSearchTree(self.parametric_list).build_grid_tree_and_return_grid()
+        expected = list(itertools.product([0, 1, 2], [5.0, 7.0], [10, 20, 30]))
+        self.assertEqual([tuple(axis['value'] for axis in point) for point in grid], expected)
+        self.assertEqual([axis['cell_specification'] for axis in grid[0]],
+                         ['alpha/fizz/buzz', 'beta/foo/bar', 'gamma/x/y'])
+
+    def test_chunks_match_points(self):
+        grid_search_tree = GridSearchTree(self.parametric_list)
+        points = grid_search_tree.build_grid_tree_and_return_grid()
+        starts = []
+        streamed = []
+        for start, chunk in grid_search_tree.iter_grid_chunks(chunk_size=4):
+            starts.append(start)
+            streamed.extend(zip(chunk['alpha/fizz/buzz'], chunk['beta/foo/bar'], chunk['gamma/x/y']))
+        self.assertEqual(starts, [0, 4, 8, 12, 16])
+        self.assertEqual(streamed, [tuple(axis['value'] for axis in point) for point in points])
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import CopyOnWriteSheets, XlsxReader
+from landbosse.excelio.ParametricOverridePlan import ParametricOverridePlan
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestParametricOverridePlan(TestCase):
+    def setUp(self):
+        XlsxReader._override_plans.clear()
+        self.shared = {
+            'rsmeans': pd.DataFrame({
+                'Operation ID': ['Excavation', 'Grading', 'Excavation'],
+                'Rate USD per unit': [10.0, 2.0, 5.0]
+            }),
+            'crew_price': pd.DataFrame({
+                'Labor type ID': ['Rigger', 'Oiler'],
+                'Hourly rate USD per hour': [40.0, 30.0]
+            })
+        }
+        self.project_parameters = pd.Series({
+            'Project ID': 'project1',
+            'Hub height m': 80.0,
+            'rsmeans/Excavation/Rate USD per unit': 20.0,
+            'crew_price/Oiler/Hourly rate USD per hour': np.nan,
+            'project list/x/Hub height m': 90.0
+        })
+
+    def test_steps_resolved_to_positions(self):
+        plan = ParametricOverridePlan(self.shared, self.project_parameters.index)
+        self.assertEqual(len(plan.steps), 3)
+        self.assertEqual(plan.steps[0]['row_positions'].tolist(), [0, 2])
+        self.assertEqual(plan.steps[0]['column_positions'].tolist(), [1])
+        self.assertEqual(plan.steps[1]['row_positions'].tolist(), [1])
+
+    def test_apply_writes_values(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        XlsxReader().modify_project_data_and_project_list(sheets, self.project_parameters)
+        self.assertEqual(sheets['rsmeans']['Rate USD per unit'].tolist(), [20.0, 2.0, 20.0])
+        self.assertEqual(self.project_parameters['Hub height m'], 90.0)
+        self.assertEqual(sheets.copied_sheet_names(), ['rsmeans'])
+        self.assertEqual(self.shared['rsmeans']['Rate USD per unit'].tolist(), [10.0, 2.0, 5.0])
+
+    def test_apply_without_project_data(self):
+        sheets = CopyOnWriteSheets(self.shared)
+        XlsxReader().modify_project_data_and_project_list(sheets, self.project_parameters, apply_project_data=False)
+        self.assertEqual(self.project_parameters['Hub height m'], 90.0)
+        self.assertEqual(sheets.copied_sheet_names(), [])
+
+        self.project_parameters['rsmeans/Trenching/Rate USD per unit'] = 3.0
+        with self.assertRaises(XlsxOperationException):
+            XlsxReader().modify_project_data_and_project_list(sheets, self.project_parameters,
+                                                              apply_project_data=False)
+
+    def test_plan_reused_across_serials(self):
+        xlsx_reader = XlsxReader()
+        first = xlsx_reader.parametric_override_plan(CopyOnWriteSheets(self.shared), self.project_parameters)
+        second = xlsx_reader.parametric_override_plan(CopyOnWriteSheets(self.shared), self.project_parameters.copy())
+        self.assertIs(first, second)
+
+    def test_invalid_spec_raised_only_with_value(self):
+        self.project_parameters['rsmeans/Trenching/Rate USD per unit'] = np.nan
+        XlsxReader().modify_project_data_and_project_list(CopyOnWriteSheets(self.shared), self.project_parameters)
+
+        self.project_parameters['rsmeans/Trenching/Rate USD per unit'] = 3.0
+        with self.assertRaises(XlsxOperationException):
+            XlsxReader().modify_project_data_and_project_list(CopyOnWriteSheets(self.shared), self.project_parameters)
+
+    def test_missing_dataframe_raises(self):
+        project_parameters = pd.Series({'equip/E1/Number of equipment': 2})
+        with self.assertRaises(XlsxOperationException):
+            XlsxReader().modify_project_data_and_project_list(dict(self.shared), project_parameters)
@@ -0,0 +1,64 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import ProjectCostPredictor, XlsxDataframeCache, XlsxParallelManagerRunner
+
+
+class TestProjectCostPredictor(TestCase):
+    def setUp(self):
+        self.project_data_sheets = {
+            'crane_specs': pd.DataFrame({'Crane name': ['a', 'b', 'c']}),
+            'components': pd.DataFrame({'Component': ['Tower', 'Nacelle']})
+        }
+
+    def test_features(self):
+        project_parameters = pd.Series({'Number of turbines': 10, 'Total project construction time (months)': 9})
+        features = ProjectCostPredictor.features(project_parameters, self.project_data_sheets)
+        np.testing.assert_array_equal(features, [1.0, 10.0, 9.0, 6.0])
+
+    def test_fit_to_timings(self):
+        predictor = ProjectCostPredictor(min_timings=4)
+        features = np.array([[1.0, turbines, months, 300.0] for turbines in [10, 50, 100] for months in [6, 12]])
+        seconds = 0.5 + 0.01 * features[:, 1] + 0.1 * features[:, 2]
+        np.testing.assert_allclose(predictor.predict(features), features @ ProjectCostPredictor.prior_coefficients)
+
+        for row_features, row_seconds in zip(features, seconds):
+            predictor.record(row_features, row_seconds)
+        np.testing.assert_allclose(predictor.predict(features), seconds)
+        # The crane combinations did not vary, so they keep their prior.
+        self.assertEqual(predictor.coefficients[3], ProjectCostPredictor.prior_coefficients[3])
+
+    def test_predictions_are_positive(self):
+        predictor = ProjectCostPredictor(min_timings=2)
+        predictor.record([1.0, 10.0, 6.0, 300.0], 1.0)
+        predictor.record([1.0, 20.0, 6.0, 300.0], 0.5)
+        self.assertGreater(predictor.predict([1.0, 1000.0, 6.0, 300.0]), 0)
+
+
+class TestPlanBatches(TestCase):
+    def test_largest_first(self):
+        runner = XlsxParallelManagerRunner()
+        # Predict the cost of each project from its number of turbines.
+        runner.cost_predictor.coefficients = np.array([0.0, 1.0, 0.0, 0.0])
+        project_list = pd.DataFrame({
+            'Project data file': ['ge15_public'] * 8,
+            'Number of turbines': [1, 1, 1, 1, 1, 1, 20, 2],
+            'Total project construction time (months)': [9] * 8
+        })
+        rows = [(position, index, project_parameters)
+                for position, (index, project_parameters) in enumerate(project_list.iterrows())]
+        groups = [rows[:6], rows[6:7], rows[7:]]
+        project_data_sheets = {
+            'crane_specs': pd.DataFrame({'Crane name': ['a']}),
+            'components': pd.DataFrame({'Component': ['Tower']})
+        }
+        with patch.object(XlsxDataframeCache, 'read_all_sheets_from_xlsx', return_value=project_data_sheets):
+            batches = runner.plan_batches(groups, worker_count=2)
+
+        self.assertEqual([cost for cost, _ in batches], [20.0, 2.0, 2.0, 2.0, 1.0, 1.0])
+        self.assertEqual([[row[0] for row in batch_rows] for _, batch_rows in batches],
+                         [[6], [0, 1], [2, 3], [7], [4], [5]])
+        self.assertEqual(len(batches[0][1][0][3]), 4)
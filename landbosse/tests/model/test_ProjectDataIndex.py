@@ -0,0 +1,105 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.model import ProjectDataIndex
+
+
+class TestProjectDataIndex(TestCase):
+    def setUp(self):
+        """
+        Creates small project data sheets that have just the columns the
+        views need.
+        """
+        ProjectDataIndex.clear_shared_views()
+
+        self.sheets = dict()
+        self.sheets['rsmeans'] = pd.DataFrame([
+            ['Excavation', 'Labor', 'Excavated dirt', 10.0, 'cubic yards', 100.0, 4, 'Foundations'],
+            ['Excavation', 'Equipment rental', 'Excavated dirt', 5.0, 'cubic yards', 100.0, 4, 'Foundations'],
+            ['Grading', 'Labor', 'Gravel', 2.0, 'loose cubic yard', 50.0, 2, 'Roads'],
+        ], columns=['Operation ID', 'Type of cost', 'Material type ID', 'Rate USD per unit', 'Units',
+                    'Daily output', 'Number of workers', 'Module'])
+        self.sheets['crew'] = pd.DataFrame([
+            ['M0001', 'Management', 'Management - project size', 'Project manager', 1],
+            ['M0001', 'Management', 'Management - project size', 'Project manager', 1],
+            ['C0001', 'Base', 'Erection', 'Crane operator', 2],
+        ], columns=['Crew type ID', 'Operation', 'Crew name', 'Labor type ID', 'Number of workers'])
+        self.sheets['crew_price'] = pd.DataFrame([
+            ['Project manager', 100.0, 150.0],
+            ['Crane operator', 50.0, 100.0],
+        ], columns=['Labor type ID', 'Hourly rate USD per hour', 'Per diem USD per day'])
+        self.sheets['crane_specs'] = pd.DataFrame([
+            ['Offload crane', 'OC1', 'Small crane', 'Lattice', 100.0, 50.0, 20.0, 10.0, 5.0, 2.0, 4.0, 4.0, 'C0001'],
+            ['Offload crane', 'OC1', 'Small crane', 'Lattice', 100.0, 20.0, 40.0, 12.0, 5.0, 2.0, 4.0, 4.0, 'C0001'],
+            ['Base crane', 'BC1', 'Large crane', 'Telescopic', 400.0, 200.0, 90.0, 15.0, 8.0, 1.0, 6.0, 6.0, 'C0001'],
+        ], columns=['Equipment name', 'Equipment ID', 'Crane name', 'Boom system', 'Crane capacity tonne',
+                    'Max capacity tonne', 'Hub height m', 'Max wind speed m per s', 'Hoist speed m per min',
+                    'Speed of travel km per hr', 'Setup time hr', 'Breakdown time hr', 'Crew type ID'])
+
+    def test_rsmeans_for_module_matches_where_dropna(self):
+        """
+        The module view must be identical to the filter the modules used to
+        run themselves.
+        """
+        rsmeans = self.sheets['rsmeans']
+        expected = rsmeans.where(rsmeans['Module'] == 'Foundations').dropna(thresh=4)
+        actual = ProjectDataIndex(self.sheets).rsmeans_for_module('Foundations')
+        pd.testing.assert_frame_equal(expected, actual)
+
+    def test_management_crew(self):
+        management_crew = ProjectDataIndex(self.sheets).management_crew()
+        self.assertEqual(len(management_crew), 2)
+        self.assertTrue(management_crew['Crew type ID'].str.contains('M0').all())
+        self.assertEqual(list(management_crew.columns[:3]), list(self.sheets['crew_price'].columns))
+
+    def test_crew_with_prices_removes_duplicates(self):
+        crew_with_prices = ProjectDataIndex(self.sheets).crew_with_prices()
+        self.assertEqual(len(crew_with_prices), 2)
+
+    def test_crane_lift_polygons(self):
+        index = ProjectDataIndex(self.sheets)
+        crane_poly = index.crane_lift_polygons()
+        self.assertEqual(sorted(crane_poly['Crane name']), ['Large crane', 'Small crane'])
+        small_crane = crane_poly[crane_poly['Crane name'] == 'Small crane'].iloc[0]
+        self.assertEqual(small_crane['Max wind speed m per s'], 10.0)
+        self.assertEqual(small_crane['Crane poly'].bounds, (0.0, 0.0, 50.0, 40.0))
+        offload_poly = index.crane_lift_polygons(offload=True)
+        self.assertEqual(list(offload_poly['Crane name']), ['Small crane'])
+        self.assertIs(crane_poly, ProjectDataIndex(self.sheets).crane_lift_polygons())
+
+    def test_views_shared_between_identical_sheets(self):
+        """
+        Two indexes over sheets with the same contents must return the same
+        view without rebuilding it.
+        """
+        copied_sheets = {name: df.copy() for name, df in self.sheets.items()}
+        first = ProjectDataIndex(self.sheets).rsmeans_for_module('Roads')
+        second = ProjectDataIndex(copied_sheets).rsmeans_for_module('Roads')
+        self.assertIs(first, second)
+
+    def test_views_rebuilt_when_sheet_changes(self):
+        """
+        Changing a sheet must rebuild only the views that depend on it.
+        """
+        first_index = ProjectDataIndex(self.sheets)
+        first_rsmeans = first_index.rsmeans_for_module('Roads')
+        first_crew = first_index.crew_with_prices()
+
+        modified_sheets = {name: df.copy() for name, df in self.sheets.items()}
+        modified_sheets['rsmeans'].loc[2, 'Rate USD per unit'] = 3.0
+        second_index = ProjectDataIndex(modified_sheets)
+
+        self.assertIsNot(first_rsmeans, second_index.rsmeans_for_module('Roads'))
+        self.assertEqual(second_index.rsmeans_for_module('Roads')['Rate USD per unit'].iloc[0], 3.0)
+        self.assertIs(first_crew, second_index.crew_with_prices())
+
+    def test_from_input_dict(self):
+        input_dict = {
+            'rsmeans': self.sheets['rsmeans'],
+            'crew_cost': self.sheets['crew_price'],
+            'project_data': {'crew': self.sheets['crew']}
+        }
+        index = ProjectDataIndex.from_input_dict(input_dict)
+        self.assertEqual(len(index.management_crew()), 2)
+        self.assertEqual(len(index.crew_with_prices()), 2)
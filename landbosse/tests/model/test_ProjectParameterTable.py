@@ -0,0 +1,65 @@
+import pickle
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import ProjectParameterTable
+
+
+class TestProjectParameterTable(TestCase):
+    def setUp(self):
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': ['ge15', 'ge15', 'plain'],
+            'Project ID with serial': ['ge15_0', 'ge15_1', np.nan],
+            'Number of turbines': [10, 20, 30],
+            'Hub height m': [80.0, 90.0, 100.0],
+            'project list/Project/Hub height m': [85.0, np.nan, np.nan]
+        }, index=[5, 6, 7])
+        self.table = ProjectParameterTable(self.extended_project_list)
+
+    def test_records_match_iterrows(self):
+        self.assertEqual(len(self.table), 3)
+        for position, (index, row) in enumerate(self.extended_project_list.iterrows()):
+            record = self.table.record(position)
+            self.assertEqual(record.name, index)
+            pd.testing.assert_series_equal(record.to_series(), row)
+            self.assertEqual([type(value) for value in record.values], [type(value) for value in row.values])
+
+    def test_record_interface(self):
+        record = self.table.record(0)
+        self.assertEqual(record['Number of turbines'], 10)
+        self.assertIn('Hub height m', record)
+        self.assertNotIn('Rotor diameter m', record)
+        self.assertIsNone(record.get('Rotor diameter m'))
+        with self.assertRaises(KeyError):
+            record['Rotor diameter m']
+
+        # Setting values changes only this record.
+        record['Hub height m'] = 85.0
+        record['Project size MW'] = 15.0
+        self.assertEqual(record.index[-1], 'Project size MW')
+        self.assertEqual(record['Project size MW'], 15.0)
+        other = self.table.record(1)
+        self.assertNotIn('Project size MW', other)
+        self.assertEqual(self.table.record(0)['Hub height m'], 80.0)
+
+    def test_pickle(self):
+        record = self.table.record(1)
+        unpickled = pickle.loads(pickle.dumps(record))
+        self.assertEqual(unpickled.index, record.index)
+        pd.testing.assert_series_equal(unpickled.to_series(), record.to_series())
+        self.assertEqual(unpickled['Hub height m'], 90.0)
+        # A record pickles to much less than its Series.
+        self.assertLess(len(pickle.dumps(record)), len(pickle.dumps(record.to_series())))
+
+    def test_records_to_dataframe(self):
+        records = [self.table.record(position) for position in range(len(self.table))]
+        expected = pd.DataFrame([row for _, row in self.extended_project_list.iterrows()])
+        pd.testing.assert_frame_equal(ProjectParameterTable.records_to_dataframe(records), expected)
+
+        # Records with different names are joined like a list of Series.
+        records[2]['Project size MW'] = 45.0
+        expected = pd.DataFrame([record.to_series() for record in records]).infer_objects()
+        pd.testing.assert_frame_equal(ProjectParameterTable.records_to_dataframe(records), expected)
+        self.assertTrue(ProjectParameterTable.records_to_dataframe([]).empty)
@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import ProjectResultWriter
+from landbosse.model import DetailCollector
+
+
+class TestProjectResult(TestCase):
+    def setUp(self):
+        details = DetailCollector('project_1', 'ErectionCost')
+        details.add(unit='usd', type='variable', variable_df_key_col_name='labor_cost_total', value=10.0)
+        result_writer = ProjectResultWriter()
+        result_writer.write(
+            pd.DataFrame({'project_id_with_serial': ['project_1'], 'cost_per_project': [1.5]}),
+            details.to_dataframe(),
+            pd.DataFrame({'Project ID': ['project_1']})
+        )
+        self.final_result = result_writer.result()
+
+    def test_deprecated_keys_warn_and_give_lists(self):
+        with self.assertWarns(DeprecationWarning):
+            module_type_operation_list = self.final_result['module_type_operation_list']
+        self.assertEqual(module_type_operation_list, [{'project_id_with_serial': 'project_1', 'cost_per_project': 1.5}])
+        with self.assertWarns(DeprecationWarning):
+            details_list = self.final_result['details_list']
+        self.assertEqual(details_list, DetailCollector.to_records(self.final_result['details_df']))
+        self.assertEqual(details_list[0]['value'], 10.0)
+
+    def test_other_keys_missing(self):
+        with self.assertRaises(KeyError):
+            self.final_result['runs_dict']
+        self.assertEqual(sorted(self.final_result.keys()),
+                         ['details_df', 'extended_project_list', 'module_type_operation_df'])
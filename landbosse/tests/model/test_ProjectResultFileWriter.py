@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+import pandas as pd
+
+from landbosse.excelio import ProjectResultFileWriter, ProjectResultWriter
+from landbosse.model import DetailCollector
+from landbosse.model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+
+
+class TestProjectResultFileWriter(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_ops = Mock()
+        self.file_ops.landbosse_output_dir.return_value = self.temp_dir.name
+        self.file_ops.extended_project_list_path.return_value = self.temp_dir.name
+
+        self.chunks = []
+        for position, project_id in enumerate(['ge15_0', 'ge15_1', 'plain']):
+            costs = pd.DataFrame([{column: 0 for column in COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS}] * 2)
+            costs['project_id_with_serial'] = project_id
+            costs['cost_per_project'] = [position + 0.5, 10.0 * position]
+            details = DetailCollector(project_id, 'ErectionCost')
+            details.add(unit='usd', type='variable', variable_df_key_col_name='labor_cost_total', value=position)
+            extended_project_list = pd.DataFrame({
+                'Project ID': [project_id.split('_')[0]],
+                'Project ID with serial': [project_id if project_id != 'plain' else None],
+                'Number of turbines': [100 + position]
+            }, index=[position])
+            self.chunks.append((costs, details.to_dataframe(), extended_project_list))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_output(self, filename):
+        with open(os.path.join(self.temp_dir.name, filename)) as output_file:
+            return output_file.read()
+
+    def test_chunks_written_like_whole_outputs(self):
+        with ProjectResultFileWriter(self.file_ops) as result_writer:
+            for chunk in self.chunks:
+                result_writer.write(*chunk)
+
+        memory_writer = ProjectResultWriter()
+        for chunk in self.chunks:
+            memory_writer.write(*chunk)
+        final_result = memory_writer.result()
+
+        self.assertEqual(
+            self.read_output('landbosse-costs.csv'),
+            result_writer.csv_generator.create_costs_dataframe(final_result['module_type_operation_df'])
+            .to_csv(index=False)
+        )
+        self.assertEqual(
+            self.read_output('landbosse-details.csv'),
+            result_writer.csv_generator.create_details_dataframe(final_result['details_df']).to_csv(index=False)
+        )
+        self.assertEqual(
+            self.read_output('extended_project_list.csv'),
+            final_result['extended_project_list'].to_csv(index=False)
+        )
+        self.assertEqual(result_writer.details_row_count, 3)
+        self.assertEqual(list(result_writer.extended_project_ids.index), [0, 1, 2])
+        self.assertTrue(os.path.isfile(os.path.join(self.temp_dir.name, 'landbosse-output.xlsx')))
+
+    def test_float_columns_stay_float(self):
+        costs, details, _ = self.chunks[0]
+        with ProjectResultFileWriter(self.file_ops) as result_writer:
+            result_writer.write(costs, details, pd.DataFrame({
+                'Project ID': ['ge15'], 'Project ID with serial': ['ge15_0'], 'Labor cost multiplier': [1.2]
+            }))
+            result_writer.write(costs, details, pd.DataFrame({
+                'Project ID with serial': ['ge15_1'], 'Labor cost multiplier': [1], 'Project ID': ['ge15']
+            }, index=[1]))
+        self.assertEqual(self.read_output('extended_project_list.csv').splitlines(), [
+            'Project ID,Project ID with serial,Labor cost multiplier', 'ge15,ge15_0,1.2', 'ge15,ge15_1,1.0'
+        ])
+
+    def test_costs_only_and_kept_costs(self):
+        with ProjectResultFileWriter(self.file_ops, costs_only=True, keep_costs=True) as result_writer:
+            for chunk in self.chunks:
+                result_writer.write(*chunk)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, 'landbosse-details.csv')))
+        self.assertEqual(result_writer.module_type_operation_df['cost_per_project'].tolist(),
+                         [0.5, 0.0, 1.5, 10.0, 2.5, 20.0])
+
+    def test_no_projects(self):
+        with ProjectResultFileWriter(self.file_ops) as result_writer:
+            pass
+        self.assertEqual(self.read_output('landbosse-costs.csv').splitlines()[0],
+                         ','.join(result_writer.csv_generator.costs_csv_columns.values()))
+        self.assertEqual(len(result_writer.extended_project_ids), 0)
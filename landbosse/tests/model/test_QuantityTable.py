@@ -0,0 +1,81 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.model import QuantityTable
+from landbosse.model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+
+
+class TestQuantityTable(TestCase):
+    def setUp(self):
+        self.anchor_costs = pd.DataFrame({
+            'operation_id': ['Foundation', 'Erection'],
+            'type_of_cost': ['Materials', 'Equipment rental'],
+            'raw_cost': [1000.0, 50.0],
+            'turbine_rating_MW': 2.0,
+            'num_turbines': 10,
+            'rotor_diameter_m': 100.0,
+            'project_id_with_serial': 'ge15_0',
+            'module': ['FoundationCost', 'ErectionCost'],
+            'raw_cost_total_or_per_turbine': ['total', 'turbine'],
+            'cost_per_turbine': [100.0, 50.0],
+            'cost_per_project': [1000.0, 500.0],
+            'usd_per_kw_per_project': [0.05, 0.025]
+        })[COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS]
+        self.crane_options = pd.DataFrame({
+            'Choice': ['separate', 'separate', 'separate', 'same'],
+            'Operation': ['Base', 'Base', 'Top', 'Base + Top'],
+            'Crane name': ['A', 'B', 'A', 'C'],
+            'Boom system': ['x', 'x', 'x', 'x'],
+            'Total cost USD': [10.0, 20.0, 5.0, 30.0]
+        })
+        # Concrete changes the foundation, the crane price changes crane A.
+        self.table = QuantityTable(
+            'ge15',
+            ['material_price/Concrete/Material price USD per unit', 'equip_price/Crane/Equipment price USD per hour'],
+            [100.0, 1.0],
+            self.anchor_costs,
+            np.array([[10.0, 0.0], [0.0, 2.0]]),
+            self.crane_options,
+            np.array([[0.0, 0.0, 0.0, 0.0], [4.0, 0.0, 1.0, 0.0]]),
+            allow_same_crane=True
+        )
+
+    def test_is_linear(self):
+        self.assertTrue(QuantityTable.is_price_item('crew_price/Oiler/Hourly rate USD per hour'))
+        self.assertFalse(QuantityTable.is_price_item('components/Tower/Mass tonne'))
+        self.assertTrue(QuantityTable.is_linear(['project list/x/Fuel cost USD per gal',
+                                                 'material_price/Concrete/Material price USD per unit']))
+        self.assertFalse(QuantityTable.is_linear(['project list/x/Labor cost multiplier',
+                                                  'crew_price/Oiler/Hourly rate USD per hour']))
+        self.assertFalse(QuantityTable.is_linear(['project list/x/Hub height m']))
+
+    def test_reprice(self):
+        raw_costs, needs_full_model = self.table.reprice([[100.0, 1.0], [110.0, 3.0], [100.0, 4.0]])
+        np.testing.assert_allclose(raw_costs, [[1000, 50], [1100, 54], [1000, 56]])
+        # At a crane price of 4, crane B is cheaper than crane A for the base.
+        self.assertEqual(needs_full_model.tolist(), [False, False, True])
+
+    def test_same_crane_choice(self):
+        # The same crane is cheaper when both separate cranes are expensive.
+        self.crane_options['Total cost USD'] = [20.0, 25.0, 15.0, 30.0]
+        table = QuantityTable('ge15', ['equip_price/Crane/Equipment price USD per hour'], [1.0], self.anchor_costs,
+                              np.zeros((1, 2)), self.crane_options, np.array([[0.0, 0.0, -30.0, 0.0]]))
+        self.assertEqual(table.anchor_crane_choices.tolist(), [1, 3, 3])
+        _, needs_full_model = table.reprice([[1.0], [1.2]])
+        self.assertEqual(needs_full_model.tolist(), [False, True])
+
+    def test_cost_rows(self):
+        raw_costs, _ = self.table.reprice([[110.0, 3.0]])
+        rows = self.table.cost_rows(raw_costs, ['ge15_1'])
+        self.assertEqual(list(rows.columns), COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS)
+        self.assertEqual(rows['project_id_with_serial'].tolist(), ['ge15_1', 'ge15_1'])
+        np.testing.assert_allclose(rows['cost_per_project'], [1100, 540])
+        np.testing.assert_allclose(rows['cost_per_turbine'], [110, 54])
+        np.testing.assert_allclose(rows['usd_per_kw_per_project'], [1100 / 20000, 540 / 20000])
+
+    def test_quantity_table(self):
+        quantities = self.table.quantity_table()
+        self.assertEqual(quantities['module'].tolist(), ['ErectionCost', 'FoundationCost'])
+        self.assertEqual(quantities['Quantity'].tolist(), [2.0, 10.0])
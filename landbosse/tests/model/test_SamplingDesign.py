@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import XlsxReader
+from landbosse.excelio.SamplingDesign import SamplingDesign
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestSamplingDesign(TestCase):
+    def make_parametric_list(self, design, sample_count=20, seed=3):
+        return pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 10, 'Step': None, 'Value list': None,
+             'Design': design, 'Sample count': sample_count, 'Seed': seed},
+            {'Project ID': 'ge15', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': 0, 'Max': 20, 'Step': 10, 'Value list': None,
+             'Design': None, 'Sample count': None, 'Seed': None},
+            {'Project ID': 'ge15', 'Dataframe name': 'gamma', 'Row name': 'x', 'Column name': 'y',
+             'Min': None, 'Max': None, 'Step': None, 'Value list': '1, 5',
+             'Design': None, 'Sample count': None, 'Seed': None}
+        ])
+
+    def test_values_within_axes(self):
+        for design in ['Latin hypercube', 'Sobol', 'Halton']:
+            values = dict(SamplingDesign(self.make_parametric_list(design, sample_count=16)).axes())
+            self.assertEqual(len(values['alpha/fizz/buzz']), 16)
+            self.assertTrue(((values['alpha/fizz/buzz'] >= 0) & (values['alpha/fizz/buzz'] <= 10)).all())
+            self.assertTrue(set(values['beta/foo/bar']) <= {0, 10, 20})
+            self.assertTrue(set(values['gamma/x/y']) <= {1, 5})
+
+    def test_latin_hypercube_is_stratified(self):
+        values = dict(SamplingDesign(self.make_parametric_list('latin hypercube')).axes())['alpha/fizz/buzz']
+        counts, _ = np.histogram(values, bins=20, range=(0, 10))
+        self.assertTrue((counts == 1).all())
+
+    def test_seed_is_reproducible(self):
+        first = SamplingDesign(self.make_parametric_list('Halton')).axes()[0][1]
+        second = SamplingDesign(self.make_parametric_list('Halton')).axes()[0][1]
+        np.testing.assert_array_equal(first, second)
+
+    def test_chunks_match_axes(self):
+        design = SamplingDesign(self.make_parametric_list('Sobol', sample_count=32))
+        chunks = list(design.iter_grid_chunks(chunk_size=10))
+        self.assertEqual([start for start, _ in chunks], [0, 10, 20, 30])
+        np.testing.assert_array_equal(np.concatenate([chunk['alpha/fizz/buzz'] for _, chunk in chunks]),
+                                      design.axes()[0][1])
+
+    def test_missing_sample_count(self):
+        with self.assertRaises(XlsxOperationException):
+            SamplingDesign(self.make_parametric_list('Sobol', sample_count=None))
+
+    def test_unknown_design(self):
+        with self.assertRaises(XlsxOperationException):
+            SamplingDesign(self.make_parametric_list('Random walk'))
+
+    def test_parametric_value_list(self):
+        parametric_list = pd.concat([
+            self.make_parametric_list('Latin hypercube', sample_count=5),
+            pd.DataFrame([{'Project ID': 'ge20', 'Dataframe name': 'alpha', 'Row name': 'fizz',
+                           'Column name': 'buzz', 'Min': 0, 'Max': 1, 'Step': 1}])
+        ], ignore_index=True)
+        parametric_value_list = XlsxReader().create_parametric_value_list(parametric_list)
+        self.assertEqual(parametric_value_list['Project ID with serial'].tolist(),
+                         ['ge15_0', 'ge15_1', 'ge15_2', 'ge15_3', 'ge15_4', 'ge20_5', 'ge20_6'])
+        self.assertEqual(parametric_value_list['alpha/fizz/buzz'].tolist()[5:], [0, 1])
@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import SensitivityAnalysis
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.tests.model.FakeCostRunner import FakeCostRunner
+
+
+def linear_costs(project_parameters):
+    """
+    The FoundationCost is a linear function of the two parametric inputs
+    and the ErectionCost is constant.
+    """
+    x = project_parameters['alpha/fizz/buzz']
+    y = project_parameters['beta/foo/bar']
+    return {'FoundationCost': 100 + 2 * x + 5 * y, 'ErectionCost': 50}
+
+
+class TestSensitivityAnalysis(TestCase):
+    def setUp(self):
+        self.project_list = pd.DataFrame({
+            'Project ID': ['ge15', 'other'],
+            'Project data file': ['ge15_data', 'other_data']
+        })
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 10, 'Step': None},
+            {'Project ID': 'ge15', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': 20, 'Max': 40, 'Step': None}
+        ])
+
+    def indices(self, result, output):
+        return result[result['Output'] == output].set_index('Factor')
+
+    def test_sobol(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, linear_costs)
+        analysis = SensitivityAnalysis(runner, 'ge15', 'sobol', sample_count=256)
+        result = analysis.run()
+        self.assertEqual(runner.run_counts, [256 * 4])
+
+        # The variance of a linear function is the sum of the variances of
+        # its terms: (2 * 10) ** 2 / 12 and (5 * 20) ** 2 / 12
+        foundation = self.indices(result, 'FoundationCost')
+        expected = np.array([400, 10000]) / 10400
+        np.testing.assert_allclose(foundation.loc[['alpha/fizz/buzz', 'beta/foo/bar'], 'S1'], expected, atol=0.02)
+        np.testing.assert_allclose(foundation.loc[['alpha/fizz/buzz', 'beta/foo/bar'], 'ST'], expected, atol=0.02)
+
+        erection = self.indices(result, 'ErectionCost')
+        self.assertEqual(erection['S1'].tolist(), [0, 0])
+
+    def test_morris(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, linear_costs)
+        analysis = SensitivityAnalysis(runner, 'ge15', 'morris', sample_count=10)
+        result = analysis.run()
+
+        # Effects are per unit of range: 2 * 10 and 5 * 20
+        foundation = self.indices(result, 'FoundationCost')
+        np.testing.assert_allclose(foundation.loc[['alpha/fizz/buzz', 'beta/foo/bar'], 'mu_star'], [20, 100])
+        np.testing.assert_allclose(foundation['sigma'], [0, 0], atol=1e-9)
+
+        # A grid of 4 levels in 2 dimensions has few distinct points, so
+        # trajectories share points and each is run once.
+        self.assertLess(runner.run_counts[0], 10 * 3)
+
+    def test_cache(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, linear_costs)
+        self.parametric_list.loc[0, 'Step'] = 5
+        analysis = SensitivityAnalysis(runner, 'ge15', 'sobol', sample_count=8)
+        first = analysis.run()
+        # Points in the blocks that only differ by the discrete factor are
+        # shared with the base matrices.
+        self.assertLess(runner.run_counts[0], 8 * 4)
+
+        second = analysis.run()
+        self.assertEqual(len(runner.run_counts), 1)
+        self.assertEqual(analysis.evaluation_count, 0)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_project_without_parametric_rows(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, linear_costs)
+        with self.assertRaises(XlsxOperationException):
+            SensitivityAnalysis(runner, 'other').run()
@@ -0,0 +1,105 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pandas as pd
+
+from landbosse.excelio import ShardMerger
+from landbosse.excelio import XlsxReader
+from landbosse.excelio import XlsxSerialManagerRunner
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+
+
+class TestShardMerger(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.project_list = pd.DataFrame({
+            'Project ID': ['ge15', 'plain'],
+            'Project data file': ['ge15_data', 'plain_data']
+        })
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 3, 'Step': 1}
+        ])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_shard(self, shard):
+        """
+        Writes the outputs of a shard, with one cost row per project, the way
+        main.py does.
+        """
+        runner = XlsxSerialManagerRunner(shard=shard)
+        rows = [project_parameters for _, project_parameters in
+                runner.iter_extended_project_list_rows(self.project_list, self.parametric_list)]
+        extended_project_list = pd.DataFrame(rows)
+        project_ids_with_serial = extended_project_list['Project ID with serial'] \
+            .fillna(extended_project_list['Project ID'])
+
+        shard_dir = os.path.join(self.temp_dir.name, f'shard{shard[0]}')
+        os.makedirs(os.path.join(shard_dir, 'calculated_parametric_inputs'))
+        extended_project_list.to_csv(os.path.join(shard_dir, ShardMerger.EXTENDED_PROJECT_LIST_FILENAME), index=False)
+        pd.DataFrame({
+            'Project ID with serial': project_ids_with_serial,
+            'Cost per project': extended_project_list['alpha/fizz/buzz'].fillna(-1)
+        }).to_csv(os.path.join(shard_dir, ShardMerger.COSTS_FILENAME), index=False)
+        ShardMerger.write_manifest(shard_dir, shard, 5, extended_project_list, costs_only=True)
+        return shard_dir
+
+    def test_shards_partition_extended_project_list(self):
+        positions = []
+        for shard_index in range(3):
+            runner = XlsxSerialManagerRunner(shard=(shard_index, 3))
+            positions.append([position for position, _ in
+                              runner.iter_extended_project_list_rows(self.project_list, self.parametric_list)])
+        self.assertEqual(positions, [[0, 3], [1, 4], [2]])
+
+    def test_invalid_shard(self):
+        with self.assertRaises(XlsxOperationException):
+            XlsxSerialManagerRunner(shard=(3, 3))
+
+    def test_merge_restores_order(self):
+        shard_dirs = [self.run_shard((shard_index, 2)) for shard_index in [1, 0]]
+        output_dir = os.path.join(self.temp_dir.name, 'merged')
+        os.makedirs(output_dir)
+        ShardMerger(shard_dirs).merge(output_dir)
+        costs = pd.read_csv(os.path.join(output_dir, ShardMerger.COSTS_FILENAME))
+        self.assertEqual(costs['Project ID with serial'].tolist(), ['ge15_0', 'ge15_1', 'ge15_2', 'ge15_3', 'plain'])
+        self.assertEqual(costs['Cost per project'].tolist(), [0, 1, 2, 3, -1])
+        extended_project_list = pd.read_csv(os.path.join(output_dir, ShardMerger.EXTENDED_PROJECT_LIST_FILENAME))
+        self.assertEqual(extended_project_list['Project ID'].tolist(), ['ge15'] * 4 + ['plain'])
+
+    def test_merge_writes_values_unchanged(self):
+        """
+        Numbers must be written with the same digits the shards wrote, as
+        in an unsharded run.
+        """
+        shard_dirs = [self.run_shard((shard_index, 2)) for shard_index in [0, 1]]
+        costs_filename = os.path.join(shard_dirs[1], ShardMerger.COSTS_FILENAME)
+        with open(costs_filename, 'w') as costs_file:
+            costs_file.write('Project ID with serial,Cost per project\nge15_1,9442.946196105862\nge15_3,7\n')
+        output_dir = os.path.join(self.temp_dir.name, 'merged')
+        os.makedirs(output_dir)
+        ShardMerger(shard_dirs).merge(output_dir)
+        with open(os.path.join(output_dir, ShardMerger.COSTS_FILENAME)) as costs_file:
+            self.assertEqual(costs_file.read().splitlines(), [
+                'Project ID with serial,Cost per project', 'ge15_0,0.0', 'ge15_1,9442.946196105862',
+                'ge15_2,2.0', 'ge15_3,7', 'plain,-1.0'
+            ])
+
+    def test_missing_shard(self):
+        shard_dirs = [self.run_shard((0, 2))]
+        with self.assertRaises(XlsxOperationException):
+            ShardMerger(shard_dirs).check()
+
+    def test_incomplete_costs(self):
+        shard_dirs = [self.run_shard((shard_index, 2)) for shard_index in [0, 1]]
+        costs_filename = os.path.join(shard_dirs[1], ShardMerger.COSTS_FILENAME)
+        pd.read_csv(costs_filename).iloc[:-1].to_csv(costs_filename, index=False)
+        with self.assertRaises(XlsxOperationException):
+            ShardMerger(shard_dirs).check()
+
+    def test_extended_project_count(self):
+        self.assertEqual(XlsxReader().extended_project_count(self.project_list, self.parametric_list), 5)
+        self.assertEqual(XlsxReader().extended_project_count(self.project_list, pd.DataFrame()), 2)
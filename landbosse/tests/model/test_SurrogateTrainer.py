@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from landbosse.excelio import SurrogateTrainer
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.tests.model.FakeCostRunner import FakeCostRunner
+
+
+def linear_costs(project_parameters):
+    """
+    The FoundationCost is a linear function of the two parametric inputs.
+    """
+    x = project_parameters['alpha/fizz/buzz']
+    y = project_parameters['beta/foo/bar']
+    return {'FoundationCost': 100 + 2 * x + 5 * y}
+
+
+class TestSurrogateTrainer(TestCase):
+    def setUp(self):
+        self.project_list = pd.DataFrame({
+            'Project ID': ['ge15', 'other'],
+            'Project data file': ['ge15_data', 'other_data']
+        })
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 10, 'Step': None, 'Design': 'Sobol', 'Sample count': 16, 'Seed': 2},
+            {'Project ID': 'ge15', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': 20, 'Max': 40, 'Step': None}
+        ])
+
+    def test_train_and_fallback(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, linear_costs)
+        emulator = SurrogateTrainer(runner, 'ge15', 'polynomial', degree=1, test_fraction=0.25).train()
+        self.assertEqual(runner.run_counts, [16])
+        self.assertEqual(emulator.input_names, ['alpha/fizz/buzz', 'beta/foo/bar'])
+        self.assertEqual(emulator.output_names, ['FoundationCost', 'Total'])
+        self.assertEqual(emulator.validation['Points'].tolist(), [4, 4])
+        self.assertLess(emulator.validation['Max relative error'].max(), 1e-9)
+
+        costs = emulator.evaluate([[5, 30], [50, 30]])
+        np.testing.assert_allclose(costs[:, 0], [260, 350])
+        self.assertEqual(runner.run_counts, [16, 1])
+
+    def test_project_without_parametric_rows(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, linear_costs)
+        with self.assertRaises(XlsxOperationException):
+            SurrogateTrainer(runner, 'other').train()
@@ -0,0 +1,109 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from landbosse.excelio import UncertaintyAnalysis
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.model.CostModule import COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS
+from landbosse.tests.model.FakeCostRunner import FakeCostRunner
+
+CONCRETE = 'material_price/Concrete/Material price USD per unit'
+CRANE = 'equip_price/Crane/Equipment price USD per hour'
+
+
+def cost_model(project_parameters):
+    """
+    The FoundationCost is 10 units of concrete. The ErectionCost chooses
+    crane A, which takes 4 hours, or crane B, which takes 1 hour and costs
+    10 to mobilize, for the base and uses crane A for the top. The crane
+    price is 2 if it is not in the project parameters.
+    """
+    concrete = project_parameters[CONCRETE]
+    crane = project_parameters.get(CRANE, 2.0)
+    crane_options = pd.DataFrame({
+        'Choice': ['separate', 'separate', 'separate', 'same'],
+        'Operation': ['Base', 'Base', 'Top', 'Base + Top'],
+        'Crane name': ['A', 'B', 'A', 'C'],
+        'Boom system': 'x',
+        'Total cost USD': [4 * crane, 10 + crane, crane, 1000 + crane]
+    })
+    costs = pd.DataFrame({
+        'operation_id': ['Foundation', 'Erection'],
+        'type_of_cost': ['Materials', 'Equipment rental'],
+        'raw_cost': [10 * concrete, min(4 * crane, 10 + crane) + crane],
+        'turbine_rating_MW': 2.0,
+        'num_turbines': 5,
+        'rotor_diameter_m': 100.0,
+        'project_id_with_serial': project_parameters['Project ID with serial'],
+        'module': ['FoundationCost', 'ErectionCost'],
+        'raw_cost_total_or_per_turbine': ['total', 'turbine'],
+        'cost_per_turbine': 0.0,
+        'cost_per_project': [10 * concrete, 5 * (min(4 * crane, 10 + crane) + crane)],
+        'usd_per_kw_per_project': 0.0
+    })[COSTS_BY_MODULE_TYPE_OPERATION_COLUMNS]
+    return costs, crane_options, True
+
+
+class TestUncertaintyAnalysis(TestCase):
+    def setUp(self):
+        self.project_list = pd.DataFrame({'Project ID': ['ge15'], 'Project data file': ['ge15_data']})
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'material_price', 'Row name': 'Concrete',
+             'Column name': 'Material price USD per unit', 'Distribution': 'Normal', 'Mean': 100,
+             'Standard deviation': 10, 'Min': 0},
+            {'Project ID': 'ge15', 'Dataframe name': 'equip_price', 'Row name': 'Crane',
+             'Column name': 'Equipment price USD per hour', 'Distribution': None, 'Min': 1, 'Max': 6}
+        ])
+
+    def analysis(self, sample_count=1000):
+        runner = FakeCostRunner(self.project_list, self.parametric_list,
+                                lambda project_parameters: cost_model(project_parameters)[0])
+        analysis = UncertaintyAnalysis(runner, 'ge15', sample_count=sample_count)
+        analysis.repricing_sweep.run_full_model = lambda project_parameters, enable=False: \
+            cost_model(project_parameters)
+        return runner, analysis
+
+    def test_distribution(self):
+        row = pd.Series({'Dataframe name': 'a', 'Row name': 'b', 'Column name': 'c', 'Distribution': 'Lognormal',
+                         'Mean': 50.0, 'Standard deviation': 5.0})
+        distribution = UncertaintyAnalysis.distribution(row)
+        self.assertAlmostEqual(distribution.mean(), 50.0)
+        self.assertAlmostEqual(distribution.std(), 5.0)
+
+        row['Distribution'] = 'Triangular'
+        with self.assertRaises(XlsxOperationException):
+            UncertaintyAnalysis.distribution(row)
+        row['Distribution'] = 'Cauchy'
+        with self.assertRaises(XlsxOperationException):
+            UncertaintyAnalysis.distribution(row)
+
+    def test_reprice_across_crane_choices(self):
+        runner, analysis = self.analysis()
+        summary = analysis.run().set_index('Output')
+
+        # The crane choice changes at a crane price of 10 / 3, so there is
+        # one take off for each choice and no sample is run.
+        self.assertEqual(len(analysis.quantity_tables), 2)
+        self.assertEqual(sum(runner.run_counts), 0)
+
+        crane = analysis.samples[CRANE].values
+        expected_erection = 5 * (np.minimum(4 * crane, 10 + crane) + crane)
+        np.testing.assert_allclose(analysis.costs['ErectionCost'], expected_erection)
+        np.testing.assert_allclose(analysis.costs['FoundationCost'], 10 * analysis.samples[CONCRETE])
+        self.assertAlmostEqual(summary.loc['FoundationCost', 'Mean'], 1000, delta=1)
+        self.assertAlmostEqual(summary.loc['FoundationCost', 'P95'], 1000 + 100 * stats.norm.ppf(0.95), delta=5)
+        self.assertEqual(summary.loc['Total', 'Samples'], 1000)
+
+    def test_full_model_for_other_inputs(self):
+        self.parametric_list.loc[1, 'Dataframe name'] = 'components'
+        self.parametric_list.loc[1, 'Column name'] = 'Mass tonne'
+        runner, analysis = self.analysis(sample_count=20)
+        summary = analysis.run().set_index('Output')
+
+        # The tower mass is not a price, so every sample is run.
+        self.assertEqual(len(analysis.quantity_tables), 0)
+        self.assertEqual(sum(runner.run_counts), 20)
+        np.testing.assert_allclose(analysis.costs['FoundationCost'], 10 * analysis.samples[CONCRETE])
+        self.assertEqual(summary.loc['ErectionCost', 'Standard deviation'], 0)
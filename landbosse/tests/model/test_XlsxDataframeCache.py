@@ -0,0 +1,117 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+import pandas as pd
+
+from landbosse.excelio import XlsxDataframeCache
+
+
+class TestXlsxDataframeCache(TestCase):
+    def setUp(self):
+        """
+        Writes a small .xlsx file into a temporary folder, next to the
+        folder of the cache.
+        """
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.xlsx_filename = os.path.join(self.temp_dir.name, 'project_data.xlsx')
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+        self.write_xlsx(rate=10.0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_xlsx(self, rate):
+        with pd.ExcelWriter(self.xlsx_filename) as writer:
+            pd.DataFrame({'Operation ID': ['Excavation'], 'Rate USD per unit': [rate]}) \
+                .to_excel(writer, sheet_name='rsmeans', index=False)
+            pd.DataFrame({'Labor type ID': ['Crane operator']}).to_excel(writer, sheet_name='crew', index=False)
+
+    def read_sheets(self, cache_dir=None):
+        """
+        Reads all the sheets of the .xlsx file, from the cache on disk if
+        it is up to date, as if it had not been read before.
+        """
+        XlsxDataframeCache._cache.pop('project_data', None)
+        try:
+            with patch.object(XlsxDataframeCache, 'cache_dir', cache_dir or self.cache_dir):
+                return dict(XlsxDataframeCache.read_all_sheets_from_xlsx('project_data', self.temp_dir.name))
+        finally:
+            XlsxDataframeCache._cache.pop('project_data', None)
+
+    def cache_filename(self):
+        return XlsxDataframeCache.cache_filename(self.xlsx_filename, self.cache_dir)
+
+    def test_cache_file_written_to_cache_dir(self):
+        self.read_sheets()
+        self.assertEqual(os.path.dirname(self.cache_filename()), self.cache_dir)
+        self.assertTrue(os.path.exists(self.cache_filename()))
+        self.assertEqual(sorted(os.listdir(self.temp_dir.name)), ['cache', 'project_data.xlsx'])
+
+    def test_hit_skips_parser_and_writes_nothing(self):
+        """
+        A second read must come from the cache file, without hashing the
+        .xlsx file or writing the cache file again.
+        """
+        parsed = self.read_sheets()
+        with patch.object(XlsxDataframeCache, 'parse_all_sheets') as parse_all_sheets, \
+                patch.object(XlsxDataframeCache, 'content_hash') as content_hash, \
+                patch.object(XlsxDataframeCache, 'write_cache_file') as write_cache_file:
+            loaded = self.read_sheets()
+        parse_all_sheets.assert_not_called()
+        content_hash.assert_not_called()
+        write_cache_file.assert_not_called()
+        self.assertEqual(list(parsed.keys()), list(loaded.keys()))
+        for sheet_name in parsed:
+            pd.testing.assert_frame_equal(parsed[sheet_name], loaded[sheet_name])
+
+    def test_touched_xlsx_not_parsed_again(self):
+        """
+        A .xlsx file with a new modification time but the same contents
+        must still be loaded from the cache file.
+        """
+        self.read_sheets()
+        stat = os.stat(self.xlsx_filename)
+        os.utime(self.xlsx_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with patch.object(XlsxDataframeCache, 'parse_all_sheets') as parse_all_sheets:
+            self.read_sheets()
+        parse_all_sheets.assert_not_called()
+
+    def test_stale_cache_file_invalidated(self):
+        """
+        Changing the .xlsx file must cause it to be parsed again.
+        """
+        self.read_sheets()
+        self.write_xlsx(rate=20.0)
+        sheets = self.read_sheets()
+        self.assertEqual(sheets['rsmeans']['Rate USD per unit'].iloc[0], 20.0)
+
+    def test_corrupt_cache_file_ignored(self):
+        os.makedirs(self.cache_dir)
+        with open(self.cache_filename(), 'wb') as cache_file:
+            cache_file.write(b'not a pickle')
+        sheets = self.read_sheets()
+        self.assertEqual(sheets['rsmeans']['Rate USD per unit'].iloc[0], 10.0)
+
+    def test_disk_cache_off_by_default(self):
+        XlsxDataframeCache._cache.pop('project_data', None)
+        try:
+            XlsxDataframeCache.read_all_sheets_from_xlsx('project_data', self.temp_dir.name)
+        finally:
+            XlsxDataframeCache._cache.pop('project_data', None)
+        self.assertIsNone(XlsxDataframeCache.cache_dir)
+        self.assertEqual(os.listdir(self.temp_dir.name), ['project_data.xlsx'])
+
+    def test_prefetch_fills_cache(self):
+        second_filename = os.path.join(self.temp_dir.name, 'second_project_data.xlsx')
+        pd.DataFrame({'Component': ['Blade']}).to_excel(second_filename, sheet_name='components', index=False)
+        basenames = ['project_data', 'second_project_data', 'project_data']
+        try:
+            XlsxDataframeCache.prefetch(basenames, xlsx_path=self.temp_dir.name, max_workers=2)
+            self.assertEqual(list(XlsxDataframeCache._cache['project_data'].keys()), ['rsmeans', 'crew'])
+            sheets = XlsxDataframeCache.read_all_sheets_from_xlsx('second_project_data', self.temp_dir.name)
+            self.assertEqual(sheets['components']['Component'].iloc[0], 'Blade')
+        finally:
+            XlsxDataframeCache._cache.pop('project_data', None)
+            XlsxDataframeCache._cache.pop('second_project_data', None)
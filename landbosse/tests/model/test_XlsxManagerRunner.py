@@ -0,0 +1,178 @@
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+import pandas as pd
+
+from landbosse.excelio import ProjectResultWriter, XlsxDataframeCache, XlsxManagerRunner, XlsxReader, \
+    XlsxSerialManagerRunner
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.model import DetailCollector
+from landbosse.tests.model.FakeCostRunner import FakeCostRunner
+
+
+class TestCompactOutputDict(TestCase):
+    def setUp(self):
+        erection_details = DetailCollector('project_1', 'ErectionCost')
+        erection_details.add(unit='usd', type='variable', variable_df_key_col_name='labor_cost_total', value=10.0)
+        foundation_details = DetailCollector('project_1', 'FoundationCost')
+        foundation_details.add(unit='m', type='variable', variable_df_key_col_name='Radius', value=3.5)
+        self.output_dict = {
+            'erection_module_type_operation': pd.DataFrame({
+                'project_id_with_serial': ['project_1'] * 2,
+                'module': ['ErectionCost'] * 2,
+                'cost_per_project': [1.0, 2.0]
+            }),
+            'foundation_module_type_operation': pd.DataFrame(),
+            'management_module_type_operation': pd.DataFrame({
+                'project_id_with_serial': ['project_1'],
+                'module': ['ManagementCost'],
+                'cost_per_project': [3.0]
+            }),
+            'erection_cost_csv': erection_details.to_dataframe(),
+            'foundation_cost_csv': foundation_details.to_dataframe(),
+            'crane_data_output': pd.DataFrame({'Crane name': ['LR1600'] * 1000}),
+            'project_series': pd.Series({'Project ID': 'project_1'})
+        }
+
+    def test_keeps_the_same_rows(self):
+        runner = XlsxManagerRunner()
+        compact = XlsxManagerRunner.compact_output_dict(self.output_dict)
+        self.assertEqual(sorted(compact.keys()), ['project_csv', 'project_module_type_operation'])
+        pd.testing.assert_frame_equal(
+            runner.extract_module_type_operation_dataframe({'project_1': compact}),
+            runner.extract_module_type_operation_dataframe({'project_1': self.output_dict})
+        )
+        pd.testing.assert_frame_equal(
+            runner.extract_details_dataframe({'project_1': compact}),
+            runner.extract_details_dataframe({'project_1': self.output_dict})
+        )
+        self.assertLess(len(pickle.dumps(compact)), len(pickle.dumps(self.output_dict)))
+
+    def test_project_without_rows(self):
+        self.assertEqual(XlsxManagerRunner.compact_output_dict({'crane_data_output': pd.DataFrame()}), dict())
+
+
+class TestIterProjectGroups(TestCase):
+    def test_groups_share_project_data(self):
+        extended_project_list = pd.DataFrame({
+            'Project data file': ['a', 'b', 'a', 'a', 'b', 'a'],
+            'Labor cost multiplier': [1.0] * 6,
+            'Number of turbines': [10, 20, 30, 40, 50, 60]
+        }, index=[10, 11, 12, 13, 14, 15])
+        windows = list(XlsxManagerRunner().iter_project_groups(extended_project_list.iterrows(), window_size=5))
+        self.assertEqual(
+            [[[(position, index) for position, index, _ in group] for group in groups] for groups in windows],
+            [[[(0, 10), (2, 12), (3, 13)], [(1, 11), (4, 14)]], [[(5, 15)]]]
+        )
+        self.assertEqual(windows[0][0][1][2]['Number of turbines'], 30)
+
+
+class TestRunProjectsCostAndScalingModifications(TestCase):
+    def setUp(self):
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': ['project_1'],
+            'Project ID with serial': ['project_1_0'],
+            'Project data file': ['project_data'],
+            'Number of turbines': [100],
+            'Turbine rating MW': [2.0],
+            'Hub height m': [80.0],
+            'Flag for user-defined home run trench length (0 = no; 1 = yes)': [0],
+            'Number of access roads': [1.0],
+            'project list/Project/Number of access roads': [3.0]
+        })
+
+    def old_order(self):
+        """
+        The project list cell specifications applied first, then the cost
+        and scaling modifications, one row at a time.
+        """
+        xlsx_reader = XlsxReader()
+        project_parameters = self.extended_project_list.iloc[0].copy()
+        xlsx_reader.modify_project_data_and_project_list(dict(), project_parameters)
+        xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+        return project_parameters
+
+    @patch('landbosse.excelio.XlsxSerialManagerRunner.Manager')
+    @patch.object(XlsxReader, 'create_master_input_dictionary', return_value=dict())
+    @patch.object(XlsxDataframeCache, 'read_all_sheets_from_xlsx', return_value=dict())
+    def test_scaling_overwrites_project_list_specifications(self, *_):
+        result = XlsxSerialManagerRunner().run_projects(
+            self.extended_project_list.iterrows(), enable_cost_and_scaling_modifications=True, costs_only=True)
+        project_parameters = result['extended_project_list'].iloc[0]
+        self.assertEqual(project_parameters['Number of access roads'], 2)
+        self.assertEqual(project_parameters['Number of access roads'], self.old_order()['Number of access roads'])
+        self.assertEqual(project_parameters['Project size MW'], 200.0)
+
+
+class TestRunProjectsInChunks(TestCase):
+    @patch('landbosse.excelio.XlsxSerialManagerRunner.Manager')
+    @patch.object(XlsxReader, 'create_master_input_dictionary', return_value=dict())
+    @patch.object(XlsxDataframeCache, 'read_all_sheets_from_xlsx', return_value=dict())
+    def test_outputs_handed_over_in_chunks(self, *_):
+        extended_project_list = pd.DataFrame({
+            'Project ID': ['project_1'] * 5,
+            'Project ID with serial': [f'project_1_{serial}' for serial in range(5)],
+            'Project data file': ['project_data'] * 5
+        })
+        result_writer = ProjectResultWriter()
+        runner = XlsxSerialManagerRunner()
+        runner.output_chunk_size = 2
+        result = runner.run_projects(extended_project_list.iterrows(), costs_only=True, result_writer=result_writer)
+        self.assertEqual([len(chunk) for chunk in result_writer.extended_project_lists], [2, 2, 1])
+        self.assertEqual(list(result['extended_project_list']['Project ID with serial']),
+                         list(extended_project_list['Project ID with serial']))
+
+
+class TestRunCostsByModule(TestCase):
+    def setUp(self):
+        self.project_list = pd.DataFrame({'Project ID': ['ge15', 'ge20'], 'Project data file': ['ge15', 'ge20']})
+        self.parametric_list = pd.DataFrame([{
+            'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+            'Min': 0, 'Max': 10, 'Step': 5, 'Value list': None
+        }])
+
+    def test_costs_in_parametric_value_order(self):
+        def costs(project_parameters):
+            # The project with buzz 5 fails and has no cost rows
+            if project_parameters['alpha/fizz/buzz'] == 5:
+                return pd.DataFrame(columns=['project_id_with_serial', 'module', 'cost_per_project'])
+            return {'FoundationCost': project_parameters['alpha/fizz/buzz'] * 2.0}
+
+        runner = FakeCostRunner(self.project_list, self.parametric_list, costs)
+        project_list, project_parametric_list = runner.read_parametric_project('ge15')
+        parametric_value_list = XlsxReader().create_parametric_value_list(project_parametric_list)
+        parametric_value_list = parametric_value_list.iloc[::-1]
+        costs_by_module, result = runner.run_costs_by_module(project_list, parametric_value_list)
+        self.assertEqual(list(costs_by_module.index), list(parametric_value_list['Project ID with serial']))
+        self.assertEqual(costs_by_module['FoundationCost'].tolist()[0], 20.0)
+        self.assertTrue(costs_by_module.iloc[1].isnull().all())
+        self.assertEqual(len(result['extended_project_list']), 3)
+
+    def test_project_without_parametric_rows(self):
+        runner = FakeCostRunner(self.project_list, self.parametric_list, lambda _: {})
+        with self.assertRaises(XlsxOperationException):
+            runner.read_parametric_project('ge20')
+
+
+class TestCheckShardable(TestCase):
+    def make_parametric_list(self, design, seed):
+        return pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 10, 'Step': None, 'Value list': None,
+             'Design': design, 'Sample count': 8, 'Seed': seed},
+            {'Project ID': 'ge20', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 10, 'Step': 5, 'Value list': None,
+             'Design': None, 'Sample count': None, 'Seed': None}
+        ])
+
+    def test_unseeded_sampling_design_refused(self):
+        runner = XlsxManagerRunner(shard=(0, 2))
+        project_list = pd.DataFrame({'Project ID': ['ge15'], 'Project data file': ['ge15_data']})
+        with self.assertRaises(XlsxOperationException):
+            next(runner.iter_extended_project_list_rows(project_list, self.make_parametric_list('Sobol', None)))
+
+    def test_seeded_and_grid_designs_allowed(self):
+        XlsxManagerRunner.check_shardable(self.make_parametric_list('Sobol', 3))
+        XlsxManagerRunner.check_shardable(self.make_parametric_list(None, None))
+        XlsxManagerRunner.check_shardable(pd.DataFrame())
@@ -0,0 +1,286 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import pandas as pd
+
+from landbosse.excelio import CopyOnWriteSheets, XlsxReader
+
+
+class TestXlsxReaderLaborMultiplier(TestCase):
+    def setUp(self):
+        XlsxReader._labor_multiplier_cache.clear()
+        self.project_data = {
+            'crew_price': pd.DataFrame({
+                'Labor type ID': ['Crane operator', 'RSMeans'],
+                'Hourly rate USD per hour': [50.0, 60.0],
+                'Per diem USD per day': [100.0, 120.0]
+            }),
+            'rsmeans': pd.DataFrame({
+                'Operation ID': ['Excavation', 'Excavation', 'Grading'],
+                'Type of cost': ['Labor', 'Equipment rental', None],
+                'Rate USD per unit': [10.0, 5.0, 2.0],
+                'Module': ['Foundations', 'Foundations', 'Roads']
+            })
+        }
+
+    def test_multiplier_applied_to_labor_only(self):
+        XlsxReader().apply_labor_multiplier_to_project_data_dict(self.project_data, 1.5)
+        crew_price = self.project_data['crew_price']
+        rsmeans = self.project_data['rsmeans']
+        self.assertEqual(crew_price['Hourly rate USD per hour'].tolist(), [75.0, 90.0])
+        self.assertEqual(crew_price['Per diem USD per day'].tolist(), [150.0, 180.0])
+        self.assertEqual(rsmeans['Rate USD per unit'].tolist(), [15.0, 5.0, 2.0])
+
+    def test_rate_column_moved_last(self):
+        XlsxReader().apply_labor_multiplier_to_project_data_dict(self.project_data, 1.5)
+        self.assertEqual(list(self.project_data['rsmeans'].columns),
+                         ['Operation ID', 'Type of cost', 'Module', 'Rate USD per unit'])
+
+    def test_original_dataframes_not_modified(self):
+        crew_price = self.project_data['crew_price']
+        rsmeans = self.project_data['rsmeans']
+        XlsxReader().apply_labor_multiplier_to_project_data_dict(self.project_data, 2.0)
+        self.assertEqual(crew_price['Hourly rate USD per hour'].tolist(), [50.0, 60.0])
+        self.assertEqual(rsmeans['Rate USD per unit'].tolist(), [10.0, 5.0, 2.0])
+
+    def test_adjusted_dataframes_cached_per_multiplier(self):
+        """
+        Identical sheets with the same multiplier must get the same adjusted
+        dataframes. A different multiplier must get new ones.
+        """
+        copied_project_data = {name: df.copy() for name, df in self.project_data.items()}
+        other_project_data = {name: df.copy() for name, df in self.project_data.items()}
+        xlsx_reader = XlsxReader()
+        xlsx_reader.apply_labor_multiplier_to_project_data_dict(self.project_data, 2.0)
+        xlsx_reader.apply_labor_multiplier_to_project_data_dict(copied_project_data, 2.0)
+        xlsx_reader.apply_labor_multiplier_to_project_data_dict(other_project_data, 3.0)
+        self.assertIs(self.project_data['rsmeans'], copied_project_data['rsmeans'])
+        self.assertIs(self.project_data['crew_price'], copied_project_data['crew_price'])
+        self.assertIsNot(self.project_data['rsmeans'], other_project_data['rsmeans'])
+        self.assertEqual(other_project_data['rsmeans']['Rate USD per unit'].tolist(), [30.0, 5.0, 2.0])
+
+    def test_int_and_float_multipliers_cached_separately(self):
+        """
+        1 == 1.0, but an int multiplier leaves integer columns as integers
+        and a float multiplier makes them floats, as without the cache.
+        """
+        self.project_data['crew_price']['Per diem USD per day'] = [100, 120]
+        float_project_data = {name: df.copy() for name, df in self.project_data.items()}
+        xlsx_reader = XlsxReader()
+        xlsx_reader.apply_labor_multiplier_to_project_data_dict(self.project_data, 1)
+        xlsx_reader.apply_labor_multiplier_to_project_data_dict(float_project_data, 1.0)
+        self.assertEqual(self.project_data['crew_price']['Per diem USD per day'].dtype, 'int64')
+        self.assertEqual(float_project_data['crew_price']['Per diem USD per day'].dtype, 'float64')
+
+
+class TestXlsxReaderParametricStreaming(TestCase):
+    def setUp(self):
+        self.parametric_list = pd.DataFrame([
+            {'Project ID': 'ge15', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': 0, 'Max': 2, 'Step': 1, 'Value list': None},
+            {'Project ID': 'ge15', 'Dataframe name': 'beta', 'Row name': 'foo', 'Column name': 'bar',
+             'Min': 10, 'Max': 30, 'Step': 10, 'Value list': None},
+            {'Project ID': 'ge20', 'Dataframe name': 'alpha', 'Row name': 'fizz', 'Column name': 'buzz',
+             'Min': None, 'Max': None, 'Step': None, 'Value list': '1, 2'}
+        ])
+        self.project_list = pd.DataFrame({
+            'Project ID': ['ge15', 'plain', 'ge20'],
+            'Project data file': ['ge15_data', 'plain_data', 'ge20_data'],
+            'Hub height m': [80, 90, 100]
+        })
+
+    def test_serial_numbers_run_across_projects(self):
+        parametric_value_list = XlsxReader().create_parametric_value_list(self.parametric_list)
+        self.assertEqual(parametric_value_list['Project ID with serial'].tolist(),
+                         [f'ge15_{index:02d}' for index in range(9)] + ['ge20_09', 'ge20_10'])
+        self.assertEqual(parametric_value_list['beta/foo/bar'].tolist()[:4], [10, 20, 30, 10])
+
+    def test_streamed_chunks_match_extended_project_list(self):
+        xlsx_reader = XlsxReader()
+        parametric_value_list = xlsx_reader.create_parametric_value_list(self.parametric_list)
+        expected = xlsx_reader.outer_join_projects_to_parametric_values(self.project_list, parametric_value_list)
+        for chunk_size in [1, 4, 100]:
+            chunks = list(xlsx_reader.iter_extended_project_list_chunks(
+                self.project_list, self.parametric_list, chunk_size))
+            self.assertTrue(all(len(chunk) <= chunk_size for chunk in chunks))
+            pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+    def test_empty_parametric_list(self):
+        xlsx_reader = XlsxReader()
+        chunks = list(xlsx_reader.iter_extended_project_list_chunks(self.project_list, pd.DataFrame()))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]['Project ID'].tolist(), ['ge15', 'plain', 'ge20'])
+        self.assertTrue(chunks[0]['Project ID with serial'].isnull().all())
+
+
+class TestXlsxReaderCostAndScalingModifications(TestCase):
+    def setUp(self):
+        self.extended_project_list = pd.DataFrame({
+            'Project ID': ['small', 'medium', 'large'],
+            'Number of turbines': [10, 20, 40],
+            'Turbine rating MW': [1.5, 1.5, 2.5],
+            'Hub height m': [80.0, 80.0, 100.0],
+            'Flag for user-defined home run trench length (0 = no; 1 = yes)': [0, 1, 1],
+            'Combined Homerun Trench Length to Substation (km)': [50.0, 50.0, 50.0],
+            'project list/Project/Number of turbines': [None, None, 50.0]
+        })
+
+    def test_modifications(self):
+        modified = XlsxReader().apply_cost_and_scaling_modifications_to_extended_project_list(
+            self.extended_project_list)
+
+        # The parametric number of turbines is applied first.
+        self.assertEqual(modified['Number of turbines'].tolist(), [10, 20, 50])
+        self.assertEqual(modified['Project size MW'].tolist(), [15.0, 30.0, 125.0])
+        self.assertEqual(modified['Distance to interconnect (miles)'].tolist(),
+                         [0.0, 0.009375 * 30 + 0.625, 0.009375 * 125 + 0.625])
+        self.assertEqual(modified['New Switchyard (y/n)'].tolist(), ['n', 'n', 'y'])
+        self.assertEqual(modified['Road length adder (m)'].tolist()[0], 1e3)
+        self.assertEqual(modified['Breakpoint between base and topping (percent)'].tolist(), [0.0, 35 / 80, 35 / 100])
+        self.assertEqual(modified['Number of access roads'].tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(modified['Number of highway permits'].tolist(), [2, 4, 10])
+        self.assertEqual(modified['Rate of deliveries(turbines per week)'].tolist(), [10, 10, 6])
+        self.assertEqual(modified['Development labor cost USD'].tolist(), [255000.0, 510000.0, 2125000.0])
+
+        # The flag is a numpy integer from the sheet.
+        self.assertEqual(modified['Combined Homerun Trench Length to Substation (km)'].tolist(),
+                         [50.0, 0.1776 * 30 - 2.551, 0.1776 * 125 - 2.551])
+
+        # The extended project list itself is not modified.
+        self.assertNotIn('Project size MW', self.extended_project_list.columns)
+
+    def test_cell_specifications_keep_types_of_other_rows(self):
+        """
+        Like modify_project_data_and_project_list() on each row, an integer
+        column keeps its integers in the rows without a value.
+        """
+        self.extended_project_list['Labor cost multiplier'] = [1, 1, 1]
+        self.extended_project_list['project list/Project/Labor cost multiplier'] = [None, 1.2, 1.0]
+        modified = XlsxReader().apply_cost_and_scaling_modifications_to_extended_project_list(
+            self.extended_project_list)
+        self.assertEqual([type(value) for value in modified['Labor cost multiplier']], [int, float, float])
+        self.assertEqual(modified['Labor cost multiplier'].tolist(), [1, 1.2, 1.0])
+
+    def test_project_parameters(self):
+        """
+        The expected values are from the scaling rules applied to one row at
+        a time, after the project list cell specifications. A cell
+        specification of a scaled column is overwritten by the scaling.
+        """
+        self.extended_project_list['Number of access roads'] = [1.0, 1.0, 1.0]
+        self.extended_project_list['project list/Project/Number of access roads'] = [3.0, None, 3.0]
+        expected = {
+            'Number of turbines': [10, 20, 50],
+            'Project size MW': [15.0, 30.0, 125.0],
+            'Distance to interconnect (miles)': [0.0, 0.906250, 1.796875],
+            'Interconnect Voltage (kV)': [66.801, 73.398, 115.179],
+            'New Switchyard (y/n)': ['n', 'n', 'y'],
+            'Road length adder (m)': [1000.0, 1864.56, 3151.05],
+            'Number of access roads': [0.0, 1.0, 2.0],
+            'Number of highway permits': [2, 4, 10],
+            'Combined Homerun Trench Length to Substation (km)': [50.0, 2.777, 19.649],
+            'Rate of deliveries(turbines per week)': [10, 10, 6],
+            'Development labor cost USD': [255000.0, 510000.0, 2125000.0]
+        }
+        xlsx_reader = XlsxReader()
+        for position, (_, project_parameters) in enumerate(self.extended_project_list.iterrows()):
+            project_parameters = project_parameters.copy()
+            xlsx_reader.apply_cost_and_scaling_modifications_to_project_parameters(project_parameters)
+            for column_name, values in expected.items():
+                if isinstance(values[position], str):
+                    self.assertEqual(project_parameters[column_name], values[position])
+                else:
+                    self.assertAlmostEqual(project_parameters[column_name], values[position], places=6)
+
+
+class TestXlsxReaderProjectDataGroupKey(TestCase):
+    def setUp(self):
+        self.xlsx_reader = XlsxReader()
+        self.project_list = pd.DataFrame({
+            'Project data file': ['ge15_public'] * 4,
+            'Labor cost multiplier': [1.0] * 4,
+            'Number of turbines': [10, 20, 10, 10],
+            'rsmeans/Excavation/Rate USD per unit': [5.0, 5.0, 6.0, float('nan')],
+            'project list/Project/Labor cost multiplier': [float('nan')] * 3 + [2.0],
+            'project list/Project/Number of turbines': [float('nan'), 30.0, float('nan'), float('nan')]
+        })
+
+    def test_group_key(self):
+        keys = [self.xlsx_reader.project_data_group_key(row) for _, row in self.project_list.iterrows()]
+        # Changes to the project list do not change the project data.
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(keys[0], ('ge15_public', float, 1.0, (('rsmeans/Excavation/Rate USD per unit', float, 5.0),)))
+        self.assertNotEqual(keys[0], keys[2])
+        # A cell specification may set the labor multiplier.
+        self.assertEqual(keys[3], ('ge15_public', float, 2.0, ()))
+
+    def test_int_and_float_multipliers_not_grouped(self):
+        """
+        1 == 1.0, but they give the project data different dtypes.
+        """
+        int_project = pd.Series({'Project data file': 'ge15_public', 'Labor cost multiplier': 1})
+        float_project = pd.Series({'Project data file': 'ge15_public', 'Labor cost multiplier': 1.0})
+        self.assertNotEqual(self.xlsx_reader.project_data_group_key(int_project),
+                            self.xlsx_reader.project_data_group_key(float_project))
+
+
+class TestXlsxReaderWeatherWindow(TestCase):
+    def setUp(self):
+        XlsxReader._weather_windows.clear()
+        self.xlsx_reader = XlsxReader()
+        self.shared_sheets = {'weather_window': pd.DataFrame({'Speed m per s': [5.0] * 730})}
+
+    def test_shared_sheet_read_once(self):
+        with patch('landbosse.excelio.XlsxReader.read_weather_window', side_effect=lambda df: df.copy()) as read:
+            first = self.xlsx_reader.weather_window(CopyOnWriteSheets(self.shared_sheets), 1)
+            second = XlsxReader().weather_window(CopyOnWriteSheets(self.shared_sheets), 1, dict())
+            longer = XlsxReader().weather_window(CopyOnWriteSheets(self.shared_sheets), 2)
+        self.assertEqual(read.call_count, 1)
+        self.assertIs(first, second)
+        self.assertEqual(len(longer), 2 * 730)
+
+    def test_modified_sheet_not_cached(self):
+        with patch('landbosse.excelio.XlsxReader.read_weather_window', side_effect=lambda df: df.copy()) as read:
+            for _ in range(2):
+                project_data = CopyOnWriteSheets(self.shared_sheets)
+                project_data.writable('weather_window').iloc[0, 0] = 10.0
+                shared_inputs = dict()
+                self.xlsx_reader.weather_window(project_data, 1, shared_inputs)
+                # Projects that share inputs share the window.
+                self.xlsx_reader.weather_window(project_data, 2, shared_inputs)
+        self.assertEqual(read.call_count, 2)
+        self.assertEqual(len(XlsxReader._weather_windows), 0)
+
+
+class TestXlsxReaderSharedInputs(TestCase):
+    def setUp(self):
+        XlsxReader._labor_multiplier_cache.clear()
+        XlsxReader._weather_windows.clear()
+        self.project_data = CopyOnWriteSheets({
+            'crew_price': pd.DataFrame({
+                'Labor type ID': ['Crane operator'],
+                'Hourly rate USD per hour': [50.0],
+                'Per diem USD per day': [100.0]
+            }),
+            'rsmeans': pd.DataFrame({
+                'Operation ID': ['Excavation'],
+                'Type of cost': ['Labor'],
+                'Rate USD per unit': [10.0],
+                'Module': ['Foundations']
+            }),
+            'weather_window': pd.DataFrame({'Speed m per s': [5.0] * 730})
+        })
+
+    def test_prepared_once_per_group(self):
+        shared_inputs = dict()
+        with patch('landbosse.excelio.XlsxReader.read_weather_window', side_effect=lambda df: df.copy()) as read:
+            for months in [1, 2, 1]:
+                XlsxReader().prepare_shared_inputs(self.project_data, pd.Series({
+                    'Labor cost multiplier': 2.0, 'Total project construction time (months)': months
+                }), shared_inputs)
+        self.assertEqual(read.call_count, 1)
+        self.assertEqual(self.project_data['crew_price']['Hourly rate USD per hour'].tolist(), [100.0])
+        self.assertEqual(len(shared_inputs[('extended_weather_window', 1)]), 730)
+        self.assertEqual(len(shared_inputs[('extended_weather_window', 2)]), 2 * 730)
+        index = shared_inputs['project_data_index']
+        self.assertEqual(index.rsmeans_for_module('Foundations')['Rate USD per unit'].tolist(), [20.0])
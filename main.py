@@ -5,9 +5,16 @@ import pandas as pd
 
 from landbosse.excelio import XlsxSerialManagerRunner
 from landbosse.excelio import XlsxParallelManagerRunner
-from landbosse.excelio import XlsxGenerator
+from landbosse.excelio import AdaptiveRefinementSweep
+from landbosse.excelio import ShardMerger
+from landbosse.excelio import SurrogateTrainer
+from landbosse.excelio import SensitivityAnalysis
+from landbosse.excelio import RepricingSweep
+from landbosse.excelio import UncertaintyAnalysis
+from landbosse.excelio.XlsxOperationException import XlsxOperationException
+from landbosse.excelio import ProjectResultFileWriter
 from landbosse.excelio import XlsxValidator
-from landbosse.excelio import CsvGenerator
+from landbosse.excelio import XlsxDataframeCache
 
 # LandBOSSE, small utility functions
 from landbosse.excelio import XlsxFileOperations
@@ -19,6 +26,21 @@ if __name__ == '__main__':
     # The file_ops object handles file names for input and output data.
     file_ops = XlsxFileOperations()
 
+    # With --cache-dir or LANDBOSSE_CACHE_DIR, the parsed project data
+    # .xlsx files are kept in a cache on disk for the next runs.
+    XlsxDataframeCache.cache_dir = file_ops.disk_cache_dir()
+
+    # With --merge-shards, the outputs of the shards of a sweep are checked
+    # and merged into the output directory. No projects are run.
+    shard_dirs = file_ops.merge_shard_dirs()
+    if shard_dirs is not None:
+        ShardMerger(shard_dirs).merge(file_ops.landbosse_output_dir())
+        print(f'>>>>>>>> Merged {len(shard_dirs)} shards {datetime.now()} <<<<<<<<<<')
+        exit(0)
+
+    # With --shard, only one slice of the extended project list is run.
+    shard = file_ops.shard_option()
+
     # If run_parallel is True, an XlsxParallelManagerRunner will calculate the
     # projects in parallel. This takes advantage of multicore architecture
     # available on most hardware.
@@ -30,7 +52,11 @@ if __name__ == '__main__':
     # processes.
 
     run_parallel = True
-    manager_runner = XlsxParallelManagerRunner(file_ops) if run_parallel else XlsxSerialManagerRunner(file_ops)
+    manager_runner = XlsxParallelManagerRunner(file_ops, shard) if run_parallel else XlsxSerialManagerRunner(file_ops, shard)
+
+    # With --keep-intermediates, the whole output dictionary of each project
+    # is kept for debugging rather than only its cost and detail rows.
+    manager_runner.keep_intermediate_outputs = file_ops.keep_intermediates_enabled()
 
     # project_xlsx is the absolute path of the project_list.xlsx
     projects_xlsx = os.path.join(file_ops.landbosse_input_dir(), 'project_list.xlsx')
@@ -41,13 +67,98 @@ if __name__ == '__main__':
     # Switch to either validation or non validation producing code.
     input_path, output_path, validation_enabled, enable_scaling_study = file_ops.get_input_output_paths_from_argv_or_env()
 
-    # final_result aggregates all the results from all the projects.
-    final_result = manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study)
+    # In costs only mode, only the costs outputs are calculated and the
+    # details outputs are skipped. Repricing sweeps are always costs only.
+    reprice = file_ops.repricing_enabled()
+    costs_only = file_ops.costs_only_enabled() or reprice
+
+    # With --train-surrogate, the parametric variations of one project are
+    # run and an emulator of its costs is saved instead of the usual outputs.
+    surrogate_project_id, surrogate_method = file_ops.surrogate_options()
+    if surrogate_project_id is not None:
+        if shard is not None:
+            raise XlsxOperationException('--train-surrogate and --shard cannot be enabled at the same time.')
+        trainer = SurrogateTrainer(manager_runner, surrogate_project_id, surrogate_method)
+        emulator = trainer.train(enable_scaling_study)
+        emulator.save(os.path.join(file_ops.landbosse_output_dir(), f'landbosse-surrogate-{surrogate_project_id}.pkl'))
+        emulator.validation.to_csv(
+            os.path.join(file_ops.landbosse_output_dir(), f'landbosse-surrogate-{surrogate_project_id}-validation.csv'),
+            index=False)
+        print(emulator.validation)
+        print(f'>>>>>>>> End surrogate training {datetime.now()} <<<<<<<<<<')
+        exit(0)
+
+    # With --sensitivity, the rows of one project in the parametric list are
+    # ranked by how much they drive the cost of each module.
+    sensitivity_project_id, sensitivity_method, sample_count = file_ops.sensitivity_options()
+    if sensitivity_project_id is not None:
+        if shard is not None:
+            raise XlsxOperationException('--sensitivity and --shard cannot be enabled at the same time.')
+        analysis = SensitivityAnalysis(manager_runner, sensitivity_project_id, sensitivity_method, sample_count)
+        indices = analysis.run(enable_scaling_study)
+        indices.to_csv(
+            os.path.join(file_ops.landbosse_output_dir(), f'landbosse-sensitivity-{sensitivity_project_id}.csv'),
+            index=False)
+        print(indices)
+        print(f'>>>>>>>> End sensitivity analysis {datetime.now()} <<<<<<<<<<')
+        exit(0)
+
+    # With --uncertainty, samples of the distributions of one project's rows
+    # in the parametric list are run and the percentiles of the costs saved.
+    uncertainty_project_id, uncertainty_sample_count = file_ops.uncertainty_options()
+    if uncertainty_project_id is not None:
+        if shard is not None:
+            raise XlsxOperationException('--uncertainty and --shard cannot be enabled at the same time.')
+        analysis = UncertaintyAnalysis(manager_runner, uncertainty_project_id, uncertainty_sample_count)
+        summary = analysis.run(enable_scaling_study)
+        summary.to_csv(
+            os.path.join(file_ops.landbosse_output_dir(), f'landbosse-uncertainty-{uncertainty_project_id}.csv'),
+            index=False)
+        pd.concat([analysis.samples, analysis.costs.reset_index(drop=True)], axis=1).to_csv(
+            os.path.join(file_ops.landbosse_output_dir(),
+                         f'landbosse-uncertainty-{uncertainty_project_id}-samples.csv'),
+            index=False)
+        print(summary)
+        print(f'>>>>>>>> End uncertainty analysis {datetime.now()} <<<<<<<<<<')
+        exit(0)
 
-    # Write the extended_project_list, which has all the parametric values.
-    extended_project_list_path = os.path.join(file_ops.extended_project_list_path(), 'extended_project_list.csv')
-    extended_project_list = final_result['extended_project_list']
-    extended_project_list.to_csv(extended_project_list_path, index=False)
+    # With --adaptive, the parametric list is run as an adaptive refinement
+    # sweep that adds points only where costs change, up to a run budget.
+    run_budget, tolerance = file_ops.adaptive_refinement_options()
+    if run_budget is not None:
+        if shard is not None:
+            raise XlsxOperationException('--adaptive and --shard cannot be enabled at the same time.')
+        manager_runner = AdaptiveRefinementSweep(manager_runner, run_budget, tolerance)
+
+    # With --reprice, variations that only change prices are computed from
+    # the quantities of each project instead of running the cost modules.
+    if reprice:
+        if shard is not None or run_budget is not None:
+            raise XlsxOperationException('--reprice cannot be enabled with --shard or --adaptive.')
+        manager_runner = RepricingSweep(manager_runner)
+
+    # The result writer writes the outputs of the projects as the manager
+    # runner hands them over: the costs and details .csv files, the costs
+    # tab of the .xlsx and the extended_project_list, which has all the
+    # parametric values. The details .csv is not written in costs only
+    # mode. The costs are also kept for validation.
+    with ProjectResultFileWriter(file_ops, costs_only, keep_costs=validation_enabled) as result_writer:
+        manager_runner.run_from_project_list_xlsx(projects_xlsx, enable_scaling_study, costs_only=costs_only,
+                                                  result_writer=result_writer)
+
+    # The quantities of the projects that were repriced
+    if reprice:
+        quantities = [quantity_table.quantity_table()
+                      for quantity_table in manager_runner.quantity_tables.values() if quantity_table is not None]
+        if len(quantities) > 0:
+            pd.concat(quantities, ignore_index=True).to_csv(
+                os.path.join(file_ops.landbosse_output_dir(), 'landbosse-quantities.csv'), index=False)
+
+    # A shard records which rows of the extended project list it ran, so that
+    # the shards can be checked and merged with --merge-shards.
+    if shard is not None:
+        ShardMerger.write_manifest(file_ops.landbosse_output_dir(), shard, manager_runner.extended_project_count(),
+                                   result_writer.extended_project_ids, costs_only)
 
     # Run validation or not depending on whether validation was enabled.
     if validation_enabled:
@@ -62,7 +173,7 @@ if __name__ == '__main__':
         validator = XlsxValidator()
         validation_was_successful = validator.compare_expected_to_actual(
             expected_xlsx=expected_validation_data_path,
-            actual_module_type_operation_list=final_result['module_type_operation_list'],
+            actual_module_type_operation_list=result_writer.module_type_operation_df,
             validation_output_xlsx=validation_result_path
         )
         if validation_was_successful:
@@ -72,29 +183,16 @@ if __name__ == '__main__':
             print('Validation failed. See mismatched data above.')
             build_status = 1
 
-    # XlsxGenerator has a context manager that writes each individual
-    # worksheet to the output .xlsx. Also, copy file input structure.
+    # Copy file input structure.
     print('Writing final output folder')
 
     max_number_of_excel_rows = 1048576
-    if len(final_result['details_list']) > max_number_of_excel_rows:
+    if result_writer.details_row_count > max_number_of_excel_rows:
         print('WARNING: Details sheet in .xlsx has too many rows for Excel. Please use landbosse-details.csv instead.')
         print('Writing .xlsx file for backwards compatability.')
 
-    with XlsxGenerator('landbosse-output', file_ops) as xlsx:
-        xlsx.tab_costs_by_module_type_operation(rows=final_result['module_type_operation_list'])
     file_ops.copy_input_data()
 
-    # Always write .csv versions of the output
-    csv_generator = CsvGenerator(file_ops)
-
-    costs = csv_generator.create_costs_dataframe(final_result['module_type_operation_list'])
-    details = csv_generator.create_details_dataframe(final_result['details_list'])
-    costs_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-costs.csv')
-    details_csv_filename = os.path.join(file_ops.landbosse_output_dir(), 'landbosse-details.csv')
-    costs.to_csv(costs_csv_filename, index=False)
-    details.to_csv(details_csv_filename, index=False)
-
     # Print end timestamp
     print(f'>>>>>>>> End run {datetime.now()} <<<<<<<<<<')
 